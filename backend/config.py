@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +8,110 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key"
     API_LOG_LEVEL: str = "INFO"
 
+    # MongoDB client / connection pool. Unset optional values keep the driver defaults.
+    # Size MONGO_MAX_POOL_SIZE per worker process: workers x pool size must stay under
+    # the server's connection limit.
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGO_CONNECT_TIMEOUT_MS: int = 20000
+    MONGO_COMPRESSORS: Optional[str] = None  # e.g. "zstd,snappy,zlib"
+    MONGO_READ_PREFERENCE: Optional[str] = None  # e.g. "primaryPreferred"
+    MONGO_READ_CONCERN_LEVEL: Optional[str] = None  # e.g. "majority"
+    MONGO_WRITE_CONCERN_W: Optional[str] = None  # "majority" or a node count
+    MONGO_WRITE_CONCERN_JOURNAL: Optional[bool] = None
+
+    # The /api/admin diagnostics routes have no authentication; only enable them where
+    # the API is not publicly reachable (or behind a proxy that restricts /api/admin).
+    ADMIN_API_ENABLED: bool = False
+
+    # Slow-query monitoring (see backend/db_monitoring.py)
+    SLOW_QUERY_THRESHOLD_MS: float = 100
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN_ENABLED: bool = False
+    SLOW_QUERY_EXPLAIN_AFTER: int = 5
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 60
+
+    # Review mistakes are read from the materialized mistakes collection. Set this on
+    # databases whose collection has not been backfilled yet (see
+    # backend/scripts/backfill_mistakes.py) to aggregate them from missions instead.
+    REVIEW_MISTAKES_FROM_MISSIONS: bool = False
+
+    # Per-process cache of computed review results (see backend/services/review_cache.py)
+    REVIEW_CACHE_ENABLED: bool = True
+    REVIEW_CACHE_MAX_ENTRIES: int = 5000
+
+    # Practice session lifecycle. In-progress sessions carry an expires_at that every
+    # answer pushes PRACTICE_SESSION_TTL_HOURS ahead; a TTL index deletes them after it.
+    # The optional sweep first compacts sessions idle for PRACTICE_SESSION_IDLE_HOURS
+    # (keep it below the TTL) into ABANDONED summaries kept for the retention period.
+    PRACTICE_SESSION_TTL_HOURS: int = 72
+    PRACTICE_SESSION_IDLE_HOURS: int = 24
+    PRACTICE_SESSION_SWEEP_ENABLED: bool = False
+    PRACTICE_SESSION_SWEEP_INTERVAL_MINUTES: int = 30
+    PRACTICE_SESSION_SWEEP_BATCH_SIZE: int = 500
+    PRACTICE_ABANDONED_RETENTION_DAYS: int = 30
+
+    # Write-behind buffer for in-progress practice sessions (see
+    # backend/services/practice_session_buffer.py). Only enable it when requests for
+    # a session are routed to the same process; a crash loses at most FLUSH_SECONDS of answers.
+    PRACTICE_SESSION_BUFFER_ENABLED: bool = False
+    PRACTICE_SESSION_BUFFER_MAX_SESSIONS: int = 10000
+    PRACTICE_SESSION_BUFFER_FLUSH_SECONDS: int = 15
+    PRACTICE_SESSION_BUFFER_IDLE_SECONDS: int = 600
+
+    # Length of the rolling window in per-user practice stats
+    PRACTICE_STATS_WINDOW_DAYS: int = 30
+
+    # Per-user question exposure filters (see backend/services/question_exposure.py).
+    # Samplers skip the last GENERATION_SIZE to 2 x GENERATION_SIZE questions served.
+    QUESTION_EXPOSURE_ENABLED: bool = True
+    QUESTION_EXPOSURE_GENERATION_SIZE: int = 300
+
+    # Weekly leaderboard (see backend/services/leaderboard.py). Each process reloads its
+    # rank indexes this often, picking up completions handled by other processes.
+    LEADERBOARD_REFRESH_SECONDS: int = 60
+
+    # Incremental platform analytics (see backend/services/analytics_rollup_service.py).
+    # Each run covers events up to LAG_SECONDS ago; the first starts BACKFILL_DAYS back.
+    # Runs from different processes take turns through a claim held for LEASE_SECONDS
+    # at most (keep it above the longest run).
+    ANALYTICS_ROLLUP_ENABLED: bool = True
+    ANALYTICS_ROLLUP_INTERVAL_MINUTES: int = 15
+    ANALYTICS_ROLLUP_LAG_SECONDS: int = 120
+    ANALYTICS_ROLLUP_BACKFILL_DAYS: int = 30
+    ANALYTICS_ROLLUP_LEASE_SECONDS: int = 600
+
+    # Item analysis (see backend/services/item_analysis.py). Live counters are split over
+    # COUNTER_SHARDS documents per question; the nightly batch job runs at HOUR (UTC+7),
+    # handing CHUNK_ROWS responses at a time to WORKERS processes (inline when <= 1).
+    # Difficulty levels are only suggested for questions with MIN_RESPONSES first attempts.
+    # The batch job is off by default, like the IRT calibration; the live counters are not.
+    ITEM_STATS_COUNTER_SHARDS: int = 8
+    ITEM_ANALYSIS_ENABLED: bool = False
+    ITEM_ANALYSIS_HOUR: int = 3
+    ITEM_ANALYSIS_WORKERS: int = 2
+    ITEM_ANALYSIS_CHUNK_ROWS: int = 50000
+    ITEM_ANALYSIS_MIN_RESPONSES: int = 30
+
+    # Item response theory (see backend/services/irt.py). The nightly calibration fits
+    # IRT_MODEL ("1pl" or "2pl") at IRT_CALIBRATION_HOUR:30 (UTC+7); daily missions are
+    # picked around the difficulty a student answers correctly with TARGET_P_CORRECT.
+    # Each process reloads its item index every INDEX_REFRESH_SECONDS. Ability
+    # precision is capped at MAX_PRECISION so estimates keep moving between calibrations.
+    # Off by default; once enabled, missions stay uniformly sampled until the first
+    # calibration has stored item parameters.
+    IRT_ENABLED: bool = False
+    IRT_MODEL: str = "2pl"
+    IRT_CALIBRATION_HOUR: int = 3
+    IRT_CALIBRATION_ITERATIONS: int = 100
+    IRT_TARGET_P_CORRECT: float = 0.7
+    IRT_SELECTION_SPREAD: float = 0.5
+    IRT_MAX_PRECISION: float = 50.0
+    IRT_INDEX_REFRESH_SECONDS: int = 300
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding='utf-8', extra='ignore')
 
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
@@ -1,20 +1,58 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from backend.config import settings
+from backend.db_monitoring import PoolMonitor, SlowQueryMonitor
 
 class DatabaseManager:
     """
     Manages the connection to the MongoDB database.
     """
     client: AsyncIOMotorClient = None
+    query_monitor: SlowQueryMonitor = None
+    pool_monitor: PoolMonitor = None
 
     def connect_to_database(self):
         """
         Connects to the MongoDB database using the URI from the global settings.
+        Pool sizing, timeouts, compression and read/write concerns come from settings;
+        a SlowQueryMonitor and a PoolMonitor are registered on the client.
         """
         print("Connecting to MongoDB...")
-        self.client = AsyncIOMotorClient(settings.DATABASE_URL)
+        self.query_monitor = SlowQueryMonitor(
+            slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+            window_size=settings.SLOW_QUERY_LOG_SIZE,
+            explain_enabled=settings.SLOW_QUERY_EXPLAIN_ENABLED,
+            explain_after=settings.SLOW_QUERY_EXPLAIN_AFTER,
+        )
+        self.pool_monitor = PoolMonitor()
+        self.client = AsyncIOMotorClient(
+            settings.DATABASE_URL,
+            event_listeners=[self.query_monitor, self.pool_monitor],
+            **self.client_options()
+        )
         print("Successfully connected to MongoDB.")
 
+    def client_options(self) -> dict:
+        """
+        Builds the Motor client keyword options from settings, leaving out
+        anything that is not configured so the driver defaults apply.
+        """
+        options = {
+            "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+            "compressors": settings.MONGO_COMPRESSORS,
+            "readPreference": settings.MONGO_READ_PREFERENCE,
+            "readConcernLevel": settings.MONGO_READ_CONCERN_LEVEL,
+            "journal": settings.MONGO_WRITE_CONCERN_JOURNAL,
+        }
+        write_concern = settings.MONGO_WRITE_CONCERN_W
+        if write_concern is not None:
+            options["w"] = int(write_concern) if write_concern.isdigit() else write_concern
+        return {key: value for key, value in options.items() if value is not None}
+
     def close_database_connection(self):
         """
         Closes the connection to the MongoDB database.
@@ -0,0 +1,466 @@
+"""
+MongoDB command and connection-pool monitoring.
+
+`SlowQueryMonitor` is a PyMongo command listener registered on the Motor client by
+`DatabaseManager.connect_to_database`. It keeps per-command timing statistics, a rolling
+window of slow operations with their filter shape (values redacted), and can capture an
+`explain` once for filter shapes that keep showing up as slow (plan outline only).
+
+`PoolMonitor` is the matching connection-pool listener: checkout wait times, connections
+in use and pool-cleared events per server, used to size pools against Mongo's limits.
+
+Repository methods are attributed through a context variable set by
+`instrument_repository`; Motor copies the context into the executor thread that runs the
+PyMongo call, so the listener can see which repository method issued a command.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger("backend.db.slow_query")
+
+# "RepositoryClass.method" of the repository call currently running, if any.
+current_repository_method: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_repository_method", default=None
+)
+
+# Commands that are driver housekeeping rather than application queries.
+_IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "buildinfo", "endSessions",
+    "saslStart", "saslContinue", "getnonce", "authenticate", "killCursors", "explain",
+}
+
+# Keys that say how a command was sent rather than what it asked for.
+_COMMAND_META_KEYS = {
+    "lsid", "$db", "$clusterTime", "txnNumber", "$readPreference", "readConcern",
+    "writeConcern", "autocommit", "startTransaction", "apiVersion", "apiStrict",
+}
+
+# Commands that can be re-issued under `explain`.
+_EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+REDACTED = "?"
+
+
+def instrument_repository(cls):
+    """
+    Class decorator that tags every coroutine method of a repository with its name, so
+    MongoDB commands issued while it runs are attributed to it by the command listener.
+    """
+    for name, member in list(vars(cls).items()):
+        if inspect.iscoroutinefunction(member):
+            setattr(cls, name, _tag_repository_method(member, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _tag_repository_method(method, label: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_repository_method.set(label)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_repository_method.reset(token)
+    return wrapper
+
+
+def redact_filter(value: Any) -> Any:
+    """
+    Replaces literal values in a filter or pipeline with "?" while keeping its shape:
+    field names, operators and `$field` references survive, lists of literals collapse
+    to a single placeholder so `$in` with 3 or 300 ids has the same shape.
+    """
+    if isinstance(value, dict):
+        return {key: redact_filter(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (dict, list, tuple)) for item in value):
+            return [redact_filter(item) for item in value]
+        return [REDACTED] if value else []
+    if isinstance(value, str) and value.startswith("$"):
+        return value
+    return REDACTED
+
+
+# Plan fields that describe its shape; filters and index bounds carry literal values
+PLAN_OUTLINE_FIELDS = ("stage", "indexName", "keyPattern", "isMultiKey", "direction")
+PLAN_CHILD_FIELDS = ("inputStage", "innerStage", "outerStage", "thenStage", "elseStage")
+
+
+def plan_outline(plan: Any) -> Any:
+    """
+    Reduces an explain plan to stage names, index names and key patterns, dropping
+    filters, index bounds and other fields that hold query values. Takes a find's
+    `winningPlan` or an aggregate's `stages`.
+    """
+    if isinstance(plan, list):
+        return [plan_outline(stage) for stage in plan]
+    if not isinstance(plan, dict):
+        return None
+    # Slot-based engine plans wrap the classic plan tree
+    if "queryPlan" in plan:
+        return plan_outline(plan["queryPlan"])
+    if "stage" not in plan:
+        # An aggregate stage, e.g. {"$cursor": {"queryPlanner": ...}} or {"$group": ...}
+        name = next((key for key in plan if key.startswith("$")), None)
+        if name is None:
+            return None
+        outline: Dict[str, Any] = {"stage": name}
+        if name == "$cursor":
+            outline["inputStage"] = plan_outline((plan[name].get("queryPlanner") or {}).get("winningPlan"))
+        return outline
+    outline = {field: plan[field] for field in PLAN_OUTLINE_FIELDS if field in plan}
+    for field in PLAN_CHILD_FIELDS:
+        if field in plan:
+            outline[field] = plan_outline(plan[field])
+    if "inputStages" in plan:
+        outline["inputStages"] = plan_outline(plan["inputStages"])
+    return outline
+
+
+def _command_collection(command_name: str, command: Dict[str, Any]) -> Optional[str]:
+    if command_name == "getMore":
+        return command.get("collection")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else None
+
+
+def _command_filter(command_name: str, command: Dict[str, Any]) -> Any:
+    """Pulls the part of a command that determines its query plan."""
+    if command_name == "find":
+        return command.get("filter", {})
+    if command_name == "aggregate":
+        return command.get("pipeline", [])
+    if command_name in ("count", "distinct", "findAndModify"):
+        return command.get("query", {})
+    if command_name == "update":
+        updates = command.get("updates") or [{}]
+        return updates[0].get("q", {})
+    if command_name == "delete":
+        deletes = command.get("deletes") or [{}]
+        return deletes[0].get("q", {})
+    return None
+
+
+class SlowQueryMonitor(monitoring.CommandListener):
+    """Command listener that records durations per command, collection and repository method."""
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 100,
+        window_size: int = 200,
+        explain_enabled: bool = False,
+        explain_after: int = 5,
+    ):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.explain_enabled = explain_enabled
+        self.explain_after = explain_after
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[Any, int, Any], Dict[str, Any]] = {}
+        self._command_stats: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._slow_operations: Deque[Dict[str, Any]] = deque(maxlen=window_size)
+        self._slow_counts: Dict[str, int] = {}
+        self._pending_explains: Dict[str, Dict[str, Any]] = {}
+        self._explains: Dict[str, Dict[str, Any]] = {}
+
+    # --- CommandListener interface ---
+
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        key = (event.connection_id, event.request_id, event.operation_id)
+        record = {
+            "command": event.command_name,
+            "database": event.database_name,
+            "collection": _command_collection(event.command_name, event.command) or "-",
+            "caller": current_repository_method.get() or "-",
+            "raw": event.command,
+        }
+        with self._lock:
+            self._in_flight[key] = record
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    # --- Recording ---
+
+    def _finish(self, event, failed: bool):
+        key = (event.connection_id, event.request_id, event.operation_id)
+        with self._lock:
+            record = self._in_flight.pop(key, None)
+        if record is None:
+            return
+
+        duration_ms = event.duration_micros / 1000
+        stats_key = (record["command"], record["collection"], record["caller"])
+        with self._lock:
+            stats = self._command_stats.setdefault(stats_key, {
+                "command": record["command"],
+                "collection": record["collection"],
+                "caller": record["caller"],
+                "count": 0,
+                "failures": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "slow_count": 0,
+            })
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            if failed:
+                stats["failures"] += 1
+            if duration_ms >= self.slow_threshold_ms:
+                stats["slow_count"] += 1
+
+        if duration_ms >= self.slow_threshold_ms:
+            self._record_slow_operation(record, duration_ms, failed)
+
+    def _record_slow_operation(self, record: Dict[str, Any], duration_ms: float, failed: bool):
+        raw = record["raw"]
+        filter_shape = redact_filter(_command_filter(record["command"], raw))
+        shape_key = json.dumps(
+            [record["command"], record["collection"], filter_shape], sort_keys=True, default=str
+        )
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "command": record["command"],
+            "database": record["database"],
+            "collection": record["collection"],
+            "caller": record["caller"],
+            "duration_ms": round(duration_ms, 2),
+            "filter_shape": filter_shape,
+            "failed": failed,
+        }
+
+        with self._lock:
+            self._slow_operations.append(entry)
+            count = self._slow_counts.get(shape_key, 0) + 1
+            self._slow_counts[shape_key] = count
+            if (
+                self.explain_enabled
+                and count >= self.explain_after
+                and record["command"] in _EXPLAINABLE_COMMANDS
+                and shape_key not in self._explains
+                and shape_key not in self._pending_explains
+            ):
+                self._pending_explains[shape_key] = {
+                    "database": record["database"],
+                    "command": {k: v for k, v in raw.items() if k not in _COMMAND_META_KEYS},
+                    "entry": entry,
+                }
+
+        logger.warning(json.dumps({"event": "slow_query", **entry}, default=str))
+
+    # --- Explain capture ---
+
+    async def run_pending_explains(self, client) -> int:
+        """
+        Explains queued repeat offenders once each. Meant to run from the scheduler,
+        off the request path. Returns the number of explains captured.
+        """
+        with self._lock:
+            pending = list(self._pending_explains.items())
+            self._pending_explains.clear()
+
+        captured = 0
+        for shape_key, item in pending:
+            try:
+                result = await client[item["database"]].command(
+                    {"explain": item["command"], "verbosity": "queryPlanner"}
+                )
+            except Exception as e:
+                logger.error(f"Failed to explain slow {item['entry']['command']} on {item['entry']['collection']}: {e}")
+                continue
+
+            planner = result.get("queryPlanner") or {}
+            explain = {
+                "command": item["entry"]["command"],
+                "collection": item["entry"]["collection"],
+                "caller": item["entry"]["caller"],
+                "filter_shape": item["entry"]["filter_shape"],
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "winning_plan": plan_outline(planner.get("winningPlan", result.get("stages"))),
+            }
+            with self._lock:
+                self._explains[shape_key] = explain
+            logger.warning(json.dumps({"event": "slow_query_explain", **explain}, default=str))
+            captured += 1
+        return captured
+
+    # --- Reporting ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns a JSON-serialisable view of the collected data, slowest first."""
+        with self._lock:
+            command_stats = [
+                {
+                    **stats,
+                    "total_ms": round(stats["total_ms"], 2),
+                    "max_ms": round(stats["max_ms"], 2),
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0,
+                }
+                for stats in self._command_stats.values()
+            ]
+            slow_operations = list(reversed(self._slow_operations))
+            repeat_offenders = sorted(
+                ({"shape": json.loads(key), "slow_count": count} for key, count in self._slow_counts.items()),
+                key=lambda item: item["slow_count"],
+                reverse=True,
+            )
+            explains = list(self._explains.values())
+
+        command_stats.sort(key=lambda stats: stats["total_ms"], reverse=True)
+        return {
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "explain_enabled": self.explain_enabled,
+            "command_stats": command_stats,
+            "slow_operations": slow_operations,
+            "repeat_offenders": repeat_offenders[:20],
+            "explains": explains,
+        }
+
+    def reset(self):
+        """Clears all collected data (in-flight commands are kept)."""
+        with self._lock:
+            self._command_stats.clear()
+            self._slow_operations.clear()
+            self._slow_counts.clear()
+            self._pending_explains.clear()
+            self._explains.clear()
+
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is open-ended.
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 20, 100, 500)
+
+
+def _new_pool_stats() -> Dict[str, Any]:
+    return {
+        "connections_open": 0,
+        "connections_in_use": 0,
+        "peak_in_use": 0,
+        "waiting": 0,
+        "peak_waiting": 0,
+        "checkouts": 0,
+        "checkout_failures": {},
+        "checkout_wait_total_ms": 0.0,
+        "checkout_wait_max_ms": 0.0,
+        "checkout_wait_histogram": [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1),
+        "pool_cleared": 0,
+        "last_cleared_at": None,
+    }
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection-pool listener that keeps per-server pool gauges and checkout wait statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Dict[str, Any]] = {}
+
+    def _stats(self, address) -> Dict[str, Any]:
+        key = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+        return self._pools.setdefault(key, _new_pool_stats())
+
+    def _record_wait(self, stats: Dict[str, Any], duration: Optional[float]):
+        # `duration` (seconds) is reported by PyMongo 4.7+; older drivers leave it out.
+        if duration is None:
+            return
+        wait_ms = duration * 1000
+        stats["checkout_wait_total_ms"] += wait_ms
+        stats["checkout_wait_max_ms"] = max(stats["checkout_wait_max_ms"], wait_ms)
+        bucket = next(
+            (i for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS_MS) if wait_ms < bound),
+            len(CHECKOUT_WAIT_BUCKETS_MS),
+        )
+        stats["checkout_wait_histogram"][bucket] += 1
+
+    # --- ConnectionPoolListener interface ---
+
+    def pool_created(self, event):
+        with self._lock:
+            self._stats(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats["pool_cleared"] += 1
+            stats["last_cleared_at"] = datetime.now(timezone.utc).isoformat()
+        logger.warning(json.dumps({"event": "mongo_pool_cleared", "address": str(event.address)}))
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self._stats(event.address)["connections_open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats["connections_open"] = max(stats["connections_open"] - 1, 0)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats["waiting"] += 1
+            stats["peak_waiting"] = max(stats["peak_waiting"], stats["waiting"])
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats["waiting"] = max(stats["waiting"] - 1, 0)
+            reason = str(event.reason)
+            stats["checkout_failures"][reason] = stats["checkout_failures"].get(reason, 0) + 1
+            self._record_wait(stats, getattr(event, "duration", None))
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats["waiting"] = max(stats["waiting"] - 1, 0)
+            stats["checkouts"] += 1
+            stats["connections_in_use"] += 1
+            stats["peak_in_use"] = max(stats["peak_in_use"], stats["connections_in_use"])
+            self._record_wait(stats, getattr(event, "duration", None))
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats["connections_in_use"] = max(stats["connections_in_use"] - 1, 0)
+
+    # --- Reporting ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the pool metrics per server address."""
+        with self._lock:
+            pools = {}
+            for address, stats in self._pools.items():
+                waits = sum(stats["checkout_wait_histogram"])
+                pools[address] = {
+                    **stats,
+                    "checkout_failures": dict(stats["checkout_failures"]),
+                    "checkout_wait_total_ms": round(stats["checkout_wait_total_ms"], 2),
+                    "checkout_wait_max_ms": round(stats["checkout_wait_max_ms"], 2),
+                    "checkout_wait_avg_ms": round(stats["checkout_wait_total_ms"] / waits, 3) if waits else 0,
+                    "checkout_wait_histogram": dict(zip(
+                        [f"<{bound}ms" for bound in CHECKOUT_WAIT_BUCKETS_MS] + [f">={CHECKOUT_WAIT_BUCKETS_MS[-1]}ms"],
+                        stats["checkout_wait_histogram"],
+                    )),
+                }
+        return {"pools": pools, "checkout_wait_buckets_ms": list(CHECKOUT_WAIT_BUCKETS_MS)}
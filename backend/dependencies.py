@@ -5,13 +5,27 @@ Using FastAPI's dependency injection system, these functions provide instances
 of repositories or other services to the application's components (e.g., routes, services).
 This approach decouples components, making them easier to test and maintain.
 """
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import Depends
 
 from backend.repositories.question_repository import QuestionRepository
 from backend.repositories.mission_repository import MissionRepository
 from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_epoch_repository import ReviewEpochRepository
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.repositories.practice_stats_repository import PracticeStatsRepository
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+from backend.repositories.streak_repository import StreakRepository
+from backend.repositories.leaderboard_repository import LeaderboardRepository
+from backend.repositories.progress_rollup_repository import ProgressRollupRepository
+from backend.repositories.analytics_repository import AnalyticsRepository
+from backend.repositories.item_stats_repository import ItemStatsRepository
+from backend.repositories.irt_repository import IrtRepository
+from backend.services.progress_recorder import ProgressRecorder
 from backend.database import db_manager
+from backend.config import settings
 
 
 def get_database() -> AsyncIOMotorDatabase:
@@ -46,4 +60,143 @@ def get_practice_repository(db: AsyncIOMotorDatabase = Depends(get_database)) ->
     Initializes the repository with the database connection, providing
     an interface for practice session data operations.
     """
-    return PracticeRepository(db) 
\ No newline at end of file
+    return PracticeRepository(db)
+
+
+def get_mistake_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> MistakeRepository:
+    """
+    Dependency provider for the MistakeRepository.
+
+    Initializes the repository with the database connection, providing
+    an interface for the materialized mistakes collection.
+    """
+    return MistakeRepository(db)
+
+
+def get_review_epoch_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> ReviewEpochRepository:
+    """
+    Dependency provider for the ReviewEpochRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the per-user review epochs that cached review results are keyed by.
+    """
+    return ReviewEpochRepository(db)
+
+
+def get_review_schedule_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> ReviewScheduleRepository:
+    """
+    Dependency provider for the ReviewScheduleRepository.
+
+    Initializes the repository with the database connection, providing
+    an interface for the spaced-repetition review schedule.
+    """
+    return ReviewScheduleRepository(db)
+
+
+def get_practice_stats_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> PracticeStatsRepository:
+    """
+    Dependency provider for the PracticeStatsRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the incrementally maintained per-user practice statistics.
+    """
+    return PracticeStatsRepository(db)
+
+
+def get_streak_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> StreakRepository:
+    """
+    Dependency provider for the StreakRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the per-user mission streak counters.
+    """
+    return StreakRepository(db)
+
+
+def get_leaderboard_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> LeaderboardRepository:
+    """
+    Dependency provider for the LeaderboardRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the weekly leaderboard scores.
+    """
+    return LeaderboardRepository(db)
+
+
+def get_progress_rollup_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> ProgressRollupRepository:
+    """
+    Dependency provider for the ProgressRollupRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the per-user daily progress rollups.
+    """
+    return ProgressRollupRepository(db)
+
+
+def get_analytics_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> AnalyticsRepository:
+    """
+    Dependency provider for the AnalyticsRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the platform analytics rollups.
+    """
+    return AnalyticsRepository(db)
+
+
+def get_item_stats_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> ItemStatsRepository:
+    """
+    Dependency provider for the ItemStatsRepository.
+
+    Initializes the repository with the database connection, providing
+    access to the live per-question answer counters.
+    """
+    return ItemStatsRepository(db)
+
+
+def get_irt_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> Optional[IrtRepository]:
+    """
+    Dependency provider for the IrtRepository.
+
+    Returns None when IRT_ENABLED is off, in which case daily missions are
+    sampled without regard to ability and abilities are not updated.
+    """
+    if not settings.IRT_ENABLED:
+        return None
+    return IrtRepository(db)
+
+
+def get_question_exposure_repository(
+    db: AsyncIOMotorDatabase = Depends(get_database)
+) -> Optional[QuestionExposureRepository]:
+    """
+    Dependency provider for the QuestionExposureRepository.
+
+    Returns None when QUESTION_EXPOSURE_ENABLED is off, in which case
+    mission and practice questions are sampled without exposure filtering.
+    """
+    if not settings.QUESTION_EXPOSURE_ENABLED:
+        return None
+    return QuestionExposureRepository(db)
+
+
+def get_progress_recorder(
+    mistake_repo: MistakeRepository = Depends(get_mistake_repository),
+    epoch_repo: ReviewEpochRepository = Depends(get_review_epoch_repository),
+    schedule_repo: ReviewScheduleRepository = Depends(get_review_schedule_repository),
+    stats_repo: PracticeStatsRepository = Depends(get_practice_stats_repository),
+    streak_repo: StreakRepository = Depends(get_streak_repository),
+    leaderboard_repo: LeaderboardRepository = Depends(get_leaderboard_repository),
+    rollup_repo: ProgressRollupRepository = Depends(get_progress_rollup_repository),
+    item_repo: ItemStatsRepository = Depends(get_item_stats_repository),
+    irt_repo: Optional[IrtRepository] = Depends(get_irt_repository)
+) -> ProgressRecorder:
+    """
+    Dependency provider for the ProgressRecorder.
+
+    Returns the recorder that keeps derived collections up to date when
+    answers are submitted and missions and practice sessions complete.
+    """
+    return ProgressRecorder(
+        mistake_repo, epoch_repo, schedule_repo, stats_repo, streak_repo, leaderboard_repo, rollup_repo,
+        item_repo, irt_repo
+    )
@@ -0,0 +1,25 @@
+import logging
+
+from backend.services.analytics_rollup_service import run_analytics_rollup
+from backend.repositories.analytics_repository import AnalyticsRepository
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_analytics_rollup_job(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    analytics_repo: AnalyticsRepository
+):
+    """
+    Job to be scheduled every ANALYTICS_ROLLUP_INTERVAL_MINUTES.
+    Adds mission and practice events since the watermark to the hourly and daily
+    platform analytics.
+    """
+    try:
+        summary = await run_analytics_rollup(mission_repo, practice_repo, analytics_repo)
+        logger.info(f"Analytics rollup completed: {summary}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during analytics rollup: {e}", exc_info=True)
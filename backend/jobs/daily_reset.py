@@ -1,22 +1,28 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
-from backend.services.mission_service import archive_past_incomplete_missions, MissionGenerationError
+from backend.services.mission_lifecycle_service import archive_past_incomplete_missions
+from backend.services.mission_generation_service import MissionGenerationError
+from backend.services.progress_recorder import ProgressRecorder
+from backend.services.utils import get_utc7_today_date
 from backend.repositories.mission_repository import MissionRepository
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-async def run_daily_reset_job(mission_repo: MissionRepository):
+async def run_daily_reset_job(mission_repo: MissionRepository, recorder: Optional[ProgressRecorder] = None):
     """
     Job to be scheduled daily.
-    This job archives incomplete missions from previous days.
+    This job archives incomplete missions from previous days and resets broken streaks.
     """
     logger.info("Starting daily reset job...")
     try:
-        archived_count = await archive_past_incomplete_missions(mission_repo=mission_repo)
+        archived_count = await archive_past_incomplete_missions(mission_repo=mission_repo, recorder=recorder)
+        if recorder:
+            await recorder.day_rolled_over(get_utc7_today_date())
         logger.info(f"Daily reset job completed. Archived {archived_count} missions.")
     except MissionGenerationError as e: # Catching specific errors from service if any are relevant
         logger.error(f"Error during daily reset job (MissionGenerationError): {e}")
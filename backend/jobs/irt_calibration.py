@@ -0,0 +1,29 @@
+import logging
+
+from backend.services.irt import item_bank_index
+from backend.services.irt_calibration import run_irt_calibration
+from backend.repositories.irt_repository import IrtRepository
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.question_repository import QuestionRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_irt_calibration_job(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    question_repo: QuestionRepository,
+    irt_repo: IrtRepository
+):
+    """
+    Job to be scheduled daily at IRT_CALIBRATION_HOUR:30 (UTC+7).
+    Recalibrates question parameters and student abilities, then reloads this
+    process's item bank index; other processes pick it up on their next refresh.
+    """
+    try:
+        summary = await run_irt_calibration(mission_repo, practice_repo, question_repo, irt_repo)
+        logger.info(f"IRT calibration completed: {summary}")
+        await item_bank_index.refresh(irt_repo, question_repo)
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during IRT calibration: {e}", exc_info=True)
@@ -0,0 +1,19 @@
+import logging
+
+from backend.services.irt import item_bank_index
+from backend.repositories.irt_repository import IrtRepository
+from backend.repositories.question_repository import QuestionRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_irt_index_refresh_job(irt_repo: IrtRepository, question_repo: QuestionRepository):
+    """
+    Job run on startup and every IRT_INDEX_REFRESH_SECONDS.
+    Rebuilds the item bank index used for mission selection and ability updates
+    when the bank or the calibration changed.
+    """
+    try:
+        await item_bank_index.refresh(irt_repo, question_repo)
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during IRT index refresh: {e}", exc_info=True)
@@ -0,0 +1,25 @@
+import logging
+
+from backend.services.item_analysis_batch import run_item_analysis
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.question_repository import QuestionRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_item_analysis_job(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    question_repo: QuestionRepository
+):
+    """
+    Job to be scheduled daily at ITEM_ANALYSIS_HOUR (UTC+7).
+    Recomputes every question's item statistics from stored attempts and writes
+    them onto the question documents.
+    """
+    try:
+        summary = await run_item_analysis(mission_repo, practice_repo, question_repo)
+        logger.info(f"Item analysis completed: {summary}")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during item analysis: {e}", exc_info=True)
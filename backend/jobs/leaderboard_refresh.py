@@ -0,0 +1,18 @@
+import logging
+
+from backend.services.leaderboard import current_periods, leaderboard
+from backend.repositories.leaderboard_repository import LeaderboardRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_leaderboard_refresh_job(leaderboard_repo: LeaderboardRepository):
+    """
+    Job run on startup and every LEADERBOARD_REFRESH_SECONDS.
+    Brings this and last week's rank indexes up to date with the scores written
+    since the last refresh.
+    """
+    try:
+        await leaderboard.refresh(current_periods(), leaderboard_repo)
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during leaderboard refresh: {e}", exc_info=True)
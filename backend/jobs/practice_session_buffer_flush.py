@@ -0,0 +1,19 @@
+import logging
+
+from backend.services.practice_session_buffer import practice_session_buffer
+from backend.repositories.practice_repository import PracticeRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_practice_session_buffer_flush_job(practice_repo: PracticeRepository):
+    """
+    Job to be scheduled every PRACTICE_SESSION_BUFFER_FLUSH_SECONDS (and run on shutdown).
+    Writes back practice sessions with answers held only in the write-behind buffer.
+    """
+    try:
+        written = await practice_session_buffer.flush(practice_repo)
+        if written:
+            logger.info(f"Practice session buffer flush wrote back {written} sessions.")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during practice session buffer flush: {e}", exc_info=True)
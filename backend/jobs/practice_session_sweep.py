@@ -0,0 +1,26 @@
+import logging
+
+from backend.config import settings
+from backend.services.practice_service import abandon_idle_practice_sessions
+from backend.repositories.practice_repository import PracticeRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+async def run_practice_session_sweep_job(practice_repo: PracticeRepository):
+    """
+    Job to be scheduled at a fixed interval.
+    Compacts practice sessions idle for PRACTICE_SESSION_IDLE_HOURS into ABANDONED
+    summaries before the TTL index would delete them outright.
+    """
+    logger.info("Starting practice session sweep...")
+    try:
+        abandoned_count = await abandon_idle_practice_sessions(
+            practice_repo,
+            idle_hours=settings.PRACTICE_SESSION_IDLE_HOURS,
+            retention_days=settings.PRACTICE_ABANDONED_RETENTION_DAYS,
+            batch_size=settings.PRACTICE_SESSION_SWEEP_BATCH_SIZE
+        )
+        logger.info(f"Practice session sweep completed. Abandoned {abandoned_count} sessions.")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during practice session sweep: {e}", exc_info=True)
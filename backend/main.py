@@ -5,8 +5,31 @@ import logging
 # Import routers from your application
 from backend.routes import missions, questions
 from backend.jobs.daily_reset import run_daily_reset_job
-from backend.dependencies import get_mission_repository
+from backend.jobs.practice_session_sweep import run_practice_session_sweep_job
+from backend.jobs.practice_session_buffer_flush import run_practice_session_buffer_flush_job
+from backend.jobs.leaderboard_refresh import run_leaderboard_refresh_job
+from backend.jobs.analytics_rollup import run_analytics_rollup_job
+from backend.jobs.item_analysis import run_item_analysis_job
+from backend.jobs.irt_calibration import run_irt_calibration_job
+from backend.jobs.irt_index_refresh import run_irt_index_refresh_job
+from backend.dependencies import (
+    get_mission_repository,
+    get_practice_repository,
+    get_question_repository,
+    get_mistake_repository,
+    get_review_epoch_repository,
+    get_review_schedule_repository,
+    get_practice_stats_repository,
+    get_streak_repository,
+    get_leaderboard_repository,
+    get_progress_rollup_repository,
+    get_analytics_repository,
+    get_item_stats_repository,
+    get_irt_repository,
+)
+from backend.services.progress_recorder import ProgressRecorder
 from backend.database import db_manager
+from backend.config import settings
 # If you have other routers, import them here as well
 # from backend.routes import another_router 
 
@@ -29,9 +52,40 @@ scheduler = AsyncIOScheduler(timezone="Asia/Bangkok") # Explicitly set timezone
 async def startup_event():
     # Connect to the database
     db_manager.connect_to_database()
+    db = db_manager.get_database()
 
     # Get an instance of the repository to pass to the job
-    mission_repo = get_mission_repository(db_manager.get_database())
+    mission_repo = get_mission_repository(db)
+
+    # Make sure the indexes the repositories rely on exist
+    await mission_repo.ensure_indexes()
+    practice_repo = get_practice_repository(db)
+    await practice_repo.ensure_indexes()
+    question_repo = get_question_repository(db)
+    await question_repo.ensure_indexes()
+    mistake_repo = get_mistake_repository(db)
+    await mistake_repo.ensure_indexes()
+    schedule_repo = get_review_schedule_repository(db)
+    await schedule_repo.ensure_indexes()
+    streak_repo = get_streak_repository(db)
+    await streak_repo.ensure_indexes()
+    leaderboard_repo = get_leaderboard_repository(db)
+    await leaderboard_repo.ensure_indexes()
+    await get_progress_rollup_repository(db).ensure_indexes()
+    analytics_repo = get_analytics_repository(db)
+    await analytics_repo.ensure_indexes()
+    await get_item_stats_repository(db).ensure_indexes()
+    recorder = ProgressRecorder(
+        mistake_repo, get_review_epoch_repository(db), schedule_repo, get_practice_stats_repository(db),
+        streak_repo, leaderboard_repo
+    )
+
+    # Build the leaderboard rank indexes before serving requests
+    await run_leaderboard_refresh_job(leaderboard_repo)
+    # Build the item bank index for ability-based missions before serving requests
+    irt_repo = get_irt_repository(db)
+    if irt_repo is not None:
+        await run_irt_index_refresh_job(irt_repo, question_repo)
 
     # Add the job to the scheduler
     # Run daily at 4:00 AM UTC+7
@@ -41,8 +95,73 @@ async def startup_event():
         hour=4, 
         minute=0, 
         misfire_grace_time=3600,
-        args=[mission_repo] # Pass the repository instance to the job
+        args=[mission_repo, recorder] # Pass the repository instance to the job
+    )
+    # Compact idle practice sessions before the TTL index deletes them
+    if settings.PRACTICE_SESSION_SWEEP_ENABLED:
+        scheduler.add_job(
+            run_practice_session_sweep_job,
+            'interval',
+            minutes=settings.PRACTICE_SESSION_SWEEP_INTERVAL_MINUTES,
+            args=[practice_repo]
+        )
+    # Write back answers held by the practice session buffer
+    if settings.PRACTICE_SESSION_BUFFER_ENABLED:
+        scheduler.add_job(
+            run_practice_session_buffer_flush_job,
+            'interval',
+            seconds=settings.PRACTICE_SESSION_BUFFER_FLUSH_SECONDS,
+            args=[practice_repo]
+        )
+    # Pick up leaderboard scores written by other processes
+    scheduler.add_job(
+        run_leaderboard_refresh_job,
+        'interval',
+        seconds=settings.LEADERBOARD_REFRESH_SECONDS,
+        args=[leaderboard_repo]
     )
+    # Roll up platform analytics off the request path
+    if settings.ANALYTICS_ROLLUP_ENABLED:
+        scheduler.add_job(
+            run_analytics_rollup_job,
+            'interval',
+            minutes=settings.ANALYTICS_ROLLUP_INTERVAL_MINUTES,
+            args=[mission_repo, practice_repo, analytics_repo]
+        )
+    # Recompute per-question item statistics overnight
+    if settings.ITEM_ANALYSIS_ENABLED:
+        scheduler.add_job(
+            run_item_analysis_job,
+            'cron',
+            hour=settings.ITEM_ANALYSIS_HOUR,
+            minute=0,
+            misfire_grace_time=3600,
+            args=[mission_repo, practice_repo, question_repo]
+        )
+    # Recalibrate IRT parameters and abilities overnight, and pick up new calibrations
+    if irt_repo is not None:
+        scheduler.add_job(
+            run_irt_calibration_job,
+            'cron',
+            hour=settings.IRT_CALIBRATION_HOUR,
+            minute=30,
+            misfire_grace_time=3600,
+            args=[mission_repo, practice_repo, question_repo, irt_repo]
+        )
+        scheduler.add_job(
+            run_irt_index_refresh_job,
+            'interval',
+            seconds=settings.IRT_INDEX_REFRESH_SECONDS,
+            args=[irt_repo, question_repo]
+        )
+    # Explain repeat slow-query offenders off the request path
+    if settings.SLOW_QUERY_EXPLAIN_ENABLED:
+        scheduler.add_job(
+            db_manager.query_monitor.run_pending_explains,
+            'interval',
+            seconds=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+            args=[db_manager.client]
+        )
     # Start the scheduler
     scheduler.start()
     job_logger.info("Scheduler started and daily_reset_job scheduled.")
@@ -53,6 +172,9 @@ async def shutdown_event():
     if scheduler.running:
         scheduler.shutdown()
         job_logger.info("Scheduler shut down.")
+    # Persist buffered practice answers before the connection goes away
+    if settings.PRACTICE_SESSION_BUFFER_ENABLED:
+        await run_practice_session_buffer_flush_job(get_practice_repository(db_manager.get_database()))
     # Close the database connection
     db_manager.close_database_connection()
 
@@ -67,6 +189,16 @@ app.include_router(practice.router, prefix="/api", tags=["Practice"])
 # Include review mistakes router
 from backend.routes import review_mistakes
 app.include_router(review_mistakes.router, tags=["Review Mistakes"])
+# Include admin router for operational diagnostics (unauthenticated, so opt-in)
+if settings.ADMIN_API_ENABLED:
+    from backend.routes import admin
+    app.include_router(admin.router, prefix="/api", tags=["Admin"])
+# Include leaderboard router
+from backend.routes import leaderboard
+app.include_router(leaderboard.router, prefix="/api", tags=["Leaderboard"])
+# Include progress dashboard router
+from backend.routes import progress
+app.include_router(progress.router, prefix="/api", tags=["Progress"])
 # Include other routers here if you have them
 # app.include_router(another_router.router, prefix="/api/v1/another", tags=["Another Feature"])
 
@@ -34,6 +34,7 @@ class ReviewMistakeItem(BaseModel):
     mission_date: date
     mission_completion_date: datetime
     attempt_count: int
+    source: str = "mission"  # "mission" or "practice"
 
 class PaginationInfo(BaseModel):
     current_page: int
@@ -42,6 +43,7 @@ class PaginationInfo(BaseModel):
     items_per_page: int
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None  # opaque keyset cursor for the next page
 
 class ReviewMistakesResponse(BaseModel):
     mistakes: List[ReviewMistakeItem]
@@ -49,6 +49,20 @@ class DailyMissionDocument(BaseModel):
     answers: List[Answer] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set when the mission transitions to COMPLETE
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
+
+class MissionSummary(BaseModel):
+    """One day of a user's mission history, read with a projection (no questions or attempts)."""
+    date: date
+    status: MissionStatus
+    question_count: int = 0
+    answered_count: int = 0
+    correct_count: int = 0
+    updated_at: Optional[datetime] = None
 
     class Config:
         use_enum_values = True 
\ No newline at end of file
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 from enum import Enum
 
 from .daily_mission import Question
@@ -11,6 +11,11 @@ class PracticeSessionStatus(str, Enum):
     COMPLETED = "completed"
     ABANDONED = "abandoned"
 
+class PracticeMode(str, Enum):
+    TOPIC = "topic"  # random questions from one topic
+    MISTAKES = "mistakes"  # questions the user previously answered incorrectly
+    ADAPTIVE = "adaptive"  # one question at a time, difficulty following the answers
+
 class PracticeAnswer(BaseModel):
     """Answer model for practice sessions - simplified version without retry logic"""
     question_id: str
@@ -18,6 +23,18 @@ class PracticeAnswer(BaseModel):
     is_correct: bool
     answered_at: datetime = Field(default_factory=datetime.utcnow)
 
+class AdaptiveBucketWalk(BaseModel):
+    """A session's own order through one (topic, difficulty) bucket: offset + n * stride (mod size)."""
+    size: int
+    offset: int
+    stride: int
+    drawn: int = 0
+
+class AdaptiveState(BaseModel):
+    """Adaptive session state: the current difficulty and the walk through each bucket used."""
+    difficulty: int
+    walks: Dict[str, AdaptiveBucketWalk] = Field(default_factory=dict)  # keyed by difficulty level
+
 class PracticeSession(BaseModel):
     """
     Practice session model for free practice mode.
@@ -26,6 +43,7 @@ class PracticeSession(BaseModel):
     session_id: str = Field(default_factory=lambda: f"PRACTICE_{uuid.uuid4().hex[:8].upper()}")
     user_id: str
     topic: str  # Maps to skill_area in questions
+    mode: PracticeMode = PracticeMode.TOPIC
     question_count: int
     questions: List[Question]
     answers: List[PracticeAnswer] = Field(default_factory=list)
@@ -33,13 +51,29 @@ class PracticeSession(BaseModel):
     correct_count: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
+    # Stamped by the repository on every write
+    updated_at: Optional[datetime] = None
+    # Reclaimed by the TTL index at this time; refreshed on activity, cleared on completion
+    expires_at: Optional[datetime] = None
+    # Set when an abandoned session is compacted (questions and answers dropped)
+    answered_count: Optional[int] = None
+    abandoned_at: Optional[datetime] = None
+    # Adaptive sessions only; questions are appended as they are served
+    adaptive: Optional[AdaptiveState] = None
 
     class Config:
         use_enum_values = True
 
+    @property
+    def total_questions(self) -> int:
+        """Questions the session will have; adaptive sessions serve them one at a time"""
+        if self.mode == PracticeMode.ADAPTIVE:
+            return self.question_count
+        return len(self.questions)
+
     def calculate_score(self) -> dict:
         """Calculate session score and statistics"""
-        total_questions = len(self.questions)
+        total_questions = self.total_questions
         answered_questions = len(self.answers)
         correct_answers = sum(1 for answer in self.answers if answer.is_correct)
         
@@ -51,12 +85,33 @@ class PracticeSession(BaseModel):
             "completion_rate": (answered_questions / total_questions * 100) if total_questions > 0 else 0
         }
 
+    def next_unanswered_question(self) -> Optional[Question]:
+        """First served question without an answer"""
+        answered = {answer.question_id for answer in self.answers}
+        return next((q for q in self.questions if q.question_id not in answered), None)
+
     def is_complete(self) -> bool:
         """Check if all questions have been answered"""
-        return len(self.answers) >= len(self.questions)
+        return len(self.answers) >= self.total_questions
 
     def mark_completed(self):
         """Mark session as completed and set completion time"""
         self.status = PracticeSessionStatus.COMPLETED
         self.completed_at = datetime.utcnow()
-        self.correct_count = sum(1 for answer in self.answers if answer.is_correct) 
\ No newline at end of file
+        self.correct_count = sum(1 for answer in self.answers if answer.is_correct) 
+
+class PracticeSessionSummary(BaseModel):
+    """Listing row of a practice session, read with a projection (no questions or answers)."""
+    session_id: str
+    user_id: str
+    topic: str
+    mode: PracticeMode = PracticeMode.TOPIC
+    question_count: int
+    status: PracticeSessionStatus
+    answered_count: int = 0
+    correct_count: int = 0
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
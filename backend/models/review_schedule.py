@@ -0,0 +1,33 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from .api_responses import ReviewMistakeItem
+
+# SM-2 starting ease factor and the floor it can never drop below
+DEFAULT_EASE_FACTOR = 2.5
+MIN_EASE_FACTOR = 1.3
+
+
+class ReviewScheduleItem(BaseModel):
+    """
+    Spaced-repetition state of one question a user got wrong (SM-2).
+    One item per (user, question); `mistake` is the latest recorded mistake,
+    shown when the item comes up for review.
+    """
+    user_id: str
+    question_id: str
+    mistake: ReviewMistakeItem
+    ease_factor: float = DEFAULT_EASE_FACTOR
+    interval_days: int = 0
+    repetitions: int = 0
+    review_count: int = 0
+    next_review_at: datetime
+    last_reviewed_at: Optional[datetime] = None
+    last_grade: Optional[int] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class DueReviewsResponse(BaseModel):
+    items: List[ReviewScheduleItem]
+    next_cursor: Optional[str] = None  # opaque keyset cursor for more due items
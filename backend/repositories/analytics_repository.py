@@ -0,0 +1,165 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection names
+ANALYTICS_ROLLUPS_COLLECTION = "analytics_rollups"
+ANALYTICS_ACTIVE_USERS_COLLECTION = "analytics_active_users"
+ANALYTICS_STATE_COLLECTION = "analytics_state"
+
+ROLLUP_STATE_ID = "rollup"
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+ANALYTICS_ROLLUP_INDEXES = [
+    # Hourly or daily buckets for a range of periods
+    IndexModel([("granularity", ASCENDING), ("period", ASCENDING)], name="granularity_period"),
+]
+ANALYTICS_ACTIVE_USER_INDEXES = [
+    # Distinct active users per day
+    IndexModel([("day", ASCENDING)], name="day"),
+]
+
+
+@instrument_repository
+class AnalyticsRepository:
+    """
+    Handles the platform analytics collections, which are written only by the
+    analytics rollup job and never read together with the hot collections:
+
+    - `analytics_rollups`: one counter document per hour and per day (UTC+7)
+    - `analytics_active_users`: one document per (day, active user)
+    - `analytics_state`: the rollup watermark and the claim of the run in progress
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[ANALYTICS_ROLLUPS_COLLECTION]
+        self.active_users = db[ANALYTICS_ACTIVE_USERS_COLLECTION]
+        self.state = db[ANALYTICS_STATE_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(ANALYTICS_ROLLUP_INDEXES)
+        await self.active_users.create_indexes(ANALYTICS_ACTIVE_USER_INDEXES)
+
+    async def get_state(self) -> Dict[str, Any]:
+        """
+        The rollup state: `watermark` and, while a run holds the claim, `pending_upto`,
+        `owner` and `lease_until`.
+        """
+        return await self.state.find_one({"_id": ROLLUP_STATE_ID}) or {}
+
+    async def claim_run(self, owner: str, upto: datetime, now: datetime, lease: timedelta) -> Optional[Dict[str, Any]]:
+        """
+        Claims the next run for `owner` until `now + lease` in a single atomic update,
+        fixing the end of its window in `pending_upto`: `upto`, or the window of an
+        earlier run that was interrupted, so a retry reuses it. Returns the claimed
+        state, or None while another run holds an unexpired claim.
+        """
+        try:
+            return await self.state.find_one_and_update(
+                {"_id": ROLLUP_STATE_ID, "$or": [{"lease_until": None}, {"lease_until": {"$lte": now}}]},
+                [{"$set": {
+                    "owner": owner,
+                    "lease_until": now + lease,
+                    "pending_upto": {"$ifNull": ["$pending_upto", upto]},
+                }}],
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The state exists but did not match: its claim has not expired
+            return None
+
+    async def finish_run(self, owner: str, upto: datetime, summary: Dict[str, Any]) -> None:
+        """Advances the watermark to the applied window's end and releases the claim."""
+        await self.state.update_one(
+            {"_id": ROLLUP_STATE_ID, "owner": owner},
+            {
+                "$set": {"watermark": upto, "last_run": summary},
+                "$unset": {"pending_upto": "", "owner": "", "lease_until": ""},
+            }
+        )
+
+    async def release_run(self, owner: str) -> None:
+        """Releases a claim whose window turned out to be empty."""
+        await self.state.update_one(
+            {"_id": ROLLUP_STATE_ID, "owner": owner},
+            {"$unset": {"pending_upto": "", "owner": "", "lease_until": ""}}
+        )
+
+    async def apply_increments(
+        self, buckets: Dict[Tuple[str, str], Dict[str, int]], applied_through: datetime
+    ) -> int:
+        """
+        Adds each (granularity, period) bucket's counters in one unordered batch.
+        A bucket already carrying `applied_through` got this window's counters from
+        an interrupted earlier attempt and is skipped (its upsert fails with a
+        duplicate key), so retrying a window never double counts.
+        Returns the number of buckets written.
+        """
+        operations = [
+            UpdateOne(
+                {"_id": f"{granularity}:{period}", "applied_through": {"$ne": applied_through}},
+                {
+                    "$inc": counters,
+                    "$set": {"granularity": granularity, "period": period, "applied_through": applied_through},
+                },
+                upsert=True
+            )
+            for (granularity, period), counters in buckets.items() if counters
+        ]
+        if not operations:
+            return 0
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            if any(error["code"] != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                raise
+        return len(operations)
+
+    async def add_active_users(self, active: Iterable[Tuple[date, str]]) -> None:
+        """Records (day, user id) pairs; recording a pair twice has no effect."""
+        operations = [
+            UpdateOne(
+                {"_id": f"{day.isoformat()}:{user_id}"},
+                {"$setOnInsert": {"day": day.isoformat(), "user_id": user_id}},
+                upsert=True
+            )
+            for day, user_id in active
+        ]
+        if operations:
+            await self.active_users.bulk_write(operations, ordered=False)
+
+    async def get_rollups(self, granularity: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """Buckets of the granularity with `start` <= period <= `end`, oldest first, topics unescaped."""
+        cursor = self.collection.find(
+            {"granularity": granularity, "period": {"$gte": start, "$lte": end}},
+            {"_id": 0, "applied_through": 0}
+        ).sort("period", ASCENDING)
+        rollups = await cursor.to_list(length=None)
+        for rollup in rollups:
+            if "by_topic" in rollup:
+                rollup["by_topic"] = {unquote(key): counts for key, counts in rollup["by_topic"].items()}
+        return rollups
+
+    async def count_active_users(self, start: date, end: date) -> Dict[str, int]:
+        """Distinct active users per day (ISO date) from `start` to `end`."""
+        cursor = self.active_users.aggregate([
+            {"$match": {"day": {"$gte": start.isoformat(), "$lte": end.isoformat()}}},
+            {"$group": {"_id": "$day", "count": {"$sum": 1}}},
+        ])
+        return {doc["_id"]: doc["count"] async for doc in cursor}
+
+    async def clear_all_analytics(self):
+        """A helper method for testing to clear the collections."""
+        await self.collection.delete_many({})
+        await self.active_users.delete_many({})
+        await self.state.delete_many({})
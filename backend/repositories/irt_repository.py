@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection names
+IRT_ITEMS_COLLECTION = "irt_items"
+IRT_ABILITIES_COLLECTION = "irt_abilities"
+IRT_STATE_COLLECTION = "irt_state"
+
+CALIBRATION_STATE_ID = "calibration"
+
+# Every query is a point lookup by _id or a full read of the (bank-sized) item
+# collection, so these collections need no secondary indexes.
+
+
+def ability_step_pipeline(
+    discrimination: float, difficulty: float, is_correct: bool, max_precision: float
+):
+    """
+    Update pipeline adding one response to a user's ability estimate: a single
+    Newton step on the Gaussian-approximated posterior, as in
+    `backend.services.irt.ability_step`. A missing estimate starts from the
+    N(0, 1) prior. The step runs on the stored values, so concurrent answers of the
+    same user are applied one after the other.
+    """
+    theta = {"$ifNull": ["$theta", 0.0]}
+    precision = {"$ifNull": ["$precision", 1.0]}
+    return [
+        {"$set": {"_p": {"$divide": [1, {"$add": [
+            1, {"$exp": {"$multiply": [-discrimination, {"$subtract": [theta, difficulty]}]}}
+        ]}]}}},
+        {"$set": {"_information": {"$multiply": [
+            discrimination * discrimination, "$_p", {"$subtract": [1, "$_p"]}
+        ]}}},
+        {"$set": {
+            "theta": {"$add": [theta, {"$divide": [
+                {"$multiply": [discrimination, {"$subtract": [int(is_correct), "$_p"]}]},
+                {"$add": [precision, "$_information"]},
+            ]}]},
+            "precision": {"$min": [max_precision, {"$add": [precision, "$_information"]}]},
+            "responses": {"$add": [{"$ifNull": ["$responses", 0]}, 1]},
+            "updated_at": "$$NOW",
+        }},
+        {"$unset": ["_p", "_information"]},
+    ]
+
+
+@instrument_repository
+class IrtRepository:
+    """
+    Handles the item response theory collections:
+
+    - `irt_items`: calibrated difficulty and discrimination per question (keyed by question id)
+    - `irt_abilities`: ability estimate and its precision per user (keyed by user id)
+    - `irt_state`: the version and summary of the last calibration
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[IRT_ABILITIES_COLLECTION]
+        self.items = db[IRT_ITEMS_COLLECTION]
+        self.state = db[IRT_STATE_COLLECTION]
+
+    async def get_state(self) -> Dict[str, Any]:
+        """The calibration state: `version`, `calibrated_at` and the run summary."""
+        return await self.state.find_one({"_id": CALIBRATION_STATE_ID}) or {}
+
+    async def get_item_parameters(self) -> Dict[str, Dict[str, Any]]:
+        """Question id -> calibrated parameters (`difficulty`, `discrimination`, `responses`)."""
+        return {doc.pop("_id"): doc async for doc in self.items.find({})}
+
+    async def write_calibration(
+        self, items: Dict[str, Dict[str, Any]], abilities: Dict[str, Dict[str, Any]], summary: Dict[str, Any]
+    ) -> None:
+        """
+        Stores a calibration: item parameters and user abilities (each in one
+        batch), then the new state, whose version tells the selection indexes to
+        reload.
+        """
+        calibrated_at = datetime.utcnow()
+        if items:
+            await self.items.bulk_write([
+                UpdateOne({"_id": question_id}, {"$set": {**params, "calibrated_at": calibrated_at}}, upsert=True)
+                for question_id, params in items.items()
+            ], ordered=False)
+        if abilities:
+            await self.collection.bulk_write([
+                UpdateOne({"_id": user_id}, {"$set": {**ability, "updated_at": calibrated_at}}, upsert=True)
+                for user_id, ability in abilities.items()
+            ], ordered=False)
+        await self.state.update_one(
+            {"_id": CALIBRATION_STATE_ID},
+            {"$set": {"version": calibrated_at.isoformat(), "calibrated_at": calibrated_at, "last_run": summary}},
+            upsert=True
+        )
+
+    async def get_ability(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """The user's ability estimate (`theta`, `precision`, `responses`), or None."""
+        return await self.collection.find_one({"_id": user_id})
+
+    async def record_response(
+        self, user_id: str, discrimination: float, difficulty: float, is_correct: bool, max_precision: float
+    ) -> None:
+        """Applies one response to the user's ability estimate in a single atomic upsert."""
+        await self.collection.update_one(
+            {"_id": user_id},
+            ability_step_pipeline(discrimination, difficulty, is_correct, max_precision),
+            upsert=True
+        )
+
+    async def clear_all_irt(self):
+        """A helper method for testing to clear the collections."""
+        await self.collection.delete_many({})
+        await self.items.delete_many({})
+        await self.state.delete_many({})
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional
+from urllib.parse import unquote
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+
+from backend.db_monitoring import instrument_repository
+from backend.repositories.practice_stats_repository import topic_key
+
+# Define collection name
+QUESTION_ITEM_COUNTERS_COLLECTION = "question_item_counters"
+
+# Counters kept per question (summed over its shards)
+ITEM_COUNTER_FIELDS = ("attempts", "correct", "first_attempts", "first_correct", "solved", "attempts_to_correct")
+
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+ITEM_COUNTER_INDEXES = [
+    # All shards of a question
+    IndexModel([("question_id", ASCENDING)], name="question_id"),
+]
+
+
+@instrument_repository
+class ItemStatsRepository:
+    """
+    Handles `question_item_counters`: live answer counters per question, split over
+    a fixed number of shard documents so answers to a popular question do not all
+    update the same document. Writers pick a shard at random; readers sum them.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[QUESTION_ITEM_COUNTERS_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(ITEM_COUNTER_INDEXES)
+
+    async def record_attempt(
+        self,
+        question_id: str,
+        shard: int,
+        is_correct: bool,
+        first_choice: Optional[str] = None,
+        attempts_to_correct: int = 0
+    ) -> None:
+        """
+        Adds one answer attempt to a shard of the question's counters. `first_choice`
+        is the chosen option when this is the user's first attempt at the question;
+        `attempts_to_correct` is the attempt number when this attempt solved it.
+        """
+        inc = {"attempts": 1, "correct": int(is_correct)}
+        if first_choice is not None:
+            inc["first_attempts"] = 1
+            inc["first_correct"] = int(is_correct)
+            inc[f"first_choices.{topic_key(first_choice)}"] = 1
+        if attempts_to_correct:
+            inc["solved"] = 1
+            inc["attempts_to_correct"] = attempts_to_correct
+        await self.collection.update_one(
+            {"_id": f"{question_id}:{shard}"},
+            {"$inc": inc, "$setOnInsert": {"question_id": question_id, "shard": shard}},
+            upsert=True
+        )
+
+    async def get_counters(self, question_id: str) -> Dict[str, Any]:
+        """The question's counters summed over its shards, choice ids unescaped."""
+        totals: Dict[str, Any] = {field: 0 for field in ITEM_COUNTER_FIELDS}
+        first_choices: Dict[str, int] = {}
+        async for shard in self.collection.find({"question_id": question_id}, {"_id": 0, "question_id": 0, "shard": 0}):
+            for field in ITEM_COUNTER_FIELDS:
+                totals[field] += shard.get(field, 0)
+            for choice, count in shard.get("first_choices", {}).items():
+                first_choices[unquote(choice)] = first_choices.get(unquote(choice), 0) + count
+        totals["first_choices"] = first_choices
+        return totals
+
+    async def clear_all_counters(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
@@ -0,0 +1,133 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+LEADERBOARD_SCORES_COLLECTION = "leaderboard_scores"
+
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+LEADERBOARD_INDEXES = [
+    # A period's scores in leaderboard order
+    IndexModel(
+        [("period", ASCENDING), ("missions_completed", DESCENDING), ("accuracy", DESCENDING), ("user_id", ASCENDING)],
+        name="period_missions_accuracy",
+    ),
+    # Scores of a period changed since the last refresh
+    IndexModel([("period", ASCENDING), ("updated_at", ASCENDING)], name="period_updated_at"),
+]
+
+# Fields of a score document the leaderboard needs
+SCORE_PROJECTION = {
+    "_id": 0, "user_id": 1, "missions_completed": 1, "questions": 1, "correct": 1, "accuracy": 1, "updated_at": 1
+}
+
+
+def period_key(week_start: date) -> str:
+    """Leaderboard periods are weeks, keyed by their Monday."""
+    return week_start.isoformat()
+
+
+def score_delta_pipeline(period: str, user_id: str, source: str, missions: int, questions: int, correct: int):
+    """
+    Update pipeline adding a completion to a score document and recomputing its
+    accuracy. `source` identifies the completion (a mission date or a practice
+    session) and is kept in `counted`; a completion already counted changes
+    nothing, so repeated or concurrent completions of the same mission count once.
+    """
+    counted = {"$ifNull": ["$counted", []]}
+    return [
+        {"$set": {"_new": {"$not": [{"$in": [source, counted]}]}}},
+        {"$set": {
+            "period": period,
+            "user_id": user_id,
+            "missions_completed": {"$cond": [
+                "$_new", {"$add": [{"$ifNull": ["$missions_completed", 0]}, missions]}, "$missions_completed"
+            ]},
+            "questions": {"$cond": ["$_new", {"$add": [{"$ifNull": ["$questions", 0]}, questions]}, "$questions"]},
+            "correct": {"$cond": ["$_new", {"$add": [{"$ifNull": ["$correct", 0]}, correct]}, "$correct"]},
+            "counted": {"$cond": ["$_new", {"$concatArrays": [counted, [source]]}, "$counted"]},
+            "updated_at": {"$cond": ["$_new", "$$NOW", "$updated_at"]},
+        }},
+        {"$set": {
+            "accuracy": {"$cond": [
+                {"$gt": ["$questions", 0]}, {"$divide": ["$correct", "$questions"]}, 0
+            ]},
+        }},
+        {"$unset": "_new"},
+    ]
+
+
+@instrument_repository
+class LeaderboardRepository:
+    """
+    Handles `leaderboard_scores`: one document per (period, user) with the missions
+    completed, questions answered and correct answers in that week. Completions apply
+    deltas in place; the in-memory rank index is loaded from the period's index.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[LEADERBOARD_SCORES_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(LEADERBOARD_INDEXES)
+
+    async def apply_delta(
+        self, period: str, user_id: str, source: str, missions: int, questions: int, correct: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Adds a completion to the user's score for the period unless `source` was
+        already counted; returns the updated score.
+        """
+        return await self.collection.find_one_and_update(
+            {"_id": f"{period}:{user_id}"},
+            score_delta_pipeline(period, user_id, source, missions, questions, correct),
+            projection=SCORE_PROJECTION,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def get_period_scores(self, period: str) -> List[Dict[str, Any]]:
+        """Every score of the period, in leaderboard order."""
+        cursor = self.collection.find({"period": period}, SCORE_PROJECTION).sort([
+            ("missions_completed", DESCENDING), ("accuracy", DESCENDING), ("user_id", ASCENDING)
+        ])
+        return await cursor.to_list(length=None)
+
+    async def get_top_scores(self, period: str, limit: int) -> List[Dict[str, Any]]:
+        """The period's first `limit` scores in leaderboard order."""
+        cursor = self.collection.find({"period": period}, SCORE_PROJECTION).sort([
+            ("missions_completed", DESCENDING), ("accuracy", DESCENDING), ("user_id", ASCENDING)
+        ]).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def get_score(self, period: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """The user's score for the period, or None."""
+        return await self.collection.find_one({"_id": f"{period}:{user_id}"}, SCORE_PROJECTION)
+
+    async def count_scores(self, period: str) -> int:
+        """Number of users with a score in the period."""
+        return await self.collection.count_documents({"period": period})
+
+    async def count_scores_above(self, period: str, missions_completed: int, accuracy: float) -> int:
+        """Number of the period's scores ranked strictly above the given one (ties excluded)."""
+        return await self.collection.count_documents({
+            "period": period,
+            "$or": [
+                {"missions_completed": {"$gt": missions_completed}},
+                {"missions_completed": missions_completed, "accuracy": {"$gt": accuracy}},
+            ],
+        })
+
+    async def get_period_scores_updated_since(self, period: str, since: datetime) -> List[Dict[str, Any]]:
+        """Scores of the period written at or after `since`."""
+        cursor = self.collection.find({"period": period, "updated_at": {"$gte": since}}, SCORE_PROJECTION)
+        return await cursor.to_list(length=None)
+
+    async def clear_all_scores(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
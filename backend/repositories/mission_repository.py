@@ -1,12 +1,137 @@
+import logging
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
 
-from backend.models.daily_mission import DailyMissionDocument, MissionStatus
+from backend.db_monitoring import instrument_repository
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus, MissionSummary
+from backend.models.api_responses import ReviewMistakeItem
+from backend.repositories.mistake_repository import mistake_stats_facet, stats_from_facets
+
+logger = logging.getLogger(__name__)
 
 # Define collection name
 MISSIONS_COLLECTION = "missions"
 
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+MISSION_INDEXES = [
+    IndexModel([("user_id", ASCENDING), ("date", ASCENDING)], name="user_date", unique=True),
+    IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("date", DESCENDING)], name="user_status_date"),
+    IndexModel([("status", ASCENDING), ("date", ASCENDING)], name="status_date"),
+    # The analytics rollup reads missions changed since its watermark
+    IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+]
+
+# Fields of a mission the analytics rollup counts events from
+MISSION_ANALYTICS_PROJECTION = {
+    "_id": 0,
+    "user_id": 1,
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "completed_at": 1,
+    "answers.attempts_history.timestamp": 1,
+}
+
+# Missions whose incorrect answers are shown for review
+REVIEW_STATUSES = [MissionStatus.COMPLETE.value, MissionStatus.ARCHIVED.value]
+
+# Review listings show the newest missions first, answers in question order
+REVIEW_SORT = {"$sort": {"mission_date": -1, "answer_index": 1}}
+
+# Field each review grouping is keyed on, in the projected review documents
+REVIEW_GROUP_FIELDS = {"date": "mission_date", "topic": "skill_area"}
+
+# History rows: status and answer counts computed server-side, without questions or attempts
+MISSION_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "date": 1,
+    "status": 1,
+    "updated_at": 1,
+    "question_count": {"$size": {"$ifNull": ["$questions", []]}},
+    "answered_count": {"$size": {"$filter": {"input": {"$ifNull": ["$answers", []]}, "cond": "$$this.is_complete"}}},
+    "correct_count": {"$size": {"$filter": {"input": {"$ifNull": ["$answers", []]}, "cond": "$$this.is_correct"}}},
+}
+
+
+def _choice_text(choice_id: Any) -> Dict[str, Any]:
+    """Expression for the text of `question.choices` entry `choice_id`, or "Unknown"."""
+    return {"$ifNull": [
+        {"$arrayElemAt": [
+            {"$map": {
+                "input": {"$filter": {
+                    "input": "$question.choices",
+                    "as": "choice",
+                    "cond": {"$eq": ["$$choice.id", choice_id]},
+                }},
+                "as": "choice",
+                "in": "$$choice.text",
+            }},
+            0,
+        ]},
+        "Unknown",
+    ]}
+
+
+def _review_mistake_stages(user_id: str, skill_area: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Pipeline stages turning a user's completed/archived missions into one document per
+    incorrect answer, projected to the ReviewMistakeItem fields.
+    """
+    stages: List[Dict[str, Any]] = [
+        {"$match": {"user_id": user_id, "status": {"$in": REVIEW_STATUSES}}},
+        {"$project": {"date": 1, "updated_at": 1, "questions": 1, "answers": 1}},
+        {"$unwind": {"path": "$answers", "includeArrayIndex": "answer_index"}},
+        {"$match": {"answers.is_correct": False, "answers.current_answer": {"$nin": [None, "", 0, False]}}},
+        {"$addFields": {"question": {"$arrayElemAt": [
+            {"$filter": {
+                "input": "$questions",
+                "as": "question",
+                "cond": {"$eq": ["$$question.question_id", "$answers.question_id"]},
+            }},
+            0,
+        ]}}},
+        {"$match": {"question": {"$exists": True}}},
+    ]
+    if skill_area:
+        stages.append({"$match": {"question.skill_area": skill_area}})
+    stages.extend([
+        {"$project": {
+            "_id": 0,
+            "question_id": "$question.question_id",
+            "question_text": "$question.question_text",
+            "skill_area": "$question.skill_area",
+            "difficulty_level": "$question.difficulty_level",
+            "choices": {"$map": {
+                "input": "$question.choices",
+                "as": "choice",
+                "in": {"id": "$$choice.id", "text": "$$choice.text"},
+            }},
+            "user_answer_id": {"$toString": "$answers.current_answer"},
+            "user_answer_text": _choice_text("$answers.current_answer"),
+            "correct_answer_id": "$question.correct_answer_id",
+            "correct_answer_text": _choice_text("$question.correct_answer_id"),
+            "explanation": "$question.feedback_th",
+            "mission_date": "$date",
+            "mission_completion_date": "$updated_at",
+            "attempt_count": "$answers.attempt_count",
+            "answer_index": 1,
+        }},
+    ])
+    return stages
+
+
+def _to_review_item(doc: Dict[str, Any]) -> ReviewMistakeItem:
+    doc.pop("answer_index", None)
+    if isinstance(doc.get("mission_date"), datetime):
+        doc["mission_date"] = doc["mission_date"].date()
+    return ReviewMistakeItem(**doc)
+
+
+@instrument_repository
 class MissionRepository:
     """
     Handles loading and accessing mission data from a persistent source.
@@ -15,6 +140,18 @@ class MissionRepository:
         self.db = db
         self.collection = db[MISSIONS_COLLECTION]
 
+    async def ensure_indexes(self):
+        """
+        Creates the indexes used by this repository's queries (no-op if they already
+        exist). Each is created on its own, so a unique index that existing duplicate
+        missions prevent is logged without blocking the others or startup.
+        """
+        for index in MISSION_INDEXES:
+            try:
+                await self.collection.create_indexes([index])
+            except OperationFailure as e:
+                logger.error(f"Failed to create missions index {index.document['name']}: {e}")
+
     async def find_mission(self, user_id: str, mission_date: date) -> Optional[DailyMissionDocument]:
         """
         Finds a mission in the database for a given user and date.
@@ -91,6 +228,125 @@ class MissionRepository:
             
         return missions
 
+    async def get_mission_summaries(self, user_id: str, start: date, end: date) -> List[MissionSummary]:
+        """
+        Summary rows of a user's missions dated `start` through `end` (inclusive),
+        oldest first: a range scan of the user_date index projected to a few fields.
+        """
+        cursor = self.collection.find(
+            {
+                "user_id": user_id,
+                "date": {
+                    "$gte": datetime.combine(start, datetime.min.time()),
+                    "$lte": datetime.combine(end, datetime.min.time()),
+                },
+            },
+            MISSION_SUMMARY_PROJECTION
+        ).sort("date", 1)
+        return [MissionSummary(**doc) async for doc in cursor]
+
+    async def iter_missions_by_statuses(self, statuses: List[MissionStatus]) -> AsyncIterator[DailyMissionDocument]:
+        """
+        Streams every mission (all users) in any of the given statuses, for batch jobs
+        such as backfills. Uses the status_date index.
+        """
+        cursor = self.collection.find({"status": {"$in": [status.value for status in statuses]}})
+        async for mission_doc in cursor:
+            yield DailyMissionDocument(**mission_doc)
+
+    async def iter_missions_updated_since(self, since: datetime) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams missions (all users) saved after `since`, projected to the fields the
+        analytics rollup needs, oldest change first. Uses the updated_at index.
+        """
+        cursor = self.collection.find(
+            {"updated_at": {"$gt": since}}, MISSION_ANALYTICS_PROJECTION
+        ).sort("updated_at", ASCENDING)
+        async for mission_doc in cursor:
+            yield mission_doc
+
+    async def aggregate_review_mistakes(
+        self,
+        user_id: str,
+        skill_area: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[ReviewMistakeItem], int]:
+        """
+        Returns one page of a user's review mistakes and the total count, computed
+        from completed/archived missions in a single aggregation.
+        """
+        pipeline = _review_mistake_stages(user_id, skill_area) + [
+            REVIEW_SORT,
+            {"$facet": {
+                "page": [{"$skip": skip}, {"$limit": limit}],
+                "total": [{"$count": "count"}],
+            }},
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(1)
+        facets = result[0] if result else {"page": [], "total": []}
+        total = facets["total"][0]["count"] if facets["total"] else 0
+        return [_to_review_item(doc) for doc in facets["page"]], total
+
+    async def aggregate_grouped_review_mistakes(
+        self,
+        user_id: str,
+        group_by: str,
+        skill_area: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> Tuple[List[Tuple[Any, List[ReviewMistakeItem]]], List[Tuple[Any, int]]]:
+        """
+        Groups a user's review mistakes by mission date (newest first) or skill area
+        (alphabetically) in a single aggregation. Returns the (key, mistakes) pairs of
+        one page of groups and the (key, count) pairs of every group.
+
+        Every mistake is held in a group until the page is cut, so only the response
+        fields are pushed and the stages may spill to disk on long histories.
+        """
+        pipeline = _review_mistake_stages(user_id, skill_area) + [
+            REVIEW_SORT,
+            {"$project": {"answer_index": 0}},
+            {"$group": {
+                "_id": f"${REVIEW_GROUP_FIELDS[group_by]}",
+                "count": {"$sum": 1},
+                "mistakes": {"$push": "$$ROOT"},
+            }},
+            {"$sort": {"_id": -1 if group_by == "date" else 1}},
+            {"$facet": {
+                "page": [{"$skip": skip}, {"$limit": limit}],
+                "counts": [{"$project": {"count": 1}}],
+            }},
+        ]
+        result = await self.collection.aggregate(pipeline, allowDiskUse=True).to_list(1)
+        facets = result[0] if result else {"page": [], "counts": []}
+        page = [
+            (group["_id"], [_to_review_item(doc) for doc in group["mistakes"]])
+            for group in facets["page"]
+        ]
+        counts = [(group["_id"], group["count"]) for group in facets["counts"]]
+        return page, counts
+
+    async def aggregate_review_skill_areas(self, user_id: str) -> List[str]:
+        """Returns the sorted skill areas of a user's review mistakes."""
+        pipeline = _review_mistake_stages(user_id) + [
+            {"$group": {"_id": "$skill_area"}},
+            {"$sort": {"_id": 1}},
+        ]
+        groups = await self.collection.aggregate(pipeline).to_list(None)
+        return [group["_id"] for group in groups]
+
+    async def aggregate_review_stats(self, user_id: str, trend_since: date) -> Dict[str, Any]:
+        """
+        Computes a user's review statistics from completed/archived missions in one
+        aggregation, in the same shape as MistakeRepository.get_mistake_stats.
+        """
+        pipeline = _review_mistake_stages(user_id) + [
+            mistake_stats_facet(datetime.combine(trend_since, datetime.min.time())),
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(1)
+        return stats_from_facets(result)
+
     async def clear_all_missions(self):
         """A helper method for testing to clear the in-memory store."""
         await self.collection.delete_many({}) 
\ No newline at end of file
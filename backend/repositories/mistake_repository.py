@@ -0,0 +1,290 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+
+from backend.models.api_responses import ReviewMistakeItem
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+MISTAKES_COLLECTION = "mistakes"
+
+# One document per incorrect answer, keyed by where it came from. Review listings sort by
+# mission_date (newest first) with _id as the tie-breaker, so both indexes end in that order.
+MISTAKE_INDEXES = [
+    IndexModel(
+        [("user_id", ASCENDING), ("source", ASCENDING), ("source_id", ASCENDING), ("question_id", ASCENDING)],
+        name="mistake_key",
+        unique=True
+    ),
+    IndexModel(
+        [("user_id", ASCENDING), ("mission_date", DESCENDING), ("_id", DESCENDING)],
+        name="user_mission_date"
+    ),
+    IndexModel(
+        [("user_id", ASCENDING), ("skill_area", ASCENDING), ("mission_date", DESCENDING), ("_id", DESCENDING)],
+        name="user_skill_mission_date"
+    ),
+]
+
+# Sort used by every review listing
+MISTAKE_SORT = [("mission_date", DESCENDING), ("_id", DESCENDING)]
+
+# Field each review grouping is keyed on
+GROUP_FIELDS = {"date": "mission_date", "topic": "skill_area"}
+
+
+def mistake_stats_facet(trend_since: datetime) -> Dict[str, Any]:
+    """
+    $facet stage computing review statistics over review-item documents: the total,
+    counts per skill area and per difficulty, and weekly counts (ISO weeks, keyed by
+    their Monday) from `trend_since` on. Shared with the mission-based review path.
+    """
+    return {"$facet": {
+        "total": [{"$count": "count"}],
+        "by_skill": [
+            {"$group": {"_id": "$skill_area", "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "by_difficulty": [
+            {"$group": {"_id": "$difficulty_level", "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "by_week": [
+            {"$match": {"mission_date": {"$gte": trend_since}}},
+            {"$group": {
+                "_id": {"$dateFromParts": {
+                    "isoWeekYear": {"$isoWeekYear": "$mission_date"},
+                    "isoWeek": {"$isoWeek": "$mission_date"},
+                    "isoDayOfWeek": 1,
+                }},
+                "count": {"$sum": 1},
+            }},
+            {"$sort": {"_id": 1}},
+        ],
+    }}
+
+
+def stats_from_facets(result: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flattens the output of `mistake_stats_facet` into plain counts."""
+    facets = result[0] if result else {}
+    total = facets.get("total") or []
+    return {
+        "total": total[0]["count"] if total else 0,
+        "by_skill": [(group["_id"], group["count"]) for group in facets.get("by_skill", [])],
+        "by_difficulty": [(group["_id"], group["count"]) for group in facets.get("by_difficulty", [])],
+        "by_week": [(group["_id"].date(), group["count"]) for group in facets.get("by_week", [])],
+    }
+
+
+def _to_datetime(value: date) -> datetime:
+    """Dates are stored as datetimes at midnight, matching the missions collection."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+@instrument_repository
+class MistakeRepository:
+    """
+    Handles the materialized `mistakes` collection: one document per incorrect answer
+    from completed/archived missions and completed practice sessions, so review
+    listings are single indexed, paginated queries.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[MISTAKES_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(MISTAKE_INDEXES)
+
+    async def record_mistakes(
+        self, user_id: str, source: str, source_id: str, mistakes: List[ReviewMistakeItem]
+    ) -> int:
+        """
+        Upserts the mistakes of one mission or practice session. Re-recording the same
+        source is idempotent. Returns the number of newly inserted mistakes.
+        """
+        if not mistakes:
+            return 0
+
+        operations = []
+        for mistake in mistakes:
+            mistake_data = mistake.model_dump()
+            mistake_data["mission_date"] = _to_datetime(mistake_data["mission_date"])
+            mistake_data["source"] = source
+            operations.append(UpdateOne(
+                {"user_id": user_id, "source": source, "source_id": source_id, "question_id": mistake.question_id},
+                {"$set": mistake_data, "$setOnInsert": {"recorded_at": datetime.utcnow()}},
+                upsert=True
+            ))
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+
+    def _user_query(self, user_id: str, skill_area: Optional[str] = None) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"user_id": user_id}
+        if skill_area:
+            query["skill_area"] = skill_area
+        return query
+
+    async def count_mistakes(self, user_id: str, skill_area: Optional[str] = None) -> int:
+        """Counts a user's mistakes, optionally within one skill area."""
+        return await self.collection.count_documents(self._user_query(user_id, skill_area))
+
+    async def find_mistakes(
+        self,
+        user_id: str,
+        skill_area: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, ObjectId]] = None
+    ) -> Tuple[List[ReviewMistakeItem], Optional[Tuple[datetime, ObjectId]]]:
+        """
+        Returns one page of a user's mistakes, newest first, and the (mission_date, _id)
+        key of its last mistake when more follow. Pass that key back as `after` to read
+        the next page straight from the index; `skip` serves page-number requests.
+        """
+        query = self._user_query(user_id, skill_area)
+        if after:
+            after_date, after_id = after
+            query["mission_date"] = {"$lte": after_date}
+            query["$or"] = [
+                {"mission_date": {"$lt": after_date}},
+                {"mission_date": after_date, "_id": {"$lt": after_id}},
+            ]
+
+        # One extra document tells whether another page follows
+        cursor = self.collection.find(query).sort(MISTAKE_SORT).skip(skip).limit(limit + 1)
+        docs = await cursor.to_list(limit + 1)
+
+        next_key = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_key = (docs[-1]["mission_date"], docs[-1]["_id"])
+        return [self._to_item(doc) for doc in docs], next_key
+
+    async def count_by_group(
+        self, user_id: str, group_by: str, skill_area: Optional[str] = None
+    ) -> List[Tuple[Any, int]]:
+        """
+        Returns (group key, mistake count) pairs for a user, ordered the way review
+        groups are shown: dates newest first, topics alphabetically.
+        """
+        field = GROUP_FIELDS[group_by]
+        pipeline = [
+            {"$match": self._user_query(user_id, skill_area)},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"_id": -1 if group_by == "date" else 1}},
+        ]
+        groups = await self.collection.aggregate(pipeline).to_list(None)
+        return [(group["_id"], group["count"]) for group in groups]
+
+    async def find_mistakes_in_groups(
+        self, user_id: str, group_by: str, keys: List[Any], skill_area: Optional[str] = None
+    ) -> List[ReviewMistakeItem]:
+        """Returns all of a user's mistakes whose group key is in `keys`, newest first."""
+        query = self._user_query(user_id, skill_area)
+        query[GROUP_FIELDS[group_by]] = {"$in": keys}
+        cursor = self.collection.find(query).sort(MISTAKE_SORT)
+        return [self._to_item(doc) async for doc in cursor]
+
+    async def find_mistake_groups(
+        self,
+        user_id: str,
+        group_by: str,
+        skill_area: Optional[str] = None,
+        after: Any = None,
+        limit: int = 10
+    ) -> Tuple[List[Tuple[Any, List[ReviewMistakeItem]]], bool]:
+        """
+        Returns the next `limit` groups after group key `after` (dates newest first,
+        topics alphabetically) with their mistakes, and whether more groups follow.
+        Walks the index in group order and stops one document into the next group,
+        so the cost is the size of the page rather than the whole history.
+        """
+        field = GROUP_FIELDS[group_by]
+        query = self._user_query(user_id, skill_area)
+        if group_by == "date":
+            sort = MISTAKE_SORT
+            if after is not None:
+                query["mission_date"] = {"$lt": after}
+        else:
+            sort = [("skill_area", ASCENDING)] + MISTAKE_SORT
+            if after is not None:
+                query["skill_area"] = {"$eq": skill_area, "$gt": after} if skill_area else {"$gt": after}
+
+        groups: List[Tuple[Any, List[ReviewMistakeItem]]] = []
+        has_more = False
+        cursor = self.collection.find(query).sort(sort)
+        try:
+            async for doc in cursor:
+                key = doc[field]
+                if not groups or groups[-1][0] != key:
+                    if len(groups) == limit:
+                        has_more = True
+                        break
+                    groups.append((key, []))
+                groups[-1][1].append(self._to_item(doc))
+        finally:
+            await cursor.close()
+        return groups, has_more
+
+    async def get_mistake_stats(self, user_id: str, trend_since: date) -> Dict[str, Any]:
+        """
+        Computes a user's review statistics in one aggregation: total, per skill area,
+        per difficulty and per ISO week since `trend_since`.
+        """
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            mistake_stats_facet(_to_datetime(trend_since)),
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(1)
+        return stats_from_facets(result)
+
+    async def summarize_questions(
+        self, user_id: str, skill_area: Optional[str] = None, window: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Summarizes a user's `window` most recent mistakes per question: how often and
+        with how many attempts it was missed, and when it was last missed. Reads the
+        newest entries of the user's index range only, however long the history is.
+        """
+        pipeline = [
+            {"$match": self._user_query(user_id, skill_area)},
+            {"$sort": dict(MISTAKE_SORT)},
+            {"$limit": window},
+            {"$group": {
+                "_id": "$question_id",
+                "mistake_count": {"$sum": 1},
+                "attempt_count": {"$sum": "$attempt_count"},
+                "last_mistake_date": {"$max": "$mission_date"},
+            }},
+        ]
+        groups = await self.collection.aggregate(pipeline).to_list(None)
+        return [
+            {
+                "question_id": group["_id"],
+                "mistake_count": group["mistake_count"],
+                "attempt_count": group["attempt_count"],
+                "last_mistake_date": group["last_mistake_date"],
+            }
+            for group in groups
+        ]
+
+    async def get_skill_areas(self, user_id: str) -> List[str]:
+        """Returns the sorted skill areas a user has mistakes in."""
+        skill_areas = await self.collection.distinct("skill_area", {"user_id": user_id})
+        return sorted(skill_areas)
+
+    def _to_item(self, doc: Dict[str, Any]) -> ReviewMistakeItem:
+        doc.pop("_id", None)
+        if isinstance(doc.get("mission_date"), datetime):
+            doc["mission_date"] = doc["mission_date"].date()
+        return ReviewMistakeItem(**doc)
+
+    async def clear_all_mistakes(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
@@ -1,12 +1,90 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
 
-from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.config import settings
+from backend.db_monitoring import instrument_repository
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus, PracticeSessionSummary
 
 # Define collection name
 PRACTICE_SESSIONS_COLLECTION = "practice_sessions"
 
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+PRACTICE_SESSION_INDEXES = [
+    IndexModel([("session_id", ASCENDING)], name="session_id", unique=True),
+    # Session listings sort by (created_at, session_id) so cursors have a unique tie-breaker
+    IndexModel(
+        [("user_id", ASCENDING), ("created_at", DESCENDING), ("session_id", DESCENDING)],
+        name="user_created_session"
+    ),
+    IndexModel(
+        [("user_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("session_id", DESCENDING)],
+        name="user_status_created_session"
+    ),
+    IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
+    # Documents are deleted once expires_at passes; sessions without it are kept
+    IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    IndexModel([("status", ASCENDING), ("expires_at", ASCENDING)], name="status_expires"),
+    # The analytics rollup reads sessions changed since its watermark
+    IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+]
+
+# Listing indexes replaced by the *_session ones above; dropped once those exist
+SUPERSEDED_PRACTICE_SESSION_INDEXES = ["user_created", "user_status_created"]
+
+# Server error code for dropping an index that does not exist
+INDEX_NOT_FOUND = 27
+
+# Fields of a session the analytics rollup counts events from
+SESSION_ANALYTICS_PROJECTION = {
+    "_id": 0,
+    "user_id": 1,
+    "topic": 1,
+    "status": 1,
+    "created_at": 1,
+    "completed_at": 1,
+    "abandoned_at": 1,
+    "updated_at": 1,
+    "question_count": 1,
+    "answered_count": {"$ifNull": ["$answered_count", {"$size": {"$ifNull": ["$answers", []]}}]},
+}
+
+def _user_sessions_query(
+    user_id: str, status: Optional[PracticeSessionStatus], after: Optional[Tuple[datetime, str]]
+) -> Dict[str, Any]:
+    """Filter for a user's sessions, optionally by status, after a (created_at, session_id) key."""
+    query: Dict[str, Any] = {"user_id": user_id}
+    if status:
+        query["status"] = status.value
+    if after:
+        after_created, after_session_id = after
+        query["created_at"] = {"$lte": after_created}
+        query["$or"] = [
+            {"created_at": {"$lt": after_created}},
+            {"created_at": after_created, "session_id": {"$lt": after_session_id}},
+        ]
+    return query
+
+# Listing rows: only the summary fields, with the answer count computed server-side
+# (compacted sessions keep it in answered_count after dropping their answers)
+SESSION_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "session_id": 1,
+    "user_id": 1,
+    "topic": 1,
+    "mode": 1,
+    "question_count": 1,
+    "status": 1,
+    "correct_count": 1,
+    "created_at": 1,
+    "completed_at": 1,
+    "answered_count": {"$ifNull": ["$answered_count", {"$size": {"$ifNull": ["$answers", []]}}]},
+}
+
+@instrument_repository
 class PracticeRepository:
     """
     Handles loading and accessing practice session data from a persistent source.
@@ -14,11 +92,27 @@ class PracticeRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db[PRACTICE_SESSIONS_COLLECTION]
+        self.session_ttl = timedelta(hours=settings.PRACTICE_SESSION_TTL_HOURS)
+
+    async def ensure_indexes(self):
+        """
+        Creates the indexes used by this repository's queries (no-op if they already
+        exist), then drops superseded ones that older deployments created.
+        """
+        await self.collection.create_indexes(PRACTICE_SESSION_INDEXES)
+        for name in SUPERSEDED_PRACTICE_SESSION_INDEXES:
+            try:
+                await self.collection.drop_index(name)
+            except OperationFailure as e:
+                if e.code != INDEX_NOT_FOUND:
+                    raise
 
     async def create_session(self, session: PracticeSession) -> PracticeSession:
         """
         Creates a new practice session in the database.
         """
+        session.expires_at = self._expires_at(session)
+        session.updated_at = datetime.utcnow()
         session_data = session.model_dump()
         await self.collection.insert_one(session_data)
         return session
@@ -33,73 +127,66 @@ class PracticeRepository:
             return PracticeSession(**session_doc)
         return None
 
-    async def update_session(self, session: PracticeSession) -> PracticeSession:
+    async def update_session(self, session: PracticeSession) -> Optional[PracticeSession]:
         """
-        Updates an existing practice session.
+        Updates an existing practice session. Each update counts as activity and
+        pushes an in-progress session's expiry forward. Only sessions still in
+        progress are written, so a late (e.g. buffered) write-back cannot bring back
+        a session the sweep has compacted, and a session is completed only once.
+        Returns None when no in-progress session matched.
         """
+        session.expires_at = self._expires_at(session)
+        session.updated_at = datetime.utcnow()
         session_data = session.model_dump()
-        await self.collection.update_one(
-            {"session_id": session.session_id},
+        result = await self.collection.update_one(
+            {"session_id": session.session_id, "status": PracticeSessionStatus.IN_PROGRESS.value},
             {"$set": session_data}
         )
-        return session
+        return session if result.matched_count else None
 
-    async def get_user_sessions(
-        self, 
-        user_id: str, 
+    def _expires_at(self, session: PracticeSession) -> Optional[datetime]:
+        """Only in-progress sessions expire; finished ones are kept as history."""
+        if session.status == PracticeSessionStatus.IN_PROGRESS:
+            return datetime.utcnow() + self.session_ttl
+        return None
+
+    async def get_user_session_summaries(
+        self,
+        user_id: str,
         status: Optional[PracticeSessionStatus] = None,
-        limit: int = 50
-    ) -> List[PracticeSession]:
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[PracticeSessionSummary]:
         """
-        Gets practice sessions for a user, optionally filtered by status.
+        Gets summary rows of a user's practice sessions, newest first, optionally
+        filtered by status. `after` is the (created_at, session_id) of the last session
+        already returned. The projection keeps the bytes read proportional to the rows
+        returned, not to the questions embedded in them.
         """
-        query = {"user_id": user_id}
-        if status:
-            query["status"] = status.value
+        cursor = self.collection.find(_user_sessions_query(user_id, status, after), SESSION_SUMMARY_PROJECTION)
+        cursor = cursor.sort([("created_at", -1), ("session_id", -1)]).limit(limit)
+        return [PracticeSessionSummary(**doc) async for doc in cursor]
 
-        cursor = self.collection.find(query).sort("created_at", -1).limit(limit)
-        sessions = []
-        
+    async def iter_sessions_by_status(self, status: PracticeSessionStatus) -> AsyncIterator[PracticeSession]:
+        """
+        Streams every practice session (all users) with the given status, for batch
+        jobs such as backfills. Uses the status_created index.
+        """
+        cursor = self.collection.find({"status": status.value})
         async for session_doc in cursor:
             session_doc.pop('_id', None)
-            sessions.append(PracticeSession(**session_doc))
-        
-        return sessions
-
-    async def get_user_stats(self, user_id: str) -> dict:
-        """
-        Gets aggregated statistics for a user's practice sessions.
-        """
-        pipeline = [
-            {"$match": {"user_id": user_id, "status": "completed"}},
-            {"$group": {
-                "_id": None,
-                "total_sessions": {"$sum": 1},
-                "total_questions": {"$sum": "$question_count"},
-                "total_correct": {"$sum": "$correct_count"},
-                "topics_practiced": {"$addToSet": "$topic"}
-            }}
-        ]
-        
-        result = await self.collection.aggregate(pipeline).to_list(1)
-        
-        if result:
-            stats = result[0]
-            return {
-                "total_sessions": stats.get("total_sessions", 0),
-                "total_questions": stats.get("total_questions", 0),
-                "total_correct": stats.get("total_correct", 0),
-                "accuracy": (stats.get("total_correct", 0) / stats.get("total_questions", 1)) * 100,
-                "topics_practiced": stats.get("topics_practiced", [])
-            }
-        
-        return {
-            "total_sessions": 0,
-            "total_questions": 0,
-            "total_correct": 0,
-            "accuracy": 0,
-            "topics_practiced": []
-        }
+            yield PracticeSession(**session_doc)
+
+    async def iter_sessions_updated_since(self, since: datetime) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams practice sessions (all users) written after `since`, projected to the
+        fields the analytics rollup needs, oldest change first. Uses the updated_at index.
+        """
+        cursor = self.collection.find(
+            {"updated_at": {"$gt": since}}, SESSION_ANALYTICS_PROJECTION
+        ).sort("updated_at", ASCENDING)
+        async for session_doc in cursor:
+            yield session_doc
 
     async def delete_session(self, session_id: str) -> bool:
         """
@@ -108,13 +195,52 @@ class PracticeRepository:
         result = await self.collection.delete_one({"session_id": session_id})
         return result.deleted_count > 0
 
-    async def cleanup_abandoned_sessions(self, hours_old: int = 24) -> int:
+    async def compact_abandoned_sessions(
+        self, idle_for: timedelta, retention: timedelta, batch_size: int = 500
+    ) -> int:
         """
-        Cleans up abandoned sessions older than specified hours.
+        Marks in-progress sessions without activity for `idle_for` as ABANDONED and
+        shrinks them to a summary (questions and answers dropped, answered count kept)
+        that the TTL index deletes after `retention`. Sessions are found through the
+        status_expires index and updated in batches of `batch_size`.
+        Returns the number of sessions compacted.
         """
-        cutoff_time = datetime.utcnow() - datetime.timedelta(hours=hours_old)
-        result = await self.collection.delete_many({
-            "status": "in_progress",
-            "created_at": {"$lt": cutoff_time}
-        })
-        return result.deleted_count 
\ No newline at end of file
+        now = datetime.utcnow()
+        idle_since = now + self.session_ttl - idle_for
+        answers = {"$ifNull": ["$answers", []]}
+        compact = [
+            {"$set": {
+                "status": PracticeSessionStatus.ABANDONED.value,
+                "answered_count": {"$size": answers},
+                "correct_count": {"$size": {"$filter": {"input": answers, "cond": "$$this.is_correct"}}},
+                "questions": [],
+                "answers": [],
+                "abandoned_at": now,
+                "updated_at": now,
+                "expires_at": now + retention,
+            }},
+        ]
+
+        compacted = 0
+        while True:
+            cursor = self.collection.find(
+                {
+                    "status": PracticeSessionStatus.IN_PROGRESS.value,
+                    "$or": [
+                        {"expires_at": {"$lte": idle_since}},
+                        # Sessions written before expires_at existed
+                        {"expires_at": None, "created_at": {"$lte": now - idle_for}},
+                    ],
+                },
+                {"session_id": 1, "_id": 0}
+            ).limit(batch_size)
+            session_ids = [doc["session_id"] async for doc in cursor]
+            if not session_ids:
+                return compacted
+            result = await self.collection.update_many(
+                {"session_id": {"$in": session_ids}, "status": PracticeSessionStatus.IN_PROGRESS.value},
+                compact
+            )
+            compacted += result.modified_count
+            if len(session_ids) < batch_size:
+                return compacted
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import unquote
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+PRACTICE_USER_STATS_COLLECTION = "practice_user_stats"
+
+# Counters kept for the totals, each topic and each day
+COUNTER_FIELDS = ("sessions", "questions", "correct")
+
+# Ids of the user's most recently counted sessions, so a replayed completion is
+# not counted twice
+COUNTED_SESSIONS_KEPT = 100
+
+
+def topic_key(topic: str) -> str:
+    """Topics become field names, so '%', '.' and '$' are percent-escaped."""
+    return topic.replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def day_key(day: date) -> str:
+    return day.isoformat()
+
+
+@instrument_repository
+class PracticeStatsRepository:
+    """
+    Handles `practice_user_stats`: one document per user (keyed by user id) with
+    practice totals, per-topic counters and per-day counters for the rolling window,
+    updated in place as sessions complete so reading them is a single point lookup.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[PRACTICE_USER_STATS_COLLECTION]
+
+    async def record_session(
+        self, user_id: str, session_id: str, topic: str, day: date, questions: int, correct: int, window_days: int
+    ) -> bool:
+        """
+        Adds one completed session to a user's stats with a single atomic update.
+        Day buckets from just before the window are dropped in the same write, so a
+        user who practices at least once per window never keeps stale buckets.
+        Returns False, leaving the stats unchanged, if the session was already counted.
+        """
+        increments = {"sessions": 1, "questions": questions, "correct": correct}
+        inc: Dict[str, int] = {}
+        for field, value in increments.items():
+            inc[f"total_{field}"] = value
+            inc[f"by_topic.{topic_key(topic)}.{field}"] = value
+            inc[f"daily.{day_key(day)}.{field}"] = value
+
+        window_start = day - timedelta(days=window_days - 1)
+        expired_days = {
+            f"daily.{day_key(window_start - timedelta(days=offset))}": ""
+            for offset in range(1, window_days + 1)
+        }
+
+        try:
+            await self.collection.update_one(
+                {"_id": user_id, "counted_sessions": {"$ne": session_id}},
+                {
+                    "$inc": inc,
+                    "$addToSet": {"topics_practiced": topic},
+                    "$unset": expired_days,
+                    "$push": {"counted_sessions": {"$each": [session_id], "$slice": -COUNTED_SESSIONS_KEPT}},
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # The user's document exists but did not match: the session is already counted
+            return False
+        return True
+
+    async def get_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Returns a user's stats document with topic names unescaped, or None."""
+        doc = await self.collection.find_one({"_id": user_id})
+        if not doc:
+            return None
+        doc["by_topic"] = {unquote(key): counts for key, counts in doc.get("by_topic", {}).items()}
+        return doc
+
+    async def replace_stats(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """Writes recomputed stats documents (each with `_id` = user id) in one batch."""
+        operations = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs]
+        if not operations:
+            return 0
+        await self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def clear_all_stats(self):
+        """Deletes every stats document (used by a full rebuild and by tests)."""
+        await self.collection.delete_many({})
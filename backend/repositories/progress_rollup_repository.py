@@ -0,0 +1,84 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List
+from urllib.parse import unquote
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+
+from backend.db_monitoring import instrument_repository
+from backend.repositories.practice_stats_repository import topic_key
+
+# Define collection name
+PROGRESS_DAILY_ROLLUPS_COLLECTION = "progress_daily_rollups"
+
+# Counters kept for the day and for each skill area
+ROLLUP_FIELDS = ("attempts", "correct", "time_spent_seconds")
+
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+PROGRESS_ROLLUP_INDEXES = [
+    # A user's rollups for a range of days (the dashboard windows)
+    IndexModel([("user_id", ASCENDING), ("day", ASCENDING)], name="user_day"),
+]
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def rollup_id(user_id: str, day: date) -> str:
+    return f"{user_id}:{day.isoformat()}"
+
+
+@instrument_repository
+class ProgressRollupRepository:
+    """
+    Handles `progress_daily_rollups`: one document per (user, day) with the answer
+    attempts, correct answers and time spent that day, in total and per skill area
+    (field names escaped like practice stats topics). Every answer increments its
+    day in place, so a dashboard window reads at most one small row per day.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[PROGRESS_DAILY_ROLLUPS_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(PROGRESS_ROLLUP_INDEXES)
+
+    async def record_attempt(
+        self, user_id: str, day: date, skill_area: str, is_correct: bool, seconds: int
+    ) -> None:
+        """Adds one answer attempt to the user's rollup for the day with a single atomic upsert."""
+        increments = {"attempts": 1, "correct": int(is_correct), "time_spent_seconds": seconds}
+        inc: Dict[str, int] = {}
+        for field, value in increments.items():
+            inc[field] = value
+            inc[f"by_skill.{topic_key(skill_area)}.{field}"] = value
+        await self.collection.update_one(
+            {"_id": rollup_id(user_id, day)},
+            {"$inc": inc, "$setOnInsert": {"user_id": user_id, "day": _midnight(day)}},
+            upsert=True
+        )
+
+    async def get_rollups(self, user_id: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """The user's rollups from `start` to `end` (inclusive), skill areas unescaped."""
+        cursor = self.collection.find(
+            {"user_id": user_id, "day": {"$gte": _midnight(start), "$lte": _midnight(end)}},
+            {"_id": 0}
+        )
+        rollups = await cursor.to_list(length=None)
+        for rollup in rollups:
+            rollup["by_skill"] = {unquote(key): counts for key, counts in rollup.get("by_skill", {}).items()}
+        return rollups
+
+    async def replace_rollups(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """Writes recomputed rollup documents (each with its `_id`) in one batch."""
+        operations = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs]
+        if not operations:
+            return 0
+        await self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def clear_all_rollups(self):
+        """Deletes every rollup document (used by a full rebuild and by tests)."""
+        await self.collection.delete_many({})
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from bson.int64 import Int64
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+QUESTION_EXPOSURE_COLLECTION = "question_exposure"
+
+# Filters are stored as sub-documents of 64-bit words keyed by word index
+WORD_BITS = 64
+
+
+def _to_int64(word: int) -> Int64:
+    """Unsigned 64-bit word -> the signed value MongoDB stores."""
+    return Int64(word - (1 << WORD_BITS) if word >= 1 << (WORD_BITS - 1) else word)
+
+
+def _from_int64(value: int) -> int:
+    return value & ((1 << WORD_BITS) - 1)
+
+
+def _words(stored: Optional[Dict[str, int]]) -> Dict[int, int]:
+    return {int(index): _from_int64(value) for index, value in (stored or {}).items()}
+
+
+@instrument_repository
+class QuestionExposureRepository:
+    """
+    Handles `question_exposure`: one document per user (keyed by user id) holding
+    two generations of a fixed-size Bloom filter over the questions served to the
+    user. Bits are set in place with `$bit`; when the current generation is full it
+    becomes the previous one and the oldest generation is dropped, so a document
+    never grows past two filters.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[QUESTION_EXPOSURE_COLLECTION]
+
+    async def get_generations(self, user_id: str) -> List[Dict[int, int]]:
+        """Returns the user's [current, previous] filter words (empty dicts if none)."""
+        doc = await self.collection.find_one({"_id": user_id}, {"current": 1, "previous": 1})
+        if not doc:
+            return [{}, {}]
+        return [_words(doc.get("current")), _words(doc.get("previous"))]
+
+    async def add_exposures(self, user_id: str, word_masks: Dict[int, int], count: int, generation_size: int) -> None:
+        """
+        ORs the given word masks into the current generation and counts `count`
+        more questions in it, then rotates the generations if it holds
+        `generation_size` or more. Each step is a single atomic update.
+        """
+        if not word_masks:
+            return
+        await self.collection.update_one(
+            {"_id": user_id},
+            {
+                "$bit": {f"current.{index}": {"or": _to_int64(mask)} for index, mask in word_masks.items()},
+                "$inc": {"current_count": count},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+            upsert=True
+        )
+        await self.collection.update_one(
+            {"_id": user_id, "current_count": {"$gte": generation_size}},
+            [{"$set": {
+                "previous": "$current",
+                "current": {"$literal": {}},
+                "current_count": 0,
+                "rotated_at": "$$NOW",
+            }}]
+        )
+
+    async def clear_all_exposures(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
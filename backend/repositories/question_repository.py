@@ -1,28 +1,46 @@
 import csv
 import asyncio
+import hashlib
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, UpdateOne
 
 # Assuming models are accessible. If not, adjust the import path.
 # This might require adding backend/ to PYTHONPATH or using relative imports.
 from backend.models.daily_mission import Question, ChoiceOption
+from backend.db_monitoring import instrument_repository
 
 # Define collection name
 QUESTIONS_COLLECTION = "questions"
 
+# The question bank is read in full into the in-memory cache, so only integrity
+# and editor lookups need indexes here.
+QUESTION_INDEXES = [
+    IndexModel([("question_id", ASCENDING)], name="question_id", unique=True),
+    IndexModel([("skill_area", ASCENDING), ("difficulty_level", ASCENDING)], name="skill_difficulty"),
+]
+
+@instrument_repository
 class QuestionRepository:
     """
     Handles loading and accessing question data from a persistent source (e.g., CSV).
     """
     _questions_cache: Dict[str, Question] = {}
     _is_initialized: bool = False
+    # Fingerprint of the loaded bank's question ids, topics and difficulties, shared by
+    # all instances like the cache; derived data such as the topic catalog is keyed by it.
+    _bank_version: Optional[str] = None
 
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db[QUESTIONS_COLLECTION]
         self.questions_csv_path = Path(__file__).resolve().parent.parent / "data" / "gat_questions.csv"
 
+    async def ensure_indexes(self):
+        """Creates the indexes on the questions collection (no-op if they already exist)."""
+        await self.collection.create_indexes(QUESTION_INDEXES)
+
     async def _initialize_if_needed(self):
         """
         Initializes the repository by seeding the DB from CSV if empty,
@@ -49,6 +67,20 @@ class QuestionRepository:
             question_doc.pop('_id', None) 
             question = Question(**question_doc)
             self._questions_cache[question.question_id] = question
+        QuestionRepository._bank_version = self._fingerprint(self._questions_cache)
+
+    @staticmethod
+    def _fingerprint(questions: Dict[str, Question]) -> str:
+        digest = hashlib.sha1()
+        for question_id in sorted(questions):
+            question = questions[question_id]
+            digest.update(f"{question_id}\x1f{question.skill_area}\x1f{question.difficulty_level}\x1e".encode())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def loaded_bank_version(cls) -> Optional[str]:
+        """Version of the bank currently in the shared cache (None before the first load). No I/O."""
+        return cls._bank_version
 
     async def _seed_db_from_csv(self):
         """
@@ -114,6 +146,27 @@ class QuestionRepository:
         await self._initialize_if_needed()
         return self._questions_cache.get(question_id)
 
+    async def write_item_stats(self, item_stats: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Stores the item-analysis results on the question documents (`item_stats`) in
+        one batch. The field is not part of the Question model, so it never reaches
+        the cache or the missions and sessions questions are copied into.
+        Returns the number of questions updated.
+        """
+        operations = [
+            UpdateOne({"question_id": question_id}, {"$set": {"item_stats": stats}})
+            for question_id, stats in item_stats.items()
+        ]
+        if not operations:
+            return 0
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def get_item_stats(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """The stored item-analysis results of a question, or None."""
+        doc = await self.collection.find_one({"question_id": question_id}, {"_id": 0, "item_stats": 1})
+        return doc.get("item_stats") if doc else None
+
     async def get_questions_by_topic(self, topic: str, limit: Optional[int] = None) -> List[Question]:
         """
         Retrieves questions filtered by topic (skill_area).
@@ -163,6 +216,7 @@ class QuestionRepository:
         await self.collection.delete_many({})
         self._questions_cache.clear()
         self._is_initialized = False
+        QuestionRepository._bank_version = None
         print("Cleared all questions from the database and reset the cache.")
 
 # --- Singleton Instance Removal ---
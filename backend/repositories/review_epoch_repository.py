@@ -0,0 +1,39 @@
+from typing import Iterable
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+REVIEW_EPOCHS_COLLECTION = "review_epochs"
+
+
+@instrument_repository
+class ReviewEpochRepository:
+    """
+    Handles per-user review epochs: a counter bumped whenever a user's reviewable
+    mistakes change (a mission completes or is archived, a practice session completes).
+    Cached review results are keyed by it, so a bump invalidates them in every process.
+    Documents are keyed by user id, so no extra index is needed.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[REVIEW_EPOCHS_COLLECTION]
+
+    async def get_epoch(self, user_id: str) -> int:
+        """Returns the user's current review epoch (0 if it was never bumped)."""
+        doc = await self.collection.find_one({"_id": user_id}, {"epoch": 1})
+        return doc["epoch"] if doc else 0
+
+    async def bump_epochs(self, user_ids: Iterable[str]) -> None:
+        """Increments the review epoch of each given user."""
+        operations = [
+            UpdateOne({"_id": user_id}, {"$inc": {"epoch": 1}}, upsert=True)
+            for user_id in set(user_ids)
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def clear_all_epochs(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
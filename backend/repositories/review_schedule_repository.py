@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateOne
+
+from backend.models.review_schedule import ReviewScheduleItem, MIN_EASE_FACTOR
+from backend.models.api_responses import ReviewMistakeItem
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+REVIEW_SCHEDULE_COLLECTION = "review_schedule"
+
+# One item per (user, question). The due queue is read from user_next_review in
+# (next_review_at, question_id) order, so a page costs one index seek plus the page.
+REVIEW_SCHEDULE_INDEXES = [
+    IndexModel([("user_id", ASCENDING), ("question_id", ASCENDING)], name="user_question", unique=True),
+    IndexModel(
+        [("user_id", ASCENDING), ("next_review_at", ASCENDING), ("question_id", ASCENDING)],
+        name="user_next_review"
+    ),
+]
+
+# Order of the due queue: most overdue first
+DUE_SORT = [("next_review_at", ASCENDING), ("question_id", ASCENDING)]
+
+# Grades below this are lapses: the item starts over with a one-day interval
+PASSING_GRADE = 3
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+def sm2_update_pipeline(grade: int, reviewed_at: datetime) -> List[Dict[str, Any]]:
+    """
+    Update pipeline applying one SM-2 review with quality `grade` (0-5) to a schedule
+    item, computed by the server from the item's current state so grading is a single
+    write. Fields in the first stage all read the values from before the review.
+    """
+    miss = 5 - grade
+    ease_delta = 0.1 - miss * (0.08 + miss * 0.02)
+
+    if grade < PASSING_GRADE:
+        interval: Any = 1
+        repetitions: Any = 0
+    else:
+        interval = {"$switch": {
+            "branches": [
+                {"case": {"$eq": ["$repetitions", 0]}, "then": 1},
+                {"case": {"$eq": ["$repetitions", 1]}, "then": 6},
+            ],
+            "default": {"$toInt": {"$round": [{"$multiply": ["$interval_days", "$ease_factor"]}, 0]}},
+        }}
+        repetitions = {"$add": ["$repetitions", 1]}
+
+    return [
+        {"$set": {
+            "interval_days": interval,
+            "repetitions": repetitions,
+            "ease_factor": {"$max": [MIN_EASE_FACTOR, {"$add": ["$ease_factor", ease_delta]}]},
+            "review_count": {"$add": ["$review_count", 1]},
+            "last_grade": grade,
+            "last_reviewed_at": reviewed_at,
+        }},
+        {"$set": {"next_review_at": {"$add": [reviewed_at, {"$multiply": ["$interval_days", MS_PER_DAY]}]}}},
+    ]
+
+
+@instrument_repository
+class ReviewScheduleRepository:
+    """
+    Handles the `review_schedule` collection: the spaced-repetition state of every
+    question a user has got wrong, and the per-user queue of items due for review.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[REVIEW_SCHEDULE_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(REVIEW_SCHEDULE_INDEXES)
+
+    async def schedule_mistakes(self, user_id: str, mistakes: List[Tuple[ReviewMistakeItem, datetime]]) -> int:
+        """
+        Adds (mistake, first review time) pairs to a user's schedule. Questions already
+        scheduled keep their review state and only get the newer mistake attached.
+        Returns the number of newly scheduled questions.
+        """
+        if not mistakes:
+            return 0
+
+        operations = []
+        for mistake, due_at in mistakes:
+            item = ReviewScheduleItem(
+                user_id=user_id, question_id=mistake.question_id, mistake=mistake, next_review_at=due_at
+            ).model_dump()
+            mistake_data = item.pop("mistake")
+            mistake_data["mission_date"] = datetime.combine(mistake_data["mission_date"], datetime.min.time())
+            operations.append(UpdateOne(
+                {"user_id": user_id, "question_id": mistake.question_id},
+                {"$set": {"mistake": mistake_data}, "$setOnInsert": item},
+                upsert=True
+            ))
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+
+    async def find_due(
+        self,
+        user_id: str,
+        now: datetime,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> Tuple[List[ReviewScheduleItem], Optional[Tuple[datetime, str]]]:
+        """
+        Returns up to `limit` of a user's items due at `now`, most overdue first, and the
+        (next_review_at, question_id) key of the last one when more are due. Pass that
+        key back as `after` to read the following page.
+        """
+        query: Dict[str, Any] = {"user_id": user_id, "next_review_at": {"$lte": now}}
+        if after:
+            after_due, after_question_id = after
+            query["next_review_at"]["$gte"] = after_due
+            query["$or"] = [
+                {"next_review_at": {"$gt": after_due}},
+                {"next_review_at": after_due, "question_id": {"$gt": after_question_id}},
+            ]
+
+        # One extra document tells whether another page follows
+        cursor = self.collection.find(query).sort(DUE_SORT).limit(limit + 1)
+        docs = await cursor.to_list(limit + 1)
+
+        next_key = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_key = (docs[-1]["next_review_at"], docs[-1]["question_id"])
+        return [self._to_item(doc) for doc in docs], next_key
+
+    async def grade_item(
+        self, user_id: str, question_id: str, grade: int, reviewed_at: datetime
+    ) -> Optional[ReviewScheduleItem]:
+        """
+        Applies one graded review to an item with a single targeted update and returns
+        the rescheduled item, or None if the question is not in the user's schedule.
+        """
+        doc = await self.collection.find_one_and_update(
+            {"user_id": user_id, "question_id": question_id},
+            sm2_update_pipeline(grade, reviewed_at),
+            return_document=ReturnDocument.AFTER
+        )
+        return self._to_item(doc) if doc else None
+
+    def _to_item(self, doc: Dict[str, Any]) -> ReviewScheduleItem:
+        doc.pop("_id", None)
+        mistake = doc["mistake"]
+        if isinstance(mistake.get("mission_date"), datetime):
+            mistake["mission_date"] = mistake["mission_date"].date()
+        return ReviewScheduleItem(**doc)
+
+    async def clear_all_items(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
@@ -0,0 +1,110 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+
+from backend.db_monitoring import instrument_repository
+
+# Define collection name
+USER_STREAKS_COLLECTION = "user_streaks"
+
+# Indexes backing every query issued by this repository.
+# The query-plan tests in tests/integration/test_query_plans.py assert against these names.
+STREAK_INDEXES = [
+    # The daily reset finds live streaks whose last completed day is too old
+    IndexModel([("last_completed_date", ASCENDING)], name="last_completed_date"),
+]
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def week_start(day: date) -> date:
+    """Monday of the day's week."""
+    return day - timedelta(days=day.weekday())
+
+
+def completion_pipeline(day: date):
+    """
+    Update pipeline recording a completed mission on `day`. Only a day after the
+    last completed one changes anything, so repeated or concurrent completions of
+    the same day (and late, out-of-order ones) are no-ops.
+    """
+    completed = _midnight(day)
+    previous = _midnight(day - timedelta(days=1))
+    week = _midnight(week_start(day))
+    return [
+        # A missing last_completed_date sorts before any date
+        {"$set": {"_advances": {"$lt": ["$last_completed_date", completed]}}},
+        {"$set": {
+            "current_streak": {"$cond": [
+                "$_advances",
+                {"$cond": [
+                    {"$eq": ["$last_completed_date", previous]},
+                    {"$add": [{"$ifNull": ["$current_streak", 0]}, 1]},
+                    1,
+                ]},
+                "$current_streak",
+            ]},
+            "week_completions": {"$cond": [
+                "$_advances",
+                {"$cond": [
+                    {"$eq": ["$week_start", week]},
+                    {"$add": [{"$ifNull": ["$week_completions", 0]}, 1]},
+                    1,
+                ]},
+                "$week_completions",
+            ]},
+            "week_start": {"$cond": ["$_advances", week, "$week_start"]},
+            "total_completed_days": {"$cond": [
+                "$_advances", {"$add": [{"$ifNull": ["$total_completed_days", 0]}, 1]}, "$total_completed_days"
+            ]},
+            "last_completed_date": {"$cond": ["$_advances", completed, "$last_completed_date"]},
+        }},
+        {"$set": {
+            "longest_streak": {"$max": [{"$ifNull": ["$longest_streak", 0]}, "$current_streak"]},
+            "updated_at": "$$NOW",
+        }},
+        {"$unset": "_advances"},
+    ]
+
+
+@instrument_repository
+class StreakRepository:
+    """
+    Handles `user_streaks`: one document per user (keyed by user id) with the
+    current and longest daily-mission streaks, the last completed day and the
+    completions of the current week. Updated in place as missions complete, so
+    reading a user's streak is a single point lookup.
+    """
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[USER_STREAKS_COLLECTION]
+
+    async def ensure_indexes(self):
+        """Creates the indexes used by this repository's queries (no-op if they already exist)."""
+        await self.collection.create_indexes(STREAK_INDEXES)
+
+    async def record_completion(self, user_id: str, day: date) -> None:
+        """Counts a mission completed on `day` with one atomic pipeline upsert."""
+        await self.collection.update_one({"_id": user_id}, completion_pipeline(day), upsert=True)
+
+    async def get_streak(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the user's streak document as stored, or None."""
+        return await self.collection.find_one({"_id": user_id})
+
+    async def reset_broken_streaks(self, today: date) -> int:
+        """
+        Zeroes the current streak of every user whose last completed day is before
+        yesterday. Returns the number of streaks reset.
+        """
+        result = await self.collection.update_many(
+            {"last_completed_date": {"$lt": _midnight(today - timedelta(days=1))}, "current_streak": {"$gt": 0}},
+            {"$set": {"current_streak": 0}}
+        )
+        return result.modified_count
+
+    async def clear_all_streaks(self):
+        """A helper method for testing to clear the collection."""
+        await self.collection.delete_many({})
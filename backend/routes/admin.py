@@ -0,0 +1,158 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from backend.models.api_responses import MissionResponse
+from backend.database import db_manager
+from backend.services.review_cache import review_cache
+from backend.services.practice_session_buffer import practice_session_buffer
+from backend.services.analytics_rollup_service import get_platform_analytics, InvalidAnalyticsRangeError
+from backend.services.item_analysis import get_item_statistics
+from backend.dependencies import get_analytics_repository, get_item_stats_repository, get_question_repository
+from backend.repositories.analytics_repository import AnalyticsRepository
+from backend.repositories.item_stats_repository import ItemStatsRepository
+from backend.repositories.question_repository import QuestionRepository
+from backend.config import settings
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+)
+
+
+@router.get("/slow-queries", response_model=MissionResponse[dict])
+async def get_slow_queries():
+    """
+    Get MongoDB command timings per command, collection and repository method,
+    the rolling window of slow operations (filter values redacted) and any
+    explain plans captured for repeat offenders.
+    """
+    if not db_manager.query_monitor:
+        raise HTTPException(status_code=503, detail="Database monitoring is not active.")
+
+    return MissionResponse(
+        status="success",
+        message="Slow query report retrieved successfully.",
+        data=db_manager.query_monitor.snapshot()
+    )
+
+
+@router.post("/slow-queries/reset", response_model=MissionResponse[dict])
+async def reset_slow_queries():
+    """
+    Clear the collected command statistics and slow-operation window.
+    """
+    if not db_manager.query_monitor:
+        raise HTTPException(status_code=503, detail="Database monitoring is not active.")
+
+    db_manager.query_monitor.reset()
+    return MissionResponse(
+        status="success",
+        message="Slow query report cleared.",
+        data={}
+    )
+
+
+@router.get("/db-pool", response_model=MissionResponse[dict])
+async def get_db_pool_metrics():
+    """
+    Get MongoDB connection-pool metrics per server: open and in-use connections,
+    checkout wait times, checkout failures and pool-cleared events, together with
+    the configured pool options.
+    """
+    if not db_manager.pool_monitor:
+        raise HTTPException(status_code=503, detail="Database monitoring is not active.")
+
+    return MissionResponse(
+        status="success",
+        message="Connection pool metrics retrieved successfully.",
+        data={
+            "client_options": db_manager.client_options(),
+            **db_manager.pool_monitor.snapshot(),
+        }
+    )
+
+
+@router.get("/review-cache", response_model=MissionResponse[dict])
+async def get_review_cache_metrics():
+    """
+    Get this process's review cache metrics: entries, hits, misses, hit rate,
+    LRU evictions and entries invalidated by review epoch bumps.
+    """
+    return MissionResponse(
+        status="success",
+        message="Review cache metrics retrieved successfully.",
+        data={"enabled": settings.REVIEW_CACHE_ENABLED, **review_cache.snapshot()}
+    )
+
+
+@router.post("/review-cache/reset", response_model=MissionResponse[dict])
+async def reset_review_cache():
+    """
+    Drop every cached review result and reset the metrics.
+    """
+    review_cache.clear()
+    return MissionResponse(
+        status="success",
+        message="Review cache cleared.",
+        data={}
+    )
+
+
+@router.get("/practice-session-buffer", response_model=MissionResponse[dict])
+async def get_practice_session_buffer_metrics():
+    """
+    Get this process's practice session write-behind buffer metrics: buffered
+    and dirty sessions, hits, misses, write-backs and LRU evictions.
+    """
+    return MissionResponse(
+        status="success",
+        message="Practice session buffer metrics retrieved successfully.",
+        data={"enabled": settings.PRACTICE_SESSION_BUFFER_ENABLED, **practice_session_buffer.snapshot()}
+    )
+
+
+@router.get("/analytics", response_model=MissionResponse[dict])
+async def get_analytics(
+    granularity: str = Query("day", description="'hour' or 'day'"),
+    start: Optional[date] = Query(None, alias="from", description="First day, UTC+7 (default: 6 days before 'to')"),
+    end: Optional[date] = Query(None, alias="to", description="Last day, UTC+7 (default: today)"),
+    analytics_repo: AnalyticsRepository = Depends(get_analytics_repository)
+):
+    """
+    Get platform analytics per hour or per day: missions generated, completed and
+    archived, mission answer attempts, practice sessions and answers (also per topic)
+    and, for days, distinct active users. Served from the rollup collections; events
+    after the returned watermark are not counted yet.
+    """
+    try:
+        analytics = await get_platform_analytics(analytics_repo, granularity, start, end)
+    except InvalidAnalyticsRangeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return MissionResponse(
+        status="success",
+        message="Platform analytics retrieved successfully.",
+        data=analytics
+    )
+
+
+@router.get("/questions/{question_id}/item-stats", response_model=MissionResponse[dict])
+async def get_question_item_stats(
+    question_id: str,
+    item_repo: ItemStatsRepository = Depends(get_item_stats_repository),
+    question_repo: QuestionRepository = Depends(get_question_repository)
+):
+    """
+    Get a question's item statistics for recalibrating its difficulty level: live
+    counters (p-value, choice rates, average attempts to correct) and the results
+    of the last nightly item analysis, which add discrimination and a suggested
+    difficulty level.
+    """
+    stats = await get_item_statistics(question_id, item_repo, question_repo)
+    if stats is None:
+        raise HTTPException(status_code=404, detail=f"Question {question_id} not found.")
+    return MissionResponse(
+        status="success",
+        message="Item statistics retrieved successfully.",
+        data=stats
+    )
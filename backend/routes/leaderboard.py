@@ -0,0 +1,38 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from backend.models.api_responses import MissionResponse
+from backend.services.leaderboard import InvalidLeaderboardWeekError, get_leaderboard
+from backend.dependencies import get_leaderboard_repository
+from backend.repositories.leaderboard_repository import LeaderboardRepository
+
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["Leaderboard"],
+)
+
+
+@router.get("/weekly", response_model=MissionResponse)
+async def get_weekly_leaderboard(
+    limit: int = Query(10, ge=1, le=100, description="Number of top entries"),
+    user_id: Optional[str] = Query(None, description="Also return this user's rank"),
+    week: Optional[date] = Query(None, description="Any day of the week (default: this week, UTC+7)"),
+    leaderboard_repo: LeaderboardRepository = Depends(get_leaderboard_repository)
+):
+    """
+    Get the weekly leaderboard: users ranked by missions completed, then by accuracy
+    over their mission and practice answers. Equal scores share a rank. Weeks that
+    have not started are rejected with 422.
+    """
+    try:
+        board = await get_leaderboard(leaderboard_repo, limit=limit, user_id=user_id, week=week)
+        return MissionResponse(
+            status="success",
+            message="Leaderboard retrieved successfully.",
+            data=board
+        )
+    except InvalidLeaderboardWeekError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get leaderboard: {str(e)}")
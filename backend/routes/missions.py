@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import List, Dict, Any, Optional
 
 # Updated imports to reflect service refactoring
 from backend.models.daily_mission import DailyMissionDocument, MissionStatus
 from backend.services.mission_service import get_todays_mission_for_user
+from backend.services.mission_history_service import (
+    get_mission_history,
+    resolve_history_range,
+    history_cache_control,
+    InvalidHistoryRangeError
+)
 from backend.services.mission_progress_service import (
     update_mission_progress,
     submit_answer_with_feedback,
@@ -11,9 +19,21 @@ from backend.services.mission_progress_service import (
     reset_question_for_retry
 )
 from backend.models.api_responses import MissionResponse, ErrorResponse
-from backend.dependencies import get_mission_repository, get_question_repository
+from backend.dependencies import (
+    get_mission_repository,
+    get_question_repository,
+    get_question_exposure_repository,
+    get_irt_repository,
+    get_streak_repository,
+    get_progress_recorder,
+)
 from backend.repositories.mission_repository import MissionRepository
 from backend.repositories.question_repository import QuestionRepository
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+from backend.repositories.irt_repository import IrtRepository
+from backend.repositories.streak_repository import StreakRepository
+from backend.services.streak_service import get_streak
+from backend.services.progress_recorder import ProgressRecorder
 
 # Pydantic model for the request body of progress update
 from pydantic import BaseModel
@@ -47,13 +67,15 @@ router = APIRouter(
 async def get_daily_mission(
     user_id: str,
     mission_repo: MissionRepository = Depends(get_mission_repository),
-    question_repo: QuestionRepository = Depends(get_question_repository)
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    exposure_repo: Optional[QuestionExposureRepository] = Depends(get_question_exposure_repository),
+    irt_repo: Optional[IrtRepository] = Depends(get_irt_repository)
 ):
     """
     Retrieve or generate today's mission for a user.
     """
     try:
-        mission = await get_todays_mission_for_user(user_id, mission_repo, question_repo)
+        mission = await get_todays_mission_for_user(user_id, mission_repo, question_repo, exposure_repo, irt_repo)
         return MissionResponse(
             status="success",
             message="Daily mission retrieved successfully.",
@@ -62,11 +84,65 @@ async def get_daily_mission(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to get daily mission: {str(e)}")
 
+@router.get("/history/{user_id}", response_model=MissionResponse)
+async def get_mission_history_calendar(
+    user_id: str,
+    request: Request,
+    start: Optional[date] = Query(None, alias="from", description="First day (default: 30 days before 'to')"),
+    end: Optional[date] = Query(None, alias="to", description="Last day (default: today, UTC+7)"),
+    mission_repo: MissionRepository = Depends(get_mission_repository)
+):
+    """
+    Get a user's mission history for the streak calendar: one compact entry
+    (date, status, correct, total) per day with a mission, oldest first.
+    Ranges that end before yesterday no longer change and are cacheable for a
+    week; the ETag allows cheap revalidation of the rest.
+    """
+    try:
+        start, end = resolve_history_range(start, end)
+        history = await get_mission_history(user_id, mission_repo, start, end)
+        body = MissionResponse(
+            status="success",
+            message="Mission history retrieved successfully.",
+            data=history
+        ).model_dump_json().encode()
+        headers = {
+            "ETag": f'"{hashlib.sha1(body).hexdigest()[:16]}"',
+            "Cache-Control": history_cache_control(end),
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    except InvalidHistoryRangeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get mission history: {str(e)}")
+
+@router.get("/streak/{user_id}", response_model=MissionResponse)
+async def get_mission_streak(
+    user_id: str,
+    streak_repo: StreakRepository = Depends(get_streak_repository)
+):
+    """
+    Get a user's daily-mission streak: current and longest streak, last completed
+    day, completions this week and total completed days.
+    """
+    try:
+        streak = await get_streak(user_id, streak_repo)
+        return MissionResponse(
+            status="success",
+            message="Mission streak retrieved successfully.",
+            data=streak
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get mission streak: {str(e)}")
+
 @router.put("/daily/{user_id}/progress", response_model=MissionResponse)
 async def update_daily_mission_progress(
     user_id: str,
     payload: MissionProgressUpdatePayload,
-    mission_repo: MissionRepository = Depends(get_mission_repository)
+    mission_repo: MissionRepository = Depends(get_mission_repository),
+    recorder: ProgressRecorder = Depends(get_progress_recorder)
 ):
     """
     Update the progress of today's mission for a user.
@@ -76,7 +152,8 @@ async def update_daily_mission_progress(
             user_id=user_id,
             current_question_index=payload.current_question_index,
             answers=payload.answers,
-            mission_repo=mission_repo
+            mission_repo=mission_repo,
+            recorder=recorder
         )
         
         if not updated_mission:
@@ -94,7 +171,8 @@ async def update_daily_mission_progress(
 async def submit_answer(
     user_id: str,
     payload: AnswerSubmissionPayload,
-    mission_repo: MissionRepository = Depends(get_mission_repository)
+    mission_repo: MissionRepository = Depends(get_mission_repository),
+    recorder: ProgressRecorder = Depends(get_progress_recorder)
 ):
     """
     Submit an answer and get immediate feedback.
@@ -104,7 +182,8 @@ async def submit_answer(
             user_id=user_id,
             question_id=payload.question_id,
             user_answer=payload.answer,
-            mission_repo=mission_repo
+            mission_repo=mission_repo,
+            recorder=recorder
         )
         
         return {
@@ -121,7 +200,8 @@ async def submit_answer(
 async def mark_feedback_viewed(
     user_id: str,
     payload: FeedbackShownPayload,
-    mission_repo: MissionRepository = Depends(get_mission_repository)
+    mission_repo: MissionRepository = Depends(get_mission_repository),
+    recorder: ProgressRecorder = Depends(get_progress_recorder)
 ):
     """
     Mark feedback as shown for a specific question.
@@ -130,7 +210,8 @@ async def mark_feedback_viewed(
         updated_mission = await mark_feedback_shown(
             user_id=user_id,
             question_id=payload.question_id,
-            mission_repo=mission_repo
+            mission_repo=mission_repo,
+            recorder=recorder
         )
         
         if not updated_mission:
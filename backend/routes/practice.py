@@ -1,23 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
-from backend.models.practice_session import PracticeSession
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
 from backend.models.api_responses import MissionResponse
 from backend.services.practice_service import (
     create_practice_session,
+    create_mistakes_practice_session,
     get_practice_session,
     submit_practice_answer,
     get_practice_session_summary,
-    get_available_practice_topics,
+    list_user_practice_sessions,
+    load_practice_session,
+    apply_practice_answer,
+    save_practice_progress,
+    summarize_practice_session,
+    serve_next_adaptive_question,
+    create_adaptive_practice_session,
     PracticeServiceError,
     InsufficientQuestionsError,
     SessionNotFoundError,
-    SessionAlreadyCompletedError
+    SessionAlreadyCompletedError,
+    SessionAbandonedError
+)
+from backend.dependencies import (
+    get_question_repository,
+    get_practice_repository,
+    get_mistake_repository,
+    get_practice_stats_repository,
+    get_question_exposure_repository,
+    get_progress_recorder,
 )
-from backend.dependencies import get_question_repository, get_practice_repository
 from backend.repositories.question_repository import QuestionRepository
 from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.practice_stats_repository import PracticeStatsRepository
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+from backend.services.practice_stats_service import get_practice_stats
+from backend.services.topic_catalog import topic_catalog
+from backend.services.practice_session_buffer import PracticeSessionBuffer, practice_session_buffer
+from backend.config import settings
+from backend.services.progress_recorder import ProgressRecorder
+from backend.services.cursor_pagination import InvalidCursorError
 
 router = APIRouter(
     prefix="/practice",
@@ -29,6 +55,10 @@ class CreatePracticeSessionRequest(BaseModel):
     topic: str
     question_count: int = 5
 
+class CreateMistakesPracticeSessionRequest(BaseModel):
+    skill_area: Optional[str] = None
+    question_count: int = 5
+
 class SubmitPracticeAnswerRequest(BaseModel):
     question_id: str
     answer: Any
@@ -40,22 +70,28 @@ class PracticeSessionResponse(BaseModel):
     questions: List[Dict[str, Any]]
     status: str
 
+def _session_buffer() -> Optional[PracticeSessionBuffer]:
+    """The write-behind buffer when PRACTICE_SESSION_BUFFER_ENABLED is on."""
+    return practice_session_buffer if settings.PRACTICE_SESSION_BUFFER_ENABLED else None
+
 # API Endpoints
 
 @router.get("/topics", response_model=MissionResponse)
 async def get_practice_topics(
+    request: Request,
     question_repo: QuestionRepository = Depends(get_question_repository)
 ):
     """
-    Get all available topics for practice with question counts.
+    Get all available topics for practice with question counts, counts per
+    difficulty level and availability. Served from the pre-serialized topic
+    catalog; the ETag is the question bank version.
     """
     try:
-        topics = await get_available_practice_topics(question_repo)
-        return MissionResponse(
-            status="success",
-            message="Practice topics retrieved successfully.",
-            data=topics
-        )
+        payload = await topic_catalog.get_payload(question_repo)
+        etag = f'"{payload.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=payload.body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to get practice topics: {str(e)}")
 
@@ -64,10 +100,12 @@ async def create_session(
     user_id: str,
     request: CreatePracticeSessionRequest,
     question_repo: QuestionRepository = Depends(get_question_repository),
-    practice_repo: PracticeRepository = Depends(get_practice_repository)
+    practice_repo: PracticeRepository = Depends(get_practice_repository),
+    exposure_repo: Optional[QuestionExposureRepository] = Depends(get_question_exposure_repository)
 ):
     """
     Create a new practice session for a user.
+    Questions the user was served recently are avoided while the topic has others.
     
     Query Parameters:
     - user_id: The user ID
@@ -82,13 +120,15 @@ async def create_session(
             topic=request.topic,
             question_count=request.question_count,
             question_repo=question_repo,
-            practice_repo=practice_repo
+            practice_repo=practice_repo,
+            exposure_repo=exposure_repo
         )
         
         # Format session for response
         session_data = {
             "session_id": session.session_id,
             "topic": session.topic,
+            "mode": session.mode,
             "question_count": session.question_count,
             "questions": [q.model_dump() for q in session.questions],
             "status": session.status,
@@ -108,6 +148,107 @@ async def create_session(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create practice session: {str(e)}")
 
+@router.post("/sessions/mistakes", response_model=MissionResponse)
+async def create_mistakes_session(
+    user_id: str,
+    request: CreateMistakesPracticeSessionRequest,
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    practice_repo: PracticeRepository = Depends(get_practice_repository),
+    mistake_repo: MistakeRepository = Depends(get_mistake_repository)
+):
+    """
+    Create a "retry my mistakes" practice session from questions the user
+    previously answered incorrectly, favouring recent and repeated mistakes.
+    
+    Query Parameters:
+    - user_id: The user ID
+    
+    Request Body:
+    - skill_area: Optional skill area to practice mistakes from
+    - question_count: Maximum number of questions (1-20, default: 5)
+    """
+    try:
+        session = await create_mistakes_practice_session(
+            user_id=user_id,
+            question_count=request.question_count,
+            question_repo=question_repo,
+            practice_repo=practice_repo,
+            mistake_repo=mistake_repo,
+            skill_area=request.skill_area
+        )
+        
+        # Format session for response
+        session_data = {
+            "session_id": session.session_id,
+            "topic": session.topic,
+            "mode": session.mode,
+            "question_count": session.question_count,
+            "questions": [q.model_dump() for q in session.questions],
+            "status": session.status,
+            "created_at": session.created_at.isoformat()
+        }
+        
+        return MissionResponse(
+            status="success",
+            message="Mistakes practice session created successfully.",
+            data=session_data
+        )
+        
+    except PracticeServiceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create mistakes practice session: {str(e)}")
+
+@router.post("/sessions/adaptive", response_model=MissionResponse)
+async def create_adaptive_session(
+    user_id: str,
+    request: CreatePracticeSessionRequest,
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    practice_repo: PracticeRepository = Depends(get_practice_repository)
+):
+    """
+    Create an adaptive practice session: questions are served one at a time and
+    their difficulty follows the user's answers. The response holds the first
+    question; each submitted answer's feedback carries the next one.
+    
+    Query Parameters:
+    - user_id: The user ID
+    
+    Request Body:
+    - topic: The topic to practice
+    - question_count: Number of questions (1-20, default: 5)
+    """
+    try:
+        session = await create_adaptive_practice_session(
+            user_id=user_id,
+            topic=request.topic,
+            question_count=request.question_count,
+            question_repo=question_repo,
+            practice_repo=practice_repo
+        )
+        
+        # Format session for response
+        session_data = {
+            "session_id": session.session_id,
+            "topic": session.topic,
+            "mode": session.mode,
+            "question_count": session.question_count,
+            "questions": [q.model_dump() for q in session.questions],
+            "status": session.status,
+            "created_at": session.created_at.isoformat()
+        }
+        
+        return MissionResponse(
+            status="success",
+            message="Adaptive practice session created successfully.",
+            data=session_data
+        )
+        
+    except PracticeServiceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create adaptive practice session: {str(e)}")
+
 @router.get("/sessions/{session_id}", response_model=MissionResponse)
 async def get_session(
     session_id: str,
@@ -117,13 +258,14 @@ async def get_session(
     Get a practice session by ID.
     """
     try:
-        session = await get_practice_session(session_id, practice_repo)
+        session = await get_practice_session(session_id, practice_repo, buffer=_session_buffer())
         
         # Format session for response
         session_data = {
             "session_id": session.session_id,
             "user_id": session.user_id,
             "topic": session.topic,
+            "mode": session.mode,
             "question_count": session.question_count,
             "questions": [q.model_dump() for q in session.questions],
             "answers": [a.model_dump() for a in session.answers],
@@ -147,17 +289,23 @@ async def get_session(
 async def submit_answer(
     session_id: str,
     request: SubmitPracticeAnswerRequest,
-    practice_repo: PracticeRepository = Depends(get_practice_repository)
+    practice_repo: PracticeRepository = Depends(get_practice_repository),
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    recorder: ProgressRecorder = Depends(get_progress_recorder)
 ):
     """
     Submit an answer for a practice question.
+    For adaptive sessions the feedback includes the next question.
     """
     try:
         feedback = await submit_practice_answer(
             session_id=session_id,
             question_id=request.question_id,
             user_answer=request.answer,
-            practice_repo=practice_repo
+            practice_repo=practice_repo,
+            recorder=recorder,
+            buffer=_session_buffer(),
+            question_repo=question_repo
         )
         
         return {
@@ -170,11 +318,139 @@ async def submit_answer(
         raise HTTPException(status_code=404, detail=str(e))
     except SessionAlreadyCompletedError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except SessionAbandonedError as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except PracticeServiceError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit answer: {str(e)}")
 
+# WebSocket close codes mirroring the HTTP statuses of the REST endpoints
+WS_CLOSE_CODES = {
+    SessionNotFoundError: 4404,
+    SessionAlreadyCompletedError: 4409,
+    SessionAbandonedError: 4410,
+}
+
+async def _send_next_question(websocket: WebSocket, session: PracticeSession) -> None:
+    question = session.next_unanswered_question()
+    if question is not None:
+        await websocket.send_json({
+            "type": "question", "index": session.questions.index(question), "question": question.model_dump()
+        })
+
+async def _save_and_report(
+    session: PracticeSession,
+    reported: int,
+    practice_repo: PracticeRepository,
+    recorder: ProgressRecorder,
+    buffer: Optional[PracticeSessionBuffer]
+) -> int:
+    """
+    Saves the session, then reports each answer after the first `reported` to the
+    recorder, one at a time as the submit-answer endpoint does. Returns the number
+    of answers reported so far; none are reported if the stored session was no
+    longer in progress.
+    """
+    if not await save_practice_progress(session, practice_repo, recorder, buffer):
+        return len(session.answers)
+    for answered in range(reported + 1, len(session.answers) + 1):
+        await recorder.practice_answer_submitted(session.model_copy(update={"answers": session.answers[:answered]}))
+    return len(session.answers)
+
+@router.websocket("/sessions/{session_id}/ws")
+async def practice_session_socket(
+    websocket: WebSocket,
+    session_id: str,
+    practice_repo: PracticeRepository = Depends(get_practice_repository),
+    question_repo: QuestionRepository = Depends(get_question_repository),
+    recorder: ProgressRecorder = Depends(get_progress_recorder)
+):
+    """
+    Run a practice session over one WebSocket connection. The session is loaded
+    once and held in memory while the connection owns it; it is written once
+    when it completes or, with unsaved answers, when the client disconnects.
+    Answers are reported to the progress recorder after that write.
+    
+    Client frames:
+    - {"type": "answer", "question_id": ..., "answer": ...}
+    
+    Server frames:
+    - session: the session on connect
+    - question: the next unanswered question
+    - feedback: the same payload the submit-answer endpoint returns
+    - progress: answered, total and correct counts
+    - summary: the session summary, sent before closing on completion
+    - error: an invalid frame or answer; the connection stays open
+    
+    Sessions that are missing, completed or abandoned are closed with
+    4404, 4409 or 4410 after an error frame.
+    """
+    await websocket.accept()
+    buffer = _session_buffer()
+    try:
+        session = await load_practice_session(session_id, practice_repo, buffer)
+    except tuple(WS_CLOSE_CODES) as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=WS_CLOSE_CODES[type(e)])
+        return
+
+    await websocket.send_json(jsonable_encoder({
+        "type": "session",
+        "data": {
+            "session_id": session.session_id,
+            "topic": session.topic,
+            "mode": session.mode,
+            "question_count": session.question_count,
+            "questions": [q.model_dump() for q in session.questions],
+            "answers": [a.model_dump() for a in session.answers],
+            "status": session.status
+        }
+    }))
+
+    # Answers are reported to the recorder once saved, as in the REST flow
+    reported = len(session.answers)
+    try:
+        await _send_next_question(websocket, session)
+        while True:
+            try:
+                frame = json.loads(await websocket.receive_text())
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Frames must be JSON objects"})
+                continue
+            if not isinstance(frame, dict) or frame.get("type") != "answer":
+                await websocket.send_json({"type": "error", "detail": "Unsupported frame type"})
+                continue
+
+            try:
+                feedback = apply_practice_answer(session, frame.get("question_id"), frame.get("answer"))
+            except PracticeServiceError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            await serve_next_adaptive_question(session, question_repo)
+
+            await websocket.send_json(jsonable_encoder({"type": "feedback", "data": feedback}))
+            await websocket.send_json({
+                "type": "progress",
+                "answered": len(session.answers),
+                "total": session.total_questions,
+                "correct": sum(1 for answer in session.answers if answer.is_correct)
+            })
+
+            if session.status == PracticeSessionStatus.COMPLETED:
+                reported = await _save_and_report(session, reported, practice_repo, recorder, buffer)
+                await websocket.send_json(jsonable_encoder({
+                    "type": "summary", "data": summarize_practice_session(session)
+                }))
+                await websocket.close()
+                return
+            await _send_next_question(websocket, session)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if len(session.answers) > reported:
+            await _save_and_report(session, reported, practice_repo, recorder, buffer)
+
 @router.get("/sessions/{session_id}/summary")
 async def get_session_summary(
     session_id: str,
@@ -184,7 +460,7 @@ async def get_session_summary(
     Get summary statistics for a practice session.
     """
     try:
-        summary = await get_practice_session_summary(session_id, practice_repo)
+        summary = await get_practice_session_summary(session_id, practice_repo, buffer=_session_buffer())
         
         return {
             "status": "success",
@@ -202,10 +478,12 @@ async def get_user_sessions(
     user_id: str,
     status: Optional[str] = Query(None, description="Filter by session status"),
     limit: int = Query(10, ge=1, le=50, description="Number of sessions to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     practice_repo: PracticeRepository = Depends(get_practice_repository)
 ):
     """
-    Get practice sessions for a user.
+    Get practice sessions for a user, newest first.
+    Pass the returned `next_cursor` back to get the following page.
     """
     try:
         from backend.models.practice_session import PracticeSessionStatus
@@ -217,7 +495,9 @@ async def get_user_sessions(
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        sessions = await practice_repo.get_user_sessions(user_id, status_filter, limit)
+        sessions, next_cursor = await list_user_practice_sessions(
+            user_id, practice_repo, status=status_filter, limit=limit, cursor=cursor
+        )
         
         # Format sessions for response
         sessions_data = []
@@ -225,8 +505,10 @@ async def get_user_sessions(
             sessions_data.append({
                 "session_id": session.session_id,
                 "topic": session.topic,
+                "mode": session.mode,
                 "question_count": session.question_count,
                 "status": session.status,
+                "answered_count": session.answered_count,
                 "correct_count": session.correct_count,
                 "created_at": session.created_at.isoformat(),
                 "completed_at": session.completed_at.isoformat() if session.completed_at else None
@@ -235,22 +517,28 @@ async def get_user_sessions(
         return {
             "status": "success",
             "message": "User practice sessions retrieved successfully.",
-            "data": sessions_data
+            "data": sessions_data,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get user sessions: {str(e)}")
 
 @router.get("/users/{user_id}/stats")
 async def get_user_practice_stats(
     user_id: str,
-    practice_repo: PracticeRepository = Depends(get_practice_repository)
+    stats_repo: PracticeStatsRepository = Depends(get_practice_stats_repository)
 ):
     """
-    Get aggregated practice statistics for a user.
+    Get practice statistics for a user: totals, a per-topic breakdown and
+    the last PRACTICE_STATS_WINDOW_DAYS days.
     """
     try:
-        stats = await practice_repo.get_user_stats(user_id)
+        stats = await get_practice_stats(user_id, stats_repo, settings.PRACTICE_STATS_WINDOW_DAYS)
         
         return {
             "status": "success",
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from backend.models.api_responses import MissionResponse
+from backend.services.progress_rollup_service import get_progress_dashboard
+from backend.dependencies import get_progress_rollup_repository
+from backend.repositories.progress_rollup_repository import ProgressRollupRepository
+
+router = APIRouter(
+    prefix="/progress",
+    tags=["Progress"],
+)
+
+
+@router.get("/{user_id}/dashboard", response_model=MissionResponse)
+async def get_user_progress_dashboard(
+    user_id: str,
+    rollup_repo: ProgressRollupRepository = Depends(get_progress_rollup_repository)
+):
+    """
+    Get a user's progress dashboard: answer attempts, accuracy and time spent over
+    the last 7, 30 and 90 days (UTC+7), in total and by skill area, across missions
+    and practice.
+    """
+    try:
+        dashboard = await get_progress_dashboard(user_id, rollup_repo)
+        return MissionResponse(
+            status="success",
+            message="Progress dashboard retrieved successfully.",
+            data=dashboard
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get progress dashboard: {str(e)}")
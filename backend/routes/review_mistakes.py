@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Optional, List
 import logging
 
@@ -8,20 +9,50 @@ from backend.models.api_responses import (
     ReviewMistakesResponse,
     GroupedReviewMistakesResponse
 )
+from backend.models.review_schedule import ReviewScheduleItem, DueReviewsResponse
 from backend.services.review_mistakes_service import ReviewMistakesService
+from backend.services.review_schedule_service import (
+    get_due_reviews,
+    grade_review,
+    ReviewItemNotFoundError,
+    MIN_GRADE,
+    MAX_GRADE,
+)
+from backend.services.cursor_pagination import InvalidCursorError
 from backend.repositories.mission_repository import MissionRepository
-from backend.dependencies import get_database, get_mission_repository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_epoch_repository import ReviewEpochRepository
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.services.review_cache import review_cache
+from backend.config import settings
+from backend.dependencies import (
+    get_database,
+    get_mission_repository,
+    get_mistake_repository,
+    get_review_epoch_repository,
+    get_review_schedule_repository,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/review-mistakes", tags=["review-mistakes"])
 
 
+class GradeReviewRequest(BaseModel):
+    grade: int = Field(..., ge=MIN_GRADE, le=MAX_GRADE, description="Recall quality: 0 (blackout) to 5 (perfect)")
+
+
 def get_review_mistakes_service(
-    mission_repo: MissionRepository = Depends(get_mission_repository)
+    mission_repo: MissionRepository = Depends(get_mission_repository),
+    mistake_repo: MistakeRepository = Depends(get_mistake_repository),
+    epoch_repo: ReviewEpochRepository = Depends(get_review_epoch_repository)
 ) -> ReviewMistakesService:
     """Dependency to get review mistakes service"""
-    return ReviewMistakesService(mission_repo)
+    if settings.REVIEW_MISTAKES_FROM_MISSIONS:
+        mistake_repo = None
+    if not settings.REVIEW_CACHE_ENABLED:
+        return ReviewMistakesService(mission_repo, mistake_repo)
+    return ReviewMistakesService(mission_repo, mistake_repo, cache=review_cache, epoch_repo=epoch_repo)
 
 
 @router.get("/{user_id}", response_model=MissionResponse[ReviewMistakesResponse])
@@ -30,6 +61,7 @@ async def get_review_mistakes(
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     items_per_page: int = Query(20, ge=1, le=50, description="Items per page (max 50)"),
     skill_area: Optional[str] = Query(None, description="Filter by skill area"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides page)"),
     service: ReviewMistakesService = Depends(get_review_mistakes_service)
 ):
     """
@@ -42,7 +74,8 @@ async def get_review_mistakes(
             page=page,
             items_per_page=items_per_page,
             group_by=None,
-            skill_area_filter=skill_area
+            skill_area_filter=skill_area,
+            cursor=cursor
         )
         
         if not isinstance(result, ReviewMistakesResponse):
@@ -61,6 +94,8 @@ async def get_review_mistakes(
             data=result
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching review mistakes: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch review mistakes")
@@ -73,6 +108,7 @@ async def get_grouped_review_mistakes(
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     items_per_page: int = Query(10, ge=1, le=20, description="Groups per page (max 20)"),
     skill_area: Optional[str] = Query(None, description="Filter by skill area"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides page)"),
     service: ReviewMistakesService = Depends(get_review_mistakes_service)
 ):
     """
@@ -85,7 +121,8 @@ async def get_grouped_review_mistakes(
             page=page,
             items_per_page=items_per_page,
             group_by=group_by,
-            skill_area_filter=skill_area
+            skill_area_filter=skill_area,
+            cursor=cursor
         )
         
         if not isinstance(result, GroupedReviewMistakesResponse):
@@ -104,6 +141,8 @@ async def get_grouped_review_mistakes(
             data=result
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching grouped review mistakes: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch grouped review mistakes")
@@ -134,39 +173,15 @@ async def get_available_skill_areas(
 @router.get("/{user_id}/stats", response_model=MissionResponse[dict])
 async def get_review_stats(
     user_id: str,
+    weeks: int = Query(12, ge=1, le=52, description="Weeks of trend data to return"),
     service: ReviewMistakesService = Depends(get_review_mistakes_service)
 ):
     """
-    Get summary statistics about user's mistakes.
+    Get summary statistics about user's mistakes: totals per skill area and
+    difficulty level and a weekly trend.
     """
     try:
-        # Get all mistakes to calculate stats
-        result = await service.get_user_mistakes(
-            user_id=user_id,
-            page=1,
-            items_per_page=1000,  # Large number to get all
-            group_by=None
-        )
-        
-        if not isinstance(result, ReviewMistakesResponse):
-            raise HTTPException(status_code=500, detail="Unexpected response type")
-        
-        # Calculate basic stats
-        total_mistakes = result.total_mistakes
-        skill_areas = list(set(mistake.skill_area for mistake in result.mistakes))
-        
-        # Group by difficulty
-        difficulty_stats = {}
-        for mistake in result.mistakes:
-            level = mistake.difficulty_level
-            difficulty_stats[level] = difficulty_stats.get(level, 0) + 1
-        
-        stats = {
-            "total_mistakes": total_mistakes,
-            "skill_areas_count": len(skill_areas),
-            "skill_areas": skill_areas,
-            "difficulty_breakdown": difficulty_stats
-        }
+        stats = await service.get_review_stats(user_id, weeks=weeks)
         
         return MissionResponse(
             status="success",
@@ -175,4 +190,64 @@ async def get_review_stats(
         
     except Exception as e:
         logger.error(f"Error fetching review stats: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch review stats") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch review stats")
+
+
+@router.get("/{user_id}/due", response_model=MissionResponse[DueReviewsResponse])
+async def get_due_review_items(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=50, description="Items per page (max 50)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    schedule_repo: ReviewScheduleRepository = Depends(get_review_schedule_repository)
+):
+    """
+    Get the user's mistakes that are due for spaced-repetition review,
+    most overdue first.
+    """
+    try:
+        items, next_cursor = await get_due_reviews(user_id, schedule_repo, limit=limit, cursor=cursor)
+
+        if not items:
+            return MissionResponse(
+                status="success",
+                data=DueReviewsResponse(items=[]),
+                message="Nothing to review right now."
+            )
+
+        return MissionResponse(
+            status="success",
+            data=DueReviewsResponse(items=items, next_cursor=next_cursor)
+        )
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching due reviews: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch due reviews")
+
+
+@router.post("/{user_id}/due/{question_id}/grade", response_model=MissionResponse[ReviewScheduleItem])
+async def grade_review_item(
+    user_id: str,
+    question_id: str,
+    request: GradeReviewRequest,
+    schedule_repo: ReviewScheduleRepository = Depends(get_review_schedule_repository)
+):
+    """
+    Grade a review of one scheduled mistake (SM-2 quality 0-5) and
+    return its new schedule.
+    """
+    try:
+        item = await grade_review(user_id, question_id, request.grade, schedule_repo)
+
+        return MissionResponse(
+            status="success",
+            data=item,
+            message=f"Next review on {item.next_review_at.date().isoformat()}."
+        )
+
+    except ReviewItemNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error grading review: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to grade review")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Mistakes Backfill Script
+
+Standalone script to build the materialized `mistakes` collection from existing
+completed/archived missions and completed practice sessions, and schedules every mistake for spaced-repetition
+review. Run this once after
+deploying the mistakes collection; it is safe to re-run.
+
+Usage:
+    python -m backend.scripts.backfill_mistakes
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database import db_manager
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_epoch_repository import ReviewEpochRepository
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.services.mistake_index_service import backfill_mistakes
+
+async def main():
+    """Main backfill execution function."""
+    try:
+        print("=== EdTech Mistakes Backfill Script ===")
+        print("Connecting to database...")
+
+        # Connect to database
+        db_manager.connect_to_database()
+        db = db_manager.get_database()
+
+        if db is None:
+            print("ERROR: Could not connect to database")
+            return 1
+
+        print("Database connected successfully")
+
+        mistake_repo = MistakeRepository(db)
+        await mistake_repo.ensure_indexes()
+        schedule_repo = ReviewScheduleRepository(db)
+        await schedule_repo.ensure_indexes()
+
+        # Run backfill
+        summary = await backfill_mistakes(
+            MissionRepository(db), PracticeRepository(db), mistake_repo, ReviewEpochRepository(db), schedule_repo
+        )
+
+        # Print results summary
+        print("\n=== BACKFILL SUMMARY ===")
+        print(f"Missions processed: {summary['missions_processed']}")
+        print(f"Practice sessions processed: {summary['sessions_processed']}")
+        print(f"Mistakes inserted: {summary['mistakes_inserted']}")
+        print(f"Reviews scheduled: {summary['reviews_scheduled']}")
+        print(f"Errors: {summary['error_count']}")
+
+        return 0 if summary["error_count"] == 0 else 1
+
+    except Exception as e:
+        print(f"CRITICAL ERROR: Backfill failed - {str(e)}")
+        return 1
+
+    finally:
+        # Close database connection
+        db_manager.close_database_connection()
+        print("Database connection closed")
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Practice Stats Rebuild Script
+
+Standalone script to recompute the `practice_user_stats` collection from completed
+practice sessions. Run it once after deploying incremental practice stats, or
+whenever the stats are suspected to have drifted; it is safe to re-run.
+
+Usage:
+    python -m backend.scripts.rebuild_practice_stats
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.config import settings
+from backend.database import db_manager
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.practice_stats_repository import PracticeStatsRepository
+from backend.services.practice_stats_service import rebuild_practice_stats
+
+async def main():
+    """Main rebuild execution function."""
+    try:
+        print("=== EdTech Practice Stats Rebuild Script ===")
+        print("Connecting to database...")
+
+        # Connect to database
+        db_manager.connect_to_database()
+        db = db_manager.get_database()
+
+        if db is None:
+            print("ERROR: Could not connect to database")
+            return 1
+
+        print("Database connected successfully")
+
+        # Run rebuild
+        summary = await rebuild_practice_stats(
+            PracticeRepository(db), PracticeStatsRepository(db), settings.PRACTICE_STATS_WINDOW_DAYS
+        )
+
+        # Print results summary
+        print("\n=== REBUILD SUMMARY ===")
+        print(f"Practice sessions processed: {summary['sessions_processed']}")
+        print(f"Users written: {summary['users_written']}")
+
+        return 0
+
+    except Exception as e:
+        print(f"CRITICAL ERROR: Rebuild failed - {str(e)}")
+        return 1
+
+    finally:
+        # Close database connection
+        db_manager.close_database_connection()
+        print("Database connection closed")
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
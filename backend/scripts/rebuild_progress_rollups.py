@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Progress Rollup Rebuild Script
+
+Standalone script to recompute the `progress_daily_rollups` collection from mission
+answer histories and practice session answers. Run it once after deploying daily
+progress rollups, or whenever they are suspected to have drifted; it is safe to re-run.
+
+Usage:
+    python -m backend.scripts.rebuild_progress_rollups
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database import db_manager
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.progress_rollup_repository import ProgressRollupRepository
+from backend.services.progress_rollup_service import rebuild_progress_rollups
+
+async def main():
+    """Main rebuild execution function."""
+    try:
+        print("=== EdTech Progress Rollup Rebuild Script ===")
+        print("Connecting to database...")
+
+        # Connect to database
+        db_manager.connect_to_database()
+        db = db_manager.get_database()
+
+        if db is None:
+            print("ERROR: Could not connect to database")
+            return 1
+
+        print("Database connected successfully")
+
+        # Run rebuild
+        summary = await rebuild_progress_rollups(
+            MissionRepository(db), PracticeRepository(db), ProgressRollupRepository(db)
+        )
+
+        # Print results summary
+        print("\n=== REBUILD SUMMARY ===")
+        print(f"Missions processed: {summary['missions_processed']}")
+        print(f"Practice sessions processed: {summary['sessions_processed']}")
+        print(f"Rollups written: {summary['rollups_written']}")
+
+        return 0
+
+    except Exception as e:
+        print(f"CRITICAL ERROR: Rebuild failed - {str(e)}")
+        return 1
+
+    finally:
+        # Close database connection
+        db_manager.close_database_connection()
+        print("Database connection closed")
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,166 @@
+"""
+Adaptive Practice
+
+Adaptive practice sessions serve one question at a time. After each answer the
+difficulty steps down one level on a wrong answer and up one level after
+ADAPTIVE_STEP_UP_STREAK correct answers in a row, and the next question comes
+from that (topic, difficulty) bucket, or the nearest level that still has
+questions.
+
+Buckets are precomputed once per question bank version (CandidateIndex). Each
+session walks a bucket in its own random order, offset + n * stride with the
+stride coprime to the bucket size, so drawing the next unserved question is O(1)
+and never repeats a question within the session.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.models.daily_mission import Question
+from backend.models.practice_session import AdaptiveBucketWalk, AdaptiveState, PracticeAnswer, PracticeSession
+from backend.repositories.question_repository import QuestionRepository
+
+ADAPTIVE_STEP_UP_STREAK = 2
+
+
+@dataclass
+class CandidateIndex:
+    """Questions bucketed by (lower-cased topic, difficulty level)."""
+    version: str
+    buckets: Dict[Tuple[str, int], List[Question]]
+    levels: Dict[str, List[int]]
+
+    def topic_levels(self, topic: str) -> List[int]:
+        return self.levels.get(topic.lower(), [])
+
+    def topic_size(self, topic: str) -> int:
+        return sum(len(self.buckets[(topic.lower(), level)]) for level in self.topic_levels(topic))
+
+
+def build_candidate_index(questions: Iterable[Question], version: str = "") -> CandidateIndex:
+    """Buckets the bank in one pass; each bucket is ordered by question id."""
+    buckets: Dict[Tuple[str, int], List[Question]] = {}
+    for question in questions:
+        buckets.setdefault((question.skill_area.lower(), question.difficulty_level), []).append(question)
+    levels: Dict[str, List[int]] = {}
+    for topic, level in buckets:
+        levels.setdefault(topic, []).append(level)
+        buckets[(topic, level)].sort(key=lambda question: question.question_id)
+    return CandidateIndex(
+        version=version,
+        buckets=buckets,
+        levels={topic: sorted(topic_levels) for topic, topic_levels in levels.items()}
+    )
+
+
+class CandidateIndexCache:
+    """The candidate index of the loaded bank, rebuilt when the bank version changes."""
+
+    def __init__(self):
+        self._index: Optional[CandidateIndex] = None
+        self.builds = 0
+
+    async def get_index(self, question_repo: QuestionRepository) -> CandidateIndex:
+        index = self._index
+        version = QuestionRepository.loaded_bank_version()
+        if index is not None and version == index.version:
+            return index
+
+        # Loads the bank if this process has not yet, which sets its version
+        questions = await question_repo.get_all_questions()
+        index = build_candidate_index(questions.values(), QuestionRepository.loaded_bank_version() or "")
+        self._index = index
+        self.builds += 1
+        return index
+
+    def clear(self) -> None:
+        self._index = None
+
+
+def starting_difficulty(levels: Sequence[int]) -> int:
+    """The lower-middle level of the topic."""
+    return levels[(len(levels) - 1) // 2]
+
+
+def next_difficulty(current: int, answers: Sequence[PracticeAnswer], levels: Sequence[int]) -> int:
+    """One level down after a wrong answer, one up after a streak of correct ones."""
+    if not answers or not levels:
+        return current
+    position = min(range(len(levels)), key=lambda i: abs(levels[i] - current))
+    if not answers[-1].is_correct:
+        position = max(position - 1, 0)
+    elif len(answers) >= ADAPTIVE_STEP_UP_STREAK and all(
+        answer.is_correct for answer in answers[-ADAPTIVE_STEP_UP_STREAK:]
+    ):
+        position = min(position + 1, len(levels) - 1)
+    return levels[position]
+
+
+def _new_walk(size: int, rng: random.Random) -> AdaptiveBucketWalk:
+    stride = 1
+    if size > 1:
+        stride = rng.randrange(1, size)
+        while math.gcd(stride, size) != 1:
+            stride = rng.randrange(1, size)
+    return AdaptiveBucketWalk(size=size, offset=rng.randrange(size), stride=stride)
+
+
+def draw_question(
+    session: PracticeSession,
+    index: CandidateIndex,
+    difficulty: int,
+    rng: Optional[random.Random] = None
+) -> Optional[Question]:
+    """
+    Draws the session's next question at `difficulty`, or at the nearest level
+    with questions left. Returns None once every bucket of the topic is used up.
+    """
+    rng = rng or random
+    state = session.adaptive
+    served = {question.question_id for question in session.questions}
+    topic = session.topic.lower()
+    for level in sorted(index.topic_levels(session.topic), key=lambda level: (abs(level - difficulty), level)):
+        bucket = index.buckets[(topic, level)]
+        walk = state.walks.get(str(level))
+        # A reloaded bank may have resized the bucket; `served` still prevents repeats
+        if walk is None or walk.size != len(bucket):
+            walk = _new_walk(len(bucket), rng)
+            state.walks[str(level)] = walk
+        while walk.drawn < walk.size:
+            question = bucket[(walk.offset + walk.drawn * walk.stride) % walk.size]
+            walk.drawn += 1
+            if question.question_id not in served:
+                return question
+    return None
+
+
+def start_adaptive_state(index: CandidateIndex, topic: str) -> AdaptiveState:
+    return AdaptiveState(difficulty=starting_difficulty(index.topic_levels(topic)))
+
+
+def serve_next_question(
+    session: PracticeSession,
+    index: CandidateIndex,
+    rng: Optional[random.Random] = None
+) -> Optional[Question]:
+    """
+    Adjusts the difficulty to the answers so far and appends the next question to
+    the session. If the topic has run out, the session is shortened to the
+    questions already served (completing it) and None is returned.
+    """
+    state = session.adaptive
+    state.difficulty = next_difficulty(state.difficulty, session.answers, index.topic_levels(session.topic))
+    question = draw_question(session, index, state.difficulty, rng)
+    if question is None:
+        session.question_count = len(session.questions)
+        if session.is_complete():
+            session.mark_completed()
+        return None
+    session.questions.append(question)
+    return question
+
+
+# Shared by all requests in this process
+candidate_index = CandidateIndexCache()
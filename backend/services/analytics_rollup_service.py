@@ -0,0 +1,225 @@
+"""
+Analytics Rollup Service
+
+Platform-wide counters for operators (missions generated, completed and archived,
+mission answer attempts, practice sessions and answers per topic, daily active
+users), bucketed per hour and per day in UTC+7 and kept in the analytics
+collections so reading them never touches `missions` or `practice_sessions`.
+
+The rollup job is incremental. Each run reads only documents written after the
+watermark (through the updated_at indexes) and counts the events whose own
+timestamp falls in the run's window (watermark, upto]. A document written again
+later is read again, but its earlier events are outside the new window, so every
+event is counted once. `upto` trails the clock by ANALYTICS_ROLLUP_LAG_SECONDS so
+that events are saved before their window is processed.
+
+Every process schedules the job, so a run first claims the next window with an
+atomic update of the rollup state (see AnalyticsRepository.claim_run); runs that
+find the claim held skip. A claim outlives a crashed run by at most
+ANALYTICS_ROLLUP_LEASE_SECONDS, after which the next run retries the same window.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from backend.config import settings
+from backend.models.daily_mission import MissionStatus
+from backend.models.practice_session import PracticeSessionStatus
+from backend.repositories.analytics_repository import AnalyticsRepository
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.practice_stats_repository import topic_key
+from backend.services.utils import TARGET_TIMEZONE, get_utc7_today_date
+
+GRANULARITIES = ("hour", "day")
+
+# Longest range the admin endpoint returns, per granularity
+MAX_RANGE_DAYS = {"hour": 7, "day": 366}
+
+Buckets = Dict[Tuple[str, str], Dict[str, int]]
+
+
+class AnalyticsError(Exception):
+    """Base exception for analytics issues."""
+    pass
+
+class InvalidAnalyticsRangeError(AnalyticsError):
+    """Raised when the requested granularity or date range is not supported."""
+    pass
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps come back naive UTC; timezone-aware ones are converted."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class RollupWindow:
+    """The (since, upto] interval of event timestamps a run counts."""
+
+    def __init__(self, since: datetime, upto: datetime):
+        self.since = since
+        self.upto = upto
+
+    def contains(self, value: Optional[datetime]) -> bool:
+        value = _as_utc(value)
+        return value is not None and self.since < value <= self.upto
+
+
+def _periods(value: datetime) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    local = _as_utc(value).replace(tzinfo=timezone.utc).astimezone(TARGET_TIMEZONE)
+    return ("hour", local.strftime("%Y-%m-%dT%H")), ("day", local.date().isoformat())
+
+
+def _local_day(value: datetime) -> date:
+    return _as_utc(value).replace(tzinfo=timezone.utc).astimezone(TARGET_TIMEZONE).date()
+
+
+def _count(buckets: Buckets, at: datetime, counter: str, amount: int = 1, topic: Optional[str] = None) -> None:
+    for bucket in _periods(at):
+        counters = buckets.setdefault(bucket, {})
+        counters[counter] = counters.get(counter, 0) + amount
+        if topic is not None:
+            field = f"by_topic.{topic_key(topic)}.{counter}"
+            counters[field] = counters.get(field, 0) + amount
+
+
+def accumulate_mission(
+    buckets: Buckets, active: Set[Tuple[date, str]], mission: Dict[str, Any], window: RollupWindow
+) -> None:
+    """Counts the events of a (projected) mission document that fall in the window."""
+    if window.contains(mission.get("created_at")):
+        _count(buckets, mission["created_at"], "missions_generated")
+    if window.contains(mission.get("completed_at")):
+        _count(buckets, mission["completed_at"], "missions_completed")
+    # Archiving is the last write a mission gets
+    if mission.get("status") == MissionStatus.ARCHIVED.value and window.contains(mission.get("updated_at")):
+        _count(buckets, mission["updated_at"], "missions_archived")
+    for answer in mission.get("answers", []):
+        for attempt in answer.get("attempts_history", []):
+            if window.contains(attempt.get("timestamp")):
+                _count(buckets, attempt["timestamp"], "mission_attempts")
+                active.add((_local_day(attempt["timestamp"]), mission["user_id"]))
+
+
+def accumulate_session(
+    buckets: Buckets, active: Set[Tuple[date, str]], session: Dict[str, Any], window: RollupWindow
+) -> None:
+    """
+    Counts the events of a (projected) practice session document that fall in the
+    window. Answers are counted when the session completes: in-progress answers may
+    sit in the write-behind buffer or an open WebSocket for longer than the lag.
+    """
+    topic = session.get("topic", "")
+    if window.contains(session.get("created_at")):
+        _count(buckets, session["created_at"], "practice_sessions_started", topic=topic)
+        active.add((_local_day(session["created_at"]), session["user_id"]))
+    if session.get("status") == PracticeSessionStatus.COMPLETED.value and window.contains(session.get("completed_at")):
+        _count(buckets, session["completed_at"], "practice_sessions_completed", topic=topic)
+        _count(buckets, session["completed_at"], "practice_questions_answered",
+               amount=session.get("answered_count", 0), topic=topic)
+        active.add((_local_day(session["completed_at"]), session["user_id"]))
+    if session.get("status") == PracticeSessionStatus.ABANDONED.value and window.contains(session.get("abandoned_at")):
+        _count(buckets, session["abandoned_at"], "practice_sessions_abandoned", topic=topic)
+
+
+async def run_analytics_rollup(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    analytics_repo: AnalyticsRepository,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Applies the events since the watermark to the hourly and daily buckets and
+    advances the watermark. The first run starts ANALYTICS_ROLLUP_BACKFILL_DAYS back.
+    A run interrupted after it started applying is retried over the same window.
+    Skipped while another run holds the claim.
+
+    Returns:
+        Run summary with statistics
+    """
+    now = now or datetime.utcnow()
+    owner = uuid.uuid4().hex
+    state = await analytics_repo.claim_run(
+        owner, now - timedelta(seconds=settings.ANALYTICS_ROLLUP_LAG_SECONDS), now,
+        timedelta(seconds=settings.ANALYTICS_ROLLUP_LEASE_SECONDS)
+    )
+    if state is None:
+        return {"skipped": "another run holds the claim"}
+    since = state.get("watermark") or now - timedelta(days=settings.ANALYTICS_ROLLUP_BACKFILL_DAYS)
+    upto = state["pending_upto"]
+    if upto <= since:
+        await analytics_repo.release_run(owner)
+        return {"watermark": since.isoformat(), "missions_read": 0, "sessions_read": 0, "buckets_written": 0}
+
+    window = RollupWindow(since, upto)
+    buckets: Buckets = {}
+    active: Set[Tuple[date, str]] = set()
+
+    missions_read = 0
+    async for mission in mission_repo.iter_missions_updated_since(since):
+        accumulate_mission(buckets, active, mission, window)
+        missions_read += 1
+    sessions_read = 0
+    async for session in practice_repo.iter_sessions_updated_since(since):
+        accumulate_session(buckets, active, session, window)
+        sessions_read += 1
+
+    await analytics_repo.add_active_users(active)
+    buckets_written = await analytics_repo.apply_increments(buckets, upto)
+
+    summary = {
+        "watermark": upto.isoformat(),
+        "missions_read": missions_read,
+        "sessions_read": sessions_read,
+        "buckets_written": buckets_written,
+    }
+    await analytics_repo.finish_run(owner, upto, summary)
+    return summary
+
+
+async def get_platform_analytics(
+    analytics_repo: AnalyticsRepository,
+    granularity: str = "day",
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    The hourly or daily buckets from `start` to `end` (UTC+7 days, inclusive; default
+    the last 7 days). Daily buckets include the number of distinct active users.
+
+    Raises:
+        InvalidAnalyticsRangeError: If the granularity is unknown or the range is reversed or too long
+    """
+    if granularity not in GRANULARITIES:
+        raise InvalidAnalyticsRangeError(f"Granularity must be one of {', '.join(GRANULARITIES)}")
+    end = end or get_utc7_today_date()
+    start = start or end - timedelta(days=6)
+    if start > end:
+        raise InvalidAnalyticsRangeError(f"'from' ({start}) is after 'to' ({end})")
+    if (end - start).days + 1 > MAX_RANGE_DAYS[granularity]:
+        raise InvalidAnalyticsRangeError(
+            f"{granularity.capitalize()} analytics are limited to {MAX_RANGE_DAYS[granularity]} days"
+        )
+
+    if granularity == "hour":
+        buckets = await analytics_repo.get_rollups("hour", f"{start.isoformat()}T00", f"{end.isoformat()}T23")
+    else:
+        buckets = await analytics_repo.get_rollups("day", start.isoformat(), end.isoformat())
+        active_users = await analytics_repo.count_active_users(start, end)
+        for bucket in buckets:
+            bucket["active_users"] = active_users.get(bucket["period"], 0)
+
+    watermark = (await analytics_repo.get_state()).get("watermark")
+    return {
+        "granularity": granularity,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        # Events after the watermark are not counted yet
+        "watermark": watermark.isoformat() if watermark else None,
+        "buckets": buckets,
+    }
@@ -0,0 +1,73 @@
+"""
+Cursor Pagination
+
+Opaque cursor tokens for keyset pagination. A token carries the sort key of the
+last item on the previous page (sort field value plus a unique tie-breaker) and a
+little listing state, so the next page is read straight from the index instead of
+skipping over everything before it.
+"""
+
+import base64
+import binascii
+from typing import Any, Dict, List
+
+from bson import json_util
+from bson.errors import InvalidBSON
+
+# Payload fields
+KEY_FIELD = "k"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token cannot be decoded or does not match the request."""
+    pass
+
+
+def encode_cursor(key: List[Any], **state: Any) -> str:
+    """
+    Encodes a sort key (e.g. [mission_date, _id]) and optional listing state into
+    an opaque, URL-safe token. Datetimes and ObjectIds survive the round trip.
+    """
+    payload = {KEY_FIELD: key, **state}
+    raw = json_util.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, **expected_state: Any) -> Dict[str, Any]:
+    """
+    Decodes a token produced by `encode_cursor`. Any `expected_state` values (such as
+    the active filter) must match what the token was issued for.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or was issued for another listing
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json_util.loads(raw)
+    except (binascii.Error, ValueError, TypeError, InvalidBSON):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if not isinstance(payload, dict) or not isinstance(payload.get(KEY_FIELD), list):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    for name, value in expected_state.items():
+        if payload.get(name) != value:
+            raise InvalidCursorError("Pagination cursor does not match the requested listing")
+
+    return payload
+
+
+def cursor_key(payload: Dict[str, Any], size: int) -> List[Any]:
+    """Returns the sort key from a decoded payload, checking it has `size` parts."""
+    key = payload[KEY_FIELD]
+    if len(key) != size:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return key
+
+
+def cursor_int(payload: Dict[str, Any], name: str) -> int:
+    """Reads a non-negative integer state field from a decoded payload."""
+    value = payload.get(name)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return value
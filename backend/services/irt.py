@@ -0,0 +1,237 @@
+"""
+Item Response Theory
+
+Students have an ability `theta` and questions a difficulty `b` and discrimination
+`a` on the same logit scale: P(correct) = 1 / (1 + exp(-a * (theta - b))). Item
+parameters and abilities are calibrated nightly from all first attempts (see
+irt_calibration.py); between calibrations each first attempt moves the student's
+ability by one Newton step (`ability_step`), applied atomically in the database.
+
+Daily missions are picked near the student's ability from a difficulty-sorted
+index of the bank (ItemBankIndex). Each question is found by bisecting for a
+target difficulty and walking outward to the nearest question that is neither
+already picked nor recently served (at most SELECTION_WINDOW steps), so a pick
+costs O(log n) plus that bounded walk. Questions without a calibration take a
+prior difficulty from their difficulty level. Until a calibration has stored item
+parameters, missions are sampled uniformly instead: level-based difficulties alone
+would steer every new student to the easiest questions.
+"""
+
+import bisect
+import logging
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.config import settings
+from backend.models.daily_mission import Question
+from backend.repositories.irt_repository import IrtRepository
+from backend.repositories.question_repository import QuestionRepository
+from backend.services.item_analysis import ItemAttempt
+from backend.services.question_exposure import ExposureFilter, pick_preferring_unseen
+
+logger = logging.getLogger(__name__)
+
+# Candidates examined per pick before a recently served question is accepted
+SELECTION_WINDOW = 50
+
+
+def probability(theta: float, discrimination: float, difficulty: float) -> float:
+    return 1 / (1 + math.exp(-discrimination * (theta - difficulty)))
+
+
+def prior_difficulty(level: int, levels: Sequence[int]) -> float:
+    """Difficulty of an uncalibrated question: its level, centered on the bank's range of levels."""
+    if not levels:
+        return 0.0
+    return level - (min(levels) + max(levels)) / 2
+
+
+def ability_step(
+    theta: float, precision: float, discrimination: float, difficulty: float, is_correct: bool, max_precision: float
+) -> Tuple[float, float]:
+    """
+    One response's update of an ability estimate with the given precision (inverse
+    variance). Precision is capped at `max_precision` so abilities keep following
+    the student. Mirrors IrtRepository's update pipeline.
+    """
+    p = probability(theta, discrimination, difficulty)
+    information = discrimination * discrimination * p * (1 - p)
+    theta += discrimination * (int(is_correct) - p) / (precision + information)
+    return theta, min(max_precision, precision + information)
+
+
+def target_difficulty(theta: float) -> float:
+    """Difficulty at which a student of ability theta answers correctly with IRT_TARGET_P_CORRECT (a = 1)."""
+    target = settings.IRT_TARGET_P_CORRECT
+    return theta - math.log(target / (1 - target))
+
+
+@dataclass
+class ItemBankIndex:
+    """The bank's questions sorted by difficulty, with their (discrimination, difficulty)."""
+    version: str
+    difficulties: List[float]
+    question_ids: List[str]
+    parameters: Dict[str, Tuple[float, float]]
+    calibrated: bool = False
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def outward(self, difficulty: float) -> Iterator[int]:
+        """Positions in order of distance from `difficulty`, starting from a bisection."""
+        high = bisect.bisect_left(self.difficulties, difficulty)
+        low = high - 1
+        while low >= 0 or high < len(self.difficulties):
+            if high >= len(self.difficulties) or (
+                low >= 0 and difficulty - self.difficulties[low] <= self.difficulties[high] - difficulty
+            ):
+                yield low
+                low -= 1
+            else:
+                yield high
+                high += 1
+
+
+def build_item_bank_index(
+    questions: Dict[str, Question], calibrated: Dict[str, Dict[str, float]], version: str = ""
+) -> ItemBankIndex:
+    """Sorts the bank by calibrated (or prior) difficulty; ties are ordered by question id."""
+    levels = sorted({question.difficulty_level for question in questions.values()})
+    parameters = {}
+    for question_id, question in questions.items():
+        params = calibrated.get(question_id)
+        if params:
+            parameters[question_id] = (params["discrimination"], params["difficulty"])
+        else:
+            parameters[question_id] = (1.0, prior_difficulty(question.difficulty_level, levels))
+    ordered = sorted(parameters, key=lambda question_id: (parameters[question_id][1], question_id))
+    return ItemBankIndex(
+        version=version,
+        difficulties=[parameters[question_id][1] for question_id in ordered],
+        question_ids=ordered,
+        parameters=parameters,
+        calibrated=bool(calibrated),
+    )
+
+
+class ItemBankIndexCache:
+    """
+    The item bank index of the loaded bank and the last calibration. Rebuilt when
+    the bank version changes; `refresh` (run at startup and every
+    IRT_INDEX_REFRESH_SECONDS) also picks up new calibrations.
+    """
+
+    def __init__(self):
+        self._index: Optional[ItemBankIndex] = None
+        self.builds = 0
+
+    def current(self) -> Optional[ItemBankIndex]:
+        """The index as last built, without any I/O."""
+        return self._index
+
+    async def get_index(self, irt_repo: IrtRepository, question_repo: QuestionRepository) -> ItemBankIndex:
+        index = self._index
+        bank_version = QuestionRepository.loaded_bank_version()
+        if index is not None and bank_version is not None and index.version.startswith(f"{bank_version}:"):
+            return index
+        return await self.refresh(irt_repo, question_repo)
+
+    async def refresh(self, irt_repo: IrtRepository, question_repo: QuestionRepository) -> ItemBankIndex:
+        """Rebuilds the index if the bank or the calibration changed since it was built."""
+        # Loads the bank if this process has not yet, which sets its version
+        questions = await question_repo.get_all_questions()
+        state = await irt_repo.get_state()
+        version = f"{QuestionRepository.loaded_bank_version() or ''}:{state.get('version', '')}"
+        index = self._index
+        if index is not None and index.version == version:
+            return index
+        index = build_item_bank_index(questions, await irt_repo.get_item_parameters(), version)
+        self._index = index
+        self.builds += 1
+        return index
+
+    def clear(self) -> None:
+        self._index = None
+
+
+def select_near_ability(
+    index: ItemBankIndex,
+    theta: float,
+    k: int,
+    exposure_filter: Optional[ExposureFilter] = None,
+    rng: Optional[random.Random] = None
+) -> List[str]:
+    """
+    Picks k question ids around the target difficulty for theta, each around its
+    own target drawn with IRT_SELECTION_SPREAD so missions vary from day to day.
+    """
+    rng = rng or random
+    exposure_filter = exposure_filter or ExposureFilter()
+    center = target_difficulty(theta)
+    picked: List[str] = []
+    chosen = set()
+    for _ in range(min(k, len(index))):
+        pick = fallback = None
+        for steps, position in enumerate(index.outward(rng.gauss(center, settings.IRT_SELECTION_SPREAD))):
+            question_id = index.question_ids[position]
+            if question_id in chosen:
+                continue
+            if not exposure_filter.might_have_seen(question_id):
+                pick = question_id
+                break
+            fallback = fallback or question_id
+            if steps >= SELECTION_WINDOW:
+                break
+        # Every candidate in the window was recently served; take the nearest of them
+        pick = pick or fallback
+        picked.append(pick)
+        chosen.add(pick)
+    return picked
+
+
+async def load_ability(user_id: str, irt_repo: IrtRepository) -> float:
+    """The user's ability; the prior mean (0) for new users or if it cannot be read."""
+    try:
+        ability = await irt_repo.get_ability(user_id)
+    except Exception as e:
+        logger.error(f"Failed to load ability for user {user_id}: {e}")
+        return 0.0
+    return ability["theta"] if ability else 0.0
+
+
+async def select_mission_question_ids(
+    user_id: str,
+    k: int,
+    irt_repo: IrtRepository,
+    question_repo: QuestionRepository,
+    exposure_filter: Optional[ExposureFilter] = None
+) -> List[str]:
+    """
+    Picks k question ids near the user's ability, preferring ones not recently
+    served; a uniform sample of the bank while nothing has been calibrated.
+    """
+    index = await item_bank_index.get_index(irt_repo, question_repo)
+    if not index.calibrated:
+        return pick_preferring_unseen(index.question_ids, min(k, len(index)), exposure_filter or ExposureFilter())
+    return select_near_ability(index, await load_ability(user_id, irt_repo), k, exposure_filter)
+
+
+async def record_ability_response(user_id: str, attempt: ItemAttempt, irt_repo: IrtRepository) -> None:
+    """
+    Applies a first attempt to the user's ability. Retries are left out, as in the
+    calibration. Skipped until this process has built its item bank index.
+    """
+    index = item_bank_index.current()
+    if attempt.first_choice is None or index is None or attempt.question_id not in index.parameters:
+        return
+    discrimination, difficulty = index.parameters[attempt.question_id]
+    await irt_repo.record_response(
+        user_id, discrimination, difficulty, attempt.is_correct, settings.IRT_MAX_PRECISION
+    )
+
+
+# Shared by all requests in this process
+item_bank_index = ItemBankIndexCache()
@@ -0,0 +1,192 @@
+"""
+IRT Calibration
+
+Fits the 2PL model (or 1PL with IRT_MODEL="1pl", all discriminations fixed at 1)
+to every first attempt in missions and practice sessions, and stores the item
+parameters and each user's ability (see irt.py for how they are used).
+
+The fit is a joint maximum a posteriori estimate. Abilities have a N(0, 1) prior,
+which also fixes the scale; difficulties a N(prior, 1) prior centered on the
+question's difficulty level, so questions with few responses stay near their
+level; discriminations a N(1, 0.5^2) prior. Each iteration takes one vectorized
+Newton step per parameter block (abilities, then difficulties, then
+discriminations): gradients and curvatures are per-user and per-question sums
+computed with np.bincount over the flat response arrays.
+"""
+
+import asyncio
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import numpy as np
+
+from backend.config import settings
+from backend.models.daily_mission import MissionStatus
+from backend.models.practice_session import PracticeSessionStatus
+from backend.repositories.irt_repository import IrtRepository
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.question_repository import QuestionRepository
+from backend.services.irt import prior_difficulty
+from backend.services.item_analysis_batch import mission_responses, practice_responses
+from backend.services.utils import get_current_time_in_target_timezone
+
+DIFFICULTY_PRIOR_VARIANCE = 1.0
+DISCRIMINATION_PRIOR_VARIANCE = 0.25
+DISCRIMINATION_RANGE = (0.25, 4.0)
+
+# Stop once no parameter moves by more than this (logits)
+TOLERANCE = 1e-4
+
+
+@dataclass
+class IrtFit:
+    theta: np.ndarray
+    precision: np.ndarray
+    difficulty: np.ndarray
+    discrimination: np.ndarray
+    iterations: int
+
+
+def _probability(theta: np.ndarray, discrimination: np.ndarray, difficulty: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-discrimination * (theta - difficulty)))
+
+
+def fit_irt(
+    users: np.ndarray,
+    items: np.ndarray,
+    correct: np.ndarray,
+    n_users: int,
+    prior_difficulties: np.ndarray,
+    two_parameter: bool = True,
+    max_iterations: int = 100
+) -> IrtFit:
+    """
+    Fits abilities for `n_users` users and parameters for len(prior_difficulties)
+    questions to responses given as parallel arrays (user index, question index,
+    correct).
+    """
+    n_items = len(prior_difficulties)
+    y = correct.astype(np.float64)
+    theta = np.zeros(n_users)
+    difficulty = prior_difficulties.astype(np.float64).copy()
+    discrimination = np.ones(n_items)
+
+    def per_user(weights):
+        return np.bincount(users, weights=weights, minlength=n_users)
+
+    def per_item(weights):
+        return np.bincount(items, weights=weights, minlength=n_items)
+
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        a = discrimination[items]
+        p = _probability(theta[users], a, difficulty[items])
+        step = (per_user(a * (y - p)) - theta) / (per_user(a * a * p * (1 - p)) + 1)
+        theta += step
+        change = np.abs(step).max(initial=0)
+
+        p = _probability(theta[users], a, difficulty[items])
+        step = (
+            (-per_item(a * (y - p)) - (difficulty - prior_difficulties) / DIFFICULTY_PRIOR_VARIANCE)
+            / (per_item(a * a * p * (1 - p)) + 1 / DIFFICULTY_PRIOR_VARIANCE)
+        )
+        difficulty += step
+        change = max(change, np.abs(step).max(initial=0))
+
+        if two_parameter:
+            distance = theta[users] - difficulty[items]
+            p = _probability(theta[users], a, difficulty[items])
+            step = (
+                (per_item((y - p) * distance) - (discrimination - 1) / DISCRIMINATION_PRIOR_VARIANCE)
+                / (per_item(p * (1 - p) * distance * distance) + 1 / DISCRIMINATION_PRIOR_VARIANCE)
+            )
+            discrimination = np.clip(discrimination + step, *DISCRIMINATION_RANGE)
+            change = max(change, np.abs(step).max(initial=0))
+
+        if change < TOLERANCE:
+            break
+
+    a = discrimination[items]
+    p = _probability(theta[users], a, difficulty[items])
+    precision = per_user(a * a * p * (1 - p)) + 1
+    return IrtFit(theta, precision, difficulty, discrimination, iterations)
+
+
+async def run_irt_calibration(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    question_repo: QuestionRepository,
+    irt_repo: IrtRepository
+) -> Dict[str, Any]:
+    """
+    Recalibrates every question and user from the first attempts of all started
+    missions and practice sessions and stores the results. Abilities are replaced
+    by the fitted ones; answers submitted while the job runs may be left out until
+    the next calibration.
+
+    Returns:
+        Run summary with statistics
+    """
+    questions = await question_repo.get_all_questions()
+    question_ids = sorted(questions)
+    item_index = {question_id: index for index, question_id in enumerate(question_ids)}
+    levels = sorted({question.difficulty_level for question in questions.values()})
+
+    user_ids: Dict[str, int] = {}
+    users, items, correct = array("l"), array("l"), array("b")
+
+    def add(user_id, responses):
+        user = user_ids.setdefault(user_id, len(user_ids))
+        for item, is_correct, _, _ in responses:
+            users.append(user)
+            items.append(item)
+            correct.append(is_correct)
+
+    async for mission in mission_repo.iter_missions_by_statuses(
+        [MissionStatus.IN_PROGRESS, MissionStatus.COMPLETE, MissionStatus.ARCHIVED]
+    ):
+        add(mission.user_id, mission_responses(mission, item_index, {}))
+    for status in (PracticeSessionStatus.IN_PROGRESS, PracticeSessionStatus.COMPLETED):
+        async for session in practice_repo.iter_sessions_by_status(status):
+            add(session.user_id, practice_responses(session, item_index, {}))
+
+    summary: Dict[str, Any] = {
+        "model": settings.IRT_MODEL,
+        "responses": len(items),
+        "users": len(user_ids),
+        "timestamp": get_current_time_in_target_timezone().isoformat(),
+    }
+    if not items:
+        return {**summary, "questions_calibrated": 0, "iterations": 0}
+
+    users_array, items_array = np.frombuffer(users, dtype=users.typecode), np.frombuffer(items, dtype=items.typecode)
+    prior = np.array([prior_difficulty(questions[question_id].difficulty_level, levels) for question_id in question_ids])
+    # The fit is CPU-bound; keep the event loop serving requests meanwhile
+    fit = await asyncio.to_thread(
+        fit_irt, users_array, items_array, np.frombuffer(correct, dtype=np.int8), len(user_ids), prior,
+        settings.IRT_MODEL == "2pl", settings.IRT_CALIBRATION_ITERATIONS
+    )
+
+    item_responses = np.bincount(items_array, minlength=len(question_ids))
+    user_responses = np.bincount(users_array, minlength=len(user_ids))
+    calibrated_items = {
+        question_ids[index]: {
+            "difficulty": round(float(fit.difficulty[index]), 4),
+            "discrimination": round(float(fit.discrimination[index]), 4),
+            "responses": int(item_responses[index]),
+        }
+        for index in np.flatnonzero(item_responses)
+    }
+    abilities = {
+        user_id: {
+            "theta": round(float(fit.theta[user]), 4),
+            "precision": round(float(min(fit.precision[user], settings.IRT_MAX_PRECISION)), 4),
+            "responses": int(user_responses[user]),
+        }
+        for user_id, user in user_ids.items()
+    }
+    summary.update(questions_calibrated=len(calibrated_items), iterations=fit.iterations)
+    await irt_repo.write_calibration(calibrated_items, abilities, summary)
+    return summary
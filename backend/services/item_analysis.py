@@ -0,0 +1,111 @@
+"""
+Item Analysis
+
+Per-question answer statistics. Live counters (ItemStatsRepository) are updated
+on every mission attempt and practice answer; the batch job in
+item_analysis_batch.py recomputes the full statistics (including discrimination)
+from all stored attempts and writes them onto the question documents.
+
+First attempts are what the statistics describe: the p-value is the share of
+first attempts that were correct and distractor rates are the share of first
+attempts choosing each option. Average attempts to correct only covers users who
+eventually answered correctly.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from backend.config import settings
+from backend.models.daily_mission import DailyMissionDocument
+from backend.models.practice_session import PracticeSession
+from backend.repositories.item_stats_repository import ItemStatsRepository
+from backend.repositories.question_repository import QuestionRepository
+
+
+@dataclass
+class ItemAttempt:
+    """One answer attempt as counted by the live item counters."""
+    question_id: str
+    is_correct: bool
+    # The chosen option, when this was the user's first attempt at the question
+    first_choice: Optional[str] = None
+    # The attempt number, when this attempt answered the question correctly
+    attempts_to_correct: int = 0
+
+
+def latest_mission_item_attempt(mission: DailyMissionDocument) -> Optional[ItemAttempt]:
+    """The most recent attempt made in the mission."""
+    latest = None
+    for answer in mission.answers:
+        if answer.attempts_history and (latest is None or answer.attempts_history[-1].timestamp > latest[1].timestamp):
+            latest = (answer, answer.attempts_history[-1])
+    if latest is None:
+        return None
+    answer, attempt = latest
+    number = len(answer.attempts_history)
+    return ItemAttempt(
+        question_id=answer.question_id,
+        is_correct=attempt.is_correct,
+        first_choice=str(attempt.answer) if number == 1 else None,
+        attempts_to_correct=number if attempt.is_correct else 0,
+    )
+
+
+def latest_practice_item_attempt(session: PracticeSession) -> Optional[ItemAttempt]:
+    """The most recent practice answer; practice questions take a single attempt."""
+    if not session.answers:
+        return None
+    answer = session.answers[-1]
+    return ItemAttempt(
+        question_id=answer.question_id,
+        is_correct=answer.is_correct,
+        first_choice=str(answer.user_answer),
+        attempts_to_correct=1 if answer.is_correct else 0,
+    )
+
+
+async def record_item_attempt(
+    attempt: ItemAttempt, item_repo: ItemStatsRepository, rng: Optional[random.Random] = None
+) -> None:
+    """Adds the attempt to a random shard of the question's live counters."""
+    shard = (rng or random).randrange(settings.ITEM_STATS_COUNTER_SHARDS)
+    await item_repo.record_attempt(
+        attempt.question_id, shard, attempt.is_correct, attempt.first_choice, attempt.attempts_to_correct
+    )
+
+
+def summarize_counters(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Live statistics from summed counters."""
+    first_attempts = counters.get("first_attempts", 0)
+    solved = counters.get("solved", 0)
+    return {
+        "attempts": counters.get("attempts", 0),
+        "first_attempts": first_attempts,
+        "p_value": counters.get("first_correct", 0) / first_attempts if first_attempts else None,
+        "choice_rates": {
+            choice: count / first_attempts
+            for choice, count in sorted(counters.get("first_choices", {}).items())
+        } if first_attempts else {},
+        "average_attempts_to_correct": counters.get("attempts_to_correct", 0) / solved if solved else None,
+    }
+
+
+async def get_item_statistics(
+    question_id: str, item_repo: ItemStatsRepository, question_repo: QuestionRepository
+) -> Optional[Dict[str, Any]]:
+    """
+    A question's current difficulty level, its live statistics and the latest batch
+    results (including discrimination and a suggested difficulty level).
+    Returns None for an unknown question.
+    """
+    question = await question_repo.get_question_by_id(question_id)
+    if question is None:
+        return None
+    return {
+        "question_id": question_id,
+        "difficulty_level": question.difficulty_level,
+        "correct_answer_id": question.correct_answer_id,
+        "live": summarize_counters(await item_repo.get_counters(question_id)),
+        "batch": await question_repo.get_item_stats(question_id),
+    }
@@ -0,0 +1,309 @@
+"""
+Item Analysis Batch
+
+Recomputes every question's item statistics from stored attempts and writes them
+onto the question documents (`item_stats`). Each completed or archived mission and
+each completed practice session is one test; a response is a user's first attempt
+at one of its questions.
+
+- p-value: share of first attempts that were correct
+- discrimination: point-biserial correlation between a first attempt being correct
+  and the share of the test's other questions answered correctly on the first
+  attempt (tests with a single answered question are left out of it)
+- choice rates: share of first attempts choosing each option (distractor rates)
+- average attempts to correct: over the mission answers eventually answered correctly
+
+Responses are streamed into NumPy chunks of ITEM_ANALYSIS_CHUNK_ROWS. Each chunk is
+reduced to per-question sums with vectorized bincount passes in a process pool, so
+the job only holds a few chunks and the running sums; the statistics are derived
+from the summed columns at the end. The pool's workers are spawned rather than
+forked: the job runs inside the API process, whose Motor and scheduler threads
+hold locks a forked child would inherit.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.config import settings
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Question
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.question_repository import QuestionRepository
+from backend.services.utils import get_current_time_in_target_timezone
+
+# Columns of the per-question sums, followed by one first-choice count per option.
+# x is a first attempt being correct, y the rest score; the scored sums only cover
+# responses from tests with more than one answered question.
+(
+    RESPONSES, CORRECT, SCORED, SCORED_CORRECT, REST, REST_SQUARED, CORRECT_REST, SOLVED, ATTEMPTS_TO_CORRECT
+) = range(9)
+SUM_COLUMNS = 9
+
+# (question index, first attempt correct, first choice code or -1, attempts to correct or 0)
+Response = Tuple[int, bool, int, int]
+
+
+def mission_responses(
+    mission: DailyMissionDocument, item_index: Dict[str, int], choice_codes: Dict[str, int]
+) -> List[Response]:
+    """The first-attempt responses of a mission, for questions still in the bank."""
+    responses = []
+    for answer in mission.answers:
+        if not answer.attempts_history or answer.question_id not in item_index:
+            continue
+        first = answer.attempts_history[0]
+        solved_at = next(
+            (number for number, attempt in enumerate(answer.attempts_history, start=1) if attempt.is_correct), 0
+        )
+        responses.append((
+            item_index[answer.question_id], first.is_correct, choice_codes.get(str(first.answer), -1), solved_at
+        ))
+    return responses
+
+
+def practice_responses(
+    session: PracticeSession, item_index: Dict[str, int], choice_codes: Dict[str, int]
+) -> List[Response]:
+    """The responses of a practice session; practice questions take a single attempt."""
+    return [
+        (
+            item_index[answer.question_id],
+            answer.is_correct,
+            choice_codes.get(str(answer.user_answer), -1),
+            1 if answer.is_correct else 0,
+        )
+        for answer in session.answers if answer.question_id in item_index
+    ]
+
+
+class ResponseBuffer:
+    """Collects responses test by test, with their rest scores, until a chunk is full."""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self.items: List[int] = []
+        self.correct: List[bool] = []
+        self.rest: List[float] = []
+        self.scored: List[bool] = []
+        self.choices: List[int] = []
+        self.attempts: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add_test(self, responses: Sequence[Response]) -> None:
+        total = sum(correct for _, correct, _, _ in responses)
+        others = len(responses) - 1
+        for item, correct, choice, attempts in responses:
+            self.items.append(item)
+            self.correct.append(correct)
+            self.rest.append((total - correct) / others if others else 0.0)
+            self.scored.append(others > 0)
+            self.choices.append(choice)
+            self.attempts.append(attempts)
+
+    def take(self) -> Tuple[np.ndarray, ...]:
+        """The buffered responses as arrays; the buffer is emptied."""
+        arrays = (
+            np.array(self.items, dtype=np.int64),
+            np.array(self.correct, dtype=np.float64),
+            np.array(self.rest, dtype=np.float64),
+            np.array(self.scored, dtype=np.float64),
+            np.array(self.choices, dtype=np.int64),
+            np.array(self.attempts, dtype=np.float64),
+        )
+        self._reset()
+        return arrays
+
+
+def item_sums(
+    items: np.ndarray,
+    correct: np.ndarray,
+    rest: np.ndarray,
+    scored: np.ndarray,
+    choices: np.ndarray,
+    attempts: np.ndarray,
+    n_items: int,
+    n_choices: int
+) -> np.ndarray:
+    """
+    Per-question sums of one chunk of responses: an (n_items, SUM_COLUMNS + n_choices)
+    array. Runs in a worker process, so it only takes and returns arrays.
+    """
+    def per_item(weights: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.bincount(items, weights=weights, minlength=n_items)
+
+    scored_rest = rest * scored
+    sums = np.column_stack([
+        per_item(),
+        per_item(correct),
+        per_item(scored),
+        per_item(correct * scored),
+        per_item(scored_rest),
+        per_item(scored_rest * rest),
+        per_item(correct * scored_rest),
+        per_item((attempts > 0).astype(np.float64)),
+        per_item(attempts),
+    ])
+    known = choices >= 0
+    choice_counts = np.bincount(
+        items[known] * n_choices + choices[known], minlength=n_items * n_choices
+    ).reshape(n_items, n_choices)
+    return np.hstack([sums, choice_counts])
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _value(x: float) -> Optional[float]:
+    return None if np.isnan(x) else round(float(x), 4)
+
+
+def suggest_difficulty_levels(
+    p_values: np.ndarray, current_levels: np.ndarray, responses: np.ndarray, min_responses: int
+) -> np.ndarray:
+    """
+    Suggested difficulty levels (0 where there are too few responses): questions with
+    at least `min_responses` are ranked from highest to lowest p-value and given
+    their own current levels in ascending order, so the suggestion keeps the bank's
+    mix of levels and only reorders questions within it.
+    """
+    suggested = np.zeros(len(p_values), dtype=np.int64)
+    calibrated = np.flatnonzero(responses >= min_responses)
+    easiest_first = calibrated[np.argsort(-p_values[calibrated], kind="stable")]
+    suggested[easiest_first] = np.sort(current_levels[calibrated])
+    return suggested
+
+
+def item_statistics(
+    sums: np.ndarray,
+    question_ids: Sequence[str],
+    choice_ids: Sequence[str],
+    questions: Dict[str, Question],
+    min_responses: int,
+    computed_at: Optional[datetime] = None
+) -> Dict[str, Dict[str, Any]]:
+    """The `item_stats` of every question with at least one response, from summed columns."""
+    responses = sums[:, RESPONSES]
+    p_values = _ratio(sums[:, CORRECT], responses)
+
+    n = sums[:, SCORED]
+    sx, sy = sums[:, SCORED_CORRECT], sums[:, REST]
+    covariance = n * sums[:, CORRECT_REST] - sx * sy
+    # x is 0 or 1, so its sum of squares is its sum
+    spread = (n * sx - sx ** 2) * (n * sums[:, REST_SQUARED] - sy ** 2)
+    discrimination = _ratio(covariance, np.sqrt(np.clip(spread, 0, None)))
+
+    average_attempts = _ratio(sums[:, ATTEMPTS_TO_CORRECT], sums[:, SOLVED])
+    choice_rates = _ratio(sums[:, SUM_COLUMNS:], responses[:, None])
+    choice_columns = {choice_id: column for column, choice_id in enumerate(choice_ids)}
+
+    levels = np.array([questions[question_id].difficulty_level for question_id in question_ids], dtype=np.int64)
+    suggested = suggest_difficulty_levels(p_values, levels, responses, min_responses)
+
+    computed_at = computed_at or datetime.utcnow()
+    stats = {}
+    for index in np.flatnonzero(responses > 0):
+        question = questions[question_ids[index]]
+        stats[question.question_id] = {
+            "responses": int(responses[index]),
+            "p_value": _value(p_values[index]),
+            "discrimination": _value(discrimination[index]),
+            "choice_rates": {
+                choice.id: _value(choice_rates[index, choice_columns[choice.id]]) for choice in question.choices
+            },
+            "average_attempts_to_correct": _value(average_attempts[index]),
+            "suggested_difficulty_level": int(suggested[index]) or None,
+            "computed_at": computed_at,
+        }
+    return stats
+
+
+async def run_item_analysis(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    question_repo: QuestionRepository,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    Recomputes and stores the item statistics of every question. Chunks go to
+    `executor`, or to a process pool of ITEM_ANALYSIS_WORKERS (reduced inline when
+    that is 1 or less); at most two chunks per worker are in flight at a time.
+
+    Returns:
+        Run summary with statistics
+    """
+    questions = await question_repo.get_all_questions()
+    question_ids = sorted(questions)
+    item_index = {question_id: index for index, question_id in enumerate(question_ids)}
+    choice_ids = sorted({choice.id for question in questions.values() for choice in question.choices})
+    choice_codes = {choice_id: code for code, choice_id in enumerate(choice_ids)}
+    n_items, n_choices = len(question_ids), len(choice_ids)
+
+    workers = max(settings.ITEM_ANALYSIS_WORKERS, 1)
+    pool = executor or (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 1 else None
+    )
+    loop = asyncio.get_running_loop()
+    sums = np.zeros((n_items, SUM_COLUMNS + n_choices))
+    in_flight: List[asyncio.Future] = []
+    buffer = ResponseBuffer()
+    total_responses = 0
+
+    async def flush():
+        nonlocal sums, total_responses
+        total_responses += len(buffer)
+        arrays = buffer.take()
+        if pool is None:
+            sums += item_sums(*arrays, n_items, n_choices)
+            return
+        in_flight.append(loop.run_in_executor(pool, item_sums, *arrays, n_items, n_choices))
+        if len(in_flight) >= 2 * workers:
+            sums += await in_flight.pop(0)
+
+    try:
+        missions_processed = 0
+        async for mission in mission_repo.iter_missions_by_statuses([MissionStatus.COMPLETE, MissionStatus.ARCHIVED]):
+            buffer.add_test(mission_responses(mission, item_index, choice_codes))
+            missions_processed += 1
+            if len(buffer) >= settings.ITEM_ANALYSIS_CHUNK_ROWS:
+                await flush()
+
+        sessions_processed = 0
+        async for session in practice_repo.iter_sessions_by_status(PracticeSessionStatus.COMPLETED):
+            buffer.add_test(practice_responses(session, item_index, choice_codes))
+            sessions_processed += 1
+            if len(buffer) >= settings.ITEM_ANALYSIS_CHUNK_ROWS:
+                await flush()
+
+        if len(buffer):
+            await flush()
+        for partial in await asyncio.gather(*in_flight):
+            sums += partial
+    finally:
+        if pool is not None and executor is None:
+            pool.shutdown()
+
+    stats = item_statistics(sums, question_ids, choice_ids, questions, settings.ITEM_ANALYSIS_MIN_RESPONSES)
+    questions_updated = await question_repo.write_item_stats(stats)
+
+    return {
+        "missions_processed": missions_processed,
+        "sessions_processed": sessions_processed,
+        "responses": total_responses,
+        "questions_analyzed": len(stats),
+        "questions_updated": questions_updated,
+        "timestamp": get_current_time_in_target_timezone().isoformat()
+    }
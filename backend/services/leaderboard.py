@@ -0,0 +1,263 @@
+"""
+Leaderboard
+
+Weekly leaderboard ranked by missions completed, then accuracy over mission and
+practice answers. Completions add their deltas to the user's score document for
+the week (LeaderboardRepository); reads never aggregate over missions.
+
+Each process keeps the scores of this week and last week in a RankIndex: sort keys
+in a sorted list with a user -> score map, so top-N is a slice and "my rank" a
+binary search. Ranks are competition ranks (equal scores share a rank). Earlier
+weeks are not held in memory; they are answered with indexed top-N and count
+queries on every request. Boards are loaded from the period index on startup; every LEADERBOARD_REFRESH_SECONDS
+each process reads only the scores written since its last refresh (through the
+period_updated_at index), which picks up completions handled by other processes.
+
+Scaling limits: an update moves list entries (`insort` and `del` are O(n) memory
+moves), and each process holds every score of this and last week in memory.
+Both are cheap up to a few hundred thousand participants per week; beyond that
+the board should move to a shared sorted store.
+"""
+
+import logging
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.models.daily_mission import DailyMissionDocument
+from backend.models.practice_session import PracticeSession
+from backend.repositories.leaderboard_repository import LeaderboardRepository, period_key
+from backend.repositories.streak_repository import week_start
+from backend.services.utils import get_utc7_date, get_utc7_today_date
+
+logger = logging.getLogger(__name__)
+
+SortKey = Tuple[int, float, str]
+
+# Refreshes re-read this much before the newest score seen, so writes that
+# committed late (or on a server with a slightly different clock) are not missed
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def _sort_key(score: Dict[str, Any]) -> SortKey:
+    return (-score.get("missions_completed", 0), -score.get("accuracy", 0), score["user_id"])
+
+
+class LeaderboardError(Exception):
+    """Base exception for leaderboard issues."""
+    pass
+
+class InvalidLeaderboardWeekError(LeaderboardError):
+    """Raised when the requested week has not started yet."""
+    pass
+
+
+def _entry(rank: int, score: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rank": rank,
+        "user_id": score["user_id"],
+        "missions_completed": score.get("missions_completed", 0),
+        "accuracy": round(score.get("accuracy", 0), 4),
+        "questions": score.get("questions", 0),
+        "correct": score.get("correct", 0),
+    }
+
+
+class RankIndex:
+    """The scores of one period in leaderboard order."""
+
+    def __init__(self, scores: Iterable[Dict[str, Any]] = ()):
+        self._scores: Dict[str, Dict[str, Any]] = {score["user_id"]: score for score in scores}
+        self._keys: List[SortKey] = sorted(_sort_key(score) for score in self._scores.values())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(self, score: Dict[str, Any]) -> None:
+        """Adds or replaces a user's score."""
+        previous = self._scores.get(score["user_id"])
+        if previous is not None:
+            del self._keys[bisect_left(self._keys, _sort_key(previous))]
+        self._scores[score["user_id"]] = score
+        insort(self._keys, _sort_key(score))
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based rank of the user, or None if they have no score this period."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        missions, accuracy, _ = _sort_key(score)
+        # "" sorts before every user id, so this finds the first of the tied scores
+        return bisect_left(self._keys, (missions, accuracy, "")) + 1
+
+    def entry(self, user_id: str) -> Optional[Dict[str, Any]]:
+        rank = self.rank(user_id)
+        return _entry(rank, self._scores[user_id]) if rank is not None else None
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        return _top_entries([self._scores[key[2]] for key in self._keys[:limit]])
+
+
+def _top_entries(scores: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Entries for the first scores of a period, given in leaderboard order."""
+    entries = []
+    rank = 0
+    previous = None
+    for position, score in enumerate(scores):
+        key = _sort_key(score)[:2]
+        if key != previous:
+            rank = position + 1
+            previous = key
+        entries.append(_entry(rank, score))
+    return entries
+
+
+class LeaderboardCache:
+    """Rank indexes of the periods this process serves."""
+
+    def __init__(self):
+        self._boards: Dict[str, RankIndex] = {}
+        # Newest updated_at read from the database per period
+        self._watermarks: Dict[str, datetime] = {}
+        self.loads = 0
+
+    def _track(self, period: str, scores: Iterable[Dict[str, Any]]) -> None:
+        for score in scores:
+            updated_at = score.get("updated_at")
+            if updated_at is not None and (period not in self._watermarks or updated_at > self._watermarks[period]):
+                self._watermarks[period] = updated_at
+
+    async def _load(self, period: str, leaderboard_repo: LeaderboardRepository) -> RankIndex:
+        scores = await leaderboard_repo.get_period_scores(period)
+        self._watermarks.pop(period, None)
+        self._track(period, scores)
+        self.loads += 1
+        return RankIndex(scores)
+
+    async def get_board(self, period: str, leaderboard_repo: LeaderboardRepository) -> RankIndex:
+        board = self._boards.get(period)
+        if board is None:
+            board = await self._load(period, leaderboard_repo)
+            self._boards[period] = board
+        return board
+
+    async def refresh(self, periods: Iterable[str], leaderboard_repo: LeaderboardRepository) -> None:
+        """
+        Brings the given periods up to date, loading those not held yet and reading
+        only scores written since the last refresh for the others. Every other
+        board is dropped.
+        """
+        boards = {}
+        for period in periods:
+            board = self._boards.get(period)
+            watermark = self._watermarks.get(period)
+            if board is None or watermark is None:
+                board = await self._load(period, leaderboard_repo)
+            else:
+                scores = await leaderboard_repo.get_period_scores_updated_since(period, watermark - REFRESH_OVERLAP)
+                for score in scores:
+                    board.upsert(score)
+                self._track(period, scores)
+            boards[period] = board
+        self._boards = boards
+        self._watermarks = {period: at for period, at in self._watermarks.items() if period in boards}
+
+    def apply(self, period: str, score: Dict[str, Any]) -> None:
+        """
+        Applies an updated score to the period's board if it is loaded. The
+        watermark only follows refreshes, so other processes' writes are still read.
+        """
+        board = self._boards.get(period)
+        if board is not None:
+            board.upsert(score)
+
+    def clear(self) -> None:
+        self._boards = {}
+        self._watermarks = {}
+
+
+def current_periods(today: Optional[date] = None) -> List[str]:
+    """This week and last week, the periods kept loaded."""
+    monday = week_start(today or get_utc7_today_date())
+    return [period_key(monday), period_key(monday - timedelta(days=7))]
+
+
+async def _apply_delta(
+    period: str, user_id: str, source: str, missions: int, questions: int, correct: int,
+    leaderboard_repo: LeaderboardRepository
+) -> None:
+    score = await leaderboard_repo.apply_delta(period, user_id, source, missions, questions, correct)
+    if score:
+        leaderboard.apply(period, score)
+
+
+async def record_mission_score(mission: DailyMissionDocument, leaderboard_repo: LeaderboardRepository) -> None:
+    """Counts a completed mission towards the week of its mission date, once per mission."""
+    correct = sum(1 for answer in mission.answers if answer.is_correct)
+    await _apply_delta(
+        period_key(week_start(mission.date)), mission.user_id, f"mission:{mission.date.isoformat()}",
+        1, len(mission.questions), correct, leaderboard_repo
+    )
+
+
+async def record_practice_score(session: PracticeSession, leaderboard_repo: LeaderboardRepository) -> None:
+    """Adds a completed practice session's answers to the accuracy of its completion week (UTC+7)."""
+    day = get_utc7_date(session.completed_at or session.created_at)
+    await _apply_delta(
+        period_key(week_start(day)), session.user_id, f"practice:{session.session_id}",
+        0, session.question_count, session.correct_count, leaderboard_repo
+    )
+
+
+async def get_leaderboard(
+    leaderboard_repo: LeaderboardRepository,
+    limit: int = 10,
+    user_id: Optional[str] = None,
+    week: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    The top `limit` entries of the week containing `week` (default: this week, UTC+7),
+    plus the given user's own entry, which is None if they have no score that week.
+    This week and last week come from the in-memory boards; earlier weeks are read
+    from the database and not cached.
+
+    Raises:
+        InvalidLeaderboardWeekError: If the week has not started yet
+    """
+    today = get_utc7_today_date()
+    period = period_key(week_start(week or today))
+    periods = current_periods(today)
+    if period > periods[0]:
+        raise InvalidLeaderboardWeekError(f"The week of {week} has not started yet")
+    if period not in periods:
+        return await _get_past_leaderboard(period, leaderboard_repo, limit, user_id)
+
+    board = await leaderboard.get_board(period, leaderboard_repo)
+    return {
+        "period": period,
+        "participants": len(board),
+        "top": board.top(limit),
+        "me": board.entry(user_id) if user_id else None,
+    }
+
+
+async def _get_past_leaderboard(
+    period: str, leaderboard_repo: LeaderboardRepository, limit: int, user_id: Optional[str]
+) -> Dict[str, Any]:
+    """A week outside the in-memory boards, from the period_missions_accuracy index."""
+    me = None
+    if user_id:
+        score = await leaderboard_repo.get_score(period, user_id)
+        if score:
+            missions, accuracy, _ = _sort_key(score)
+            me = _entry(await leaderboard_repo.count_scores_above(period, -missions, -accuracy) + 1, score)
+    return {
+        "period": period,
+        "participants": await leaderboard_repo.count_scores(period),
+        "top": _top_entries(await leaderboard_repo.get_top_scores(period, limit)),
+        "me": me,
+    }
+
+
+# Shared by all requests in this process
+leaderboard = LeaderboardCache()
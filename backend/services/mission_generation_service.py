@@ -6,7 +6,11 @@ import asyncio
 from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Question
 from backend.repositories.question_repository import QuestionRepository
 from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+from backend.repositories.irt_repository import IrtRepository
 from backend.services.utils import TARGET_TIMEZONE, get_current_time_in_target_timezone
+from backend.services.question_exposure import load_exposure_filter, pick_preferring_unseen, record_exposures
+from backend.services.irt import select_mission_question_ids
 
 # Custom Exceptions
 class MissionGenerationError(Exception):
@@ -25,11 +29,16 @@ async def generate_daily_mission(
     user_id: str,
     mission_repo: MissionRepository,
     question_repo: QuestionRepository,
-    current_datetime_utc: Optional[datetime] = None
+    current_datetime_utc: Optional[datetime] = None,
+    exposure_repo: Optional[QuestionExposureRepository] = None,
+    irt_repo: Optional[IrtRepository] = None
 ) -> DailyMissionDocument:
     """
     Generates and persists a new daily mission with 5 questions per user per day.
     Uses DailyMissionDocument and embeds full Question objects.
+    With an exposure repository, questions the user was recently served are
+    avoided unless the pool has too few others. With an IRT repository, questions
+    are picked near the user's estimated ability instead of uniformly.
     """
     all_questions = await question_repo.get_all_questions()
     if not all_questions:
@@ -46,7 +55,13 @@ async def generate_daily_mission(
     if len(all_questions) < 5:
         raise NoQuestionsAvailableError(f"Insufficient questions available ({len(all_questions)} found) to generate a mission of 5 questions.")
 
-    question_ids = random.sample(list(all_questions.keys()), 5)
+    exposure_filter = await load_exposure_filter(user_id, exposure_repo) if exposure_repo is not None else None
+    if irt_repo is not None:
+        question_ids = await select_mission_question_ids(user_id, 5, irt_repo, question_repo, exposure_filter)
+    elif exposure_filter is None:
+        question_ids = random.sample(list(all_questions.keys()), 5)
+    else:
+        question_ids = pick_preferring_unseen(list(all_questions.keys()), 5, exposure_filter)
     
     mission_questions_tasks = [question_repo.get_question_by_id(qid) for qid in question_ids]
     mission_questions_results = await asyncio.gather(*mission_questions_tasks)
@@ -66,5 +81,7 @@ async def generate_daily_mission(
     )
 
     await mission_repo.save_mission(new_mission)
+    if exposure_repo is not None:
+        await record_exposures(user_id, [q.question_id for q in mission_questions], exposure_repo)
     print(f"Successfully generated and saved new mission for user '{user_id}' for date {mission_date}.")
     return new_mission 
\ No newline at end of file
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from backend.repositories.mission_repository import MissionRepository
+from backend.services.utils import get_utc7_today_date
+
+# Default and maximum length of a history range, in days
+DEFAULT_HISTORY_DAYS = 30
+MAX_HISTORY_DAYS = 366
+
+# A day's mission can still change until the daily reset has archived it the
+# following morning, so only ranges ending before yesterday are settled.
+SETTLED_CACHE_CONTROL = "private, max-age=604800, immutable"
+OPEN_CACHE_CONTROL = "private, max-age=60"
+
+class MissionHistoryError(Exception):
+    """Base exception for mission history issues."""
+    pass
+
+class InvalidHistoryRangeError(MissionHistoryError):
+    """Raised when the requested date range is reversed or too long."""
+    pass
+
+def resolve_history_range(
+    start: Optional[date], end: Optional[date], today: Optional[date] = None
+) -> Tuple[date, date]:
+    """
+    Fills in a missing end (today, UTC+7) and start (DEFAULT_HISTORY_DAYS before end)
+    and validates the range.
+    """
+    today = today or get_utc7_today_date()
+    end = end or today
+    start = start or end - timedelta(days=DEFAULT_HISTORY_DAYS - 1)
+    if start > end:
+        raise InvalidHistoryRangeError(f"'from' ({start}) is after 'to' ({end})")
+    if (end - start).days + 1 > MAX_HISTORY_DAYS:
+        raise InvalidHistoryRangeError(f"History ranges are limited to {MAX_HISTORY_DAYS} days")
+    return start, end
+
+def history_cache_control(end: date, today: Optional[date] = None) -> str:
+    """Cache-Control for a history range: long-lived once every day in it is settled."""
+    today = today or get_utc7_today_date()
+    return SETTLED_CACHE_CONTROL if end < today - timedelta(days=1) else OPEN_CACHE_CONTROL
+
+async def get_mission_history(
+    user_id: str,
+    mission_repo: MissionRepository,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    A user's missions between `start` and `end` (inclusive) as a compact per-day
+    array for the streak calendar: date, status, correct and total questions.
+    Days without a mission are left out.
+
+    Raises:
+        InvalidHistoryRangeError: If the range is reversed or longer than MAX_HISTORY_DAYS
+    """
+    start, end = resolve_history_range(start, end, today)
+    summaries = await mission_repo.get_mission_summaries(user_id, start, end)
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "days": [
+            {
+                "date": summary.date.isoformat(),
+                "status": summary.status,
+                "correct": summary.correct_count,
+                "total": summary.question_count,
+            }
+            for summary in summaries
+        ],
+    }
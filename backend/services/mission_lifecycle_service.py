@@ -1,15 +1,21 @@
 import asyncio
+from typing import Optional
 
 from backend.models.daily_mission import MissionStatus
 from backend.repositories.mission_repository import MissionRepository
+from backend.services.progress_recorder import ProgressRecorder
 from backend.services.utils import (
     get_utc7_today_date,
     get_current_time_in_target_timezone,
 )
 
-async def archive_past_incomplete_missions(mission_repo: MissionRepository) -> int:
+async def archive_past_incomplete_missions(
+    mission_repo: MissionRepository,
+    recorder: Optional[ProgressRecorder] = None
+) -> int:
     """
     Archives missions from previous days (UTC+7) that are not yet complete or already archived.
+    When a recorder is given it is told about the archived missions.
     Returns the count of archived missions.
     """
     archived_count = 0
@@ -28,5 +34,8 @@ async def archive_past_incomplete_missions(mission_repo: MissionRepository) -> i
     
     await asyncio.gather(*update_tasks)
     
+    if recorder:
+        await recorder.missions_archived(missions_to_update)
+    
     archived_count = len(missions_to_update)
     return archived_count 
\ No newline at end of file
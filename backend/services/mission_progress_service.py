@@ -2,6 +2,7 @@ from typing import List, Dict, Any, Optional
 
 from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Answer, AnswerAttempt
 from backend.repositories.mission_repository import MissionRepository
+from backend.services.progress_recorder import ProgressRecorder
 from backend.services.utils import (
     get_utc7_today_date,
     get_current_time_in_target_timezone,
@@ -40,6 +41,22 @@ def _is_mission_complete(mission: DailyMissionDocument) -> bool:
     # Condition 2: Every answer must be marked as complete and feedback shown.
     return all(answer.is_complete and answer.feedback_shown for answer in mission.answers)
 
+async def _notify_if_completed(
+    mission: DailyMissionDocument,
+    was_complete: bool,
+    recorder: Optional[ProgressRecorder],
+) -> None:
+    """
+    Notifies the progress recorder when a save moved the mission to COMPLETE.
+    """
+    if recorder and not was_complete and mission.status == MissionStatus.COMPLETE:
+        await recorder.mission_completed(mission)
+
+def _stamp_completion(mission: DailyMissionDocument, was_complete: bool) -> None:
+    """Records when the mission transitioned to COMPLETE; call after setting updated_at."""
+    if not was_complete and mission.status == MissionStatus.COMPLETE:
+        mission.completed_at = mission.updated_at
+
 def _find_or_create_answer(answers: List[Answer], question_id: str) -> Answer:
     """
     Finds existing answer or creates a new one for the given question.
@@ -65,6 +82,7 @@ async def submit_answer_with_feedback(
     question_id: str,
     user_answer: Any,
     mission_repo: MissionRepository,
+    recorder: Optional[ProgressRecorder] = None,
 ) -> Dict[str, Any]:
     """
     Submits an answer and returns feedback information.
@@ -74,6 +92,7 @@ async def submit_answer_with_feedback(
         question_id: The question ID being answered
         user_answer: The user's answer
         mission_repo: The mission repository
+        recorder: Optional recorder notified of the answer and when the mission completes
     
     Returns:
         Dictionary containing feedback information
@@ -124,13 +143,18 @@ async def submit_answer_with_feedback(
         answer.is_complete = True
     
     # Update mission status
+    was_complete = mission_doc.status == MissionStatus.COMPLETE
     if _is_mission_complete(mission_doc):
         mission_doc.status = MissionStatus.COMPLETE
     else:
         mission_doc.status = MissionStatus.IN_PROGRESS
     
     mission_doc.updated_at = get_current_time_in_target_timezone()
+    _stamp_completion(mission_doc, was_complete)
     await mission_repo.save_mission(mission_doc)
+    if recorder:
+        await recorder.mission_answer_submitted(mission_doc)
+    await _notify_if_completed(mission_doc, was_complete, recorder)
     
     return {
         "already_complete": False,
@@ -147,6 +171,7 @@ async def mark_feedback_shown(
     user_id: str,
     question_id: str,
     mission_repo: MissionRepository,
+    recorder: Optional[ProgressRecorder] = None,
 ) -> Optional[DailyMissionDocument]:
     """
     Marks feedback as shown for a specific question.
@@ -155,6 +180,7 @@ async def mark_feedback_shown(
         user_id: The user ID
         question_id: The question ID
         mission_repo: The mission repository
+        recorder: Optional recorder notified when the mission completes
     
     Returns:
         Updated mission document or None if not found
@@ -172,11 +198,14 @@ async def mark_feedback_shown(
             break
     
     # Update mission status
+    was_complete = mission_doc.status == MissionStatus.COMPLETE
     if _is_mission_complete(mission_doc):
         mission_doc.status = MissionStatus.COMPLETE
     
     mission_doc.updated_at = get_current_time_in_target_timezone()
+    _stamp_completion(mission_doc, was_complete)
     await mission_repo.save_mission(mission_doc)
+    await _notify_if_completed(mission_doc, was_complete, recorder)
     
     return mission_doc
 
@@ -235,6 +264,7 @@ async def update_mission_progress(
     current_question_index: int,
     answers: List[Dict[str, Any]],
     mission_repo: MissionRepository,
+    recorder: Optional[ProgressRecorder] = None,
 ) -> Optional[DailyMissionDocument]:
     """
     Updates the progress of today's mission for a given user.
@@ -265,12 +295,15 @@ async def update_mission_progress(
     mission_doc.answers = new_answers
     
     # Automatically update the status to COMPLETED if all conditions are met
+    was_complete = mission_doc.status == MissionStatus.COMPLETE
     if _is_mission_complete(mission_doc):
         mission_doc.status = MissionStatus.COMPLETE
     else:
         mission_doc.status = MissionStatus.IN_PROGRESS
         
     mission_doc.updated_at = get_current_time_in_target_timezone()
+    _stamp_completion(mission_doc, was_complete)
 
     await mission_repo.save_mission(mission_doc)
+    await _notify_if_completed(mission_doc, was_complete, recorder)
     return mission_doc 
\ No newline at end of file
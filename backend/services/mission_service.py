@@ -7,10 +7,14 @@ import random
 from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Question
 from backend.repositories.question_repository import QuestionRepository
 from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+from backend.repositories.irt_repository import IrtRepository
 
 # Import from new utility and service files
 from .utils import get_utc7_today_date
 from .mission_generation_service import generate_daily_mission, MissionGenerationError
+from .question_exposure import load_exposure_filter, pick_preferring_unseen, record_exposures
+from .irt import select_mission_question_ids
 
 # Define the target timezone: UTC+7
 TARGET_TIMEZONE = timezone(timedelta(hours=7))
@@ -75,11 +79,15 @@ def get_current_time_in_target_timezone() -> datetime:
 async def get_todays_mission_for_user(
     user_id: str,
     mission_repo: MissionRepository,
-    question_repo: QuestionRepository
+    question_repo: QuestionRepository,
+    exposure_repo: Optional[QuestionExposureRepository] = None,
+    irt_repo: Optional[IrtRepository] = None
 ) -> Optional[DailyMissionDocument]:
     """
     Retrieves today's (UTC+7) mission for a given user.
-    If no mission exists, it attempts to generate one.
+    If no mission exists, it attempts to generate one, avoiding recently
+    served questions when an exposure repository is given and picking questions
+    near the user's ability when an IRT repository is given.
     """
     today_target_tz_date = get_utc7_today_date()
     
@@ -90,7 +98,9 @@ async def get_todays_mission_for_user(
             mission_doc = await generate_daily_mission(
                 user_id=user_id,
                 mission_repo=mission_repo,
-                question_repo=question_repo
+                question_repo=question_repo,
+                exposure_repo=exposure_repo,
+                irt_repo=irt_repo
             )
         except MissionGenerationError:
             # Let it return None, the route will handle the 404 response.
@@ -129,11 +139,16 @@ async def generate_daily_mission(
     user_id: str,
     mission_repo: MissionRepository,
     question_repo: QuestionRepository,
-    current_datetime_utc: Optional[datetime] = None
+    current_datetime_utc: Optional[datetime] = None,
+    exposure_repo: Optional[QuestionExposureRepository] = None,
+    irt_repo: Optional[IrtRepository] = None
 ) -> DailyMissionDocument:
     """
     Generates and persists a new daily mission with 5 questions per user per day.
     Uses DailyMissionDocument and embeds full Question objects.
+    With an exposure repository, questions the user was recently served are
+    avoided unless the pool has too few others. With an IRT repository, questions
+    are picked near the user's estimated ability instead of uniformly.
     """
     all_questions = await question_repo.get_all_questions()
     if not all_questions:
@@ -153,8 +168,14 @@ async def generate_daily_mission(
     if len(all_questions) < 5:
         raise NoQuestionsAvailableError(f"Insufficient questions available ({len(all_questions)} found) to generate a mission of 5 questions.")
 
-    # Select 5 random question_ids
-    question_ids = random.sample(list(all_questions.keys()), 5)
+    # Select 5 question_ids
+    exposure_filter = await load_exposure_filter(user_id, exposure_repo) if exposure_repo is not None else None
+    if irt_repo is not None:
+        question_ids = await select_mission_question_ids(user_id, 5, irt_repo, question_repo, exposure_filter)
+    elif exposure_filter is None:
+        question_ids = random.sample(list(all_questions.keys()), 5)
+    else:
+        question_ids = pick_preferring_unseen(list(all_questions.keys()), 5, exposure_filter)
     
     # Fetch full question objects from the repository using the selected IDs
     mission_questions_tasks = [question_repo.get_question_by_id(qid) for qid in question_ids]
@@ -179,6 +200,8 @@ async def generate_daily_mission(
 
     # Persist the new mission
     await mission_repo.save_mission(new_mission)
+    if exposure_repo is not None:
+        await record_exposures(user_id, [q.question_id for q in mission_questions], exposure_repo)
     print(f"Successfully generated and saved new mission for user '{user_id}' for date {mission_date}.")
     return new_mission
 
@@ -0,0 +1,202 @@
+"""
+Mistake Index Service
+
+Builds review items from missions and practice sessions and keeps the materialized
+`mistakes` collection in step with them, including a backfill for existing data.
+"""
+
+from datetime import timezone
+from typing import Any, Dict, List, Optional, Set
+
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus, ChoiceOption
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.models.api_responses import ReviewMistakeItem
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_epoch_repository import ReviewEpochRepository
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.services.review_schedule_service import schedule_mistakes
+from backend.services.utils import get_utc7_date, get_current_time_in_target_timezone
+
+MISSION_SOURCE = "mission"
+PRACTICE_SOURCE = "practice"
+
+
+def get_choice_text(choices: List[ChoiceOption], choice_id: str) -> str:
+    """Get choice text by ID"""
+    for choice in choices:
+        if choice.id == choice_id:
+            return choice.text
+    return "Unknown"
+
+
+def _choices_payload(choices: List[ChoiceOption]) -> List[Dict[str, str]]:
+    return [{"id": choice.id, "text": choice.text} for choice in choices]
+
+
+def mission_mistake_items(mission: DailyMissionDocument) -> List[ReviewMistakeItem]:
+    """Extract incorrect answers from a single mission as review items"""
+    mistakes = []
+
+    # Create lookup for questions by ID
+    questions_by_id = {q.question_id: q for q in mission.questions}
+
+    for answer in mission.answers:
+        # Only include incorrect answers
+        if answer.is_correct or not answer.current_answer:
+            continue
+        question = questions_by_id.get(answer.question_id)
+        if not question:
+            continue
+
+        mistakes.append(ReviewMistakeItem(
+            question_id=question.question_id,
+            question_text=question.question_text,
+            skill_area=question.skill_area,
+            difficulty_level=question.difficulty_level,
+            choices=_choices_payload(question.choices),
+            user_answer_id=str(answer.current_answer),
+            user_answer_text=get_choice_text(question.choices, answer.current_answer),
+            correct_answer_id=question.correct_answer_id,
+            correct_answer_text=get_choice_text(question.choices, question.correct_answer_id),
+            explanation=question.feedback_th,
+            mission_date=mission.date,
+            mission_completion_date=mission.updated_at,
+            attempt_count=answer.attempt_count,
+            source=MISSION_SOURCE
+        ))
+
+    return mistakes
+
+
+def practice_mistake_items(session: PracticeSession) -> List[ReviewMistakeItem]:
+    """
+    Extract incorrect answers from a completed practice session as review items.
+    Practice has no retries, so each mistake counts as one attempt; the session's
+    completion day (UTC+7) stands in for the mission date.
+    """
+    completed_at = session.completed_at or session.created_at
+    if completed_at.tzinfo is None:
+        completed_at = completed_at.replace(tzinfo=timezone.utc)
+    practice_date = get_utc7_date(completed_at)
+
+    questions_by_id = {q.question_id: q for q in session.questions}
+    mistakes = []
+
+    for answer in session.answers:
+        if answer.is_correct or answer.user_answer in (None, ""):
+            continue
+        question = questions_by_id.get(answer.question_id)
+        if not question:
+            continue
+
+        mistakes.append(ReviewMistakeItem(
+            question_id=question.question_id,
+            question_text=question.question_text,
+            skill_area=question.skill_area,
+            difficulty_level=question.difficulty_level,
+            choices=_choices_payload(question.choices),
+            user_answer_id=str(answer.user_answer),
+            user_answer_text=get_choice_text(question.choices, str(answer.user_answer)),
+            correct_answer_id=question.correct_answer_id,
+            correct_answer_text=get_choice_text(question.choices, question.correct_answer_id),
+            explanation=question.feedback_th,
+            mission_date=practice_date,
+            mission_completion_date=completed_at,
+            attempt_count=1,
+            source=PRACTICE_SOURCE
+        ))
+
+    return mistakes
+
+
+async def record_mission_mistakes(mission: DailyMissionDocument, mistake_repo: MistakeRepository) -> int:
+    """Writes a completed or archived mission's mistakes to the mistakes collection."""
+    return await mistake_repo.record_mistakes(
+        mission.user_id, MISSION_SOURCE, mission.date.isoformat(), mission_mistake_items(mission)
+    )
+
+
+async def record_practice_mistakes(session: PracticeSession, mistake_repo: MistakeRepository) -> int:
+    """Writes a completed practice session's mistakes to the mistakes collection."""
+    return await mistake_repo.record_mistakes(
+        session.user_id, PRACTICE_SOURCE, session.session_id, practice_mistake_items(session)
+    )
+
+
+async def backfill_mistakes(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    mistake_repo: MistakeRepository,
+    epoch_repo: Optional[ReviewEpochRepository] = None,
+    schedule_repo: Optional[ReviewScheduleRepository] = None
+) -> Dict[str, Any]:
+    """
+    Builds the mistakes collection from existing completed/archived missions and
+    completed practice sessions. Safe to re-run: mistakes are upserted by source.
+    When `epoch_repo` is given, the review epochs of users who got new mistakes are
+    bumped so cached review results are recomputed. When `schedule_repo` is given,
+    every mistake is added to the review schedule (already scheduled questions keep
+    their review state).
+
+    Returns:
+        Backfill summary with statistics
+    """
+    missions_processed = 0
+    sessions_processed = 0
+    mistakes_inserted = 0
+    reviews_scheduled = 0
+    error_count = 0
+    touched_users: Set[str] = set()
+
+    print("Starting mistakes backfill...")
+
+    async for mission in mission_repo.iter_missions_by_statuses([MissionStatus.COMPLETE, MissionStatus.ARCHIVED]):
+        missions_processed += 1
+        try:
+            inserted = await record_mission_mistakes(mission, mistake_repo)
+            mistakes_inserted += inserted
+            if inserted:
+                touched_users.add(mission.user_id)
+            if schedule_repo:
+                reviews_scheduled += await schedule_mistakes(
+                    mission.user_id, mission_mistake_items(mission), schedule_repo
+                )
+        except Exception as e:
+            error_count += 1
+            print(f"Error backfilling mission for user {mission.user_id} date {mission.date}: {str(e)}")
+
+    async for session in practice_repo.iter_sessions_by_status(PracticeSessionStatus.COMPLETED):
+        sessions_processed += 1
+        try:
+            inserted = await record_practice_mistakes(session, mistake_repo)
+            mistakes_inserted += inserted
+            if inserted:
+                touched_users.add(session.user_id)
+            if schedule_repo:
+                reviews_scheduled += await schedule_mistakes(
+                    session.user_id, practice_mistake_items(session), schedule_repo
+                )
+        except Exception as e:
+            error_count += 1
+            print(f"Error backfilling practice session {session.session_id}: {str(e)}")
+
+    if epoch_repo and touched_users:
+        try:
+            await epoch_repo.bump_epochs(touched_users)
+        except Exception as e:
+            error_count += 1
+            print(f"Error bumping review epochs: {str(e)}")
+
+    summary = {
+        "missions_processed": missions_processed,
+        "sessions_processed": sessions_processed,
+        "mistakes_inserted": mistakes_inserted,
+        "reviews_scheduled": reviews_scheduled,
+        "error_count": error_count,
+        "timestamp": get_current_time_in_target_timezone().isoformat()
+    }
+
+    print(f"Mistakes backfill completed: {summary}")
+    return summary
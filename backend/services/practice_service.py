@@ -1,11 +1,20 @@
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+import heapq
 import random
 
-from backend.models.practice_session import PracticeSession, PracticeAnswer, PracticeSessionStatus
+from backend.models.practice_session import PracticeSession, PracticeAnswer, PracticeSessionStatus, PracticeMode, PracticeSessionSummary
 from backend.models.daily_mission import Question
 from backend.repositories.practice_repository import PracticeRepository
 from backend.repositories.question_repository import QuestionRepository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+from backend.services.utils import get_utc7_today_date
+from backend.services.progress_recorder import ProgressRecorder
+from backend.services.cursor_pagination import encode_cursor, decode_cursor, cursor_key
+from backend.services.question_exposure import load_exposure_filter, pick_preferring_unseen, record_exposures
+from backend.services.practice_session_buffer import PracticeSessionBuffer
+from backend.services.adaptive_practice import candidate_index, draw_question, serve_next_question, start_adaptive_state
 
 # Custom Exceptions
 class PracticeServiceError(Exception):
@@ -24,12 +33,35 @@ class SessionAlreadyCompletedError(PracticeServiceError):
     """Raised when trying to modify a completed session."""
     pass
 
+class SessionAbandonedError(PracticeServiceError):
+    """Raised when trying to modify a session that was abandoned for inactivity."""
+    pass
+
+# Mistakes practice: a mistake's weight halves every MISTAKE_HALF_LIFE_DAYS days and
+# grows with the attempts it took; only the user's most recent mistakes are sampled.
+MISTAKE_HALF_LIFE_DAYS = 14
+MISTAKE_SAMPLE_WINDOW = 500
+MISTAKES_TOPIC = "Mixed"
+
+def _mistake_weight(summary: Dict[str, Any], today) -> float:
+    """Sampling weight of a previously missed question: recency decay x attempts."""
+    age_days = max((today - summary["last_mistake_date"].date()).days, 0)
+    return 0.5 ** (age_days / MISTAKE_HALF_LIFE_DAYS) * max(summary["attempt_count"], 1)
+
+def _weighted_sample(weights: Dict[str, float], k: int, rng: random.Random) -> List[str]:
+    """
+    Picks k distinct keys with probability proportional to weight, without replacement
+    (Efraimidis-Spirakis: keep the k largest u^(1/w) for uniform u).
+    """
+    return heapq.nlargest(k, weights, key=lambda key: rng.random() ** (1 / weights[key]))
+
 async def create_practice_session(
     user_id: str,
     topic: str,
     question_count: int,
     question_repo: QuestionRepository,
-    practice_repo: PracticeRepository
+    practice_repo: PracticeRepository,
+    exposure_repo: Optional[QuestionExposureRepository] = None
 ) -> PracticeSession:
     """
     Creates a new practice session with questions from the specified topic.
@@ -40,6 +72,8 @@ async def create_practice_session(
         question_count: Number of questions to include
         question_repo: Question repository
         practice_repo: Practice repository
+        exposure_repo: Optional exposure repository; when given, questions the user
+            was recently served are only picked if the topic runs out of others
     
     Returns:
         Created practice session
@@ -59,8 +93,17 @@ async def create_practice_session(
             f"but {question_count} were requested"
         )
     
-    # Get random questions for the topic
-    questions = await question_repo.get_questions_by_topic(topic, question_count)
+    # Get random questions for the topic, preferring ones the user hasn't seen recently
+    if exposure_repo is None:
+        questions = await question_repo.get_questions_by_topic(topic, question_count)
+    else:
+        exposure_filter = await load_exposure_filter(user_id, exposure_repo)
+        questions = pick_preferring_unseen(
+            await question_repo.get_questions_by_topic(topic),
+            question_count,
+            exposure_filter,
+            question_id=lambda question: question.question_id
+        )
     
     if len(questions) < question_count:
         raise InsufficientQuestionsError(
@@ -78,11 +121,131 @@ async def create_practice_session(
     # Save to database
     await practice_repo.create_session(practice_session)
     
+    if exposure_repo is not None:
+        await record_exposures(user_id, [q.question_id for q in questions], exposure_repo)
+    
+    return practice_session
+
+async def create_mistakes_practice_session(
+    user_id: str,
+    question_count: int,
+    question_repo: QuestionRepository,
+    practice_repo: PracticeRepository,
+    mistake_repo: MistakeRepository,
+    skill_area: Optional[str] = None,
+    rng: Optional[random.Random] = None
+) -> PracticeSession:
+    """
+    Creates a practice session from questions the user previously answered incorrectly,
+    sampled with a preference for recent mistakes and ones that took more attempts.
+    
+    Args:
+        user_id: The user ID
+        question_count: Maximum number of questions to include
+        question_repo: Question repository
+        practice_repo: Practice repository
+        mistake_repo: Mistake repository
+        skill_area: Optional skill area to restrict the mistakes to
+        rng: Optional random source (for reproducible sampling)
+    
+    Returns:
+        Created practice session, with fewer questions if the user has fewer mistakes
+        
+    Raises:
+        InsufficientQuestionsError: If the user has no mistakes to practice
+    """
+    if question_count < 1 or question_count > 20:
+        raise PracticeServiceError("Question count must be between 1 and 20")
+    
+    summaries = await mistake_repo.summarize_questions(user_id, skill_area, window=MISTAKE_SAMPLE_WINDOW)
+    
+    # Questions that have since left the bank cannot be practiced
+    today = get_utc7_today_date()
+    candidates: Dict[str, Question] = {}
+    weights: Dict[str, float] = {}
+    for summary in summaries:
+        question = await question_repo.get_question_by_id(summary["question_id"])
+        if question:
+            candidates[question.question_id] = question
+            weights[question.question_id] = _mistake_weight(summary, today)
+    
+    if not candidates:
+        scope = f" in '{skill_area}'" if skill_area else ""
+        raise InsufficientQuestionsError(f"No mistakes{scope} to practice yet")
+    
+    selected = _weighted_sample(weights, question_count, rng or random.Random())
+    questions = [candidates[question_id] for question_id in selected]
+    
+    practice_session = PracticeSession(
+        user_id=user_id,
+        topic=skill_area or MISTAKES_TOPIC,
+        mode=PracticeMode.MISTAKES,
+        question_count=len(questions),
+        questions=questions
+    )
+    
+    await practice_repo.create_session(practice_session)
+    
+    return practice_session
+
+async def create_adaptive_practice_session(
+    user_id: str,
+    topic: str,
+    question_count: int,
+    question_repo: QuestionRepository,
+    practice_repo: PracticeRepository,
+    rng: Optional[random.Random] = None
+) -> PracticeSession:
+    """
+    Creates an adaptive practice session: questions are served one at a time,
+    each from the difficulty level that follows the user's answers so far
+    (see backend/services/adaptive_practice.py).
+    
+    Args:
+        user_id: The user ID
+        topic: The topic/skill_area to practice
+        question_count: Number of questions the session will have
+        question_repo: Question repository
+        practice_repo: Practice repository
+        rng: Optional random source (for reproducible sampling)
+    
+    Returns:
+        Created practice session holding its first question
+        
+    Raises:
+        InsufficientQuestionsError: If not enough questions available for the topic
+    """
+    if question_count < 1 or question_count > 20:
+        raise PracticeServiceError("Question count must be between 1 and 20")
+    
+    index = await candidate_index.get_index(question_repo)
+    topic_question_count = index.topic_size(topic)
+    if topic_question_count < question_count:
+        raise InsufficientQuestionsError(
+            f"Topic '{topic}' only has {topic_question_count} questions, "
+            f"but {question_count} were requested"
+        )
+    
+    practice_session = PracticeSession(
+        user_id=user_id,
+        topic=topic,
+        mode=PracticeMode.ADAPTIVE,
+        question_count=question_count,
+        questions=[],
+        adaptive=start_adaptive_state(index, topic)
+    )
+    practice_session.questions.append(
+        draw_question(practice_session, index, practice_session.adaptive.difficulty, rng)
+    )
+    
+    await practice_repo.create_session(practice_session)
+    
     return practice_session
 
 async def get_practice_session(
     session_id: str,
-    practice_repo: PracticeRepository
+    practice_repo: PracticeRepository,
+    buffer: Optional[PracticeSessionBuffer] = None
 ) -> PracticeSession:
     """
     Retrieves a practice session by ID.
@@ -90,6 +253,7 @@ async def get_practice_session(
     Args:
         session_id: The session ID
         practice_repo: Practice repository
+        buffer: Optional write-behind buffer holding answers not yet flushed
     
     Returns:
         Practice session
@@ -97,43 +261,48 @@ async def get_practice_session(
     Raises:
         SessionNotFoundError: If session is not found
     """
-    session = await practice_repo.find_session(session_id)
+    session = (buffer and buffer.peek(session_id)) or await practice_repo.find_session(session_id)
     if not session:
         raise SessionNotFoundError(f"Practice session '{session_id}' not found")
     
     return session
 
-async def submit_practice_answer(
+async def load_practice_session(
     session_id: str,
-    question_id: str,
-    user_answer: Any,
-    practice_repo: PracticeRepository
-) -> Dict[str, Any]:
+    practice_repo: PracticeRepository,
+    buffer: Optional[PracticeSessionBuffer] = None
+) -> PracticeSession:
     """
-    Submits an answer for a practice question and returns feedback.
+    Loads a practice session that can still take answers.
     
-    Args:
-        session_id: The session ID
-        question_id: The question ID
-        user_answer: The user's answer
-        practice_repo: Practice repository
-    
-    Returns:
-        Dictionary containing feedback information
-        
     Raises:
         SessionNotFoundError: If session is not found
         SessionAlreadyCompletedError: If session is already completed
-        PracticeServiceError: If question is not found in session
+        SessionAbandonedError: If session was abandoned for inactivity
     """
-    # Get session
-    session = await practice_repo.find_session(session_id)
+    if buffer is None:
+        session = await practice_repo.find_session(session_id)
+    else:
+        session = await buffer.load(session_id, practice_repo)
     if not session:
         raise SessionNotFoundError(f"Practice session '{session_id}' not found")
     
     if session.status == PracticeSessionStatus.COMPLETED:
         raise SessionAlreadyCompletedError("Cannot submit answer to completed session")
     
+    if session.status == PracticeSessionStatus.ABANDONED:
+        raise SessionAbandonedError("Practice session was abandoned after inactivity; start a new one")
+    
+    return session
+
+def apply_practice_answer(session: PracticeSession, question_id: str, user_answer: Any) -> Dict[str, Any]:
+    """
+    Records an answer on the in-memory session (completing it after the last
+    question) and returns the feedback. Nothing is persisted.
+    
+    Raises:
+        PracticeServiceError: If question is not found in session
+    """
     # Find the question
     question = None
     for q in session.questions:
@@ -164,23 +333,17 @@ async def submit_practice_answer(
     # Check answer correctness
     is_correct = _is_answer_correct(user_answer, question.correct_answer_id)
     
-    # Create answer record
-    practice_answer = PracticeAnswer(
+    # Add answer to session
+    session.answers.append(PracticeAnswer(
         question_id=question_id,
         user_answer=user_answer,
         is_correct=is_correct
-    )
-    
-    # Add answer to session
-    session.answers.append(practice_answer)
+    ))
     
     # Check if session is complete
     if session.is_complete():
         session.mark_completed()
     
-    # Update session in database
-    await practice_repo.update_session(session)
-    
     return {
         "already_answered": False,
         "is_correct": is_correct,
@@ -190,13 +353,145 @@ async def submit_practice_answer(
         "session_complete": session.status == PracticeSessionStatus.COMPLETED,
         "progress": {
             "answered": len(session.answers),
-            "total": len(session.questions)
+            "total": session.total_questions
         }
     }
 
+async def serve_next_adaptive_question(
+    session: PracticeSession,
+    question_repo: QuestionRepository
+) -> Optional[Question]:
+    """
+    For an unfinished adaptive session whose served questions are all answered,
+    appends the next question (O(1) from the cached candidate index) and returns it.
+    """
+    if session.mode != PracticeMode.ADAPTIVE or session.status == PracticeSessionStatus.COMPLETED:
+        return None
+    if len(session.answers) < len(session.questions):
+        return None
+    return serve_next_question(session, await candidate_index.get_index(question_repo))
+
+async def save_practice_progress(
+    session: PracticeSession,
+    practice_repo: PracticeRepository,
+    recorder: Optional[ProgressRecorder] = None,
+    buffer: Optional[PracticeSessionBuffer] = None
+) -> bool:
+    """
+    Persists answers applied to a session. Unfinished sessions go to the
+    write-behind buffer when one is given; completion is always written through
+    and reported to the recorder if this write completed the session.
+
+    Returns False when the stored session was no longer in progress (completed by
+    another request or compacted as abandoned), in which case nothing was written.
+    """
+    if buffer is not None and session.status != PracticeSessionStatus.COMPLETED:
+        await buffer.stage(session, practice_repo)
+        return True
+
+    saved = await practice_repo.update_session(session) is not None
+    if buffer is not None:
+        buffer.discard(session.session_id)
+    if saved and recorder and session.status == PracticeSessionStatus.COMPLETED:
+        await recorder.practice_session_completed(session)
+    return saved
+
+async def submit_practice_answer(
+    session_id: str,
+    question_id: str,
+    user_answer: Any,
+    practice_repo: PracticeRepository,
+    recorder: Optional[ProgressRecorder] = None,
+    buffer: Optional[PracticeSessionBuffer] = None,
+    question_repo: Optional[QuestionRepository] = None
+) -> Dict[str, Any]:
+    """
+    Submits an answer for a practice question and returns feedback.
+    
+    Args:
+        session_id: The session ID
+        question_id: The question ID
+        user_answer: The user's answer
+        practice_repo: Practice repository
+        recorder: Optional recorder notified of the answer and when the session completes
+        buffer: Optional write-behind buffer; answers to an unfinished session are
+            kept in memory and written back later, completion is written through
+        question_repo: Question repository, required for adaptive sessions
+    
+    Returns:
+        Dictionary containing feedback information; for adaptive sessions it
+        includes the next question
+        
+    Raises:
+        SessionNotFoundError: If session is not found
+        SessionAlreadyCompletedError: If session is already completed
+        SessionAbandonedError: If session was abandoned for inactivity
+        PracticeServiceError: If question is not found in session
+    """
+    session = await load_practice_session(session_id, practice_repo, buffer)
+    
+    feedback = apply_practice_answer(session, question_id, user_answer)
+    
+    if session.mode == PracticeMode.ADAPTIVE:
+        if question_repo is None:
+            raise PracticeServiceError("Adaptive sessions need the question repository to serve questions")
+        await serve_next_adaptive_question(session, question_repo)
+        next_question = session.next_unanswered_question()
+        feedback["next_question"] = next_question.model_dump() if next_question else None
+        feedback["session_complete"] = session.status == PracticeSessionStatus.COMPLETED
+    
+    if not feedback["already_answered"]:
+        saved = await save_practice_progress(session, practice_repo, recorder, buffer)
+        if recorder and saved:
+            await recorder.practice_answer_submitted(session)
+    
+    return feedback
+
+async def list_user_practice_sessions(
+    user_id: str,
+    practice_repo: PracticeRepository,
+    status: Optional[PracticeSessionStatus] = None,
+    limit: int = 10,
+    cursor: Optional[str] = None
+) -> Tuple[List[PracticeSessionSummary], Optional[str]]:
+    """
+    Lists a user's practice sessions, newest first, one page at a time, as
+    summary rows (no questions or answers).
+    
+    Args:
+        user_id: The user ID
+        practice_repo: Practice repository
+        status: Optional status filter
+        limit: Number of sessions per page
+        cursor: Optional cursor returned with the previous page
+    
+    Returns:
+        The page of sessions and the cursor for the next page (None on the last page)
+        
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another filter
+    """
+    status_value = status.value if status else None
+    after = None
+    if cursor:
+        payload = decode_cursor(cursor, s=status_value)
+        after = tuple(cursor_key(payload, 2))
+    
+    # One extra session tells whether another page follows
+    sessions = await practice_repo.get_user_session_summaries(user_id, status, limit + 1, after=after)
+    
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        last = sessions[-1]
+        next_cursor = encode_cursor([last.created_at, last.session_id], s=status_value)
+    
+    return sessions, next_cursor
+
 async def get_practice_session_summary(
     session_id: str,
-    practice_repo: PracticeRepository
+    practice_repo: PracticeRepository,
+    buffer: Optional[PracticeSessionBuffer] = None
 ) -> Dict[str, Any]:
     """
     Gets summary statistics for a practice session.
@@ -204,6 +499,7 @@ async def get_practice_session_summary(
     Args:
         session_id: The session ID
         practice_repo: Practice repository
+        buffer: Optional write-behind buffer holding answers not yet flushed
     
     Returns:
         Dictionary containing session summary
@@ -211,10 +507,14 @@ async def get_practice_session_summary(
     Raises:
         SessionNotFoundError: If session is not found
     """
-    session = await practice_repo.find_session(session_id)
+    session = (buffer and buffer.peek(session_id)) or await practice_repo.find_session(session_id)
     if not session:
         raise SessionNotFoundError(f"Practice session '{session_id}' not found")
     
+    return summarize_practice_session(session)
+
+def summarize_practice_session(session: PracticeSession) -> Dict[str, Any]:
+    """Summary statistics of an already loaded practice session."""
     score = session.calculate_score()
     
     return {
@@ -225,10 +525,30 @@ async def get_practice_session_summary(
         "completed_at": session.completed_at,
         "score": score,
         "questions_answered": len(session.answers),
-        "total_questions": len(session.questions),
+        "total_questions": session.total_questions,
         "correct_answers": session.correct_count if session.status == PracticeSessionStatus.COMPLETED else score["correct_answers"]
     }
 
+def build_topic_catalog(questions: Iterable[Question]) -> List[Dict[str, Any]]:
+    """
+    Builds the practice topic catalog in one pass over the bank: each topic's name,
+    question count, question count per difficulty level and availability.
+    """
+    counts: Dict[str, Dict[int, int]] = {}
+    for question in questions:
+        by_difficulty = counts.setdefault(question.skill_area, {})
+        by_difficulty[question.difficulty_level] = by_difficulty.get(question.difficulty_level, 0) + 1
+    
+    return [
+        {
+            "name": topic,
+            "question_count": sum(counts[topic].values()),
+            "difficulty_counts": {str(level): count for level, count in sorted(counts[topic].items())},
+            "available": sum(counts[topic].values()) > 0
+        }
+        for topic in sorted(counts)
+    ]
+
 async def get_available_practice_topics(
     question_repo: QuestionRepository
 ) -> List[Dict[str, Any]]:
@@ -241,18 +561,8 @@ async def get_available_practice_topics(
     Returns:
         List of topic information dictionaries
     """
-    topics = await question_repo.get_available_topics()
-    
-    topic_info = []
-    for topic in topics:
-        question_count = await question_repo.get_topic_question_count(topic)
-        topic_info.append({
-            "name": topic,
-            "question_count": question_count,
-            "available": question_count > 0
-        })
-    
-    return topic_info
+    questions = await question_repo.get_all_questions()
+    return build_topic_catalog(questions.values())
 
 def _is_answer_correct(user_answer: Any, correct_answer: str) -> bool:
     """
@@ -266,4 +576,25 @@ def _is_answer_correct(user_answer: Any, correct_answer: str) -> bool:
     user_str = str(user_answer).strip().lower()
     correct_str = str(correct_answer).strip().lower()
     
-    return user_str == correct_str 
\ No newline at end of file
+    return user_str == correct_str 
+
+async def abandon_idle_practice_sessions(
+    practice_repo: PracticeRepository,
+    idle_hours: int,
+    retention_days: int,
+    batch_size: int = 500
+) -> int:
+    """
+    Compacts in-progress sessions idle for `idle_hours` into ABANDONED summaries
+    that are deleted after `retention_days`.
+    
+    Returns:
+        Number of sessions abandoned
+    """
+    if idle_hours < 1:
+        raise PracticeServiceError("Idle hours must be at least 1")
+    return await practice_repo.compact_abandoned_sessions(
+        idle_for=timedelta(hours=idle_hours),
+        retention=timedelta(days=retention_days),
+        batch_size=batch_size
+    )
@@ -0,0 +1,140 @@
+"""
+Practice Session Buffer
+
+Optional write-behind store for in-progress practice sessions. With session
+affinity (every request for a session reaches the same process), answers are
+appended to the buffered session in memory instead of re-reading and rewriting
+the whole session document per answer. Dirty sessions are written back when
+they complete, on the periodic flush job and when evicted from the buffer, so a
+crash loses at most PRACTICE_SESSION_BUFFER_FLUSH_SECONDS of answers.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import settings
+from backend.models.practice_session import PracticeSession
+from backend.repositories.practice_repository import PracticeRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BufferedSession:
+    session: PracticeSession
+    dirty: bool
+    touched_at: float
+
+
+class PracticeSessionBuffer:
+    """Bounded LRU of in-progress practice sessions with write-behind persistence."""
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        idle_seconds: float = 600,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, _BufferedSession]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.flushed_writes = 0
+        self.evictions = 0
+
+    def peek(self, session_id: str) -> Optional[PracticeSession]:
+        """Returns the buffered session without loading or touching it."""
+        entry = self._entries.get(session_id)
+        return entry.session if entry else None
+
+    async def load(self, session_id: str, practice_repo: PracticeRepository) -> Optional[PracticeSession]:
+        """Returns the buffered session, reading and buffering it on a miss."""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self.hits += 1
+            entry.touched_at = self._clock()
+            self._entries.move_to_end(session_id)
+            return entry.session
+        self.misses += 1
+        session = await practice_repo.find_session(session_id)
+        # Another request may have buffered it while we were reading
+        if session is not None and session_id not in self._entries:
+            await self._insert(session, dirty=False, practice_repo=practice_repo)
+        return self.peek(session_id) or session
+
+    async def stage(self, session: PracticeSession, practice_repo: PracticeRepository) -> None:
+        """Marks a modified session for write-behind."""
+        entry = self._entries.get(session.session_id)
+        if entry is None:
+            await self._insert(session, dirty=True, practice_repo=practice_repo)
+            return
+        entry.session = session
+        entry.dirty = True
+        entry.touched_at = self._clock()
+        self._entries.move_to_end(session.session_id)
+
+    def discard(self, session_id: str) -> None:
+        """Drops a session that has been written through (e.g. on completion)."""
+        self._entries.pop(session_id, None)
+
+    async def flush(self, practice_repo: PracticeRepository) -> int:
+        """
+        Writes back every dirty session and drops clean ones idle for longer than
+        idle_seconds. Failed writes stay dirty for the next flush.
+        Returns the number of sessions written.
+        """
+        written = 0
+        for entry in [entry for entry in self._entries.values() if entry.dirty]:
+            entry.dirty = False
+            if await self._write(entry.session, practice_repo):
+                written += 1
+            else:
+                entry.dirty = True
+
+        idle_before = self._clock() - self.idle_seconds
+        for session_id in [
+            session_id for session_id, entry in self._entries.items()
+            if not entry.dirty and entry.touched_at < idle_before
+        ]:
+            del self._entries[session_id]
+        return written
+
+    async def _insert(self, session: PracticeSession, dirty: bool, practice_repo: PracticeRepository) -> None:
+        self._entries[session.session_id] = _BufferedSession(session, dirty, self._clock())
+        while len(self._entries) > self.max_sessions:
+            _, evicted = self._entries.popitem(last=False)
+            self.evictions += 1
+            if evicted.dirty:
+                await self._write(evicted.session, practice_repo)
+
+    async def _write(self, session: PracticeSession, practice_repo: PracticeRepository) -> bool:
+        try:
+            await practice_repo.update_session(session)
+            self.flushed_writes += 1
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write back practice session {session.session_id}: {e}")
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Buffer metrics for the admin endpoint."""
+        return {
+            "sessions": len(self._entries),
+            "dirty": sum(1 for entry in self._entries.values() if entry.dirty),
+            "max_sessions": self.max_sessions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "flushed_writes": self.flushed_writes,
+            "evictions": self.evictions,
+        }
+
+
+# Shared by all requests in this process
+practice_session_buffer = PracticeSessionBuffer(
+    settings.PRACTICE_SESSION_BUFFER_MAX_SESSIONS, settings.PRACTICE_SESSION_BUFFER_IDLE_SECONDS
+)
@@ -0,0 +1,148 @@
+"""
+Practice Stats Service
+
+Per-user practice statistics kept up to date as sessions complete: totals, a
+breakdown per topic and a rolling window of recent days. Reading them is a single
+document lookup; `rebuild_practice_stats` recomputes every document from the
+completed sessions.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.practice_stats_repository import (
+    PracticeStatsRepository,
+    COUNTER_FIELDS,
+    COUNTED_SESSIONS_KEPT,
+    topic_key,
+    day_key,
+)
+from backend.services.utils import get_utc7_date, get_utc7_today_date, get_current_time_in_target_timezone
+
+
+def _session_counts(session: PracticeSession) -> Dict[str, int]:
+    return {"sessions": 1, "questions": session.question_count, "correct": session.correct_count}
+
+
+def _session_day(session: PracticeSession) -> date:
+    """Sessions count towards their completion day in UTC+7."""
+    return get_utc7_date(session.completed_at or session.created_at)
+
+
+def _summary(counts: Dict[str, int]) -> Dict[str, Any]:
+    questions = counts.get("questions", 0)
+    correct = counts.get("correct", 0)
+    return {
+        "sessions": counts.get("sessions", 0),
+        "questions": questions,
+        "correct": correct,
+        "accuracy": (correct / questions * 100) if questions > 0 else 0,
+    }
+
+
+async def record_completed_session(
+    session: PracticeSession, stats_repo: PracticeStatsRepository, window_days: int
+) -> None:
+    """Adds a just-completed session to its user's stats."""
+    counts = _session_counts(session)
+    await stats_repo.record_session(
+        session.user_id, session.session_id, session.topic, _session_day(session),
+        questions=counts["questions"], correct=counts["correct"], window_days=window_days
+    )
+
+
+async def get_practice_stats(
+    user_id: str, stats_repo: PracticeStatsRepository, window_days: int
+) -> Dict[str, Any]:
+    """
+    Gets a user's practice statistics.
+
+    Args:
+        user_id: The user ID
+        stats_repo: Practice stats repository
+        window_days: Number of days (ending today, UTC+7) in the `recent` summary
+
+    Returns:
+        Totals, per-topic breakdown and the recent-window summary
+    """
+    doc = await stats_repo.get_stats(user_id) or {}
+
+    window_start = get_utc7_today_date() - timedelta(days=window_days - 1)
+    recent = {field: 0 for field in COUNTER_FIELDS}
+    for day, counts in doc.get("daily", {}).items():
+        if day >= day_key(window_start):
+            for field in COUNTER_FIELDS:
+                recent[field] += counts.get(field, 0)
+
+    total_questions = doc.get("total_questions", 0)
+    total_correct = doc.get("total_correct", 0)
+    return {
+        "total_sessions": doc.get("total_sessions", 0),
+        "total_questions": total_questions,
+        "total_correct": total_correct,
+        "accuracy": (total_correct / total_questions * 100) if total_questions > 0 else 0,
+        "topics_practiced": doc.get("topics_practiced", []),
+        "topic_breakdown": {topic: _summary(counts) for topic, counts in sorted(doc.get("by_topic", {}).items())},
+        "recent": {"days": window_days, **_summary(recent)},
+    }
+
+
+def accumulate_session(docs: Dict[str, Dict[str, Any]], session: PracticeSession, window_start: date) -> None:
+    """Adds a completed session to in-memory stats documents shaped like the stored ones."""
+    doc = docs.setdefault(session.user_id, {
+        "_id": session.user_id,
+        **{f"total_{field}": 0 for field in COUNTER_FIELDS},
+        "topics_practiced": [],
+        "by_topic": {},
+        "daily": {},
+        "counted_sessions": [],
+    })
+    counts = _session_counts(session)
+    day = _session_day(session)
+    buckets = [doc["by_topic"].setdefault(topic_key(session.topic), dict.fromkeys(COUNTER_FIELDS, 0))]
+    if day >= window_start:
+        buckets.append(doc["daily"].setdefault(day_key(day), dict.fromkeys(COUNTER_FIELDS, 0)))
+    for field in COUNTER_FIELDS:
+        doc[f"total_{field}"] += counts[field]
+        for bucket in buckets:
+            bucket[field] += counts[field]
+    if session.topic not in doc["topics_practiced"]:
+        doc["topics_practiced"].append(session.topic)
+    doc["counted_sessions"] = (doc["counted_sessions"] + [session.session_id])[-COUNTED_SESSIONS_KEPT:]
+
+
+async def rebuild_practice_stats(
+    practice_repo: PracticeRepository,
+    stats_repo: PracticeStatsRepository,
+    window_days: int
+) -> Dict[str, Any]:
+    """
+    Recomputes every user's practice stats from completed sessions and replaces the
+    stats collection with the result. Sessions completing while it runs may be missed;
+    run it when traffic is low.
+
+    Returns:
+        Rebuild summary with statistics
+    """
+    print("Starting practice stats rebuild...")
+
+    window_start = get_utc7_today_date() - timedelta(days=window_days - 1)
+    docs: Dict[str, Dict[str, Any]] = {}
+    sessions_processed = 0
+    async for session in practice_repo.iter_sessions_by_status(PracticeSessionStatus.COMPLETED):
+        accumulate_session(docs, session, window_start)
+        sessions_processed += 1
+
+    await stats_repo.clear_all_stats()
+    users_written = await stats_repo.replace_stats(docs.values())
+
+    summary = {
+        "sessions_processed": sessions_processed,
+        "users_written": users_written,
+        "timestamp": get_current_time_in_target_timezone().isoformat()
+    }
+
+    print(f"Practice stats rebuild completed: {summary}")
+    return summary
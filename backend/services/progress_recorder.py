@@ -0,0 +1,202 @@
+"""
+Progress Recorder
+
+Single place where learning-progress events (a mission completing, missions being
+archived, a practice session completing, a new day starting, an answer being
+submitted) update the derived collections that read paths rely on. Failures are
+logged rather than raised: the derived data can be rebuilt by its backfill, while
+the user's answer must still go through.
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, List, Optional
+
+from backend.models.daily_mission import DailyMissionDocument
+from backend.models.practice_session import PracticeSession
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_epoch_repository import ReviewEpochRepository
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.repositories.practice_stats_repository import PracticeStatsRepository
+from backend.repositories.streak_repository import StreakRepository
+from backend.repositories.leaderboard_repository import LeaderboardRepository
+from backend.repositories.progress_rollup_repository import ProgressRollupRepository
+from backend.repositories.item_stats_repository import ItemStatsRepository
+from backend.repositories.irt_repository import IrtRepository
+from backend.config import settings
+from backend.models.api_responses import ReviewMistakeItem
+from backend.services.mistake_index_service import (
+    record_mission_mistakes,
+    record_practice_mistakes,
+    mission_mistake_items,
+    practice_mistake_items,
+)
+from backend.services.review_schedule_service import schedule_mistakes
+from backend.services.practice_stats_service import record_completed_session
+from backend.services.leaderboard import record_mission_score, record_practice_score
+from backend.services.progress_rollup_service import (
+    RollupAttempt,
+    latest_mission_attempt,
+    latest_practice_attempt,
+    record_attempt,
+)
+from backend.services.item_analysis import (
+    ItemAttempt,
+    latest_mission_item_attempt,
+    latest_practice_item_attempt,
+    record_item_attempt,
+)
+from backend.services.irt import record_ability_response
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressRecorder:
+    """Applies mission and practice status transitions to derived collections."""
+
+    def __init__(
+        self,
+        mistake_repo: MistakeRepository,
+        epoch_repo: Optional[ReviewEpochRepository] = None,
+        schedule_repo: Optional[ReviewScheduleRepository] = None,
+        stats_repo: Optional[PracticeStatsRepository] = None,
+        streak_repo: Optional[StreakRepository] = None,
+        leaderboard_repo: Optional[LeaderboardRepository] = None,
+        rollup_repo: Optional[ProgressRollupRepository] = None,
+        item_repo: Optional[ItemStatsRepository] = None,
+        irt_repo: Optional[IrtRepository] = None
+    ):
+        self.mistake_repo = mistake_repo
+        # Bumping a user's review epoch invalidates their cached review results
+        self.epoch_repo = epoch_repo
+        # New mistakes are added to the user's spaced-repetition queue
+        self.schedule_repo = schedule_repo
+        # Completed practice sessions are added to the user's practice stats
+        self.stats_repo = stats_repo
+        # Completed missions extend the user's daily streak
+        self.streak_repo = streak_repo
+        # Completed missions and practice sessions add to the weekly leaderboard
+        self.leaderboard_repo = leaderboard_repo
+        # Every submitted answer is added to the user's daily progress rollup
+        self.rollup_repo = rollup_repo
+        # Every submitted answer is added to its question's live item counters
+        self.item_repo = item_repo
+        # First attempts move the user's ability estimate
+        self.irt_repo = irt_repo
+
+    async def mission_answer_submitted(self, mission: DailyMissionDocument) -> None:
+        """Called after an answer attempt was saved to the mission."""
+        await self._roll_up(mission.user_id, latest_mission_attempt(mission))
+        item_attempt = latest_mission_item_attempt(mission)
+        await self._count_item(item_attempt)
+        await self._estimate_ability(mission.user_id, item_attempt)
+
+    async def practice_answer_submitted(self, session: PracticeSession) -> None:
+        """Called after a new answer was applied to the practice session."""
+        await self._roll_up(session.user_id, latest_practice_attempt(session))
+        item_attempt = latest_practice_item_attempt(session)
+        await self._count_item(item_attempt)
+        await self._estimate_ability(session.user_id, item_attempt)
+
+    async def mission_completed(self, mission: DailyMissionDocument) -> None:
+        """Called once when a mission transitions to COMPLETE."""
+        try:
+            await record_mission_mistakes(mission, self.mistake_repo)
+        except Exception as e:
+            logger.error(f"Failed to record mistakes for user {mission.user_id} mission {mission.date}: {e}")
+        await self._schedule(mission.user_id, mission_mistake_items(mission))
+        await self._bump_epochs([mission.user_id])
+        if self.streak_repo:
+            try:
+                await self.streak_repo.record_completion(mission.user_id, mission.date)
+            except Exception as e:
+                logger.error(f"Failed to update streak for user {mission.user_id} mission {mission.date}: {e}")
+        if self.leaderboard_repo:
+            try:
+                await record_mission_score(mission, self.leaderboard_repo)
+            except Exception as e:
+                logger.error(f"Failed to update leaderboard for user {mission.user_id} mission {mission.date}: {e}")
+
+    async def missions_archived(self, missions: List[DailyMissionDocument]) -> None:
+        """Called by the archival job with the missions it just archived."""
+        for mission in missions:
+            try:
+                await record_mission_mistakes(mission, self.mistake_repo)
+            except Exception as e:
+                logger.error(f"Failed to record mistakes for user {mission.user_id} mission {mission.date}: {e}")
+            await self._schedule(mission.user_id, mission_mistake_items(mission))
+        await self._bump_epochs(mission.user_id for mission in missions)
+
+    async def day_rolled_over(self, today: date) -> None:
+        """Called by the daily reset job: zeroes streaks that missed yesterday."""
+        if not self.streak_repo:
+            return
+        try:
+            reset_count = await self.streak_repo.reset_broken_streaks(today)
+            logger.info(f"Reset {reset_count} broken streaks.")
+        except Exception as e:
+            logger.error(f"Failed to reset broken streaks: {e}")
+
+    async def practice_session_completed(self, session: PracticeSession) -> None:
+        """Called once when a practice session transitions to COMPLETED."""
+        try:
+            await record_practice_mistakes(session, self.mistake_repo)
+        except Exception as e:
+            logger.error(f"Failed to record mistakes for practice session {session.session_id}: {e}")
+        await self._schedule(session.user_id, practice_mistake_items(session))
+        await self._bump_epochs([session.user_id])
+        if self.stats_repo:
+            try:
+                await record_completed_session(session, self.stats_repo, settings.PRACTICE_STATS_WINDOW_DAYS)
+            except Exception as e:
+                logger.error(f"Failed to update practice stats for session {session.session_id}: {e}")
+        if self.leaderboard_repo:
+            try:
+                await record_practice_score(session, self.leaderboard_repo)
+            except Exception as e:
+                logger.error(f"Failed to update leaderboard for practice session {session.session_id}: {e}")
+
+    async def _roll_up(self, user_id: str, attempt: Optional[RollupAttempt]) -> None:
+        """Adds an answer attempt to the user's daily progress rollup."""
+        if not self.rollup_repo or attempt is None:
+            return
+        try:
+            await record_attempt(user_id, attempt, self.rollup_repo)
+        except Exception as e:
+            logger.error(f"Failed to update progress rollup for user {user_id}: {e}")
+
+    async def _count_item(self, attempt: Optional[ItemAttempt]) -> None:
+        """Adds an answer attempt to its question's live item counters."""
+        if not self.item_repo or attempt is None:
+            return
+        try:
+            await record_item_attempt(attempt, self.item_repo)
+        except Exception as e:
+            logger.error(f"Failed to update item counters for question {attempt.question_id}: {e}")
+
+    async def _estimate_ability(self, user_id: str, attempt: Optional[ItemAttempt]) -> None:
+        """Applies a first attempt to the user's ability estimate."""
+        if not self.irt_repo or attempt is None:
+            return
+        try:
+            await record_ability_response(user_id, attempt, self.irt_repo)
+        except Exception as e:
+            logger.error(f"Failed to update ability for user {user_id}: {e}")
+
+    async def _schedule(self, user_id: str, mistakes: List[ReviewMistakeItem]) -> None:
+        """Adds a user's new mistakes to their review schedule."""
+        if not self.schedule_repo or not mistakes:
+            return
+        try:
+            await schedule_mistakes(user_id, mistakes, self.schedule_repo)
+        except Exception as e:
+            logger.error(f"Failed to schedule reviews for user {user_id}: {e}")
+
+    async def _bump_epochs(self, user_ids: Iterable[str]) -> None:
+        """Moves the given users to a new review epoch, after their mistakes were recorded."""
+        if not self.epoch_repo:
+            return
+        try:
+            await self.epoch_repo.bump_epochs(user_ids)
+        except Exception as e:
+            logger.error(f"Failed to bump review epochs: {e}")
@@ -0,0 +1,214 @@
+"""
+Progress Rollup Service
+
+Per-user daily rollups of answer attempts, correct answers and time spent, in
+total and per skill area, updated as each mission or practice answer is
+submitted. The progress dashboard sums at most DASHBOARD_WINDOWS[-1] rows;
+`rebuild_progress_rollups` recomputes every rollup from missions and sessions.
+
+Time spent on an answer is the time since the previous answer in the same mission
+or session (or since it was created), capped at MAX_ANSWER_SECONDS so idle time
+is not counted.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.practice_stats_repository import topic_key
+from backend.repositories.progress_rollup_repository import (
+    ProgressRollupRepository,
+    ROLLUP_FIELDS,
+    rollup_id,
+)
+from backend.services.utils import get_utc7_date, get_utc7_today_date, get_current_time_in_target_timezone
+
+# Dashboard windows in days, ending today (UTC+7)
+DASHBOARD_WINDOWS = (7, 30, 90)
+
+MAX_ANSWER_SECONDS = 300
+
+
+@dataclass
+class RollupAttempt:
+    """One answer attempt as counted in the daily rollups."""
+    day: date
+    skill_area: str
+    is_correct: bool
+    seconds: int
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def answer_seconds(answered_at: datetime, previous_at: Optional[datetime]) -> int:
+    """Seconds since the previous answer, capped at MAX_ANSWER_SECONDS."""
+    if previous_at is None:
+        return 0
+    elapsed = (_as_utc(answered_at) - _as_utc(previous_at)).total_seconds()
+    return int(min(max(elapsed, 0), MAX_ANSWER_SECONDS))
+
+
+def mission_attempts(mission: DailyMissionDocument) -> List[RollupAttempt]:
+    """Every answer attempt of a mission, in the order they were made."""
+    skill_areas = {question.question_id: question.skill_area for question in mission.questions}
+    attempts = sorted(
+        (
+            (_as_utc(attempt.timestamp), skill_areas[answer.question_id], attempt.is_correct)
+            for answer in mission.answers if answer.question_id in skill_areas
+            for attempt in answer.attempts_history
+        ),
+        key=lambda attempt: attempt[0],
+    )
+    rollups = []
+    previous_at = _as_utc(mission.created_at)
+    for timestamp, skill_area, is_correct in attempts:
+        rollups.append(RollupAttempt(
+            get_utc7_date(timestamp), skill_area, is_correct, answer_seconds(timestamp, previous_at)
+        ))
+        previous_at = timestamp
+    return rollups
+
+
+def practice_attempts(session: PracticeSession) -> List[RollupAttempt]:
+    """Every answer of a practice session, in the order they were made."""
+    skill_areas = {question.question_id: question.skill_area for question in session.questions}
+    rollups = []
+    previous_at = session.created_at
+    for answer in session.answers:
+        rollups.append(RollupAttempt(
+            get_utc7_date(answer.answered_at),
+            skill_areas.get(answer.question_id, session.topic),
+            answer.is_correct,
+            answer_seconds(answer.answered_at, previous_at),
+        ))
+        previous_at = answer.answered_at
+    return rollups
+
+
+def latest_mission_attempt(mission: DailyMissionDocument) -> Optional[RollupAttempt]:
+    attempts = mission_attempts(mission)
+    return attempts[-1] if attempts else None
+
+
+def latest_practice_attempt(session: PracticeSession) -> Optional[RollupAttempt]:
+    attempts = practice_attempts(session)
+    return attempts[-1] if attempts else None
+
+
+async def record_attempt(user_id: str, attempt: RollupAttempt, rollup_repo: ProgressRollupRepository) -> None:
+    await rollup_repo.record_attempt(user_id, attempt.day, attempt.skill_area, attempt.is_correct, attempt.seconds)
+
+
+def _summary(counts: Dict[str, int]) -> Dict[str, Any]:
+    attempts = counts.get("attempts", 0)
+    correct = counts.get("correct", 0)
+    return {
+        "attempts": attempts,
+        "correct": correct,
+        "accuracy": (correct / attempts * 100) if attempts > 0 else 0,
+        "time_spent_seconds": counts.get("time_spent_seconds", 0),
+    }
+
+
+async def get_progress_dashboard(
+    user_id: str,
+    rollup_repo: ProgressRollupRepository,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Gets a user's progress dashboard: attempts, accuracy and time spent over each
+    of DASHBOARD_WINDOWS, in total and by skill area.
+    """
+    today = today or get_utc7_today_date()
+    start = today - timedelta(days=max(DASHBOARD_WINDOWS) - 1)
+    rollups = await rollup_repo.get_rollups(user_id, start, today)
+
+    windows = []
+    for days in DASHBOARD_WINDOWS:
+        window_start = today - timedelta(days=days - 1)
+        totals = dict.fromkeys(ROLLUP_FIELDS, 0)
+        by_skill: Dict[str, Dict[str, int]] = {}
+        for rollup in rollups:
+            if rollup["day"].date() < window_start:
+                continue
+            for field in ROLLUP_FIELDS:
+                totals[field] += rollup.get(field, 0)
+            for skill_area, counts in rollup.get("by_skill", {}).items():
+                skill_totals = by_skill.setdefault(skill_area, dict.fromkeys(ROLLUP_FIELDS, 0))
+                for field in ROLLUP_FIELDS:
+                    skill_totals[field] += counts.get(field, 0)
+        windows.append({
+            "days": days,
+            **_summary(totals),
+            "by_skill": {skill_area: _summary(counts) for skill_area, counts in sorted(by_skill.items())},
+        })
+    return {"user_id": user_id, "windows": windows}
+
+
+def accumulate_attempts(
+    docs: Dict[str, Dict[str, Any]], user_id: str, attempts: Iterable[RollupAttempt]
+) -> None:
+    """Adds attempts to in-memory rollup documents shaped like the stored ones."""
+    for attempt in attempts:
+        doc = docs.setdefault(rollup_id(user_id, attempt.day), {
+            "_id": rollup_id(user_id, attempt.day),
+            "user_id": user_id,
+            "day": datetime.combine(attempt.day, datetime.min.time()),
+            **dict.fromkeys(ROLLUP_FIELDS, 0),
+            "by_skill": {},
+        })
+        skill = doc["by_skill"].setdefault(topic_key(attempt.skill_area), dict.fromkeys(ROLLUP_FIELDS, 0))
+        for bucket in (doc, skill):
+            bucket["attempts"] += 1
+            bucket["correct"] += int(attempt.is_correct)
+            bucket["time_spent_seconds"] += attempt.seconds
+
+
+async def rebuild_progress_rollups(
+    mission_repo: MissionRepository,
+    practice_repo: PracticeRepository,
+    rollup_repo: ProgressRollupRepository
+) -> Dict[str, Any]:
+    """
+    Recomputes every daily rollup from mission answer histories and practice answers
+    and replaces the rollup collection with the result. Answers submitted while it
+    runs may be missed; run it when traffic is low. Abandoned practice sessions have
+    been compacted without their answers and are not counted.
+
+    Returns:
+        Rebuild summary with statistics
+    """
+    print("Starting progress rollup rebuild...")
+
+    docs: Dict[str, Dict[str, Any]] = {}
+    missions_processed = 0
+    async for mission in mission_repo.iter_missions_by_statuses(
+        [MissionStatus.IN_PROGRESS, MissionStatus.COMPLETE, MissionStatus.ARCHIVED]
+    ):
+        accumulate_attempts(docs, mission.user_id, mission_attempts(mission))
+        missions_processed += 1
+
+    sessions_processed = 0
+    for status in (PracticeSessionStatus.IN_PROGRESS, PracticeSessionStatus.COMPLETED):
+        async for session in practice_repo.iter_sessions_by_status(status):
+            accumulate_attempts(docs, session.user_id, practice_attempts(session))
+            sessions_processed += 1
+
+    await rollup_repo.clear_all_rollups()
+    rollups_written = await rollup_repo.replace_rollups(docs.values())
+
+    summary = {
+        "missions_processed": missions_processed,
+        "sessions_processed": sessions_processed,
+        "rollups_written": rollups_written,
+        "timestamp": get_current_time_in_target_timezone().isoformat()
+    }
+
+    print(f"Progress rollup rebuild completed: {summary}")
+    return summary
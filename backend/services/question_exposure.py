@@ -0,0 +1,106 @@
+"""
+Question Exposure
+
+Tracks which questions each user has recently been served so mission and practice
+samplers can avoid repeats. Every user has a rotating pair of Bloom filters
+(EXPOSURE_FILTER_BITS bits each, see QuestionExposureRepository), so checking a
+question costs EXPOSURE_FILTER_HASHES bit tests however long the user's history is.
+A filter remembers between QUESTION_EXPOSURE_GENERATION_SIZE and twice that many
+most recent questions; false positives only make a question look seen.
+
+Exposure tracking is best-effort: failures are logged and questions are still served.
+"""
+
+import hashlib
+import logging
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from backend.config import settings
+from backend.repositories.question_exposure_repository import QuestionExposureRepository, WORD_BITS
+
+logger = logging.getLogger(__name__)
+
+# Changing either value invalidates every stored filter
+EXPOSURE_FILTER_BITS = 8192
+EXPOSURE_FILTER_HASHES = 7
+
+T = TypeVar("T")
+
+
+def exposure_bits(question_id: str) -> List[int]:
+    """Bit positions of a question (double hashing over one blake2b digest)."""
+    digest = hashlib.blake2b(question_id.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + i * h2) % EXPOSURE_FILTER_BITS for i in range(EXPOSURE_FILTER_HASHES)]
+
+
+def exposure_masks(question_ids: Iterable[str]) -> Dict[int, int]:
+    """Word index -> OR mask setting the bits of every given question."""
+    masks: Dict[int, int] = {}
+    for question_id in question_ids:
+        for bit in exposure_bits(question_id):
+            index = bit // WORD_BITS
+            masks[index] = masks.get(index, 0) | (1 << (bit % WORD_BITS))
+    return masks
+
+
+class ExposureFilter:
+    """Read-only view of a user's filter generations."""
+
+    def __init__(self, generations: Optional[List[Dict[int, int]]] = None):
+        self.generations = [generation for generation in generations or [] if generation]
+
+    def might_have_seen(self, question_id: str) -> bool:
+        """False means never served recently; True may be a false positive."""
+        if not self.generations:
+            return False
+        bits = exposure_bits(question_id)
+        return any(
+            all(words.get(bit // WORD_BITS, 0) >> (bit % WORD_BITS) & 1 for bit in bits)
+            for words in self.generations
+        )
+
+
+def pick_preferring_unseen(
+    candidates: Sequence[T],
+    k: int,
+    exposure_filter: ExposureFilter,
+    question_id: Callable[[T], str] = lambda candidate: candidate,
+    rng: Optional[random.Random] = None,
+) -> List[T]:
+    """
+    Randomly picks k candidates, taking recently seen ones only when there are
+    fewer than k unseen ones.
+    """
+    rng = rng or random
+    unseen: List[T] = []
+    seen: List[T] = []
+    for candidate in candidates:
+        (seen if exposure_filter.might_have_seen(question_id(candidate)) else unseen).append(candidate)
+    if len(unseen) >= k:
+        return rng.sample(unseen, k)
+    return unseen + rng.sample(seen, min(k - len(unseen), len(seen)))
+
+
+async def load_exposure_filter(user_id: str, exposure_repo: QuestionExposureRepository) -> ExposureFilter:
+    """Loads the user's filter; an empty filter if it cannot be read."""
+    try:
+        return ExposureFilter(await exposure_repo.get_generations(user_id))
+    except Exception as e:
+        logger.error(f"Failed to load question exposure for user {user_id}: {e}")
+        return ExposureFilter()
+
+
+async def record_exposures(
+    user_id: str, question_ids: Iterable[str], exposure_repo: QuestionExposureRepository
+) -> None:
+    """Adds the served questions to the user's current filter generation."""
+    question_ids = list(question_ids)
+    try:
+        await exposure_repo.add_exposures(
+            user_id, exposure_masks(question_ids), len(question_ids), settings.QUESTION_EXPOSURE_GENERATION_SIZE
+        )
+    except Exception as e:
+        logger.error(f"Failed to record question exposure for user {user_id}: {e}")
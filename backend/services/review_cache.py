@@ -0,0 +1,106 @@
+"""
+Review Cache
+
+In-process LRU cache of computed review results (mistake pages, grouped pages,
+stats, skill areas). Entries are keyed by user id, the user's review epoch and
+the request parameters. A user's mistakes only change on mission/practice status
+transitions, which bump the epoch, so an entry never needs explicit invalidation:
+once the epoch moves on, the user's older entries are dropped and new requests
+miss until recomputed.
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from backend.config import settings
+
+CacheKey = Tuple[str, int, Hashable]
+
+
+class ReviewCache:
+    """Bounded LRU of review results keyed by (user id, review epoch, request key)."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self._user_keys: Dict[str, Set[CacheKey]] = {}
+        self._user_epochs: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, epoch: int, key: Hashable) -> Optional[Any]:
+        """Returns the cached value, or None on a miss."""
+        self._observe_epoch(user_id, epoch)
+        cache_key = (user_id, epoch, key)
+        if cache_key in self._entries:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return self._entries[cache_key]
+        self.misses += 1
+        return None
+
+    def put(self, user_id: str, epoch: int, key: Hashable, value: Any) -> None:
+        """Stores a value computed at `epoch`, unless the user has already moved past it."""
+        self._observe_epoch(user_id, epoch)
+        if epoch < self._user_epochs[user_id]:
+            return
+        cache_key = (user_id, epoch, key)
+        self._entries[cache_key] = value
+        self._entries.move_to_end(cache_key)
+        self._user_keys.setdefault(user_id, set()).add(cache_key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._forget(evicted)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self, user_id: str, epoch: int, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Returns the cached value or computes, stores and returns it."""
+        value = self.get(user_id, epoch, key)
+        if value is None:
+            value = await compute()
+            self.put(user_id, epoch, key, value)
+        return value
+
+    def _observe_epoch(self, user_id: str, epoch: int) -> None:
+        # A newer epoch makes every entry of the user stale
+        if epoch > self._user_epochs.get(user_id, epoch - 1):
+            stale = self._user_keys.pop(user_id, set())
+            for cache_key in stale:
+                self._entries.pop(cache_key, None)
+            self.invalidations += len(stale)
+            self._user_epochs[user_id] = epoch
+
+    def _forget(self, cache_key: CacheKey) -> None:
+        user_id = cache_key[0]
+        user_keys = self._user_keys.get(user_id)
+        if user_keys is not None:
+            user_keys.discard(cache_key)
+            if not user_keys:
+                del self._user_keys[user_id]
+                self._user_epochs.pop(user_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hit/miss metrics for the admin endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "users": len(self._user_keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def clear(self) -> None:
+        """Drops every entry and resets the metrics."""
+        self.__init__(self.max_entries)
+
+
+# Shared by all requests in this process
+review_cache = ReviewCache(settings.REVIEW_CACHE_MAX_ENTRIES)
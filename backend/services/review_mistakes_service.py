@@ -1,273 +1,305 @@
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Tuple, Hashable, Callable, Awaitable
+from datetime import date, datetime, timedelta
 import math
-from collections import defaultdict
 
-from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Answer, Question, ChoiceOption
 from backend.models.api_responses import (
-    ReviewMistakeItem, 
-    ReviewMistakesResponse, 
+    ReviewMistakeItem,
+    ReviewMistakesResponse,
     GroupedReviewMistakesResponse,
     PaginationInfo
 )
 from backend.repositories.mission_repository import MissionRepository
-from backend.services.utils import get_current_time_in_target_timezone
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_epoch_repository import ReviewEpochRepository
+from backend.services.review_cache import ReviewCache
+from backend.services.utils import get_utc7_today_date
+from backend.services.cursor_pagination import (
+    InvalidCursorError,
+    encode_cursor,
+    decode_cursor,
+    cursor_key,
+    cursor_int,
+)
+
+# Display format for date group keys
+DATE_GROUP_FORMAT = '%d %b %Y'
 
 
 class ReviewMistakesService:
     """Service for handling review mistakes functionality with advanced features"""
-    
-    def __init__(self, mission_repo: MissionRepository):
+
+    def __init__(
+        self,
+        mission_repo: MissionRepository,
+        mistake_repo: Optional[MistakeRepository] = None,
+        cache: Optional[ReviewCache] = None,
+        epoch_repo: Optional[ReviewEpochRepository] = None
+    ):
         self.mission_repo = mission_repo
-    
+        # When present, mistakes are read from the materialized mistakes collection.
+        # Otherwise (REVIEW_MISTAKES_FROM_MISSIONS) they are computed from missions
+        # with database-side aggregations.
+        self.mistake_repo = mistake_repo
+        # Results are cached only when both are given: entries are keyed by the
+        # user's review epoch, which status transitions bump.
+        self.cache = cache if epoch_repo else None
+        self.epoch_repo = epoch_repo
+
     async def get_user_mistakes(
         self,
         user_id: str,
         page: int = 1,
         items_per_page: int = 20,
         group_by: Optional[str] = None,  # 'date' or 'topic'
-        skill_area_filter: Optional[str] = None
+        skill_area_filter: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> ReviewMistakesResponse | GroupedReviewMistakesResponse:
         """
         Retrieves paginated user mistakes from completed and archived missions.
-        
+
         Args:
             user_id: The user ID
-            page: Page number (1-based)
+            page: Page number (1-based), used when no cursor is given
             items_per_page: Number of items per page
             group_by: Grouping method ('date' or 'topic')
             skill_area_filter: Optional filter by skill area
-        
+            cursor: Optional `next_cursor` from the previous page
+
         Returns:
             Paginated response with mistakes data
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or belongs to another listing
         """
-        # Get all completed and archived missions for the user
-        missions = await self._get_eligible_missions(user_id)
-        
-        # Extract mistakes from missions
-        all_mistakes = await self._extract_mistakes_from_missions(missions)
-        
-        # Apply skill area filter if provided
-        if skill_area_filter:
-            all_mistakes = [m for m in all_mistakes if m.skill_area == skill_area_filter]
-        
-        total_mistakes = len(all_mistakes)
-        
-        if total_mistakes == 0:
-            empty_pagination = PaginationInfo(
-                current_page=1,
-                total_pages=0,
-                total_items=0,
-                items_per_page=items_per_page,
-                has_next=False,
-                has_previous=False
-            )
-            
+        return await self._cached(
+            user_id,
+            ("mistakes", page, items_per_page, group_by, skill_area_filter, cursor),
+            lambda: self._get_user_mistakes(user_id, page, items_per_page, group_by, skill_area_filter, cursor)
+        )
+
+    async def _get_user_mistakes(
+        self,
+        user_id: str,
+        page: int,
+        items_per_page: int,
+        group_by: Optional[str],
+        skill_area_filter: Optional[str],
+        cursor: Optional[str]
+    ) -> ReviewMistakesResponse | GroupedReviewMistakesResponse:
+        """Computes the response for `get_user_mistakes`"""
+        if cursor:
+            if not self.mistake_repo:
+                raise InvalidCursorError("Cursor pagination requires the mistakes collection")
             if group_by:
-                return GroupedReviewMistakesResponse(
-                    grouped_mistakes={},
-                    pagination=empty_pagination,
-                    total_mistakes=0,
-                    group_counts={}
-                )
-            else:
-                return ReviewMistakesResponse(
-                    mistakes=[],
-                    pagination=empty_pagination,
-                    total_mistakes=0
+                return await self._get_grouped_page_after(
+                    user_id, group_by, skill_area_filter, items_per_page, cursor
                 )
-        
-        # Handle grouping
+            return await self._get_page_after(user_id, skill_area_filter, items_per_page, cursor)
+
+        skip = (page - 1) * items_per_page
+
         if group_by:
-            return await self._get_grouped_mistakes(
-                all_mistakes, page, items_per_page, group_by
+            page_groups, groups = await self._fetch_group_page(
+                user_id, group_by, skill_area_filter, skip, items_per_page
             )
-        else:
-            return await self._get_paginated_mistakes(
-                all_mistakes, page, items_per_page
+
+            total_mistakes = sum(count for _, count in groups)
+            pagination = self._build_pagination(page, items_per_page, len(groups))
+            if self.mistake_repo and pagination.has_next and page_groups:
+                pagination.next_cursor = encode_cursor(
+                    [page_groups[-1][0]], g=group_by, s=skill_area_filter,
+                    p=page + 1, t=len(groups), m=total_mistakes
+                )
+
+            return GroupedReviewMistakesResponse(
+                grouped_mistakes={self._display_key(group_by, key): mistakes for key, mistakes in page_groups},
+                pagination=pagination,
+                total_mistakes=total_mistakes,
+                group_counts={self._display_key(group_by, key): count for key, count in groups}
             )
-    
+
+        mistakes, total_items, next_key = await self._fetch_page(user_id, skill_area_filter, skip, items_per_page)
+        pagination = self._build_pagination(page, items_per_page, total_items)
+        if next_key:
+            pagination.next_cursor = encode_cursor(list(next_key), s=skill_area_filter, p=page + 1, t=total_items)
+        return ReviewMistakesResponse(
+            mistakes=mistakes,
+            pagination=pagination,
+            total_mistakes=total_items
+        )
+
+    async def get_review_stats(self, user_id: str, weeks: int = 12) -> Dict[str, Any]:
+        """
+        Get summary statistics about a user's mistakes, computed by one aggregation.
+
+        Args:
+            user_id: The user ID
+            weeks: Number of weeks (ending with the current UTC+7 week) in the trend
+
+        Returns:
+            Total mistakes, counts per skill area and difficulty level, and weekly counts
+        """
+        today = get_utc7_today_date()
+        trend_since = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+        return await self._cached(
+            user_id, ("stats", trend_since, weeks), lambda: self._get_review_stats(user_id, trend_since, weeks)
+        )
+
+    async def _get_review_stats(self, user_id: str, trend_since: date, weeks: int) -> Dict[str, Any]:
+        """Computes the response for `get_review_stats`"""
+        if self.mistake_repo:
+            stats = await self.mistake_repo.get_mistake_stats(user_id, trend_since)
+        else:
+            stats = await self.mission_repo.aggregate_review_stats(user_id, trend_since)
+
+        weekly_counts = dict(stats["by_week"])
+        skill_breakdown = dict(stats["by_skill"])
+        return {
+            "total_mistakes": stats["total"],
+            "skill_areas_count": len(skill_breakdown),
+            "skill_areas": list(skill_breakdown),
+            "skill_area_breakdown": skill_breakdown,
+            "difficulty_breakdown": dict(stats["by_difficulty"]),
+            "weekly_trend": [
+                {
+                    "week_start": (trend_since + timedelta(weeks=week)).isoformat(),
+                    "count": weekly_counts.get(trend_since + timedelta(weeks=week), 0)
+                }
+                for week in range(weeks)
+            ]
+        }
+
     async def get_available_skill_areas(self, user_id: str) -> List[str]:
         """
         Get list of skill areas where user has made mistakes.
-        
+
         Args:
             user_id: The user ID
-            
+
         Returns:
             List of available skill areas
         """
-        missions = await self._get_eligible_missions(user_id)
-        mistakes = await self._extract_mistakes_from_missions(missions)
-        
-        skill_areas = list(set(mistake.skill_area for mistake in mistakes))
-        return sorted(skill_areas)
-    
-    async def _get_eligible_missions(self, user_id: str) -> List[DailyMissionDocument]:
-        """Get all completed and archived missions for a user"""
-        eligible_statuses = [MissionStatus.COMPLETE, MissionStatus.ARCHIVED]
-        missions = []
-        
-        for status in eligible_statuses:
-            status_missions = await self.mission_repo.find_missions_by_status(user_id, status)
-            missions.extend(status_missions)
-        
-        # Sort by date descending (most recent first)
-        missions.sort(key=lambda m: m.date, reverse=True)
-        return missions
-    
-    async def _extract_mistakes_from_missions(
-        self, missions: List[DailyMissionDocument]
-    ) -> List[ReviewMistakeItem]:
-        """Extract incorrect answers from missions"""
-        mistakes = []
-        
-        for mission in missions:
-            mission_mistakes = await self._extract_mistakes_from_single_mission(mission)
-            mistakes.extend(mission_mistakes)
-        
-        return mistakes
-    
-    async def _extract_mistakes_from_single_mission(
-        self, mission: DailyMissionDocument
-    ) -> List[ReviewMistakeItem]:
-        """Extract mistakes from a single mission"""
-        mistakes = []
-        
-        # Create lookup for questions by ID
-        questions_by_id = {q.question_id: q for q in mission.questions}
-        
-        for answer in mission.answers:
-            # Only include incorrect answers
-            if not answer.is_correct and answer.current_answer:
-                question = questions_by_id.get(answer.question_id)
-                if not question:
-                    continue
-                
-                # Find user's answer text and correct answer text
-                user_answer_text = self._get_choice_text(question.choices, answer.current_answer)
-                correct_answer_text = self._get_choice_text(question.choices, question.correct_answer_id)
-                
-                mistake_item = ReviewMistakeItem(
-                    question_id=question.question_id,
-                    question_text=question.question_text,
-                    skill_area=question.skill_area,
-                    difficulty_level=question.difficulty_level,
-                    choices=[
-                        {"id": choice.id, "text": choice.text} 
-                        for choice in question.choices
-                    ],
-                    user_answer_id=str(answer.current_answer),
-                    user_answer_text=user_answer_text,
-                    correct_answer_id=question.correct_answer_id,
-                    correct_answer_text=correct_answer_text,
-                    explanation=question.feedback_th,
-                    mission_date=mission.date,
-                    mission_completion_date=mission.updated_at,
-                    attempt_count=answer.attempt_count
-                )
-                
-                mistakes.append(mistake_item)
-        
-        return mistakes
-    
-    def _get_choice_text(self, choices: List[ChoiceOption], choice_id: str) -> str:
-        """Get choice text by ID"""
-        for choice in choices:
-            if choice.id == choice_id:
-                return choice.text
-        return "Unknown"
-    
-    async def _get_paginated_mistakes(
-        self, mistakes: List[ReviewMistakeItem], page: int, items_per_page: int
+        if self.mistake_repo:
+            compute = lambda: self.mistake_repo.get_skill_areas(user_id)
+        else:
+            compute = lambda: self.mission_repo.aggregate_review_skill_areas(user_id)
+        return await self._cached(user_id, ("skill_areas",), compute)
+
+    async def _cached(self, user_id: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Serves `compute()` from the review cache at the user's current review epoch"""
+        if not self.cache:
+            return await compute()
+        epoch = await self.epoch_repo.get_epoch(user_id)
+        return await self.cache.get_or_compute(user_id, epoch, key, compute)
+
+    async def _get_page_after(
+        self, user_id: str, skill_area_filter: Optional[str], items_per_page: int, cursor: str
     ) -> ReviewMistakesResponse:
-        """Get paginated mistakes without grouping"""
-        total_items = len(mistakes)
-        total_pages = math.ceil(total_items / items_per_page) if total_items > 0 else 0
-        
-        # Calculate pagination
-        start_idx = (page - 1) * items_per_page
-        end_idx = start_idx + items_per_page
-        paginated_mistakes = mistakes[start_idx:end_idx]
-        
-        pagination_info = PaginationInfo(
-            current_page=page,
-            total_pages=total_pages,
-            total_items=total_items,
-            items_per_page=items_per_page,
-            has_next=page < total_pages,
-            has_previous=page > 1
+        """Get the page following a cursor; totals are carried in the cursor"""
+        payload = decode_cursor(cursor, s=skill_area_filter, g=None)
+        page, total_items = cursor_int(payload, "p"), cursor_int(payload, "t")
+
+        mistakes, next_key = await self.mistake_repo.find_mistakes(
+            user_id, skill_area_filter, limit=items_per_page, after=tuple(cursor_key(payload, 2))
         )
-        
+        pagination = self._build_pagination(page, items_per_page, total_items)
+        pagination.has_next = next_key is not None
+        if next_key:
+            pagination.next_cursor = encode_cursor(list(next_key), s=skill_area_filter, p=page + 1, t=total_items)
         return ReviewMistakesResponse(
-            mistakes=paginated_mistakes,
-            pagination=pagination_info,
+            mistakes=mistakes,
+            pagination=pagination,
             total_mistakes=total_items
         )
-    
-    async def _get_grouped_mistakes(
-        self, 
-        mistakes: List[ReviewMistakeItem], 
-        page: int, 
-        items_per_page: int, 
-        group_by: str
+
+    async def _get_grouped_page_after(
+        self, user_id: str, group_by: str, skill_area_filter: Optional[str], items_per_page: int, cursor: str
     ) -> GroupedReviewMistakesResponse:
-        """Get grouped and paginated mistakes"""
-        # Group mistakes
-        grouped = defaultdict(list)
-        
-        for mistake in mistakes:
-            if group_by == 'date':
-                # Group by mission date in DD MMM YYYY format
-                key = mistake.mission_date.strftime('%d %b %Y')
-            elif group_by == 'topic':
-                # Group by skill area
-                key = mistake.skill_area
-            else:
-                key = 'All'
-            
-            grouped[key].append(mistake)
-        
-        # Convert to regular dict and sort groups
-        grouped_dict = dict(grouped)
-        
-        if group_by == 'date':
-            # Sort by date descending (most recent first)
-            sorted_keys = sorted(
-                grouped_dict.keys(), 
-                key=lambda x: datetime.strptime(x, '%d %b %Y'), 
-                reverse=True
+        """Get the groups following a cursor; only the page's group counts are returned"""
+        payload = decode_cursor(cursor, s=skill_area_filter, g=group_by)
+        page, total_groups = cursor_int(payload, "p"), cursor_int(payload, "t")
+        total_mistakes = cursor_int(payload, "m")
+
+        page_groups, has_more = await self.mistake_repo.find_mistake_groups(
+            user_id, group_by, skill_area_filter, after=cursor_key(payload, 1)[0], limit=items_per_page
+        )
+        pagination = self._build_pagination(page, items_per_page, total_groups)
+        pagination.has_next = has_more
+        if has_more:
+            pagination.next_cursor = encode_cursor(
+                [page_groups[-1][0]], g=group_by, s=skill_area_filter,
+                p=page + 1, t=total_groups, m=total_mistakes
             )
-        else:
-            # Sort alphabetically for topics
-            sorted_keys = sorted(grouped_dict.keys())
-        
-        # Create group counts
-        group_counts = {key: len(grouped_dict[key]) for key in sorted_keys}
-        
-        # Paginate groups (not individual items)
-        total_groups = len(sorted_keys)
-        total_pages = math.ceil(total_groups / items_per_page) if total_groups > 0 else 0
-        
-        start_idx = (page - 1) * items_per_page
-        end_idx = start_idx + items_per_page
-        paginated_keys = sorted_keys[start_idx:end_idx]
-        
-        # Build final grouped response
-        paginated_grouped = {key: grouped_dict[key] for key in paginated_keys}
-        
-        pagination_info = PaginationInfo(
+        return GroupedReviewMistakesResponse(
+            grouped_mistakes={self._display_key(group_by, key): mistakes for key, mistakes in page_groups},
+            pagination=pagination,
+            total_mistakes=total_mistakes,
+            group_counts={self._display_key(group_by, key): len(mistakes) for key, mistakes in page_groups}
+        )
+
+    async def _fetch_page(
+        self, user_id: str, skill_area_filter: Optional[str], skip: int, limit: int
+    ) -> Tuple[List[ReviewMistakeItem], int, Optional[Tuple[Any, Any]]]:
+        """
+        Get one page of mistakes, newest first, the total number of mistakes and,
+        from the mistakes collection, the keyset position after the page.
+        """
+        if not self.mistake_repo:
+            mistakes, total_items = await self.mission_repo.aggregate_review_mistakes(
+                user_id, skill_area_filter, skip, limit
+            )
+            return mistakes, total_items, None
+
+        total_items = await self.mistake_repo.count_mistakes(user_id, skill_area_filter)
+        mistakes, next_key = [], None
+        if total_items > skip:
+            mistakes, next_key = await self.mistake_repo.find_mistakes(
+                user_id, skill_area_filter, skip=skip, limit=limit
+            )
+        return mistakes, total_items, next_key
+
+    async def _fetch_group_page(
+        self, user_id: str, group_by: str, skill_area_filter: Optional[str], skip: int, limit: int
+    ) -> Tuple[List[Tuple[Any, List[ReviewMistakeItem]]], List[Tuple[Any, int]]]:
+        """
+        Get the (key, mistakes) pairs of one page of groups and the (key, count) pairs
+        of every group. Dates sort newest first, topics alphabetically.
+        """
+        if not self.mistake_repo:
+            return await self.mission_repo.aggregate_grouped_review_mistakes(
+                user_id, group_by, skill_area_filter, skip, limit
+            )
+
+        groups = await self.mistake_repo.count_by_group(user_id, group_by, skill_area_filter)
+        page_keys = [key for key, _ in groups[skip:skip + limit]]
+        grouped: Dict[Any, List[ReviewMistakeItem]] = {key: [] for key in page_keys}
+        if page_keys:
+            mistakes = await self.mistake_repo.find_mistakes_in_groups(
+                user_id, group_by, page_keys, skill_area_filter
+            )
+            for mistake in mistakes:
+                if group_by == 'date':
+                    # Group keys are the stored datetimes at midnight
+                    key = datetime.combine(mistake.mission_date, datetime.min.time())
+                else:
+                    key = mistake.skill_area
+                grouped[key].append(mistake)
+        return list(grouped.items()), groups
+
+    def _display_key(self, group_by: str, key: Any) -> str:
+        """Group keys are shown as 'DD Mon YYYY' dates or topic names"""
+        return key.strftime(DATE_GROUP_FORMAT) if group_by == 'date' else key
+
+    def _build_pagination(self, page: int, items_per_page: int, total_items: int) -> PaginationInfo:
+        """Build pagination info for a page over `total_items` items (or groups)"""
+        if total_items == 0:
+            page = 1
+        total_pages = math.ceil(total_items / items_per_page) if total_items > 0 else 0
+        return PaginationInfo(
             current_page=page,
             total_pages=total_pages,
-            total_items=total_groups,
+            total_items=total_items,
             items_per_page=items_per_page,
             has_next=page < total_pages,
             has_previous=page > 1
         )
-        
-        return GroupedReviewMistakesResponse(
-            grouped_mistakes=paginated_grouped,
-            pagination=pagination_info,
-            total_mistakes=len(mistakes),
-            group_counts=group_counts
-        ) 
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Review Schedule Service
+
+Spaced-repetition (SM-2) review queue built on top of recorded mistakes. Every question
+a user gets wrong is scheduled for a first review a day after the mistake; grading a
+review (quality 0-5) moves the question's next review further out, or back to one day
+when the answer was not recalled.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from backend.models.api_responses import ReviewMistakeItem
+from backend.models.review_schedule import ReviewScheduleItem
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.services.cursor_pagination import encode_cursor, decode_cursor, cursor_key
+
+# Delay between a mistake and its first review
+FIRST_REVIEW_DELAY = timedelta(days=1)
+
+# SM-2 review quality scale
+MIN_GRADE = 0
+MAX_GRADE = 5
+
+
+# Custom Exceptions
+class ReviewScheduleError(Exception):
+    """Base exception for review schedule issues."""
+    pass
+
+class ReviewItemNotFoundError(ReviewScheduleError):
+    """Raised when a question is not in the user's review schedule."""
+    pass
+
+class InvalidGradeError(ReviewScheduleError):
+    """Raised when a review grade is outside the SM-2 quality scale."""
+    pass
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Schedule times are stored as naive UTC datetimes."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def schedule_mistakes(
+    user_id: str, mistakes: List[ReviewMistakeItem], schedule_repo: ReviewScheduleRepository
+) -> int:
+    """Schedules the first review of each mistake one day after it was made."""
+    return await schedule_repo.schedule_mistakes(
+        user_id,
+        [(mistake, _utc_naive(mistake.mission_completion_date) + FIRST_REVIEW_DELAY) for mistake in mistakes]
+    )
+
+
+async def get_due_reviews(
+    user_id: str,
+    schedule_repo: ReviewScheduleRepository,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[ReviewScheduleItem], Optional[str]]:
+    """
+    Gets the user's items due for review, most overdue first.
+
+    Args:
+        user_id: The user ID
+        schedule_repo: Review schedule repository
+        limit: Maximum number of items to return
+        cursor: Optional `next_cursor` from the previous page
+
+    Returns:
+        The due items and a cursor for the next page (None when no more are due)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    now = datetime.utcnow()
+    after = None
+    if cursor:
+        after = tuple(cursor_key(decode_cursor(cursor, q="due"), 2))
+
+    items, next_key = await schedule_repo.find_due(user_id, now, limit=limit, after=after)
+    next_cursor = encode_cursor(list(next_key), q="due") if next_key else None
+    return items, next_cursor
+
+
+async def grade_review(
+    user_id: str,
+    question_id: str,
+    grade: int,
+    schedule_repo: ReviewScheduleRepository
+) -> ReviewScheduleItem:
+    """
+    Records a review of one scheduled question and reschedules it (SM-2).
+
+    Args:
+        user_id: The user ID
+        question_id: The reviewed question
+        grade: Recall quality, 0 (blackout) to 5 (perfect)
+        schedule_repo: Review schedule repository
+
+    Returns:
+        The rescheduled item
+
+    Raises:
+        InvalidGradeError: If the grade is outside 0-5
+        ReviewItemNotFoundError: If the question is not in the user's schedule
+    """
+    if not MIN_GRADE <= grade <= MAX_GRADE:
+        raise InvalidGradeError(f"Grade must be between {MIN_GRADE} and {MAX_GRADE}")
+
+    item = await schedule_repo.grade_item(user_id, question_id, grade, datetime.utcnow())
+    if not item:
+        raise ReviewItemNotFoundError(f"Question {question_id} is not scheduled for review")
+    return item
@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from backend.repositories.streak_repository import StreakRepository, week_start
+from backend.services.utils import get_utc7_today_date
+
+async def get_streak(
+    user_id: str,
+    streak_repo: StreakRepository,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Returns a user's streak counters from their streak document. A streak whose
+    last completed day is before yesterday reads as 0 even before the daily reset
+    has zeroed it, and the weekly count only covers the current (Monday-based) week.
+    """
+    today = today or get_utc7_today_date()
+    doc = await streak_repo.get_streak(user_id) or {}
+
+    last_completed = doc.get("last_completed_date")
+    last_completed_date = last_completed.date() if last_completed else None
+    current_streak = doc.get("current_streak", 0)
+    if last_completed_date is None or last_completed_date < today - timedelta(days=1):
+        current_streak = 0
+
+    stored_week = doc.get("week_start")
+    week_completions = doc.get("week_completions", 0)
+    if stored_week is None or stored_week.date() != week_start(today):
+        week_completions = 0
+
+    return {
+        "current_streak": current_streak,
+        "longest_streak": doc.get("longest_streak", 0),
+        "last_completed_date": last_completed_date.isoformat() if last_completed_date else None,
+        "week_completions": week_completions,
+        "total_completed_days": doc.get("total_completed_days", 0),
+    }
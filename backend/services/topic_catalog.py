@@ -0,0 +1,54 @@
+"""
+Topic Catalog
+
+The practice topic catalog (see `build_topic_catalog`) only changes when the question
+bank does, so it is built once per bank version and kept as the serialized response
+body. Serving it costs no database access and no serialization.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from backend.models.api_responses import MissionResponse
+from backend.repositories.question_repository import QuestionRepository
+from backend.services.practice_service import get_available_practice_topics
+
+
+@dataclass
+class CatalogPayload:
+    version: str
+    body: bytes
+
+
+class TopicCatalogCache:
+    """Pre-serialized `/api/practice/topics` response, rebuilt when the bank version changes."""
+
+    def __init__(self):
+        self._payload: Optional[CatalogPayload] = None
+        self.builds = 0
+
+    async def get_payload(self, question_repo: QuestionRepository) -> CatalogPayload:
+        """Returns the cached response, building it first if the bank was (re)loaded since."""
+        payload = self._payload
+        version = QuestionRepository.loaded_bank_version()
+        if payload is not None and version == payload.version:
+            return payload
+
+        # Loads the bank if this process has not yet, which sets its version
+        topics = await get_available_practice_topics(question_repo)
+        body = MissionResponse(
+            status="success",
+            message="Practice topics retrieved successfully.",
+            data=topics
+        ).model_dump_json().encode()
+        payload = CatalogPayload(version=QuestionRepository.loaded_bank_version() or "", body=body)
+        self._payload = payload
+        self.builds += 1
+        return payload
+
+    def clear(self) -> None:
+        self._payload = None
+
+
+# Shared by all requests in this process
+topic_catalog = TopicCatalogCache()
@@ -8,4 +8,10 @@ def get_utc7_today_date() -> datetime.date:
 
 def get_current_time_in_target_timezone() -> datetime:
     """Gets the current time in the target timezone."""
-    return datetime.now(TARGET_TIMEZONE) 
\ No newline at end of file
+    return datetime.now(TARGET_TIMEZONE) 
+
+def get_utc7_date(value: datetime) -> datetime.date:
+    """Calendar date of a timestamp in UTC+7; naive timestamps are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(TARGET_TIMEZONE).date()
@@ -69,4 +69,18 @@ async def clean_collections(test_db_manager: DatabaseManager):
     yield
     
     # Optional: you could also clean up after the test if needed,
-    # but cleaning before is usually sufficient for isolation. 
\ No newline at end of file
+    # but cleaning before is usually sufficient for isolation. 
+
+def pytest_terminal_summary(terminalreporter):
+    """Prints the query-plan report if the plan regression suite ran in this session."""
+    from backend.tests.integration.query_plan_harness import PLAN_REPORT
+
+    if not PLAN_REPORT.entries:
+        return
+    report = PLAN_REPORT.render()
+    terminalreporter.write_sep("=", "query plans")
+    terminalreporter.write_line(report)
+
+    report_path = os.environ.get("QUERY_PLAN_REPORT")
+    if report_path:
+        Path(report_path).write_text(report + "\n", encoding="utf-8")
@@ -0,0 +1,283 @@
+"""
+Helpers for the query-plan regression suite.
+
+Repositories are pointed at a `RecordingCollection`, which forwards every call to
+the real Motor collection and remembers the shape of each query it issued. The
+recorded queries are then re-issued as `explain` commands so the winning plan and
+execution statistics can be checked and collected into a readable report.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+@dataclass
+class RecordedQuery:
+    """The shape of one command issued by a repository."""
+    operation: str  # find, aggregate, update, findAndModify, delete, count
+    collection: str
+    filter: Dict[str, Any] = field(default_factory=dict)
+    sort: Optional[Dict[str, int]] = None
+    skip: Optional[int] = None
+    limit: Optional[int] = None
+    pipeline: Optional[List[Dict[str, Any]]] = None
+    update: Optional[Dict[str, Any]] = None
+    upsert: bool = False
+    multi: bool = False
+
+    def to_explain_command(self) -> Dict[str, Any]:
+        """Builds the database command to pass to `explain`."""
+        if self.operation == "find":
+            command: Dict[str, Any] = {"find": self.collection, "filter": self.filter}
+            if self.sort:
+                command["sort"] = self.sort
+            if self.skip:
+                command["skip"] = self.skip
+            if self.limit:
+                command["limit"] = self.limit
+            return command
+        if self.operation == "aggregate":
+            return {"aggregate": self.collection, "pipeline": self.pipeline or [], "cursor": {}}
+        if self.operation == "update":
+            return {
+                "update": self.collection,
+                "updates": [{"q": self.filter, "u": self.update or {}, "upsert": self.upsert, "multi": self.multi}],
+            }
+        if self.operation == "findAndModify":
+            return {"findAndModify": self.collection, "query": self.filter, "update": self.update or {}, "upsert": self.upsert}
+        if self.operation == "delete":
+            return {"delete": self.collection, "deletes": [{"q": self.filter, "limit": 0 if self.multi else 1}]}
+        if self.operation == "count":
+            return {"count": self.collection, "query": self.filter}
+        raise ValueError(f"Cannot explain operation '{self.operation}'")
+
+
+class _RecordingCursor:
+    """Wraps a Motor cursor so that `sort`/`skip`/`limit` chained after `find` are recorded too."""
+
+    def __init__(self, cursor, query: RecordedQuery):
+        self._cursor = cursor
+        self._query = query
+
+    def sort(self, key, direction=None):
+        keys = [(key, direction)] if direction is not None else list(key)
+        self._query.sort = {**(self._query.sort or {}), **dict(keys)}
+        self._cursor = self._cursor.sort(key, direction) if direction is not None else self._cursor.sort(key)
+        return self
+
+    def skip(self, value: int):
+        self._query.skip = value
+        self._cursor = self._cursor.skip(value)
+        return self
+
+    def limit(self, value: int):
+        self._query.limit = value
+        self._cursor = self._cursor.limit(value)
+        return self
+
+    def __aiter__(self):
+        return self._cursor.__aiter__()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RecordingCollection:
+    """
+    Proxy around a Motor collection that records every query issued through it.
+    Anything not intercepted here is passed straight through.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.queries: List[RecordedQuery] = []
+
+    def _record(self, **kwargs) -> RecordedQuery:
+        query = RecordedQuery(collection=self._collection.name, **kwargs)
+        self.queries.append(query)
+        return query
+
+    def find(self, filter=None, *args, **kwargs):
+        query = self._record(operation="find", filter=filter or {})
+        return _RecordingCursor(self._collection.find(filter, *args, **kwargs), query)
+
+    async def find_one(self, filter=None, *args, **kwargs):
+        self._record(operation="find", filter=filter or {}, limit=1)
+        return await self._collection.find_one(filter, *args, **kwargs)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        self._record(operation="aggregate", pipeline=pipeline)
+        return self._collection.aggregate(pipeline, *args, **kwargs)
+
+    async def count_documents(self, filter, *args, **kwargs):
+        self._record(operation="count", filter=filter)
+        return await self._collection.count_documents(filter, *args, **kwargs)
+
+    async def update_one(self, filter, update, upsert=False, *args, **kwargs):
+        self._record(operation="update", filter=filter, update=update, upsert=upsert)
+        return await self._collection.update_one(filter, update, upsert, *args, **kwargs)
+
+    async def update_many(self, filter, update, upsert=False, *args, **kwargs):
+        self._record(operation="update", filter=filter, update=update, upsert=upsert, multi=True)
+        return await self._collection.update_many(filter, update, upsert, *args, **kwargs)
+
+    async def find_one_and_update(self, filter, update, *args, upsert=False, **kwargs):
+        self._record(operation="findAndModify", filter=filter, update=update, upsert=upsert)
+        return await self._collection.find_one_and_update(filter, update, *args, upsert=upsert, **kwargs)
+
+    async def delete_one(self, filter, *args, **kwargs):
+        self._record(operation="delete", filter=filter)
+        return await self._collection.delete_one(filter, *args, **kwargs)
+
+    async def delete_many(self, filter, *args, **kwargs):
+        self._record(operation="delete", filter=filter, multi=True)
+        return await self._collection.delete_many(filter, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+@dataclass
+class PlanSummary:
+    """The parts of an explain result the regression suite cares about."""
+    stages: List[str]
+    index_names: List[str]
+    keys_examined: int
+    docs_examined: int
+    n_returned: int
+
+    @property
+    def uses_collscan(self) -> bool:
+        return "COLLSCAN" in self.stages
+
+
+def _find_key(node: Any, key: str) -> Optional[Any]:
+    """Depth-first search for the first occurrence of `key` in a nested explain document."""
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _walk_plan(plan: Dict[str, Any], stages: List[str], index_names: List[str]):
+    # Slot-based engine output nests the classic tree under "queryPlan".
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+    if "stage" in plan:
+        stages.append(plan["stage"])
+    if "indexName" in plan:
+        index_names.append(plan["indexName"])
+    for child_key in ("inputStage", "outerStage", "innerStage"):
+        if child_key in plan:
+            _walk_plan(plan[child_key], stages, index_names)
+    for child in plan.get("inputStages", []):
+        _walk_plan(child, stages, index_names)
+
+
+def summarize_explain(explain: Dict[str, Any]) -> PlanSummary:
+    """
+    Reduces an explain result (find, aggregate, update, delete or count) to a PlanSummary.
+    Aggregations that were pushed down into the query layer keep their plan under a
+    `$cursor` stage, which the key search below finds without special casing.
+    """
+    query_planner = _find_key(explain, "queryPlanner") or {}
+    winning_plan = query_planner.get("winningPlan", {})
+    stages: List[str] = []
+    index_names: List[str] = []
+    _walk_plan(winning_plan, stages, index_names)
+
+    execution_stats = _find_key(explain, "executionStats") or {}
+    return PlanSummary(
+        stages=stages,
+        index_names=index_names,
+        keys_examined=execution_stats.get("totalKeysExamined", 0),
+        docs_examined=execution_stats.get("totalDocsExamined", 0),
+        n_returned=execution_stats.get("nReturned", 0),
+    )
+
+
+async def explain_query(db: AsyncIOMotorDatabase, query: RecordedQuery) -> PlanSummary:
+    """Runs `explain` with execution statistics for a recorded query."""
+    explain = await db.command({"explain": query.to_explain_command(), "verbosity": "executionStats"})
+    return summarize_explain(explain)
+
+
+@dataclass
+class PlanReportEntry:
+    label: str
+    query: RecordedQuery
+    summary: PlanSummary
+    expected_index: Optional[str]
+    problems: List[str]
+
+
+class PlanReport:
+    """Collects plan checks across the suite and renders them as a text table."""
+
+    def __init__(self):
+        self.entries: List[PlanReportEntry] = []
+
+    def add(self, entry: PlanReportEntry):
+        self.entries.append(entry)
+
+    def render(self) -> str:
+        header = f"{'query':<52} {'op':<9} {'plan':<28} {'index':<20} {'keys':>6} {'docs':>6} {'ret':>5}  result"
+        lines = ["Query plan report", "=" * len(header), header, "-" * len(header)]
+        for entry in self.entries:
+            summary = entry.summary
+            plan = ">".join(summary.stages)[:28]
+            index = ",".join(summary.index_names) or "-"
+            result = "ok" if not entry.problems else "FAIL: " + "; ".join(entry.problems)
+            lines.append(
+                f"{entry.label:<52} {entry.query.operation:<9} {plan:<28} {index:<20} "
+                f"{summary.keys_examined:>6} {summary.docs_examined:>6} {summary.n_returned:>5}  {result}"
+            )
+        return "\n".join(lines)
+
+
+def check_plan(
+    summary: PlanSummary,
+    expected_index: Optional[str],
+    max_keys_per_returned: float,
+    max_docs_per_returned: float,
+    expected_matches: Optional[int] = None,
+) -> List[str]:
+    """
+    Returns a list of human-readable problems with a plan; empty means it passed.
+
+    `expected_index=None` declares that a collection scan is intended (e.g. cache loads).
+    Ratios are taken against `nReturned`, or against `expected_matches` for aggregations
+    whose output (one `$group` row) says nothing about how many documents they needed.
+    """
+    problems = []
+    if expected_index is None:
+        return problems
+    if summary.uses_collscan:
+        problems.append("COLLSCAN")
+    if "IXSCAN" not in summary.stages and "IDHACK" not in summary.stages:
+        problems.append("no IXSCAN")
+    if expected_index not in summary.index_names:
+        problems.append(f"expected index '{expected_index}', got {summary.index_names or 'none'}")
+
+    returned = max(expected_matches if expected_matches is not None else summary.n_returned, 1)
+    keys_ratio = summary.keys_examined / returned
+    docs_ratio = summary.docs_examined / returned
+    if keys_ratio > max_keys_per_returned:
+        problems.append(f"keys/returned {keys_ratio:.1f} > {max_keys_per_returned}")
+    if docs_ratio > max_docs_per_returned:
+        problems.append(f"docs/returned {docs_ratio:.1f} > {max_docs_per_returned}")
+    return problems
+
+
+# Shared across the test module and the terminal summary hook in conftest.py
+PLAN_REPORT = PlanReport()
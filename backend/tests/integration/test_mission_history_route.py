@@ -0,0 +1,45 @@
+from datetime import date
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock
+
+from backend.routes.missions import router as missions_router
+from backend.dependencies import get_mission_repository
+from backend.models.daily_mission import MissionStatus, MissionSummary
+
+# The repository is mocked, so these tests run without a database
+app = FastAPI()
+app.include_router(missions_router, prefix="/api")
+client = TestClient(app)
+
+mission_repo = AsyncMock()
+mission_repo.get_mission_summaries.return_value = [
+    MissionSummary(date=date(2024, 3, 1), status=MissionStatus.COMPLETE, question_count=5, correct_count=4)
+]
+app.dependency_overrides[get_mission_repository] = lambda: mission_repo
+
+
+def test_history_of_past_days_is_cacheable_and_revalidates():
+    response = client.get("/api/missions/history/user1", params={"from": "2024-03-01", "to": "2024-03-07"})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["days"] == [{"date": "2024-03-01", "status": "complete", "correct": 4, "total": 5}]
+    assert "immutable" in response.headers["cache-control"]
+
+    revalidated = client.get(
+        "/api/missions/history/user1",
+        params={"from": "2024-03-01", "to": "2024-03-07"},
+        headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+def test_history_including_today_is_short_lived():
+    response = client.get("/api/missions/history/user1")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=60"
+
+def test_reversed_range_is_rejected():
+    response = client.get("/api/missions/history/user1", params={"from": "2024-03-07", "to": "2024-03-01"})
+
+    assert response.status_code == 400
@@ -0,0 +1,112 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from unittest.mock import AsyncMock
+
+from backend.routes.practice import router as practice_router
+from backend.dependencies import get_practice_repository, get_question_repository, get_progress_recorder
+from backend.models.daily_mission import Question, ChoiceOption
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+
+# The repositories are mocked, so these tests run without a database
+app = FastAPI()
+app.include_router(practice_router, prefix="/api")
+client = TestClient(app)
+
+
+def _session() -> PracticeSession:
+    questions = [
+        Question(
+            question_id=f"q{i}",
+            question_text=f"Question {i}?",
+            skill_area="Math",
+            difficulty_level=1,
+            choices=[ChoiceOption(id="a", text="A"), ChoiceOption(id="b", text="B")],
+            correct_answer_id="b",
+            feedback_th="fb"
+        )
+        for i in range(1, 3)
+    ]
+    return PracticeSession(session_id="PRACTICE_WS", user_id="user1", topic="Math", question_count=2, questions=questions)
+
+@pytest.fixture
+def practice_repo():
+    repo = AsyncMock()
+    repo.find_session.return_value = _session()
+    return repo
+
+@pytest.fixture
+def recorder():
+    return AsyncMock()
+
+@pytest.fixture(autouse=True)
+def override_dependencies(practice_repo, recorder):
+    app.dependency_overrides[get_practice_repository] = lambda: practice_repo
+    app.dependency_overrides[get_question_repository] = lambda: AsyncMock()
+    app.dependency_overrides[get_progress_recorder] = lambda: recorder
+    yield
+    app.dependency_overrides = {}
+
+
+def test_session_runs_over_one_connection_with_one_write(practice_repo, recorder):
+    with client.websocket_connect("/api/practice/sessions/PRACTICE_WS/ws") as ws:
+        assert ws.receive_json()["type"] == "session"
+        assert ws.receive_json()["question"]["question_id"] == "q1"
+
+        ws.send_json({"type": "answer", "question_id": "q1", "answer": "b"})
+        assert ws.receive_json()["data"]["is_correct"] is True
+        assert ws.receive_json() == {"type": "progress", "answered": 1, "total": 2, "correct": 1}
+        assert ws.receive_json()["question"]["question_id"] == "q2"
+        practice_repo.update_session.assert_not_called()
+        recorder.practice_answer_submitted.assert_not_called()
+
+        ws.send_json({"type": "answer", "question_id": "q2", "answer": "a"})
+        assert ws.receive_json()["data"]["is_correct"] is False
+        assert ws.receive_json()["answered"] == 2
+        summary = ws.receive_json()
+        assert summary["type"] == "summary"
+        assert summary["data"]["correct_answers"] == 1
+
+    practice_repo.find_session.assert_awaited_once_with("PRACTICE_WS")
+    practice_repo.update_session.assert_awaited_once()
+    assert practice_repo.update_session.call_args.args[0].status == PracticeSessionStatus.COMPLETED
+    recorder.practice_session_completed.assert_awaited_once()
+    # Each answer is reported once the session is saved, with the answers up to it
+    reported = [call.args[0] for call in recorder.practice_answer_submitted.await_args_list]
+    assert [[answer.question_id for answer in session.answers] for session in reported] == [["q1"], ["q1", "q2"]]
+
+def test_disconnect_saves_unsaved_answers(practice_repo, recorder):
+    with client.websocket_connect("/api/practice/sessions/PRACTICE_WS/ws") as ws:
+        ws.receive_json()
+        ws.receive_json()
+        ws.send_json({"type": "answer", "question_id": "q1", "answer": "b"})
+        ws.receive_json()
+        ws.receive_json()
+        ws.receive_json()
+
+    saved = practice_repo.update_session.call_args.args[0]
+    assert len(saved.answers) == 1
+    assert saved.status == PracticeSessionStatus.IN_PROGRESS
+    recorder.practice_session_completed.assert_not_called()
+    recorder.practice_answer_submitted.assert_awaited_once()
+
+def test_invalid_frames_get_error_frames(practice_repo):
+    with client.websocket_connect("/api/practice/sessions/PRACTICE_WS/ws") as ws:
+        ws.receive_json()
+        ws.receive_json()
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"type": "answer", "question_id": "missing", "answer": "b"})
+        assert ws.receive_json()["type"] == "error"
+
+    practice_repo.update_session.assert_not_called()
+
+def test_missing_session_closes_with_not_found(practice_repo):
+    practice_repo.find_session.return_value = None
+
+    with client.websocket_connect("/api/practice/sessions/UNKNOWN/ws") as ws:
+        assert ws.receive_json()["type"] == "error"
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_json()
+    assert exc_info.value.code == 4404
@@ -0,0 +1,577 @@
+"""
+Query-plan regression suite.
+
+Runs every MissionRepository, PracticeRepository, QuestionRepository, MistakeRepository,
+ReviewScheduleRepository, StreakRepository, LeaderboardRepository, ProgressRollupRepository,
+AnalyticsRepository and ItemStatsRepository query against a seeded local mongod, captures
+`explain("executionStats")` for each command the repository issued, and asserts the plan shape: an IXSCAN on the expected index and a bounded ratio of
+keys/documents examined to documents returned. A readable report is printed at the end of
+the run (and written to $QUERY_PLAN_REPORT when set).
+
+Needs only a local mongod (MONGO_DB_URI, default mongodb://localhost:27017); the tests skip
+when none is reachable.
+"""
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Optional
+
+import pytest
+import pytest_asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Question, ChoiceOption
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.repositories.mission_repository import MissionRepository
+from backend.repositories.practice_repository import PracticeRepository
+from backend.repositories.question_repository import QuestionRepository
+from backend.repositories.mistake_repository import MistakeRepository
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository
+from backend.repositories.streak_repository import StreakRepository
+from backend.repositories.leaderboard_repository import LeaderboardRepository
+from backend.repositories.progress_rollup_repository import ProgressRollupRepository
+from backend.repositories.analytics_repository import AnalyticsRepository
+from backend.repositories.item_stats_repository import ItemStatsRepository
+from backend.tests.integration.query_plan_harness import (
+    PLAN_REPORT,
+    PlanReportEntry,
+    RecordingCollection,
+    check_plan,
+    explain_query,
+    summarize_explain,
+)
+
+MONGO_URI = os.environ.get("MONGO_DB_URI", "mongodb://localhost:27017")
+PLAN_DB_NAME = "edtech_query_plans"
+
+# Plan thresholds: a healthy indexed query examines about one key and one document per
+# result, plus a few boundary keys for multi-interval scans such as `$nin`.
+MAX_KEYS_PER_RETURNED = 2.0
+MAX_DOCS_PER_RETURNED = 1.5
+
+SEED_USERS = 20
+SEED_MISSION_DAYS = 30
+SEED_SESSIONS_PER_USER = 15
+SEED_BASE_DATE = date(2024, 1, 1)
+
+
+def _seed_question(index: int) -> Question:
+    return Question(
+        question_id=f"PLANQ{index:03d}",
+        question_text=f"Plan question {index}",
+        skill_area="Vocabulary" if index % 2 else "Analogies",
+        difficulty_level=index % 3 + 1,
+        choices=[ChoiceOption(id="a", text="A"), ChoiceOption(id="b", text="B")],
+        correct_answer_id="a",
+        feedback_th="feedback",
+    )
+
+
+def _seed_mission_status(day: int) -> MissionStatus:
+    if day >= SEED_MISSION_DAYS - 2:
+        return MissionStatus.NOT_STARTED
+    return [MissionStatus.ARCHIVED, MissionStatus.COMPLETE, MissionStatus.COMPLETE, MissionStatus.IN_PROGRESS][day % 4]
+
+
+def _seed_session_status(index: int) -> PracticeSessionStatus:
+    return PracticeSessionStatus.IN_PROGRESS if index % 3 == 0 else PracticeSessionStatus.COMPLETED
+
+
+async def _seed(db):
+    questions = [_seed_question(i) for i in range(5)]
+
+    missions = []
+    for user in range(SEED_USERS):
+        for day in range(SEED_MISSION_DAYS):
+            mission_data = DailyMissionDocument(
+                user_id=f"user_{user}",
+                date=SEED_BASE_DATE + timedelta(days=day),
+                questions=questions,
+                status=_seed_mission_status(day),
+            ).model_dump()
+            mission_data["date"] = datetime.combine(mission_data["date"], datetime.min.time())
+            mission_data["updated_at"] = mission_data["date"] + timedelta(hours=12)
+            missions.append(mission_data)
+    await db["missions"].insert_many(missions)
+
+    sessions = []
+    for user in range(SEED_USERS):
+        for index in range(SEED_SESSIONS_PER_USER):
+            sessions.append(PracticeSession(
+                session_id=f"PRACTICE_U{user}_S{index}",
+                user_id=f"user_{user}",
+                topic="Vocabulary",
+                question_count=len(questions),
+                questions=questions,
+                status=_seed_session_status(index),
+                created_at=datetime(2024, 1, 1) + timedelta(hours=user * 100 + index),
+                updated_at=datetime(2024, 1, 1) + timedelta(hours=user * 100 + index),
+            ).model_dump())
+    await db["practice_sessions"].insert_many(sessions)
+
+    # Every question of a complete/archived mission is recorded as a mistake
+    mistakes = []
+    for mission_data in missions:
+        if mission_data["status"] not in (MissionStatus.COMPLETE, MissionStatus.ARCHIVED):
+            continue
+        for question in questions:
+            mistakes.append({
+                "user_id": mission_data["user_id"],
+                "source": "mission",
+                "source_id": mission_data["date"].date().isoformat(),
+                "question_id": question.question_id,
+                "skill_area": question.skill_area,
+                "mission_date": mission_data["date"],
+            })
+    await db["mistakes"].insert_many(mistakes)
+
+    # Each question is scheduled once per user, due on successive days
+    schedule = []
+    for user in range(SEED_USERS):
+        for index, question in enumerate(questions):
+            schedule.append({
+                "user_id": f"user_{user}",
+                "question_id": question.question_id,
+                "mistake": {
+                    "question_id": question.question_id,
+                    "question_text": question.question_text,
+                    "skill_area": question.skill_area,
+                    "difficulty_level": question.difficulty_level,
+                    "choices": [],
+                    "user_answer_id": "b",
+                    "user_answer_text": "b",
+                    "correct_answer_id": question.correct_answer_id,
+                    "correct_answer_text": question.correct_answer_id,
+                    "explanation": question.feedback_th,
+                    "mission_date": datetime.combine(SEED_BASE_DATE, datetime.min.time()),
+                    "mission_completion_date": datetime.combine(SEED_BASE_DATE, datetime.min.time()),
+                    "attempt_count": 1,
+                },
+                "ease_factor": 2.5,
+                "interval_days": 0,
+                "repetitions": 0,
+                "review_count": 0,
+                "next_review_at": datetime.combine(SEED_BASE_DATE + timedelta(days=index), datetime.min.time()),
+            })
+    await db["review_schedule"].insert_many(schedule)
+
+    # Each user last completed a mission on a successive day, all on a live streak
+    await db["user_streaks"].insert_many([
+        {
+            "_id": f"user_{user}",
+            "current_streak": 1,
+            "longest_streak": 1,
+            "last_completed_date": datetime.combine(SEED_BASE_DATE + timedelta(days=user), datetime.min.time()),
+        }
+        for user in range(SEED_USERS)
+    ])
+
+    # Every user has a score in two weekly periods
+    await db["leaderboard_scores"].insert_many([
+        {
+            "_id": f"{period}:user_{user}",
+            "period": period,
+            "user_id": f"user_{user}",
+            "missions_completed": user % 7,
+            "questions": 35,
+            "correct": user,
+            "accuracy": user / 35,
+            "updated_at": datetime.combine(SEED_BASE_DATE + timedelta(days=user % 7), datetime.min.time()),
+        }
+        for period in ("2024-01-01", "2024-01-08")
+        for user in range(SEED_USERS)
+    ])
+
+    # One progress rollup per user and mission day
+    await db["progress_daily_rollups"].insert_many([
+        {
+            "_id": f"user_{user}:{(SEED_BASE_DATE + timedelta(days=day)).isoformat()}",
+            "user_id": f"user_{user}",
+            "day": datetime.combine(SEED_BASE_DATE + timedelta(days=day), datetime.min.time()),
+            "attempts": 5,
+            "correct": 3,
+            "time_spent_seconds": 120,
+            "by_skill": {"Vocabulary": {"attempts": 5, "correct": 3, "time_spent_seconds": 120}},
+        }
+        for user in range(SEED_USERS)
+        for day in range(SEED_MISSION_DAYS)
+    ])
+
+    # Hourly and daily platform analytics for every mission day
+    await db["analytics_rollups"].insert_many([
+        {
+            "_id": f"{granularity}:{period}",
+            "granularity": granularity,
+            "period": period,
+            "missions_generated": SEED_USERS,
+        }
+        for day in range(SEED_MISSION_DAYS)
+        for granularity, period in [("day", (SEED_BASE_DATE + timedelta(days=day)).isoformat())] + [
+            ("hour", f"{(SEED_BASE_DATE + timedelta(days=day)).isoformat()}T{hour:02d}") for hour in range(24)
+        ]
+    ])
+
+    # Live item counters for every seeded question, over 8 shards
+    await db["question_item_counters"].insert_many([
+        {
+            "_id": f"{question.question_id}:{shard}",
+            "question_id": question.question_id,
+            "shard": shard,
+            "attempts": 10,
+            "first_attempts": 8,
+            "first_correct": 5,
+        }
+        for question in questions
+        for shard in range(8)
+    ])
+
+
+@pytest_asyncio.fixture
+async def plan_db():
+    """A freshly seeded, indexed database on the local mongod."""
+    client = AsyncIOMotorClient(MONGO_URI, serverSelectionTimeoutMS=1000)
+    try:
+        await client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip(f"No local mongod reachable at {MONGO_URI}")
+
+    await client.drop_database(PLAN_DB_NAME)
+    db = client[PLAN_DB_NAME]
+    await MissionRepository(db).ensure_indexes()
+    await PracticeRepository(db).ensure_indexes()
+    await QuestionRepository(db).ensure_indexes()
+    await MistakeRepository(db).ensure_indexes()
+    await ReviewScheduleRepository(db).ensure_indexes()
+    await StreakRepository(db).ensure_indexes()
+    await LeaderboardRepository(db).ensure_indexes()
+    await ProgressRollupRepository(db).ensure_indexes()
+    await AnalyticsRepository(db).ensure_indexes()
+    await ItemStatsRepository(db).ensure_indexes()
+    await _seed(db)
+
+    yield db
+
+    await client.drop_database(PLAN_DB_NAME)
+    client.close()
+
+
+@dataclass
+class PlanCase:
+    label: str
+    repository: type
+    call: Callable[[Any], Awaitable[Any]]
+    # One entry per command the call issues; None means a collection scan is intended.
+    expected_indexes: List[Optional[str]]
+    # For aggregations that collapse to one row, the number of documents they must read.
+    expected_matches: Optional[int] = None
+
+    def __str__(self):
+        return self.label
+
+
+async def _save_existing_mission(repo: MissionRepository):
+    mission = await repo.find_mission("user_2", SEED_BASE_DATE + timedelta(days=3))
+    repo.collection.queries.clear()  # only the write is under test
+    mission.current_question_index = 1
+    await repo.save_mission(mission)
+
+
+async def _update_existing_session(repo: PracticeRepository):
+    session = await repo.find_session("PRACTICE_U4_S3")
+    repo.collection.queries.clear()  # only the write is under test
+    await repo.update_session(session)
+
+
+async def _second_session_page(repo: PracticeRepository):
+    first_page = await repo.get_user_session_summaries("user_5", limit=5)
+    repo.collection.queries.clear()  # only the keyset page is under test
+    last = first_page[-1]
+    await repo.get_user_session_summaries("user_5", limit=5, after=(last.created_at, last.session_id))
+
+
+async def _second_mistake_page(repo: MistakeRepository):
+    _, next_key = await repo.find_mistakes("user_8", limit=10)
+    repo.collection.queries.clear()  # only the keyset page is under test
+    await repo.find_mistakes("user_8", limit=10, after=next_key)
+
+
+async def _drain(documents):
+    return [document async for document in documents]
+
+
+REVIEW_MISSIONS_PER_USER = sum(
+    1 for day in range(SEED_MISSION_DAYS)
+    if _seed_mission_status(day) in (MissionStatus.COMPLETE, MissionStatus.ARCHIVED)
+)
+
+PLAN_CASES = [
+    PlanCase(
+        "MissionRepository.find_mission",
+        MissionRepository,
+        lambda repo: repo.find_mission("user_1", SEED_BASE_DATE + timedelta(days=5)),
+        ["user_date"],
+    ),
+    PlanCase("MissionRepository.save_mission", MissionRepository, _save_existing_mission, ["user_date"]),
+    PlanCase(
+        "MissionRepository.get_missions_to_archive",
+        MissionRepository,
+        lambda repo: repo.get_missions_to_archive(SEED_BASE_DATE + timedelta(days=SEED_MISSION_DAYS)),
+        ["status_date"],
+    ),
+    PlanCase(
+        "MissionRepository.find_missions_by_status",
+        MissionRepository,
+        lambda repo: repo.find_missions_by_status("user_3", MissionStatus.COMPLETE),
+        ["user_status_date"],
+    ),
+    PlanCase(
+        "MissionRepository.get_mission_summaries",
+        MissionRepository,
+        lambda repo: repo.get_mission_summaries("user_3", SEED_BASE_DATE, SEED_BASE_DATE + timedelta(days=6)),
+        ["user_date"],
+    ),
+    PlanCase(
+        "MissionRepository.aggregate_review_mistakes",
+        MissionRepository,
+        lambda repo: repo.aggregate_review_mistakes("user_3", limit=10),
+        ["user_status_date"],
+        expected_matches=REVIEW_MISSIONS_PER_USER,
+    ),
+    PlanCase(
+        "MissionRepository.aggregate_grouped_review_mistakes",
+        MissionRepository,
+        lambda repo: repo.aggregate_grouped_review_mistakes("user_3", "date", limit=10),
+        ["user_status_date"],
+        expected_matches=REVIEW_MISSIONS_PER_USER,
+    ),
+    PlanCase(
+        "PracticeRepository.find_session",
+        PracticeRepository,
+        lambda repo: repo.find_session("PRACTICE_U1_S1"),
+        ["session_id"],
+    ),
+    PlanCase("PracticeRepository.update_session", PracticeRepository, _update_existing_session, ["session_id"]),
+    PlanCase(
+        "PracticeRepository.get_user_session_summaries",
+        PracticeRepository,
+        lambda repo: repo.get_user_session_summaries("user_5", limit=10),
+        ["user_created_session"],
+    ),
+    PlanCase(
+        "PracticeRepository.get_user_session_summaries(status)",
+        PracticeRepository,
+        lambda repo: repo.get_user_session_summaries("user_5", PracticeSessionStatus.COMPLETED, limit=10),
+        ["user_status_created_session"],
+    ),
+    PlanCase(
+        "PracticeRepository.get_user_session_summaries(after)",
+        PracticeRepository,
+        _second_session_page,
+        ["user_created_session"],
+    ),
+    PlanCase(
+        "PracticeRepository.delete_session",
+        PracticeRepository,
+        lambda repo: repo.delete_session("PRACTICE_U7_S2"),
+        ["session_id"],
+    ),
+    PlanCase(
+        "MistakeRepository.find_mistakes",
+        MistakeRepository,
+        lambda repo: repo.find_mistakes("user_8", limit=10),
+        ["user_mission_date"],
+    ),
+    PlanCase(
+        "MistakeRepository.find_mistakes(skill_area)",
+        MistakeRepository,
+        lambda repo: repo.find_mistakes("user_8", "Vocabulary", limit=10),
+        ["user_skill_mission_date"],
+    ),
+    PlanCase(
+        "MistakeRepository.find_mistakes(after)",
+        MistakeRepository,
+        _second_mistake_page,
+        ["user_mission_date"],
+    ),
+    PlanCase(
+        "MistakeRepository.find_mistake_groups(topic)",
+        MistakeRepository,
+        lambda repo: repo.find_mistake_groups("user_8", "topic", after="Analogies", limit=1),
+        ["user_skill_mission_date"],
+    ),
+    PlanCase(
+        "MistakeRepository.find_mistakes_in_groups(date)",
+        MistakeRepository,
+        lambda repo: repo.find_mistakes_in_groups(
+            "user_9", "date", [datetime.combine(SEED_BASE_DATE + timedelta(days=day), datetime.min.time()) for day in (1, 2)]
+        ),
+        ["user_mission_date"],
+    ),
+    PlanCase(
+        "MistakeRepository.summarize_questions(skill_area)",
+        MistakeRepository,
+        lambda repo: repo.summarize_questions("user_6", "Vocabulary", window=20),
+        ["user_skill_mission_date"],
+    ),
+    PlanCase(
+        "ReviewScheduleRepository.find_due",
+        ReviewScheduleRepository,
+        lambda repo: repo.find_due("user_3", datetime.combine(SEED_BASE_DATE + timedelta(days=2), datetime.min.time()), limit=2),
+        ["user_next_review"],
+    ),
+    PlanCase(
+        "ReviewScheduleRepository.grade_item",
+        ReviewScheduleRepository,
+        lambda repo: repo.grade_item("user_3", "PLANQ001", 4, datetime(2024, 6, 1)),
+        ["user_question"],
+    ),
+    PlanCase(
+        "StreakRepository.reset_broken_streaks",
+        StreakRepository,
+        lambda repo: repo.reset_broken_streaks(SEED_BASE_DATE + timedelta(days=10)),
+        ["last_completed_date"],
+    ),
+    PlanCase(
+        "LeaderboardRepository.get_period_scores",
+        LeaderboardRepository,
+        lambda repo: repo.get_period_scores("2024-01-08"),
+        ["period_missions_accuracy"],
+    ),
+    PlanCase(
+        "LeaderboardRepository.get_top_scores",
+        LeaderboardRepository,
+        lambda repo: repo.get_top_scores("2024-01-08", 10),
+        ["period_missions_accuracy"],
+    ),
+    PlanCase(
+        "LeaderboardRepository.count_scores",
+        LeaderboardRepository,
+        lambda repo: repo.count_scores("2024-01-08"),
+        ["period_missions_accuracy"],
+    ),
+    PlanCase(
+        "LeaderboardRepository.count_scores_above",
+        LeaderboardRepository,
+        lambda repo: repo.count_scores_above("2024-01-08", 3, 0.1),
+        ["period_missions_accuracy"],
+    ),
+    PlanCase(
+        "LeaderboardRepository.get_period_scores_updated_since",
+        LeaderboardRepository,
+        lambda repo: repo.get_period_scores_updated_since(
+            "2024-01-08", datetime.combine(SEED_BASE_DATE + timedelta(days=5), datetime.min.time())
+        ),
+        ["period_updated_at"],
+    ),
+    PlanCase(
+        "ProgressRollupRepository.get_rollups",
+        ProgressRollupRepository,
+        lambda repo: repo.get_rollups("user_7", SEED_BASE_DATE + timedelta(days=10), SEED_BASE_DATE + timedelta(days=16)),
+        ["user_day"],
+    ),
+    PlanCase(
+        "MissionRepository.iter_missions_updated_since",
+        MissionRepository,
+        lambda repo: _drain(repo.iter_missions_updated_since(
+            datetime.combine(SEED_BASE_DATE + timedelta(days=SEED_MISSION_DAYS - 2), datetime.min.time())
+        )),
+        ["updated_at"],
+    ),
+    PlanCase(
+        "PracticeRepository.iter_sessions_updated_since",
+        PracticeRepository,
+        lambda repo: _drain(repo.iter_sessions_updated_since(datetime(2024, 1, 1) + timedelta(hours=1800))),
+        ["updated_at"],
+    ),
+    PlanCase(
+        "AnalyticsRepository.get_rollups(day)",
+        AnalyticsRepository,
+        lambda repo: repo.get_rollups("day", "2024-01-08", "2024-01-14"),
+        ["granularity_period"],
+    ),
+    PlanCase(
+        "ItemStatsRepository.get_counters",
+        ItemStatsRepository,
+        lambda repo: repo.get_counters("PLANQ002"),
+        ["question_id"],
+    ),
+    # The question bank is loaded into memory once; count + full read are intended scans.
+    PlanCase(
+        "QuestionRepository._initialize_if_needed",
+        QuestionRepository,
+        lambda repo: repo.get_all_questions(),
+        [None, None],
+    ),
+]
+
+
+@pytest.mark.parametrize("case", PLAN_CASES, ids=str)
+@pytest.mark.asyncio
+async def test_repository_query_plan(plan_db, case: PlanCase):
+    repo = case.repository(plan_db)
+    if isinstance(repo, QuestionRepository):
+        repo._questions_cache = {}  # the cache is shared at class level; force a real load
+    recorder = RecordingCollection(repo.collection)
+    repo.collection = recorder
+
+    await case.call(repo)
+
+    assert len(recorder.queries) == len(case.expected_indexes), (
+        f"{case.label} issued {len(recorder.queries)} commands, expected {len(case.expected_indexes)}"
+    )
+
+    failures = []
+    for query, expected_index in zip(recorder.queries, case.expected_indexes):
+        summary = await explain_query(plan_db, query)
+        problems = check_plan(
+            summary,
+            expected_index,
+            MAX_KEYS_PER_RETURNED,
+            MAX_DOCS_PER_RETURNED,
+            expected_matches=case.expected_matches,
+        )
+        PLAN_REPORT.add(PlanReportEntry(case.label, query, summary, expected_index, problems))
+        failures.extend(problems)
+
+    assert not failures, f"{case.label}: {failures}"
+
+
+def test_summarize_explain_reads_nested_aggregate_plan():
+    """The summary must find the plan under `$cursor` and unwrap slot-based `queryPlan` nodes."""
+    explain = {
+        "stages": [
+            {"$cursor": {
+                "queryPlanner": {"winningPlan": {"queryPlan": {
+                    "stage": "FETCH",
+                    "inputStage": {"stage": "IXSCAN", "indexName": "user_status_created"},
+                }}},
+                "executionStats": {"nReturned": 10, "totalKeysExamined": 10, "totalDocsExamined": 10},
+            }},
+            {"$group": {}},
+        ]
+    }
+
+    summary = summarize_explain(explain)
+
+    assert summary.stages == ["FETCH", "IXSCAN"]
+    assert summary.index_names == ["user_status_created"]
+    assert check_plan(summary, "user_status_created", MAX_KEYS_PER_RETURNED, MAX_DOCS_PER_RETURNED) == []
+
+
+def test_check_plan_flags_collscan_and_wasted_keys():
+    collscan = summarize_explain({
+        "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+        "executionStats": {"nReturned": 1, "totalKeysExamined": 0, "totalDocsExamined": 500},
+    })
+    problems = check_plan(collscan, "user_date", MAX_KEYS_PER_RETURNED, MAX_DOCS_PER_RETURNED)
+    assert "COLLSCAN" in problems
+    assert any(p.startswith("docs/returned") for p in problems)
+
+    wide_scan = summarize_explain({
+        "queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_date"}}},
+        "executionStats": {"nReturned": 1, "totalKeysExamined": 30, "totalDocsExamined": 1},
+    })
+    problems = check_plan(wide_scan, "user_date", MAX_KEYS_PER_RETURNED, MAX_DOCS_PER_RETURNED)
+    assert problems == ["keys/returned 30.0 > 2.0"]
@@ -0,0 +1,93 @@
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from backend.repositories.analytics_repository import AnalyticsRepository
+
+UPTO = datetime(2024, 3, 27, 10, 0)
+
+
+@pytest.fixture
+def mock_db():
+    """Fixture to create a mock database with one mock collection per name."""
+    collections = {}
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: collections.setdefault(name, AsyncMock())
+    return db
+
+@pytest.fixture
+def analytics_repository(mock_db):
+    """Fixture to create an AnalyticsRepository instance with a mock database."""
+    return AnalyticsRepository(db=mock_db)
+
+@pytest.mark.asyncio
+async def test_apply_increments_guards_each_bucket_with_the_window(analytics_repository):
+    written = await analytics_repository.apply_increments(
+        {("day", "2024-03-27"): {"missions_generated": 2}, ("hour", "2024-03-27T09"): {}}, UPTO
+    )
+
+    assert written == 1
+    [operation] = analytics_repository.collection.bulk_write.call_args.args[0]
+    assert operation._filter == {"_id": "day:2024-03-27", "applied_through": {"$ne": UPTO}}
+    assert operation._doc["$inc"] == {"missions_generated": 2}
+    assert operation._doc["$set"]["applied_through"] == UPTO
+    assert analytics_repository.collection.bulk_write.call_args.kwargs == {"ordered": False}
+
+@pytest.mark.asyncio
+async def test_apply_increments_skips_buckets_already_applied(analytics_repository):
+    analytics_repository.collection.bulk_write.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key"}]}
+    )
+
+    # A retried window: the bucket already has its counters
+    assert await analytics_repository.apply_increments({("day", "2024-03-27"): {"mission_attempts": 1}}, UPTO) == 1
+
+    analytics_repository.collection.bulk_write.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 2, "errmsg": "bad value"}]}
+    )
+    with pytest.raises(BulkWriteError):
+        await analytics_repository.apply_increments({("day", "2024-03-27"): {"mission_attempts": 1}}, UPTO)
+
+@pytest.mark.asyncio
+async def test_active_users_are_idempotent_upserts(analytics_repository):
+    await analytics_repository.add_active_users({(date(2024, 3, 27), "user1")})
+
+    [operation] = analytics_repository.active_users.bulk_write.call_args.args[0]
+    assert operation._filter == {"_id": "2024-03-27:user1"}
+    assert operation._doc == {"$setOnInsert": {"day": "2024-03-27", "user_id": "user1"}}
+
+@pytest.mark.asyncio
+async def test_claim_run_is_one_atomic_update_unless_claimed(analytics_repository):
+    now = UPTO + timedelta(minutes=2)
+    analytics_repository.state.find_one_and_update.return_value = {"_id": "rollup", "pending_upto": UPTO}
+
+    state = await analytics_repository.claim_run("run1", UPTO, now, timedelta(minutes=10))
+
+    assert state == {"_id": "rollup", "pending_upto": UPTO}
+    query, pipeline = analytics_repository.state.find_one_and_update.call_args.args
+    assert query == {"_id": "rollup", "$or": [{"lease_until": None}, {"lease_until": {"$lte": now}}]}
+    # An interrupted run's window is kept so the retry reapplies exactly that window
+    assert pipeline[0]["$set"] == {
+        "owner": "run1", "lease_until": now + timedelta(minutes=10), "pending_upto": {"$ifNull": ["$pending_upto", UPTO]}
+    }
+    assert analytics_repository.state.find_one_and_update.call_args.kwargs == {
+        "upsert": True, "return_document": ReturnDocument.AFTER
+    }
+
+    # A held claim makes the upsert collide with the existing state document
+    analytics_repository.state.find_one_and_update.side_effect = DuplicateKeyError("E11000 duplicate key error")
+    assert await analytics_repository.claim_run("run2", UPTO, now, timedelta(minutes=10)) is None
+
+@pytest.mark.asyncio
+async def test_finish_run_advances_watermark_and_releases_the_claim(analytics_repository):
+    await analytics_repository.finish_run("run1", UPTO, {"buckets_written": 3})
+
+    query, update = analytics_repository.state.update_one.call_args.args
+    assert query == {"_id": "rollup", "owner": "run1"}
+    assert update == {
+        "$set": {"watermark": UPTO, "last_run": {"buckets_written": 3}},
+        "$unset": {"pending_upto": "", "owner": "", "lease_until": ""},
+    }
@@ -0,0 +1,96 @@
+import math
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.repositories.irt_repository import IrtRepository, ability_step_pipeline
+from backend.services.irt import ability_step
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def irt_repository(mock_db_collection):
+    """Fixture to create an IrtRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return IrtRepository(db=mock_db)
+
+
+def _evaluate(expression, doc):
+    """Evaluates the aggregation operators used by ability_step_pipeline."""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return doc.get(expression[1:])
+    if not isinstance(expression, dict):
+        return expression
+    [(operator, args)] = expression.items()
+    if operator == "$exp":
+        return math.exp(_evaluate(args, doc))
+    values = [_evaluate(arg, doc) for arg in args]
+    if operator == "$ifNull":
+        return values[0] if values[0] is not None else values[1]
+    if operator == "$add":
+        return sum(values)
+    if operator == "$multiply":
+        return math.prod(values)
+    if operator == "$subtract":
+        return values[0] - values[1]
+    if operator == "$divide":
+        return values[0] / values[1]
+    if operator == "$min":
+        return min(values)
+    raise AssertionError(f"unexpected operator {operator}")
+
+
+def _apply(pipeline, doc):
+    for stage in pipeline:
+        if "$unset" in stage:
+            for field in stage["$unset"]:
+                doc.pop(field, None)
+        else:
+            doc.update({
+                field: _evaluate(value, doc)
+                for field, value in stage["$set"].items() if value != "$$NOW"
+            })
+    return doc
+
+
+@pytest.mark.parametrize("doc", [{}, {"theta": 0.8, "precision": 12.0, "responses": 40}])
+@pytest.mark.parametrize("is_correct", [True, False])
+def test_pipeline_matches_ability_step(doc, is_correct):
+    updated = _apply(ability_step_pipeline(1.3, 0.5, is_correct, 50.0), dict(doc))
+
+    theta, precision = ability_step(doc.get("theta", 0.0), doc.get("precision", 1.0), 1.3, 0.5, is_correct, 50.0)
+    assert updated["theta"] == pytest.approx(theta)
+    assert updated["precision"] == pytest.approx(precision)
+    assert updated["responses"] == doc.get("responses", 0) + 1
+    assert "_p" not in updated and "_information" not in updated
+
+@pytest.mark.asyncio
+async def test_record_response_is_one_atomic_pipeline_upsert(irt_repository, mock_db_collection):
+    await irt_repository.record_response("user1", 1.3, 0.5, True, 50.0)
+
+    mock_db_collection.update_one.assert_awaited_once()
+    query, update = mock_db_collection.update_one.call_args.args
+    assert query == {"_id": "user1"}
+    assert update == ability_step_pipeline(1.3, 0.5, True, 50.0)
+    assert mock_db_collection.update_one.call_args.kwargs == {"upsert": True}
+
+@pytest.mark.asyncio
+async def test_write_calibration_writes_items_abilities_then_state(irt_repository, mock_db_collection):
+    await irt_repository.write_calibration(
+        {"q0": {"difficulty": 0.2, "discrimination": 1.1, "responses": 40}},
+        {"user1": {"theta": -0.3, "precision": 8.0, "responses": 12}},
+        {"responses": 52}
+    )
+
+    assert mock_db_collection.bulk_write.await_count == 2
+    [item_op], [ability_op] = (call.args[0] for call in mock_db_collection.bulk_write.call_args_list)
+    assert item_op._filter == {"_id": "q0"}
+    assert item_op._doc["$set"]["difficulty"] == 0.2
+    assert ability_op._filter == {"_id": "user1"}
+    assert ability_op._doc["$set"]["theta"] == -0.3
+    _, state_update = mock_db_collection.update_one.call_args.args
+    assert state_update["$set"]["version"] == state_update["$set"]["calibrated_at"].isoformat()
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.repositories.item_stats_repository import ItemStatsRepository
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def item_stats_repository(mock_db_collection):
+    """Fixture to create an ItemStatsRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return ItemStatsRepository(db=mock_db)
+
+@pytest.mark.asyncio
+async def test_first_correct_attempt_is_one_upsert_on_its_shard(item_stats_repository, mock_db_collection):
+    await item_stats_repository.record_attempt("GATQ001", 3, True, first_choice="b.1", attempts_to_correct=1)
+
+    mock_db_collection.update_one.assert_awaited_once()
+    query, update = mock_db_collection.update_one.call_args.args
+    assert query == {"_id": "GATQ001:3"}
+    assert mock_db_collection.update_one.call_args.kwargs == {"upsert": True}
+    assert update["$inc"] == {
+        "attempts": 1,
+        "correct": 1,
+        "first_attempts": 1,
+        "first_correct": 1,
+        "first_choices.b%2E1": 1,
+        "solved": 1,
+        "attempts_to_correct": 1,
+    }
+    assert update["$setOnInsert"] == {"question_id": "GATQ001", "shard": 3}
+
+@pytest.mark.asyncio
+async def test_retry_only_counts_the_attempt(item_stats_repository, mock_db_collection):
+    await item_stats_repository.record_attempt("GATQ001", 0, False)
+
+    _, update = mock_db_collection.update_one.call_args.args
+    assert update["$inc"] == {"attempts": 1, "correct": 0}
+
+@pytest.mark.asyncio
+async def test_get_counters_sums_shards(item_stats_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.__aiter__.return_value = [
+        {"attempts": 3, "correct": 1, "first_attempts": 2, "first_correct": 1, "first_choices": {"a": 1, "b%2E1": 1}},
+        {"attempts": 2, "correct": 2, "first_attempts": 1, "first_correct": 1, "first_choices": {"a": 1},
+         "solved": 2, "attempts_to_correct": 3},
+    ]
+    mock_db_collection.find = MagicMock(return_value=cursor)
+
+    counters = await item_stats_repository.get_counters("GATQ001")
+
+    assert mock_db_collection.find.call_args.args[0] == {"question_id": "GATQ001"}
+    assert counters == {
+        "attempts": 5, "correct": 3, "first_attempts": 3, "first_correct": 2, "solved": 2, "attempts_to_correct": 3,
+        "first_choices": {"a": 2, "b.1": 1},
+    }
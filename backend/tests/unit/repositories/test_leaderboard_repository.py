@@ -0,0 +1,80 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from pymongo import ReturnDocument
+
+from backend.repositories.leaderboard_repository import LeaderboardRepository, period_key, score_delta_pipeline
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def leaderboard_repository(mock_db_collection):
+    """Fixture to create a LeaderboardRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return LeaderboardRepository(db=mock_db)
+
+def test_period_key_is_monday_iso_date():
+    assert period_key(date(2024, 3, 25)) == "2024-03-25"
+
+@pytest.mark.asyncio
+async def test_apply_delta_is_one_atomic_upsert_returning_the_score(leaderboard_repository, mock_db_collection):
+    mock_db_collection.find_one_and_update.return_value = {"user_id": "user1", "missions_completed": 2}
+
+    score = await leaderboard_repository.apply_delta("2024-03-25", "user1", "mission:2024-03-27", 1, 5, 4)
+
+    assert score == {"user_id": "user1", "missions_completed": 2}
+    query, pipeline = mock_db_collection.find_one_and_update.call_args.args
+    kwargs = mock_db_collection.find_one_and_update.call_args.kwargs
+    assert query == {"_id": "2024-03-25:user1"}
+    assert kwargs["upsert"] is True
+    assert kwargs["return_document"] == ReturnDocument.AFTER
+    assert pipeline == score_delta_pipeline("2024-03-25", "user1", "mission:2024-03-27", 1, 5, 4)
+
+def test_score_delta_pipeline_counts_each_source_once():
+    pipeline = score_delta_pipeline("2024-03-25", "user1", "mission:2024-03-27", 1, 5, 4)
+
+    assert pipeline[0] == {"$set": {"_new": {"$not": [{"$in": ["mission:2024-03-27", {"$ifNull": ["$counted", []]}]}]}}}
+    counters = pipeline[1]["$set"]
+    assert counters["period"] == "2024-03-25"
+    assert counters["missions_completed"] == {"$cond": [
+        "$_new", {"$add": [{"$ifNull": ["$missions_completed", 0]}, 1]}, "$missions_completed"
+    ]}
+    assert counters["correct"] == {"$cond": ["$_new", {"$add": [{"$ifNull": ["$correct", 0]}, 4]}, "$correct"]}
+    assert counters["counted"] == {"$cond": [
+        "$_new", {"$concatArrays": [{"$ifNull": ["$counted", []]}, ["mission:2024-03-27"]]}, "$counted"
+    ]}
+    # An already counted completion leaves updated_at alone, so refreshes do not re-read it
+    assert counters["updated_at"] == {"$cond": ["$_new", "$$NOW", "$updated_at"]}
+    # Accuracy is recomputed from the updated totals in the same write
+    assert "accuracy" in pipeline[2]["$set"]
+    assert pipeline[-1] == {"$unset": "_new"}
+
+@pytest.mark.asyncio
+async def test_get_period_scores_reads_in_leaderboard_order(leaderboard_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[])
+    mock_db_collection.find = MagicMock(return_value=cursor)
+    cursor.sort.return_value = cursor
+
+    await leaderboard_repository.get_period_scores("2024-03-25")
+
+    assert mock_db_collection.find.call_args.args[0] == {"period": "2024-03-25"}
+    assert cursor.sort.call_args.args[0] == [("missions_completed", -1), ("accuracy", -1), ("user_id", 1)]
+
+@pytest.mark.asyncio
+async def test_get_period_scores_updated_since(leaderboard_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[])
+    mock_db_collection.find = MagicMock(return_value=cursor)
+
+    await leaderboard_repository.get_period_scores_updated_since("2024-03-25", datetime(2024, 3, 27, 8, 0))
+
+    assert mock_db_collection.find.call_args.args[0] == {
+        "period": "2024-03-25", "updated_at": {"$gte": datetime(2024, 3, 27, 8, 0)}
+    }
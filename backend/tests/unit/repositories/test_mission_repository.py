@@ -1,6 +1,7 @@
 import pytest
 from datetime import date, datetime
 from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import OperationFailure
 from backend.models.daily_mission import DailyMissionDocument, MissionStatus
 from backend.repositories.mission_repository import MissionRepository
 
@@ -21,6 +22,18 @@ def mission_repository(mock_db):
     """Fixture to create a MissionRepository instance with a mock database."""
     return MissionRepository(db=mock_db)
 
+@pytest.mark.asyncio
+async def test_ensure_indexes_survives_duplicate_missions(mission_repository, mock_db_collection):
+    # Duplicate (user_id, date) missions prevent the unique index
+    mock_db_collection.create_indexes.side_effect = [
+        OperationFailure("E11000 duplicate key error", code=11000), None, None, None
+    ]
+
+    await mission_repository.ensure_indexes()
+
+    created = [call.args[0][0].document["name"] for call in mock_db_collection.create_indexes.await_args_list]
+    assert created == ["user_date", "user_status_date", "status_date", "updated_at"]
+
 @pytest.mark.asyncio
 async def test_find_mission_found(mission_repository, mock_db_collection):
     user_id = "user1"
@@ -87,4 +100,78 @@ async def test_get_missions_to_archive(mission_repository, mock_db_collection):
     
     assert len(missions) == 1
     assert missions[0].user_id == "user1"
-    mock_db_collection.find.assert_called_once() 
\ No newline at end of file
+    mock_db_collection.find.assert_called_once() 
+@pytest.mark.asyncio
+async def test_aggregate_review_mistakes_runs_single_facet_pipeline(mission_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{
+        "page": [{
+            "question_id": "q1",
+            "question_text": "What is 2+2?",
+            "skill_area": "math",
+            "difficulty_level": 1,
+            "choices": [{"id": "a", "text": "3"}, {"id": "b", "text": "4"}],
+            "user_answer_id": "a",
+            "user_answer_text": "3",
+            "correct_answer_id": "b",
+            "correct_answer_text": "4",
+            "explanation": "",
+            "mission_date": datetime(2024, 1, 15),
+            "mission_completion_date": datetime(2024, 1, 15, 8, 30),
+            "attempt_count": 2,
+            "answer_index": 0,
+        }],
+        "total": [{"count": 7}],
+    }])
+    mock_db_collection.aggregate = MagicMock(return_value=cursor)
+
+    items, total = await mission_repository.aggregate_review_mistakes("user1", "math", skip=5, limit=5)
+
+    pipeline = mock_db_collection.aggregate.call_args.args[0]
+    assert pipeline[0] == {"$match": {
+        "user_id": "user1",
+        "status": {"$in": [MissionStatus.COMPLETE.value, MissionStatus.ARCHIVED.value]},
+    }}
+    assert {"$match": {"question.skill_area": "math"}} in pipeline
+    assert pipeline[-1]["$facet"]["page"] == [{"$skip": 5}, {"$limit": 5}]
+    assert total == 7
+    assert items[0].mission_date == date(2024, 1, 15)
+    assert items[0].user_answer_text == "3"
+
+@pytest.mark.asyncio
+async def test_aggregate_grouped_review_mistakes_returns_page_and_counts(mission_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{
+        "page": [{"_id": "math", "count": 1, "mistakes": []}],
+        "counts": [{"_id": "english", "count": 3}, {"_id": "math", "count": 1}],
+    }])
+    mock_db_collection.aggregate = MagicMock(return_value=cursor)
+
+    page, counts = await mission_repository.aggregate_grouped_review_mistakes("user1", "topic", skip=1, limit=1)
+
+    pipeline = mock_db_collection.aggregate.call_args.args[0]
+    group_at = next(i for i, stage in enumerate(pipeline) if "$group" in stage)
+    assert pipeline[group_at]["$group"]["_id"] == "$skill_area"
+    assert pipeline[group_at - 1] == {"$project": {"answer_index": 0}}
+    assert mock_db_collection.aggregate.call_args.kwargs == {"allowDiskUse": True}
+    assert page == [("math", [])]
+    assert counts == [("english", 3), ("math", 1)]
+
+@pytest.mark.asyncio
+async def test_get_mission_summaries_projects_out_questions(mission_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.__aiter__.return_value = [{
+        "date": datetime(2024, 3, 1), "status": MissionStatus.COMPLETE.value,
+        "question_count": 5, "answered_count": 5, "correct_count": 4, "updated_at": datetime(2024, 3, 1, 9)
+    }]
+    mock_db_collection.find = MagicMock(return_value=cursor)
+
+    summaries = await mission_repository.get_mission_summaries("user1", date(2024, 3, 1), date(2024, 3, 7))
+
+    query, projection = mock_db_collection.find.call_args.args
+    assert query == {"user_id": "user1", "date": {"$gte": datetime(2024, 3, 1), "$lte": datetime(2024, 3, 7)}}
+    assert "questions" not in projection and "answers" not in projection
+    cursor.sort.assert_called_once_with("date", 1)
+    assert summaries[0].date == date(2024, 3, 1)
+    assert summaries[0].correct_count == 4
@@ -0,0 +1,55 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.repositories.mistake_repository import MistakeRepository
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    collection = AsyncMock()
+    collection.aggregate = MagicMock()
+    return collection
+
+@pytest.fixture
+def mistake_repository(mock_db_collection):
+    """Fixture to create a MistakeRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return MistakeRepository(db=mock_db)
+
+@pytest.mark.asyncio
+async def test_get_mistake_stats_uses_one_facet_aggregation(mistake_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{
+        "total": [{"count": 4}],
+        "by_skill": [{"_id": "Math", "count": 4}],
+        "by_difficulty": [{"_id": 2, "count": 4}],
+        "by_week": [{"_id": datetime(2024, 1, 8), "count": 4}],
+    }])
+    mock_db_collection.aggregate.return_value = cursor
+
+    stats = await mistake_repository.get_mistake_stats("user1", date(2024, 1, 1))
+
+    pipeline = mock_db_collection.aggregate.call_args.args[0]
+    assert pipeline[0] == {"$match": {"user_id": "user1"}}
+    assert set(pipeline[1]["$facet"]) == {"total", "by_skill", "by_difficulty", "by_week"}
+    assert pipeline[1]["$facet"]["by_week"][0] == {"$match": {"mission_date": {"$gte": datetime(2024, 1, 1)}}}
+    assert stats == {
+        "total": 4,
+        "by_skill": [("Math", 4)],
+        "by_difficulty": [(2, 4)],
+        "by_week": [(date(2024, 1, 8), 4)],
+    }
+
+@pytest.mark.asyncio
+async def test_get_mistake_stats_without_mistakes(mistake_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{"total": [], "by_skill": [], "by_difficulty": [], "by_week": []}])
+    mock_db_collection.aggregate.return_value = cursor
+
+    stats = await mistake_repository.get_mistake_stats("user1", date(2024, 1, 1))
+
+    assert stats["total"] == 0
+    assert stats["by_skill"] == []
@@ -0,0 +1,115 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import OperationFailure
+
+from backend.repositories.practice_repository import PracticeRepository
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    collection = AsyncMock()
+    collection.find = MagicMock()
+    return collection
+
+@pytest.fixture
+def practice_repository(mock_db_collection):
+    """Fixture to create a PracticeRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return PracticeRepository(db=mock_db)
+
+@pytest.fixture
+def session():
+    return PracticeSession(user_id="user1", topic="Math", question_count=1, questions=[])
+
+def _id_cursor(session_ids):
+    cursor = MagicMock()
+    cursor.limit.return_value = cursor
+    cursor.__aiter__.return_value = [{"session_id": session_id} for session_id in session_ids]
+    return cursor
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_drops_superseded_listing_indexes(practice_repository, mock_db_collection):
+    mock_db_collection.drop_index.side_effect = [
+        None, OperationFailure("index not found with name [user_status_created]", code=27)
+    ]
+
+    await practice_repository.ensure_indexes()
+
+    mock_db_collection.create_indexes.assert_awaited_once()
+    assert [call.args[0] for call in mock_db_collection.drop_index.await_args_list] == [
+        "user_created", "user_status_created"
+    ]
+
+@pytest.mark.asyncio
+async def test_activity_pushes_expiry_forward(practice_repository, mock_db_collection, session):
+    before = datetime.utcnow()
+    await practice_repository.create_session(session)
+
+    inserted = mock_db_collection.insert_one.call_args.args[0]
+    assert inserted["expires_at"] >= before + practice_repository.session_ttl
+
+    first_expiry = inserted["expires_at"]
+    await practice_repository.update_session(session)
+    assert mock_db_collection.update_one.call_args.args[1]["$set"]["expires_at"] >= first_expiry
+
+@pytest.mark.asyncio
+async def test_update_only_writes_sessions_still_in_progress(practice_repository, mock_db_collection, session):
+    await practice_repository.update_session(session)
+
+    # A compacted (abandoned) session is not overwritten by a late write-back
+    assert mock_db_collection.update_one.call_args.args[0] == {
+        "session_id": session.session_id, "status": PracticeSessionStatus.IN_PROGRESS.value
+    }
+
+@pytest.mark.asyncio
+async def test_completed_session_no_longer_expires(practice_repository, mock_db_collection, session):
+    session.mark_completed()
+
+    await practice_repository.update_session(session)
+
+    assert mock_db_collection.update_one.call_args.args[1]["$set"]["expires_at"] is None
+
+@pytest.mark.asyncio
+async def test_compact_abandoned_sessions_in_batches(practice_repository, mock_db_collection):
+    mock_db_collection.find.side_effect = [_id_cursor(["S1", "S2"]), _id_cursor(["S3"])]
+    mock_db_collection.update_many.side_effect = [MagicMock(modified_count=2), MagicMock(modified_count=1)]
+
+    compacted = await practice_repository.compact_abandoned_sessions(
+        idle_for=timedelta(hours=24), retention=timedelta(days=30), batch_size=2
+    )
+
+    assert compacted == 3
+    query, pipeline = mock_db_collection.update_many.call_args_list[0].args
+    assert query == {"session_id": {"$in": ["S1", "S2"]}, "status": "in_progress"}
+    compact = pipeline[0]["$set"]
+    assert compact["status"] == PracticeSessionStatus.ABANDONED.value
+    assert compact["questions"] == [] and compact["answers"] == []
+    # Sessions stored without an answers array count as zero answered
+    assert compact["answered_count"] == {"$size": {"$ifNull": ["$answers", []]}}
+
+@pytest.mark.asyncio
+async def test_session_summaries_use_a_projection(practice_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.__aiter__.return_value = [{
+        "session_id": "PRACTICE_1", "user_id": "user1", "topic": "Math", "mode": "topic",
+        "question_count": 5, "status": "in_progress", "correct_count": 0, "answered_count": 2,
+        "created_at": datetime(2024, 1, 1),
+    }]
+    mock_db_collection.find.return_value = cursor
+
+    summaries = await practice_repository.get_user_session_summaries(
+        "user1", PracticeSessionStatus.IN_PROGRESS, limit=10
+    )
+
+    query, projection = mock_db_collection.find.call_args.args
+    assert query == {"user_id": "user1", "status": "in_progress"}
+    assert "questions" not in projection and "answers" not in projection
+    assert projection["_id"] == 0
+    cursor.limit.assert_called_once_with(10)
+    assert summaries[0].answered_count == 2
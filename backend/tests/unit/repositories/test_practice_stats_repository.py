@@ -0,0 +1,59 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import DuplicateKeyError
+
+from backend.repositories.practice_stats_repository import COUNTED_SESSIONS_KEPT, PracticeStatsRepository
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def stats_repository(mock_db_collection):
+    """Fixture to create a PracticeStatsRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return PracticeStatsRepository(db=mock_db)
+
+@pytest.mark.asyncio
+async def test_record_session_is_one_atomic_upsert(stats_repository, mock_db_collection):
+    counted = await stats_repository.record_session(
+        "user1", "S1", "Reading 2.0", date(2024, 3, 31), questions=5, correct=4, window_days=30
+    )
+
+    mock_db_collection.update_one.assert_awaited_once()
+    query, update = mock_db_collection.update_one.call_args.args
+    assert counted is True
+    # A session already in counted_sessions does not match, so it is never added twice
+    assert query == {"_id": "user1", "counted_sessions": {"$ne": "S1"}}
+    assert update["$push"] == {"counted_sessions": {"$each": ["S1"], "$slice": -COUNTED_SESSIONS_KEPT}}
+    assert mock_db_collection.update_one.call_args.kwargs == {"upsert": True}
+    assert update["$inc"]["total_correct"] == 4
+    assert update["$inc"]["by_topic.Reading 2%2E0.questions"] == 5
+    assert update["$inc"]["daily.2024-03-31.sessions"] == 1
+    assert update["$addToSet"] == {"topics_practiced": "Reading 2.0"}
+    # Buckets from the 30 days before the window (2024-03-02 .. 2024-03-31) are dropped
+    assert "daily.2024-03-01" in update["$unset"]
+    assert "daily.2024-02-01" in update["$unset"]
+    assert "daily.2024-03-02" not in update["$unset"]
+
+@pytest.mark.asyncio
+async def test_record_session_skips_a_counted_session(stats_repository, mock_db_collection):
+    mock_db_collection.update_one.side_effect = DuplicateKeyError("E11000 duplicate key error")
+
+    assert await stats_repository.record_session(
+        "user1", "S1", "Math", date(2024, 3, 31), questions=5, correct=4, window_days=30
+    ) is False
+
+@pytest.mark.asyncio
+async def test_get_stats_unescapes_topics(stats_repository, mock_db_collection):
+    mock_db_collection.find_one.return_value = {
+        "_id": "user1", "by_topic": {"Reading 2%2E0": {"sessions": 1}}
+    }
+
+    stats = await stats_repository.get_stats("user1")
+
+    assert stats["by_topic"] == {"Reading 2.0": {"sessions": 1}}
@@ -0,0 +1,49 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.repositories.progress_rollup_repository import ProgressRollupRepository
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def rollup_repository(mock_db_collection):
+    """Fixture to create a ProgressRollupRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return ProgressRollupRepository(db=mock_db)
+
+@pytest.mark.asyncio
+async def test_record_attempt_is_one_atomic_upsert(rollup_repository, mock_db_collection):
+    await rollup_repository.record_attempt("user1", date(2024, 3, 27), "Reading 2.0", True, 42)
+
+    mock_db_collection.update_one.assert_awaited_once()
+    query, update = mock_db_collection.update_one.call_args.args
+    assert query == {"_id": "user1:2024-03-27"}
+    assert mock_db_collection.update_one.call_args.kwargs == {"upsert": True}
+    assert update["$inc"] == {
+        "attempts": 1,
+        "correct": 1,
+        "time_spent_seconds": 42,
+        "by_skill.Reading 2%2E0.attempts": 1,
+        "by_skill.Reading 2%2E0.correct": 1,
+        "by_skill.Reading 2%2E0.time_spent_seconds": 42,
+    }
+    assert update["$setOnInsert"] == {"user_id": "user1", "day": datetime(2024, 3, 27)}
+
+@pytest.mark.asyncio
+async def test_get_rollups_reads_day_range_and_unescapes_skills(rollup_repository, mock_db_collection):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{"day": datetime(2024, 3, 27), "by_skill": {"Reading 2%2E0": {"attempts": 1}}}])
+    mock_db_collection.find = MagicMock(return_value=cursor)
+
+    rollups = await rollup_repository.get_rollups("user1", date(2024, 1, 1), date(2024, 3, 30))
+
+    assert mock_db_collection.find.call_args.args[0] == {
+        "user_id": "user1", "day": {"$gte": datetime(2024, 1, 1), "$lte": datetime(2024, 3, 30)}
+    }
+    assert rollups[0]["by_skill"] == {"Reading 2.0": {"attempts": 1}}
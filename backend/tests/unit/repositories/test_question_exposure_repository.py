@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from bson.int64 import Int64
+
+from backend.repositories.question_exposure_repository import QuestionExposureRepository
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def exposure_repository(mock_db_collection):
+    """Fixture to create a QuestionExposureRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return QuestionExposureRepository(db=mock_db)
+
+@pytest.mark.asyncio
+async def test_add_exposures_sets_bits_then_rotates_full_generation(exposure_repository, mock_db_collection):
+    await exposure_repository.add_exposures("user1", {0: 0b101, 3: 1 << 63}, count=2, generation_size=300)
+
+    assert mock_db_collection.update_one.await_count == 2
+    (query, update), kwargs = mock_db_collection.update_one.call_args_list[0]
+    assert query == {"_id": "user1"}
+    assert kwargs == {"upsert": True}
+    assert update["$bit"]["current.0"] == {"or": Int64(0b101)}
+    # The top bit of a word is stored as a negative signed 64-bit value
+    assert update["$bit"]["current.3"] == {"or": Int64(-(1 << 63))}
+    assert update["$inc"] == {"current_count": 2}
+
+    (query, pipeline), _ = mock_db_collection.update_one.call_args_list[1]
+    assert query == {"_id": "user1", "current_count": {"$gte": 300}}
+    assert pipeline[0]["$set"]["previous"] == "$current"
+    assert pipeline[0]["$set"]["current_count"] == 0
+
+@pytest.mark.asyncio
+async def test_add_exposures_without_masks_writes_nothing(exposure_repository, mock_db_collection):
+    await exposure_repository.add_exposures("user1", {}, count=0, generation_size=300)
+
+    mock_db_collection.update_one.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_generations_returns_unsigned_words(exposure_repository, mock_db_collection):
+    mock_db_collection.find_one.return_value = {
+        "_id": "user1", "current": {"3": Int64(-(1 << 63))}, "previous": {"0": Int64(5)}
+    }
+
+    generations = await exposure_repository.get_generations("user1")
+
+    assert generations == [{3: 1 << 63}, {0: 5}]
+
+@pytest.mark.asyncio
+async def test_get_generations_for_new_user(exposure_repository, mock_db_collection):
+    mock_db_collection.find_one.return_value = None
+
+    assert await exposure_repository.get_generations("user1") == [{}, {}]
@@ -0,0 +1,143 @@
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.models.api_responses import ReviewMistakeItem
+from backend.repositories.review_schedule_repository import ReviewScheduleRepository, sm2_update_pipeline
+
+
+def _evaluate(expression, doc):
+    """Evaluates the aggregation operators used by the SM-2 pipeline against a dict."""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return doc[expression[1:]]
+    if not isinstance(expression, dict):
+        return expression
+    (operator, args), = expression.items()
+    if operator == "$switch":
+        for branch in args["branches"]:
+            if _evaluate(branch["case"], doc):
+                return _evaluate(branch["then"], doc)
+        return _evaluate(args["default"], doc)
+    if operator == "$toInt":
+        return int(_evaluate(args, doc))
+    values = [_evaluate(arg, doc) for arg in args]
+    if operator == "$eq":
+        return values[0] == values[1]
+    if operator == "$round":
+        return round(values[0], values[1])
+    if operator == "$multiply":
+        return values[0] * values[1]
+    if operator == "$max":
+        return max(values)
+    if operator == "$add":
+        if isinstance(values[0], datetime):
+            return values[0] + timedelta(milliseconds=values[1])
+        return sum(values)
+    raise AssertionError(f"unexpected operator {operator}")
+
+
+def _review(doc, grade, reviewed_at):
+    for stage in sm2_update_pipeline(grade, reviewed_at):
+        doc = {**doc, **{field: _evaluate(value, doc) for field, value in stage["$set"].items()}}
+    return doc
+
+
+def _mistake(question_id="q1"):
+    return ReviewMistakeItem(
+        question_id=question_id, question_text="Question", skill_area="Math", difficulty_level=1,
+        choices=[{"id": "a", "text": "A"}], user_answer_id="b", user_answer_text="B",
+        correct_answer_id="a", correct_answer_text="A", explanation="",
+        mission_date=date(2024, 3, 1), mission_completion_date=datetime(2024, 3, 1, 8), attempt_count=1
+    )
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    collection = AsyncMock()
+    collection.find = MagicMock()
+    return collection
+
+@pytest.fixture
+def schedule_repository(mock_db_collection):
+    """Fixture to create a ReviewScheduleRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return ReviewScheduleRepository(db=mock_db)
+
+
+def test_sm2_intervals_grow_with_successful_reviews():
+    now = datetime(2024, 3, 2)
+    doc = {"ease_factor": 2.5, "interval_days": 0, "repetitions": 0, "review_count": 0}
+
+    doc = _review(doc, 4, now)
+    assert (doc["interval_days"], doc["repetitions"]) == (1, 1)
+    doc = _review(doc, 4, now)
+    assert doc["interval_days"] == 6
+    doc = _review(doc, 5, now)
+    assert doc["interval_days"] == 15  # 6 x 2.5
+    assert doc["ease_factor"] == pytest.approx(2.6)
+    assert doc["next_review_at"] == now + timedelta(days=15)
+    assert doc["review_count"] == 3
+
+
+def test_sm2_lapse_resets_interval_and_lowers_ease():
+    now = datetime(2024, 3, 2)
+    doc = {"ease_factor": 1.4, "interval_days": 15, "repetitions": 3, "review_count": 3}
+
+    doc = _review(doc, 1, now)
+
+    assert (doc["interval_days"], doc["repetitions"]) == (1, 0)
+    assert doc["ease_factor"] == 1.3  # never below the SM-2 floor
+    assert doc["next_review_at"] == now + timedelta(days=1)
+    assert doc["last_grade"] == 1
+
+
+@pytest.mark.asyncio
+async def test_grade_item_is_one_targeted_update(schedule_repository, mock_db_collection):
+    mock_db_collection.find_one_and_update.return_value = None
+
+    assert await schedule_repository.grade_item("user1", "q1", 4, datetime(2024, 3, 2)) is None
+
+    mock_db_collection.find_one_and_update.assert_awaited_once()
+    assert mock_db_collection.find_one_and_update.call_args.args[0] == {"user_id": "user1", "question_id": "q1"}
+    mock_db_collection.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_schedule_mistakes_keeps_existing_review_state(schedule_repository, mock_db_collection):
+    mock_db_collection.bulk_write.return_value = MagicMock(upserted_count=1)
+    due_at = datetime(2024, 3, 2, 8)
+
+    assert await schedule_repository.schedule_mistakes("user1", [(_mistake(), due_at)]) == 1
+
+    operation = mock_db_collection.bulk_write.call_args.args[0][0]
+    assert operation._filter == {"user_id": "user1", "question_id": "q1"}
+    assert set(operation._doc["$set"]) == {"mistake"}
+    assert operation._doc["$setOnInsert"]["next_review_at"] == due_at
+    assert operation._doc["$setOnInsert"]["repetitions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_find_due_reads_one_page_after_key(schedule_repository, mock_db_collection):
+    now = datetime(2024, 3, 10)
+    docs = [
+        {"user_id": "user1", "question_id": f"q{i}", "next_review_at": datetime(2024, 3, i + 1),
+         "mistake": _mistake(f"q{i}").model_dump()}
+        for i in range(3)
+    ]
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=docs)
+    mock_db_collection.find.return_value = cursor
+
+    items, next_key = await schedule_repository.find_due(
+        "user1", now, limit=2, after=(datetime(2024, 2, 28), "q9")
+    )
+
+    query = mock_db_collection.find.call_args.args[0]
+    assert query["next_review_at"] == {"$lte": now, "$gte": datetime(2024, 2, 28)}
+    cursor.limit.assert_called_once_with(3)
+    assert [item.question_id for item in items] == ["q0", "q1"]
+    assert next_key == (datetime(2024, 3, 2), "q1")
@@ -0,0 +1,55 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.repositories.streak_repository import StreakRepository, completion_pipeline, week_start
+
+
+@pytest.fixture
+def mock_db_collection():
+    """Fixture to create a mock database collection."""
+    return AsyncMock()
+
+@pytest.fixture
+def streak_repository(mock_db_collection):
+    """Fixture to create a StreakRepository instance with a mock database."""
+    mock_db = MagicMock()
+    mock_db.__getitem__.return_value = mock_db_collection
+    return StreakRepository(db=mock_db)
+
+def test_week_start_is_monday():
+    assert week_start(date(2024, 3, 31)) == date(2024, 3, 25)  # Sunday
+    assert week_start(date(2024, 3, 25)) == date(2024, 3, 25)
+
+@pytest.mark.asyncio
+async def test_record_completion_is_one_atomic_pipeline_upsert(streak_repository, mock_db_collection):
+    await streak_repository.record_completion("user1", date(2024, 3, 27))
+
+    mock_db_collection.update_one.assert_awaited_once()
+    query, update = mock_db_collection.update_one.call_args.args
+    assert query == {"_id": "user1"}
+    assert mock_db_collection.update_one.call_args.kwargs == {"upsert": True}
+    assert update == completion_pipeline(date(2024, 3, 27))
+
+def test_completion_pipeline_only_advances_on_a_later_day():
+    pipeline = completion_pipeline(date(2024, 3, 27))
+
+    assert pipeline[0] == {"$set": {"_advances": {"$lt": ["$last_completed_date", datetime(2024, 3, 27)]}}}
+    counters = pipeline[1]["$set"]
+    # Consecutive day extends the streak, anything else restarts it
+    assert counters["current_streak"]["$cond"][1]["$cond"][0] == {"$eq": ["$last_completed_date", datetime(2024, 3, 26)]}
+    assert counters["current_streak"]["$cond"][2] == "$current_streak"
+    assert counters["week_start"] == {"$cond": ["$_advances", datetime(2024, 3, 25), "$week_start"]}
+    assert "longest_streak" in pipeline[2]["$set"]
+    assert pipeline[-1] == {"$unset": "_advances"}
+
+@pytest.mark.asyncio
+async def test_reset_broken_streaks_zeroes_streaks_older_than_yesterday(streak_repository, mock_db_collection):
+    mock_db_collection.update_many.return_value = MagicMock(modified_count=3)
+
+    reset_count = await streak_repository.reset_broken_streaks(date(2024, 3, 27))
+
+    assert reset_count == 3
+    query, update = mock_db_collection.update_many.call_args.args
+    assert query == {"last_completed_date": {"$lt": datetime(2024, 3, 26)}, "current_streak": {"$gt": 0}}
+    assert update == {"$set": {"current_streak": 0}}
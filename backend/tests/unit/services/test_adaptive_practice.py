@@ -0,0 +1,103 @@
+import random
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.models.daily_mission import Question
+from backend.models.practice_session import PracticeAnswer, PracticeMode, PracticeSession, PracticeSessionStatus
+from backend.services.adaptive_practice import (
+    CandidateIndexCache,
+    build_candidate_index,
+    draw_question,
+    next_difficulty,
+    serve_next_question,
+    start_adaptive_state,
+)
+
+
+def _question(question_id: str, difficulty: int, topic: str = "Math") -> Question:
+    return Question(
+        question_id=question_id, question_text=f"{question_id}?", skill_area=topic,
+        difficulty_level=difficulty, choices=[], correct_answer_id="a", feedback_th="fb"
+    )
+
+@pytest.fixture
+def bank():
+    return [_question(f"m{level}_{i}", level) for level in (1, 2, 3) for i in range(4)] + [_question("r1", 1, "Reading")]
+
+@pytest.fixture
+def index(bank):
+    return build_candidate_index(bank, "v1")
+
+def _session(index, question_count=5) -> PracticeSession:
+    return PracticeSession(
+        user_id="user1", topic="math", mode=PracticeMode.ADAPTIVE, question_count=question_count,
+        questions=[], adaptive=start_adaptive_state(index, "math")
+    )
+
+def _answers(*correct):
+    return [PracticeAnswer(question_id=f"q{i}", user_answer="a", is_correct=c) for i, c in enumerate(correct)]
+
+
+def test_index_buckets_by_topic_and_difficulty(index):
+    assert index.topic_levels("MATH") == [1, 2, 3]
+    assert index.topic_size("Math") == 12
+    assert [q.question_id for q in index.buckets[("reading", 1)]] == ["r1"]
+
+def test_next_difficulty_steps_down_on_wrong_and_up_on_streak():
+    levels = [1, 2, 3]
+    assert next_difficulty(2, _answers(False), levels) == 1
+    assert next_difficulty(1, _answers(False), levels) == 1
+    assert next_difficulty(2, _answers(True), levels) == 2
+    assert next_difficulty(2, _answers(False, True, True), levels) == 3
+    assert next_difficulty(3, _answers(True, True), levels) == 3
+
+def test_draw_walks_a_bucket_without_repeats(index):
+    session = _session(index, question_count=12)
+    rng = random.Random(3)
+
+    drawn = []
+    for _ in range(4):
+        question = draw_question(session, index, 2, rng)
+        session.questions.append(question)
+        drawn.append(question.question_id)
+
+    assert sorted(drawn) == [f"m2_{i}" for i in range(4)]
+    # Level 2 is used up, so the nearest level (lower first) is drawn from
+    assert draw_question(session, index, 2, rng).difficulty_level == 1
+
+def test_serve_next_question_follows_answers(index):
+    session = _session(index)
+    session.questions.append(draw_question(session, index, session.adaptive.difficulty))
+    assert session.questions[0].difficulty_level == 2
+
+    session.answers.append(PracticeAnswer(question_id=session.questions[0].question_id, user_answer="b", is_correct=False))
+    question = serve_next_question(session, index)
+
+    assert question.difficulty_level == 1
+    assert session.adaptive.difficulty == 1
+    assert len(session.questions) == 2
+
+def test_serve_next_question_completes_when_topic_runs_out():
+    index = build_candidate_index([_question("only", 1)], "v1")
+    session = _session(index, question_count=3)
+    session.questions.append(draw_question(session, index, 1))
+    session.answers.append(PracticeAnswer(question_id="only", user_answer="a", is_correct=True))
+
+    assert serve_next_question(session, index) is None
+    assert session.question_count == 1
+    assert session.status == PracticeSessionStatus.COMPLETED
+
+@pytest.mark.asyncio
+async def test_index_cache_rebuilds_only_on_new_bank_version(bank):
+    cache = CandidateIndexCache()
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = {q.question_id: q for q in bank}
+
+    with patch("backend.services.adaptive_practice.QuestionRepository.loaded_bank_version", return_value="v1"):
+        await cache.get_index(question_repo)
+        await cache.get_index(question_repo)
+    assert cache.builds == 1
+
+    with patch("backend.services.adaptive_practice.QuestionRepository.loaded_bank_version", return_value="v2"):
+        await cache.get_index(question_repo)
+    assert cache.builds == 2
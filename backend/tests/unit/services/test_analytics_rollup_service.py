@@ -0,0 +1,239 @@
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+from backend.models.daily_mission import Answer, ChoiceOption, DailyMissionDocument, MissionStatus, Question
+from backend.services.analytics_rollup_service import (
+    InvalidAnalyticsRangeError,
+    RollupWindow,
+    accumulate_mission,
+    accumulate_session,
+    get_platform_analytics,
+    run_analytics_rollup,
+)
+from backend.services.mission_progress_service import submit_answer_with_feedback
+
+SINCE = datetime(2024, 3, 27, 1, 0)  # 08:00 in UTC+7
+UPTO = SINCE + timedelta(minutes=15)
+
+
+def _async_iter(items):
+    async def iterate(*args):
+        for item in items:
+            yield item
+    return MagicMock(side_effect=iterate)
+
+
+def _mission(**fields):
+    return {"user_id": "user1", "status": "in_progress", "created_at": SINCE - timedelta(hours=1), "answers": [], **fields}
+
+
+def test_mission_events_are_counted_by_their_own_timestamp():
+    buckets, active = {}, set()
+    mission = _mission(
+        status="complete",
+        created_at=SINCE + timedelta(minutes=1),
+        completed_at=SINCE + timedelta(minutes=5),
+        updated_at=SINCE + timedelta(minutes=5),
+        answers=[{"attempts_history": [
+            {"timestamp": SINCE - timedelta(minutes=1)},  # counted by the previous run
+            {"timestamp": SINCE + timedelta(minutes=4)},
+        ]}],
+    )
+
+    accumulate_mission(buckets, active, mission, RollupWindow(SINCE, UPTO))
+
+    assert buckets[("day", "2024-03-27")] == {"missions_generated": 1, "missions_completed": 1, "mission_attempts": 1}
+    assert buckets[("hour", "2024-03-27T08")] == buckets[("day", "2024-03-27")]
+    assert active == {(date(2024, 3, 27), "user1")}
+
+
+def test_archived_missions_count_their_last_write():
+    buckets, active = {}, set()
+    accumulate_mission(
+        buckets, active, _mission(status="archived", updated_at=SINCE + timedelta(minutes=2)), RollupWindow(SINCE, UPTO)
+    )
+    assert buckets[("day", "2024-03-27")] == {"missions_archived": 1}
+
+
+def test_sessions_count_per_topic_and_answers_on_completion():
+    buckets, active = {}, set()
+    session = {
+        "user_id": "user2", "topic": "Reading 2.0", "status": "completed",
+        "created_at": SINCE + timedelta(minutes=1), "completed_at": SINCE + timedelta(minutes=9),
+        "answered_count": 5,
+    }
+
+    accumulate_session(buckets, active, session, RollupWindow(SINCE, UPTO))
+
+    assert buckets[("day", "2024-03-27")] == {
+        "practice_sessions_started": 1,
+        "by_topic.Reading 2%2E0.practice_sessions_started": 1,
+        "practice_sessions_completed": 1,
+        "by_topic.Reading 2%2E0.practice_sessions_completed": 1,
+        "practice_questions_answered": 5,
+        "by_topic.Reading 2%2E0.practice_questions_answered": 5,
+    }
+    assert active == {(date(2024, 3, 27), "user2")}
+
+
+@pytest.fixture
+def repos():
+    mission_repo = MagicMock()
+    practice_repo = MagicMock()
+    analytics_repo = AsyncMock()
+    mission = _mission(created_at=SINCE + timedelta(minutes=3), updated_at=SINCE + timedelta(minutes=3))
+    mission_repo.iter_missions_updated_since = _async_iter([mission])
+    practice_repo.iter_sessions_updated_since = _async_iter([])
+    return mission_repo, practice_repo, analytics_repo
+
+
+@pytest.mark.asyncio
+async def test_run_applies_window_and_advances_watermark(repos):
+    mission_repo, practice_repo, analytics_repo = repos
+    analytics_repo.apply_increments.return_value = 2
+    now = UPTO + timedelta(seconds=120)
+    upto = now - timedelta(seconds=120)
+    analytics_repo.claim_run.return_value = {"watermark": SINCE, "pending_upto": upto}
+
+    summary = await run_analytics_rollup(mission_repo, practice_repo, analytics_repo, now=now)
+
+    analytics_repo.claim_run.assert_awaited_once_with(ANY, upto, now, timedelta(seconds=600))
+    owner = analytics_repo.claim_run.call_args.args[0]
+    mission_repo.iter_missions_updated_since.assert_called_once_with(SINCE)
+    buckets, applied_through = analytics_repo.apply_increments.call_args.args
+    assert applied_through == upto
+    assert buckets[("day", "2024-03-27")] == {"missions_generated": 1}
+    analytics_repo.finish_run.assert_awaited_once_with(owner, upto, summary)
+    assert summary["missions_read"] == 1
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_is_retried_over_the_same_window(repos):
+    mission_repo, practice_repo, analytics_repo = repos
+    # The claim keeps the interrupted run's window rather than the one asked for
+    analytics_repo.claim_run.return_value = {"watermark": SINCE, "pending_upto": UPTO}
+
+    await run_analytics_rollup(mission_repo, practice_repo, analytics_repo, now=UPTO + timedelta(hours=1))
+
+    assert analytics_repo.apply_increments.call_args.args[1] == UPTO
+
+
+@pytest.mark.asyncio
+async def test_first_run_starts_backfill_days_back(repos):
+    mission_repo, practice_repo, analytics_repo = repos
+    now = datetime(2024, 3, 31)
+    analytics_repo.claim_run.return_value = {"pending_upto": now - timedelta(seconds=120)}
+
+    await run_analytics_rollup(mission_repo, practice_repo, analytics_repo, now=now)
+
+    mission_repo.iter_missions_updated_since.assert_called_once_with(now - timedelta(days=30))
+
+
+class _RollupStore:
+    """In-memory rollup state and buckets with the claim and window guards of AnalyticsRepository."""
+
+    def __init__(self, watermark):
+        self.state = {"watermark": watermark}
+        self.buckets = {}
+
+    async def claim_run(self, owner, upto, now, lease):
+        if self.state.get("lease_until") and self.state["lease_until"] > now:
+            return None
+        self.state.update(owner=owner, lease_until=now + lease, pending_upto=self.state.get("pending_upto") or upto)
+        return dict(self.state)
+
+    async def release_run(self, owner):
+        if self.state.get("owner") == owner:
+            for field in ("pending_upto", "owner", "lease_until"):
+                self.state.pop(field, None)
+
+    async def finish_run(self, owner, upto, summary):
+        if self.state.get("owner") == owner:
+            await self.release_run(owner)
+            self.state["watermark"] = upto
+
+    async def add_active_users(self, active):
+        pass
+
+    async def apply_increments(self, buckets, applied_through):
+        for key, counters in buckets.items():
+            bucket = self.buckets.setdefault(key, {})
+            if bucket.get("applied_through") == applied_through:
+                continue
+            bucket["applied_through"] = applied_through
+            for field, value in counters.items():
+                bucket[field] = bucket.get(field, 0) + value
+        return len(buckets)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_runs_count_each_event_once():
+    mission = _mission(created_at=SINCE + timedelta(minutes=3), updated_at=SINCE + timedelta(minutes=3))
+
+    def missions(*args):
+        async def iterate():
+            await asyncio.sleep(0)  # let the other run start while this one reads
+            yield mission
+        return iterate()
+
+    mission_repo, practice_repo = MagicMock(), MagicMock()
+    mission_repo.iter_missions_updated_since = MagicMock(side_effect=missions)
+    practice_repo.iter_sessions_updated_since = _async_iter([])
+    store = _RollupStore(SINCE)
+
+    # Two workers whose clocks put the end of their windows a few seconds apart
+    first, second = await asyncio.gather(
+        run_analytics_rollup(mission_repo, practice_repo, store, now=UPTO + timedelta(seconds=120)),
+        run_analytics_rollup(mission_repo, practice_repo, store, now=UPTO + timedelta(seconds=125)),
+    )
+
+    assert second == {"skipped": "another run holds the claim"}
+    assert first["missions_read"] == 1
+    assert store.buckets[("day", "2024-03-27")]["missions_generated"] == 1
+    assert store.state == {"watermark": UPTO}
+
+
+@pytest.mark.asyncio
+async def test_daily_analytics_include_active_users():
+    analytics_repo = AsyncMock()
+    analytics_repo.get_rollups.return_value = [{"granularity": "day", "period": "2024-03-27", "mission_attempts": 4}]
+    analytics_repo.count_active_users.return_value = {"2024-03-27": 2}
+    analytics_repo.get_state.return_value = {"watermark": UPTO}
+
+    analytics = await get_platform_analytics(analytics_repo, "day", date(2024, 3, 21), date(2024, 3, 27))
+
+    analytics_repo.get_rollups.assert_awaited_once_with("day", "2024-03-21", "2024-03-27")
+    assert analytics["buckets"][0]["active_users"] == 2
+    assert analytics["watermark"] == UPTO.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_analytics_range_validation():
+    analytics_repo = AsyncMock()
+    with pytest.raises(InvalidAnalyticsRangeError):
+        await get_platform_analytics(analytics_repo, "minute")
+    with pytest.raises(InvalidAnalyticsRangeError):
+        await get_platform_analytics(analytics_repo, "hour", date(2024, 3, 1), date(2024, 3, 27))
+    with pytest.raises(InvalidAnalyticsRangeError):
+        await get_platform_analytics(analytics_repo, "day", date(2024, 3, 28), date(2024, 3, 27))
+
+
+@pytest.mark.asyncio
+async def test_completion_time_is_stamped_once():
+    question = Question(
+        question_id="q0", question_text="?", skill_area="Vocabulary", difficulty_level=1,
+        choices=[ChoiceOption(id="a", text="A")], correct_answer_id="a", feedback_th=""
+    )
+    mission = DailyMissionDocument(
+        user_id="user1", date=date(2024, 3, 27), questions=[question], status=MissionStatus.IN_PROGRESS,
+        answers=[Answer(question_id="q0", current_answer="", feedback_shown=True)]
+    )
+    mission_repo = AsyncMock()
+    mission_repo.find_mission.return_value = mission
+
+    await submit_answer_with_feedback("user1", "q0", "a", mission_repo)
+
+    assert mission.status == MissionStatus.COMPLETE
+    assert mission.completed_at == mission.updated_at
@@ -0,0 +1,68 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from backend.models.practice_session import PracticeSessionStatus, PracticeSessionSummary
+from backend.services.cursor_pagination import (
+    InvalidCursorError,
+    encode_cursor,
+    decode_cursor,
+    cursor_key,
+    cursor_int,
+)
+from backend.services.practice_service import list_user_practice_sessions
+
+
+def test_cursor_round_trips_datetimes_and_object_ids():
+    key = [datetime(2024, 1, 15, 8, 30, 0, 123000), ObjectId()]
+
+    payload = decode_cursor(encode_cursor(key, s="Math", p=3, t=40), s="Math")
+
+    assert cursor_key(payload, 2) == key
+    assert cursor_int(payload, "p") == 3
+    assert cursor_int(payload, "t") == 40
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", "", "e30", encode_cursor(["a"])[:-3]])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        payload = decode_cursor(token)
+        cursor_key(payload, 1)
+
+
+def test_cursor_is_bound_to_its_listing():
+    token = encode_cursor(["a"], s="completed")
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, s="in_progress")
+    with pytest.raises(InvalidCursorError):
+        cursor_int(decode_cursor(token), "p")
+
+
+def _session(index: int) -> PracticeSessionSummary:
+    return PracticeSessionSummary(
+        session_id=f"PRACTICE_{index}",
+        user_id="user1",
+        topic="Math",
+        question_count=1,
+        status=PracticeSessionStatus.IN_PROGRESS,
+        created_at=datetime(2024, 1, 1, index)
+    )
+
+
+@pytest.mark.asyncio
+async def test_practice_sessions_page_by_cursor():
+    practice_repo = AsyncMock()
+    practice_repo.get_user_session_summaries.return_value = [_session(5), _session(4), _session(3)]
+
+    sessions, next_cursor = await list_user_practice_sessions("user1", practice_repo, limit=2)
+
+    assert [s.session_id for s in sessions] == ["PRACTICE_5", "PRACTICE_4"]
+    practice_repo.get_user_session_summaries.return_value = [_session(3)]
+    sessions, last_cursor = await list_user_practice_sessions("user1", practice_repo, limit=2, cursor=next_cursor)
+
+    assert practice_repo.get_user_session_summaries.call_args.kwargs["after"] == (datetime(2024, 1, 1, 4), "PRACTICE_4")
+    assert [s.session_id for s in sessions] == ["PRACTICE_3"]
+    assert last_cursor is None
@@ -0,0 +1,166 @@
+import random
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.models.daily_mission import Question
+from backend.repositories.question_repository import QuestionRepository
+from backend.services.irt import (
+    SELECTION_WINDOW,
+    ability_step,
+    build_item_bank_index,
+    item_bank_index,
+    prior_difficulty,
+    record_ability_response,
+    select_mission_question_ids,
+    select_near_ability,
+    target_difficulty,
+)
+from backend.services.item_analysis import ItemAttempt
+from backend.services.question_exposure import ExposureFilter, exposure_masks
+
+
+def _question(question_id, difficulty_level=1):
+    return Question(
+        question_id=question_id, question_text="?", skill_area="Vocabulary", difficulty_level=difficulty_level,
+        choices=[], correct_answer_id="a", feedback_th=""
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    item_bank_index.clear()
+    yield
+    item_bank_index.clear()
+
+
+@pytest.fixture
+def index():
+    # 200 calibrated questions with difficulties -5.0 .. 4.95
+    questions = {f"q{i:03d}": _question(f"q{i:03d}") for i in range(200)}
+    calibrated = {question_id: {"difficulty": -5 + i * 0.05, "discrimination": 1.0}
+                  for i, question_id in enumerate(sorted(questions))}
+    return build_item_bank_index(questions, calibrated, "v1")
+
+
+def test_prior_difficulty_centers_levels():
+    assert [prior_difficulty(level, [1, 2, 3]) for level in (1, 2, 3)] == [-1, 0, 1]
+    assert prior_difficulty(2, []) == 0.0
+
+
+def test_ability_step_moves_towards_the_response():
+    up, precision = ability_step(0.0, 1.0, 1.0, 0.0, True, 50.0)
+    down, _ = ability_step(0.0, 1.0, 1.0, 0.0, False, 50.0)
+    assert (up, down, precision) == (pytest.approx(0.4), pytest.approx(-0.4), pytest.approx(1.25))
+    assert ability_step(0.0, 50.0, 1.0, 0.0, True, 50.0)[1] == 50.0
+
+
+def test_online_steps_track_a_students_ability():
+    rng = random.Random(5)
+    true_theta, theta, precision = 1.2, 0.0, 1.0
+    for _ in range(400):
+        difficulty = rng.uniform(-2, 3)
+        correct = rng.random() < 1 / (1 + 2.718281828 ** -(true_theta - difficulty))
+        theta, precision = ability_step(theta, precision, 1.0, difficulty, correct, 50.0)
+    assert theta == pytest.approx(true_theta, abs=0.5)
+
+
+def test_uncalibrated_questions_use_their_level():
+    index = build_item_bank_index(
+        {"easy": _question("easy", 1), "mid": _question("mid", 2), "hard": _question("hard", 3)},
+        {"mid": {"difficulty": 1.5, "discrimination": 0.8}},
+    )
+
+    assert index.question_ids == ["easy", "hard", "mid"]
+    assert index.parameters == {"easy": (1.0, -1.0), "mid": (0.8, 1.5), "hard": (1.0, 1.0)}
+
+
+def test_outward_visits_positions_by_distance(index):
+    positions = list(index.outward(0.0))
+
+    assert sorted(positions) == list(range(len(index)))
+    distances = [abs(index.difficulties[position]) for position in positions]
+    assert distances == sorted(distances)
+
+
+def test_selection_is_near_the_target_and_distinct(index, monkeypatch):
+    monkeypatch.setattr("backend.services.irt.settings.IRT_SELECTION_SPREAD", 0.3)
+
+    picked = select_near_ability(index, 1.0, 5, rng=random.Random(1))
+
+    assert len(set(picked)) == 5
+    for question_id in picked:
+        assert abs(index.parameters[question_id][1] - target_difficulty(1.0)) < 1.5
+
+
+def test_selection_skips_recently_served_questions(index, monkeypatch):
+    monkeypatch.setattr("backend.services.irt.settings.IRT_SELECTION_SPREAD", 0.0)
+    position = next(index.outward(target_difficulty(0.0)))
+    nearest = index.question_ids[position - 10:position + 10]
+
+    picked = select_near_ability(index, 0.0, 5, ExposureFilter([exposure_masks(nearest)]), rng=random.Random(1))
+
+    assert not set(picked) & set(nearest)
+
+
+def test_selection_falls_back_to_seen_questions(index, monkeypatch):
+    monkeypatch.setattr("backend.services.irt.settings.IRT_SELECTION_SPREAD", 0.0)
+    everything = ExposureFilter([exposure_masks(index.question_ids)])
+
+    picked = select_near_ability(index, 0.0, 5, everything, rng=random.Random(1))
+
+    # The nearest five, since everything within the window was served
+    assert sorted(picked) == sorted(index.question_ids[p] for p in list(index.outward(target_difficulty(0.0)))[:5])
+    assert SELECTION_WINDOW < len(index)
+
+
+@pytest.mark.asyncio
+async def test_index_cache_reloads_on_new_calibration(monkeypatch):
+    monkeypatch.setattr(QuestionRepository, "_bank_version", "bank1")
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = {"q0": _question("q0")}
+    irt_repo = AsyncMock()
+    irt_repo.get_state.return_value = {"version": "c1"}
+    irt_repo.get_item_parameters.return_value = {}
+
+    first = await item_bank_index.get_index(irt_repo, question_repo)
+    assert await item_bank_index.get_index(irt_repo, question_repo) is first
+    assert await item_bank_index.refresh(irt_repo, question_repo) is first
+
+    irt_repo.get_state.return_value = {"version": "c2"}
+    irt_repo.get_item_parameters.return_value = {"q0": {"difficulty": 0.7, "discrimination": 1.2}}
+    refreshed = await item_bank_index.refresh(irt_repo, question_repo)
+
+    assert refreshed.parameters["q0"] == (1.2, 0.7)
+    assert item_bank_index.builds == 2
+
+
+@pytest.mark.asyncio
+async def test_selection_is_uniform_until_calibrated(monkeypatch):
+    monkeypatch.setattr(QuestionRepository, "_bank_version", "bank1")
+    questions = {f"q{i}": _question(f"q{i}", difficulty_level=1 + i % 3) for i in range(30)}
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = questions
+    irt_repo = AsyncMock()
+    irt_repo.get_state.return_value = {}
+    irt_repo.get_item_parameters.return_value = {}
+    random.seed(3)
+
+    picks = [await select_mission_question_ids("user1", 5, irt_repo, question_repo) for _ in range(20)]
+
+    # Level-based priors alone would keep a new student on the easiest level
+    assert all(len(set(picked)) == 5 for picked in picks)
+    assert {questions[question_id].difficulty_level for picked in picks for question_id in picked} == {1, 2, 3}
+    irt_repo.get_ability.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_only_first_attempts_update_ability(index, monkeypatch):
+    monkeypatch.setattr(item_bank_index, "_index", index)
+    irt_repo = AsyncMock()
+
+    await record_ability_response("user1", ItemAttempt("q100", False, None, 0), irt_repo)
+    irt_repo.record_response.assert_not_awaited()
+
+    await record_ability_response("user1", ItemAttempt("q100", True, "a", 1), irt_repo)
+    irt_repo.record_response.assert_awaited_once()
+    assert irt_repo.record_response.call_args.args[:4] == ("user1", 1.0, index.parameters["q100"][1], True)
@@ -0,0 +1,119 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from backend.models.daily_mission import (
+    Answer, AnswerAttempt, ChoiceOption, DailyMissionDocument, MissionStatus, Question
+)
+from backend.models.practice_session import PracticeSessionStatus
+from backend.services.irt_calibration import fit_irt, run_irt_calibration
+
+
+def _async_iter(items):
+    async def iterate(*args):
+        for item in items:
+            yield item
+    return MagicMock(side_effect=iterate)
+
+
+def _question(question_id, difficulty_level=1):
+    return Question(
+        question_id=question_id, question_text="?", skill_area="Vocabulary", difficulty_level=difficulty_level,
+        choices=[ChoiceOption(id="a", text="A"), ChoiceOption(id="b", text="B")],
+        correct_answer_id="a", feedback_th=""
+    )
+
+
+def _simulate(rng, n_users=1500, n_items=30, per_user=20):
+    theta = rng.normal(size=n_users)
+    difficulty = rng.uniform(-1.5, 1.5, size=n_items)
+    discrimination = rng.uniform(0.6, 2.0, size=n_items)
+    users = np.repeat(np.arange(n_users), per_user)
+    items = np.concatenate([rng.choice(n_items, size=per_user, replace=False) for _ in range(n_users)])
+    p = 1 / (1 + np.exp(-discrimination[items] * (theta[users] - difficulty[items])))
+    return theta, difficulty, discrimination, users, items, (rng.random(len(p)) < p).astype(np.int8)
+
+
+def test_fit_recovers_2pl_parameters():
+    theta, difficulty, discrimination, users, items, correct = _simulate(np.random.default_rng(11))
+
+    fit = fit_irt(users, items, correct, len(theta), np.zeros(len(difficulty)))
+
+    assert fit.iterations < 100
+    assert np.corrcoef(fit.difficulty, difficulty)[0, 1] > 0.95
+    assert np.corrcoef(fit.discrimination, discrimination)[0, 1] > 0.7
+    assert np.corrcoef(fit.theta, theta)[0, 1] > 0.8
+    assert (fit.precision > 1).all()
+
+
+def test_1pl_fixes_discrimination_and_sparse_items_stay_near_their_prior():
+    rng = np.random.default_rng(2)
+    _, _, _, users, items, correct = _simulate(rng, n_users=300, n_items=10, per_user=5)
+    # One extra question with a single (correct) response
+    users, items, correct = np.append(users, 0), np.append(items, 10), np.append(correct, 1)
+    prior = np.append(np.zeros(10), 1.0)
+
+    fit = fit_irt(users, items, correct, 300, prior, two_parameter=False)
+
+    assert (fit.discrimination == 1).all()
+    assert 0 < fit.difficulty[10] < 1.0
+
+
+@pytest.mark.asyncio
+async def test_run_irt_calibration_writes_items_and_abilities(monkeypatch):
+    monkeypatch.setattr("backend.services.irt_calibration.settings.IRT_MODEL", "1pl")
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = {
+        "q0": _question("q0", 1), "q1": _question("q1", 3), "unused": _question("unused", 2)
+    }
+    mission_repo, practice_repo = MagicMock(), MagicMock()
+    mission_repo.iter_missions_by_statuses = _async_iter([
+        DailyMissionDocument(
+            user_id=user_id, date=date(2024, 3, 27), questions=[_question("q0"), _question("q1")],
+            status=MissionStatus.COMPLETE,
+            answers=[
+                Answer(question_id="q0", current_answer="a", is_correct=True, attempt_count=1,
+                       attempts_history=[AnswerAttempt(answer="a", is_correct=True, timestamp=datetime(2024, 3, 27))]),
+                Answer(question_id="q1", current_answer="a", is_correct=True, attempt_count=2, attempts_history=[
+                    AnswerAttempt(answer="b", is_correct=False, timestamp=datetime(2024, 3, 27)),
+                    AnswerAttempt(answer="a", is_correct=True, timestamp=datetime(2024, 3, 27, 0, 1)),
+                ]),
+            ],
+        )
+        for user_id in ("user1", "user2")
+    ])
+    practice_repo.iter_sessions_by_status = _async_iter([])
+    irt_repo = AsyncMock()
+
+    summary = await run_irt_calibration(mission_repo, practice_repo, question_repo, irt_repo)
+
+    assert mission_repo.iter_missions_by_statuses.call_args.args[0] == [
+        MissionStatus.IN_PROGRESS, MissionStatus.COMPLETE, MissionStatus.ARCHIVED
+    ]
+    assert [call.args[0] for call in practice_repo.iter_sessions_by_status.call_args_list] == [
+        PracticeSessionStatus.IN_PROGRESS, PracticeSessionStatus.COMPLETED
+    ]
+    assert (summary["responses"], summary["users"], summary["questions_calibrated"]) == (4, 2, 2)
+    items, abilities, _ = irt_repo.write_calibration.call_args.args
+    assert set(items) == {"q0", "q1"}
+    # Only first attempts count: everyone got q0 right and q1 wrong
+    assert items["q0"]["difficulty"] < -1 and items["q1"]["difficulty"] > 1
+    assert items["q0"]["responses"] == 2 and items["q1"]["discrimination"] == 1.0
+    assert set(abilities) == {"user1", "user2"} and abilities["user1"]["responses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_irt_calibration_without_responses_writes_nothing():
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = {"q0": _question("q0")}
+    mission_repo, practice_repo = MagicMock(), MagicMock()
+    mission_repo.iter_missions_by_statuses = _async_iter([])
+    practice_repo.iter_sessions_by_status = _async_iter([])
+    irt_repo = AsyncMock()
+
+    summary = await run_irt_calibration(mission_repo, practice_repo, question_repo, irt_repo)
+
+    assert summary["responses"] == 0
+    irt_repo.write_calibration.assert_not_awaited()
@@ -0,0 +1,131 @@
+import random
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock
+
+from backend.models.daily_mission import (
+    Answer, AnswerAttempt, ChoiceOption, DailyMissionDocument, MissionStatus, Question
+)
+from backend.models.practice_session import PracticeAnswer, PracticeSession
+from backend.services.item_analysis import (
+    ItemAttempt,
+    get_item_statistics,
+    latest_mission_item_attempt,
+    latest_practice_item_attempt,
+    record_item_attempt,
+    summarize_counters,
+)
+from backend.services.progress_recorder import ProgressRecorder
+
+START = datetime(2024, 3, 27, 1, 0)
+
+
+def _question(question_id, difficulty_level=1):
+    return Question(
+        question_id=question_id, question_text="?", skill_area="Vocabulary", difficulty_level=difficulty_level,
+        choices=[ChoiceOption(id="a", text="A"), ChoiceOption(id="b", text="B")],
+        correct_answer_id="a", feedback_th=""
+    )
+
+
+def _mission(*answers):
+    return DailyMissionDocument(
+        user_id="user1", date=date(2024, 3, 27), questions=[_question("q0"), _question("q1")],
+        status=MissionStatus.IN_PROGRESS, created_at=START, answers=list(answers)
+    )
+
+
+def test_latest_mission_item_attempt_on_a_retry():
+    mission = _mission(
+        Answer(question_id="q0", current_answer="a", is_correct=True, attempt_count=2, attempts_history=[
+            AnswerAttempt(answer="b", is_correct=False, timestamp=START + timedelta(seconds=10)),
+            AnswerAttempt(answer="a", is_correct=True, timestamp=START + timedelta(seconds=40)),
+        ]),
+        Answer(question_id="q1", current_answer="b", is_correct=False, attempt_count=1, attempts_history=[
+            AnswerAttempt(answer="b", is_correct=False, timestamp=START + timedelta(seconds=20)),
+        ]),
+    )
+
+    # A retry is not a first attempt, but it reached the correct answer on attempt 2
+    assert latest_mission_item_attempt(mission) == ItemAttempt("q0", True, None, 2)
+
+
+def test_latest_mission_item_attempt_on_a_first_attempt():
+    mission = _mission(
+        Answer(question_id="q1", current_answer="b", is_correct=False, attempt_count=1, attempts_history=[
+            AnswerAttempt(answer="b", is_correct=False, timestamp=START),
+        ]),
+    )
+
+    assert latest_mission_item_attempt(mission) == ItemAttempt("q1", False, "b", 0)
+    assert latest_mission_item_attempt(_mission()) is None
+
+
+def test_latest_practice_item_attempt_is_a_first_attempt():
+    session = PracticeSession(
+        user_id="user1", topic="Vocabulary", question_count=2, questions=[_question("q0"), _question("q1")],
+        answers=[
+            PracticeAnswer(question_id="q0", user_answer="b", is_correct=False),
+            PracticeAnswer(question_id="q1", user_answer="a", is_correct=True),
+        ],
+    )
+
+    assert latest_practice_item_attempt(session) == ItemAttempt("q1", True, "a", 1)
+
+
+@pytest.mark.asyncio
+async def test_record_item_attempt_picks_a_shard(monkeypatch):
+    monkeypatch.setattr("backend.services.item_analysis.settings.ITEM_STATS_COUNTER_SHARDS", 4)
+    item_repo = AsyncMock()
+
+    await record_item_attempt(ItemAttempt("q0", True, "a", 1), item_repo, rng=random.Random(7))
+
+    question_id, shard, *rest = item_repo.record_attempt.call_args.args
+    assert (question_id, rest) == ("q0", [True, "a", 1])
+    assert 0 <= shard < 4
+
+
+def test_summarize_counters():
+    stats = summarize_counters({
+        "attempts": 7, "correct": 4, "first_attempts": 4, "first_correct": 3, "solved": 3, "attempts_to_correct": 5,
+        "first_choices": {"b": 1, "a": 3},
+    })
+
+    assert stats == {
+        "attempts": 7, "first_attempts": 4, "p_value": 0.75,
+        "choice_rates": {"a": 0.75, "b": 0.25}, "average_attempts_to_correct": 5 / 3,
+    }
+    assert summarize_counters({})["p_value"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_item_statistics_combines_live_and_batch():
+    item_repo = AsyncMock()
+    item_repo.get_counters.return_value = {"first_attempts": 2, "first_correct": 1, "first_choices": {"a": 1, "b": 1}}
+    question_repo = AsyncMock()
+    question_repo.get_question_by_id.return_value = _question("q0", difficulty_level=2)
+    question_repo.get_item_stats.return_value = {"discrimination": 0.31, "suggested_difficulty_level": 3}
+
+    stats = await get_item_statistics("q0", item_repo, question_repo)
+
+    assert stats["difficulty_level"] == 2
+    assert stats["live"]["p_value"] == 0.5
+    assert stats["batch"]["suggested_difficulty_level"] == 3
+
+    question_repo.get_question_by_id.return_value = None
+    assert await get_item_statistics("missing", item_repo, question_repo) is None
+
+
+@pytest.mark.asyncio
+async def test_recorder_counts_items_and_swallows_errors():
+    item_repo = AsyncMock()
+    item_repo.record_attempt.side_effect = Exception("write failed")
+    mission = _mission(
+        Answer(question_id="q1", current_answer="a", is_correct=True, attempt_count=1, attempts_history=[
+            AnswerAttempt(answer="a", is_correct=True, timestamp=START),
+        ]),
+    )
+
+    await ProgressRecorder(AsyncMock(), item_repo=item_repo).mission_answer_submitted(mission)
+
+    item_repo.record_attempt.assert_awaited_once()
@@ -0,0 +1,191 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from backend.models.daily_mission import (
+    Answer, AnswerAttempt, ChoiceOption, DailyMissionDocument, MissionStatus, Question
+)
+from backend.models.practice_session import PracticeAnswer, PracticeSession, PracticeSessionStatus
+from backend.services.item_analysis_batch import (
+    ResponseBuffer,
+    item_statistics,
+    item_sums,
+    mission_responses,
+    practice_responses,
+    run_item_analysis,
+    suggest_difficulty_levels,
+)
+
+START = datetime(2024, 3, 27, 1, 0)
+
+
+def _async_iter(items):
+    async def iterate(*args):
+        for item in items:
+            yield item
+    return MagicMock(side_effect=iterate)
+
+
+def _question(question_id, difficulty_level=1):
+    return Question(
+        question_id=question_id, question_text="?", skill_area="Vocabulary", difficulty_level=difficulty_level,
+        choices=[ChoiceOption(id="a", text="A"), ChoiceOption(id="b", text="B"), ChoiceOption(id="c", text="C")],
+        correct_answer_id="a", feedback_th=""
+    )
+
+
+def _attempts(*answers):
+    return [
+        AnswerAttempt(answer=answer, is_correct=answer == "a", timestamp=START + timedelta(seconds=i))
+        for i, answer in enumerate(answers)
+    ]
+
+
+def _mission(user_id, **histories):
+    return DailyMissionDocument(
+        user_id=user_id, date=date(2024, 3, 27), questions=[_question(q) for q in histories],
+        status=MissionStatus.COMPLETE, created_at=START,
+        answers=[
+            Answer(question_id=q, current_answer=h[-1], is_correct=h[-1] == "a", attempt_count=len(h),
+                   attempts_history=_attempts(*h))
+            for q, h in histories.items()
+        ],
+    )
+
+
+def test_mission_responses_use_first_attempts():
+    mission = _mission("user1", q0=["b", "a"], q1=["c", "b", "c"], gone=["a"])
+
+    responses = mission_responses(mission, {"q0": 0, "q1": 1}, {"a": 0, "b": 1, "c": 2})
+
+    assert responses == [(0, False, 1, 2), (1, False, 2, 0)]
+
+
+def test_practice_responses():
+    session = PracticeSession(
+        user_id="user1", topic="Vocabulary", question_count=2, questions=[_question("q0"), _question("q1")],
+        answers=[
+            PracticeAnswer(question_id="q0", user_answer="a", is_correct=True),
+            PracticeAnswer(question_id="q1", user_answer="z", is_correct=False),
+        ],
+    )
+
+    assert practice_responses(session, {"q0": 0, "q1": 1}, {"a": 0}) == [(0, True, 0, 1), (1, False, -1, 0)]
+
+
+def test_item_sums_match_direct_statistics():
+    rng = np.random.default_rng(3)
+    n_items, n_choices, tests, length = 6, 3, 400, 4
+    ability = rng.normal(size=tests)
+    easiness = np.linspace(-1.5, 1.5, n_items)
+    buffer = ResponseBuffer()
+    for t in range(tests):
+        items = rng.choice(n_items, size=length, replace=False)
+        correct = rng.random(length) < 1 / (1 + np.exp(-(ability[t] + easiness[items])))
+        buffer.add_test([
+            (int(item), bool(ok), 0 if ok else int(rng.integers(1, n_choices)), 1 if ok else 0)
+            for item, ok in zip(items, correct)
+        ])
+    buffer.add_test([(0, True, 0, 1)])  # a single-question test counts for the p-value only
+    arrays = buffer.take()
+    items, correct, rest, scored = arrays[:4]
+
+    # Two chunks reduce to the same sums as one
+    half = len(items) // 2
+    sums = (item_sums(*(a[:half] for a in arrays), n_items, n_choices)
+            + item_sums(*(a[half:] for a in arrays), n_items, n_choices))
+    assert np.allclose(sums, item_sums(*arrays, n_items, n_choices))
+
+    question_ids = [f"q{i}" for i in range(n_items)]
+    stats = item_statistics(sums, question_ids, ["a", "b", "c"], {q: _question(q) for q in question_ids}, 30)
+    for i, question_id in enumerate(question_ids):
+        mine = items == i
+        both = mine & (scored > 0)
+        assert stats[question_id]["responses"] == mine.sum()
+        assert stats[question_id]["p_value"] == pytest.approx(correct[mine].mean(), abs=1e-4)
+        assert stats[question_id]["discrimination"] == pytest.approx(
+            np.corrcoef(correct[both], rest[both])[0, 1], abs=1e-4
+        )
+        assert stats[question_id]["choice_rates"]["a"] == stats[question_id]["p_value"]
+        assert stats[question_id]["average_attempts_to_correct"] == 1.0
+    # Easier items discriminate positively in this model
+    assert all(stats[q]["discrimination"] > 0 for q in question_ids)
+
+
+def test_suggested_levels_keep_the_bank_mix():
+    p_values = np.array([0.2, 0.9, 0.5, 0.7, np.nan])
+    levels = np.array([1, 3, 2, 1, 2])
+    responses = np.array([50, 50, 50, 10, 0])
+
+    suggested = suggest_difficulty_levels(p_values, levels, responses, 30)
+
+    # Only the first three are calibrated; their levels {1, 2, 3} are reassigned by p-value
+    assert suggested.tolist() == [3, 1, 2, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_are_spawned_not_forked(monkeypatch):
+    monkeypatch.setattr("backend.services.item_analysis_batch.settings.ITEM_ANALYSIS_WORKERS", 2)
+    pools = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            pools.append(kwargs)
+
+    monkeypatch.setattr("backend.services.item_analysis_batch.ProcessPoolExecutor", RecordingPool)
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = {"q0": _question("q0")}
+    question_repo.write_item_stats.return_value = 0
+    mission_repo, practice_repo = MagicMock(), MagicMock()
+    mission_repo.iter_missions_by_statuses = _async_iter([])
+    practice_repo.iter_sessions_by_status = _async_iter([])
+
+    await run_item_analysis(mission_repo, practice_repo, question_repo)
+
+    assert pools[0]["mp_context"].get_start_method() == "spawn"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [1, 2])
+async def test_run_item_analysis_writes_stats(monkeypatch, workers):
+    monkeypatch.setattr("backend.services.item_analysis_batch.settings.ITEM_ANALYSIS_WORKERS", workers)
+    monkeypatch.setattr("backend.services.item_analysis_batch.settings.ITEM_ANALYSIS_CHUNK_ROWS", 3)
+    monkeypatch.setattr("backend.services.item_analysis_batch.settings.ITEM_ANALYSIS_MIN_RESPONSES", 1)
+    questions = {"q0": _question("q0", 2), "q1": _question("q1", 1), "q2": _question("q2", 3)}
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = questions
+    question_repo.write_item_stats.side_effect = lambda stats: len(stats)
+    mission_repo, practice_repo = MagicMock(), MagicMock()
+    mission_repo.iter_missions_by_statuses = _async_iter([
+        _mission("user1", q0=["a"], q1=["b", "a"]),
+        _mission("user2", q0=["a"], q1=["c", "c", "c"]),
+    ])
+    practice_repo.iter_sessions_by_status = _async_iter([
+        PracticeSession(
+            user_id="user3", topic="Vocabulary", question_count=2, status=PracticeSessionStatus.COMPLETED,
+            questions=[_question("q0"), _question("q1")],
+            answers=[
+                PracticeAnswer(question_id="q0", user_answer="b", is_correct=False),
+                PracticeAnswer(question_id="q1", user_answer="a", is_correct=True),
+            ],
+        ),
+    ])
+
+    summary = await run_item_analysis(mission_repo, practice_repo, question_repo)
+
+    assert mission_repo.iter_missions_by_statuses.call_args.args[0] == [MissionStatus.COMPLETE, MissionStatus.ARCHIVED]
+    assert practice_repo.iter_sessions_by_status.call_args.args[0] == PracticeSessionStatus.COMPLETED
+    assert (summary["missions_processed"], summary["sessions_processed"], summary["responses"]) == (2, 1, 6)
+    [stats] = question_repo.write_item_stats.call_args.args
+    assert set(stats) == {"q0", "q1"}
+    assert stats["q0"]["p_value"] == pytest.approx(2 / 3, abs=1e-4)
+    assert stats["q1"]["choice_rates"] == {"a": pytest.approx(1 / 3, abs=1e-4), "b": pytest.approx(1 / 3, abs=1e-4),
+                                           "c": pytest.approx(1 / 3, abs=1e-4)}
+    assert stats["q1"]["average_attempts_to_correct"] == 1.5
+    # q1 (p 1/3) is harder than q0 (p 2/3), so they swap levels
+    assert (stats["q0"]["suggested_difficulty_level"], stats["q1"]["suggested_difficulty_level"]) == (1, 2)
+    assert stats["q0"]["discrimination"] == -1.0
@@ -0,0 +1,227 @@
+import pytest
+import random
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from backend.models.daily_mission import Answer, ChoiceOption, DailyMissionDocument, MissionStatus, Question
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.services.leaderboard import (
+    REFRESH_OVERLAP,
+    InvalidLeaderboardWeekError,
+    LeaderboardCache,
+    RankIndex,
+    current_periods,
+    get_leaderboard,
+    leaderboard,
+    record_mission_score,
+    record_practice_score,
+)
+from backend.services.progress_recorder import ProgressRecorder
+
+
+def _score(user_id, missions, accuracy):
+    return {"user_id": user_id, "missions_completed": missions, "accuracy": accuracy, "questions": 10, "correct": 0}
+
+
+@pytest.fixture(autouse=True)
+def clear_leaderboard():
+    leaderboard.clear()
+    yield
+    leaderboard.clear()
+
+
+def test_rank_index_orders_by_missions_then_accuracy_with_shared_ranks():
+    board = RankIndex([
+        _score("carol", 3, 0.5),
+        _score("alice", 5, 0.9),
+        _score("bob", 3, 0.5),
+        _score("dave", 3, 0.8),
+    ])
+
+    assert [(entry["rank"], entry["user_id"]) for entry in board.top(10)] == [
+        (1, "alice"), (2, "dave"), (3, "bob"), (3, "carol")
+    ]
+    assert board.rank("carol") == 3
+    assert board.rank("nobody") is None
+    assert len(board) == 4
+
+
+def test_rank_index_upsert_moves_user():
+    board = RankIndex([_score("alice", 5, 0.9), _score("bob", 3, 0.5)])
+
+    board.upsert(_score("bob", 6, 0.5))
+
+    assert board.rank("bob") == 1
+    assert board.rank("alice") == 2
+    assert len(board) == 2
+
+
+def test_rank_index_matches_a_rebuild_after_many_updates():
+    rng = random.Random(7)
+    board = RankIndex()
+    latest = {}
+    for _ in range(500):
+        score = _score(f"user{rng.randrange(40)}", rng.randrange(8), rng.choice([0.25, 0.5, 0.75]))
+        board.upsert(score)
+        latest[score["user_id"]] = score
+
+    assert board.top(100) == RankIndex(latest.values()).top(100)
+
+
+def test_current_periods_are_this_and_last_week():
+    assert current_periods(date(2024, 3, 27)) == ["2024-03-25", "2024-03-18"]
+
+
+@pytest.mark.asyncio
+async def test_boards_load_once_and_receive_deltas():
+    cache = LeaderboardCache()
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.get_period_scores.return_value = [_score("alice", 1, 1.0)]
+
+    board = await cache.get_board("2024-03-25", leaderboard_repo)
+    cache.apply("2024-03-25", _score("bob", 2, 0.5))
+    cache.apply("2024-03-18", _score("carol", 9, 1.0))  # not loaded: ignored
+
+    assert await cache.get_board("2024-03-25", leaderboard_repo) is board
+    assert leaderboard_repo.get_period_scores.await_count == 1
+    assert board.rank("bob") == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_drops_other_periods():
+    cache = LeaderboardCache()
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.get_period_scores.return_value = []
+    await cache.get_board("2024-01-01", leaderboard_repo)
+
+    await cache.refresh(["2024-03-25"], leaderboard_repo)
+    await cache.get_board("2024-01-01", leaderboard_repo)
+
+    assert cache.loads == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_reads_only_scores_written_since_the_last_one():
+    cache = LeaderboardCache()
+    leaderboard_repo = AsyncMock()
+    loaded_at = datetime(2024, 3, 27, 8, 0)
+    leaderboard_repo.get_period_scores.return_value = [
+        {**_score("alice", 2, 0.9), "updated_at": loaded_at}, {**_score("bob", 1, 0.5), "updated_at": loaded_at}
+    ]
+    board = await cache.get_board("2024-03-25", leaderboard_repo)
+    leaderboard_repo.get_period_scores_updated_since.return_value = [
+        {**_score("bob", 3, 0.5), "updated_at": loaded_at + timedelta(minutes=1)}
+    ]
+
+    await cache.refresh(["2024-03-25"], leaderboard_repo)
+
+    leaderboard_repo.get_period_scores.assert_awaited_once()
+    leaderboard_repo.get_period_scores_updated_since.assert_awaited_once_with(
+        "2024-03-25", loaded_at - REFRESH_OVERLAP
+    )
+    assert await cache.get_board("2024-03-25", leaderboard_repo) is board
+    assert (board.rank("bob"), board.rank("alice")) == (1, 2)
+
+    await cache.refresh(["2024-03-25"], leaderboard_repo)
+    assert leaderboard_repo.get_period_scores_updated_since.call_args.args[1] == (
+        loaded_at + timedelta(minutes=1) - REFRESH_OVERLAP
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_leaderboard_returns_top_and_my_rank():
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.get_period_scores.return_value = [
+        _score("alice", 5, 0.9), _score("bob", 3, 0.5), _score("carol", 1, 1.0)
+    ]
+
+    with patch("backend.services.leaderboard.get_utc7_today_date", return_value=date(2024, 3, 28)):
+        board = await get_leaderboard(leaderboard_repo, limit=1, user_id="carol", week=date(2024, 3, 27))
+
+    assert board["period"] == "2024-03-25"
+    assert board["participants"] == 3
+    assert [entry["user_id"] for entry in board["top"]] == ["alice"]
+    assert board["me"]["rank"] == 3
+    leaderboard_repo.get_period_scores.assert_awaited_once_with("2024-03-25")
+
+
+@pytest.mark.asyncio
+async def test_earlier_weeks_are_queried_without_being_cached():
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.get_top_scores.return_value = [_score("alice", 5, 0.9), _score("bob", 5, 0.9)]
+    leaderboard_repo.get_score.return_value = _score("carol", 1, 1.0)
+    leaderboard_repo.count_scores.return_value = 40
+    leaderboard_repo.count_scores_above.return_value = 12
+    loads = leaderboard.loads
+
+    with patch("backend.services.leaderboard.get_utc7_today_date", return_value=date(2024, 3, 28)):
+        board = await get_leaderboard(leaderboard_repo, limit=2, user_id="carol", week=date(2024, 1, 3))
+
+    assert board["period"] == "2024-01-01"
+    assert board["participants"] == 40
+    assert [(entry["rank"], entry["user_id"]) for entry in board["top"]] == [(1, "alice"), (1, "bob")]
+    assert board["me"]["rank"] == 13
+    leaderboard_repo.get_top_scores.assert_awaited_once_with("2024-01-01", 2)
+    leaderboard_repo.count_scores_above.assert_awaited_once_with("2024-01-01", 1, 1.0)
+    leaderboard_repo.get_period_scores.assert_not_awaited()
+    assert leaderboard.loads == loads
+
+
+@pytest.mark.asyncio
+async def test_weeks_that_have_not_started_are_rejected():
+    with patch("backend.services.leaderboard.get_utc7_today_date", return_value=date(2024, 3, 28)):
+        with pytest.raises(InvalidLeaderboardWeekError):
+            await get_leaderboard(AsyncMock(), week=date(2024, 4, 1))
+
+
+@pytest.mark.asyncio
+async def test_record_mission_score_counts_mission_week_and_correct_answers():
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.apply_delta.return_value = _score("user1", 1, 0.5)
+    questions = [
+        Question(
+            question_id=f"q{i}", question_text="?", skill_area="Vocabulary", difficulty_level=1,
+            choices=[ChoiceOption(id="a", text="A")], correct_answer_id="a", feedback_th=""
+        )
+        for i in range(2)
+    ]
+    mission = DailyMissionDocument(
+        user_id="user1", date=date(2024, 3, 31), questions=questions, status=MissionStatus.COMPLETE,
+        answers=[
+            Answer(question_id="q0", current_answer="a", is_correct=True, is_complete=True),
+            Answer(question_id="q1", current_answer="b", is_correct=False, is_complete=True),
+        ]
+    )
+
+    await record_mission_score(mission, leaderboard_repo)
+
+    leaderboard_repo.apply_delta.assert_awaited_once_with("2024-03-25", "user1", "mission:2024-03-31", 1, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_record_practice_score_uses_completion_week_in_target_timezone():
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.apply_delta.return_value = None
+    session = PracticeSession(
+        user_id="user1", topic="Vocabulary", question_count=5, correct_count=3, questions=[],
+        status=PracticeSessionStatus.COMPLETED,
+        # Sunday 20:00 UTC is Monday in UTC+7
+        completed_at=datetime(2024, 3, 31, 20, 0, tzinfo=timezone.utc),
+    )
+
+    await record_practice_score(session, leaderboard_repo)
+
+    leaderboard_repo.apply_delta.assert_awaited_once_with(
+        "2024-04-01", "user1", f"practice:{session.session_id}", 0, 5, 3
+    )
+
+
+@pytest.mark.asyncio
+async def test_recorder_swallows_leaderboard_errors():
+    leaderboard_repo = AsyncMock()
+    leaderboard_repo.apply_delta.side_effect = Exception("write failed")
+    mission = DailyMissionDocument(user_id="user1", date=date(2024, 3, 27), questions=[], status=MissionStatus.COMPLETE)
+
+    await ProgressRecorder(AsyncMock(), leaderboard_repo=leaderboard_repo).mission_completed(mission)
+
+    leaderboard_repo.apply_delta.assert_awaited_once()
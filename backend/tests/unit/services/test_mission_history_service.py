@@ -0,0 +1,53 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock
+
+from backend.models.daily_mission import MissionStatus, MissionSummary
+from backend.services.mission_history_service import (
+    InvalidHistoryRangeError,
+    OPEN_CACHE_CONTROL,
+    SETTLED_CACHE_CONTROL,
+    get_mission_history,
+    history_cache_control,
+    resolve_history_range,
+)
+
+TODAY = date(2024, 3, 15)
+
+
+def test_resolve_history_range_defaults_to_last_30_days():
+    assert resolve_history_range(None, None, today=TODAY) == (date(2024, 2, 15), TODAY)
+    assert resolve_history_range(date(2024, 3, 1), None, today=TODAY) == (date(2024, 3, 1), TODAY)
+
+def test_resolve_history_range_rejects_reversed_and_long_ranges():
+    with pytest.raises(InvalidHistoryRangeError):
+        resolve_history_range(date(2024, 3, 10), date(2024, 3, 1), today=TODAY)
+    with pytest.raises(InvalidHistoryRangeError):
+        resolve_history_range(date(2022, 1, 1), date(2024, 3, 1), today=TODAY)
+
+def test_only_settled_ranges_are_cached_long():
+    assert history_cache_control(date(2024, 3, 13), today=TODAY) == SETTLED_CACHE_CONTROL
+    # Yesterday's mission may still be archived by the next daily reset
+    assert history_cache_control(date(2024, 3, 14), today=TODAY) == OPEN_CACHE_CONTROL
+    assert history_cache_control(TODAY, today=TODAY) == OPEN_CACHE_CONTROL
+
+@pytest.mark.asyncio
+async def test_get_mission_history_returns_compact_days():
+    mission_repo = AsyncMock()
+    mission_repo.get_mission_summaries.return_value = [
+        MissionSummary(date=date(2024, 3, 1), status=MissionStatus.COMPLETE, question_count=5, correct_count=4,
+                       answered_count=5, updated_at=datetime(2024, 3, 1, 9)),
+        MissionSummary(date=date(2024, 3, 3), status=MissionStatus.ARCHIVED, question_count=5, correct_count=1),
+    ]
+
+    history = await get_mission_history("user1", mission_repo, date(2024, 3, 1), date(2024, 3, 7), today=TODAY)
+
+    mission_repo.get_mission_summaries.assert_awaited_once_with("user1", date(2024, 3, 1), date(2024, 3, 7))
+    assert history == {
+        "from": "2024-03-01",
+        "to": "2024-03-07",
+        "days": [
+            {"date": "2024-03-01", "status": "complete", "correct": 4, "total": 5},
+            {"date": "2024-03-03", "status": "archived", "correct": 1, "total": 5},
+        ],
+    }
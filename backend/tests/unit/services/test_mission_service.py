@@ -12,6 +12,7 @@ from backend.services.mission_generation_service import (
 from backend.services.mission_service import get_todays_mission_for_user
 from backend.services.mission_progress_service import update_mission_progress
 from backend.services.mission_lifecycle_service import archive_past_incomplete_missions
+from backend.services.irt import item_bank_index, target_difficulty
 
 TARGET_TIMEZONE = timezone(timedelta(hours=7))
 
@@ -43,6 +44,17 @@ async def test_generate_daily_mission_success(mock_mission_repo, mock_question_r
     assert len(mission.questions) == 5
     mock_mission_repo.save_mission.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_generate_daily_mission_avoids_recently_served_questions(mock_mission_repo, mock_question_repo):
+    from backend.services.question_exposure import exposure_masks
+    exposure_repo = AsyncMock()
+    exposure_repo.get_generations.return_value = [exposure_masks([f"q{i}" for i in range(5)]), {}]
+
+    mission = await generate_daily_mission("user1", mock_mission_repo, mock_question_repo, exposure_repo=exposure_repo)
+
+    assert {q.question_id for q in mission.questions} == {f"q{i}" for i in range(5, 10)}
+    exposure_repo.add_exposures.assert_awaited_once()
+
 @pytest.mark.asyncio
 async def test_generate_daily_mission_no_questions(mock_mission_repo, mock_question_repo):
     mock_question_repo.get_all_questions.return_value = {}
@@ -160,4 +172,22 @@ async def test_archive_past_incomplete_missions(mock_mission_repo):
     assert mock_mission_repo.save_mission.call_count == 2
     # Verify that the status is updated to ARCHIVED
     first_call_args = mock_mission_repo.save_mission.call_args_list[0].args[0]
-    assert first_call_args.status == MissionStatus.ARCHIVED 
\ No newline at end of file
+    assert first_call_args.status == MissionStatus.ARCHIVED 
+@pytest.mark.asyncio
+async def test_generate_daily_mission_picks_near_ability(mock_mission_repo, mock_question_repo):
+    item_bank_index.clear()
+    irt_repo = AsyncMock()
+    irt_repo.get_state.return_value = {"version": "c1"}
+    irt_repo.get_item_parameters.return_value = {
+        f"q{i}": {"difficulty": i - 5.0, "discrimination": 1.0} for i in range(10)
+    }
+    irt_repo.get_ability.return_value = {"theta": 3.0}
+
+    with patch("backend.services.irt.settings.IRT_SELECTION_SPREAD", 0.0):
+        mission = await generate_daily_mission("user1", mock_mission_repo, mock_question_repo, irt_repo=irt_repo)
+    item_bank_index.clear()
+
+    # The five questions closest to the target difficulty (about 2.15)
+    assert round(target_difficulty(3.0), 2) == 2.15
+    assert sorted(q.question_id for q in mission.questions) == ["q5", "q6", "q7", "q8", "q9"]
+    irt_repo.get_ability.assert_awaited_once_with("user1")
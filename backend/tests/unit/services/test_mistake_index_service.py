@@ -0,0 +1,198 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus, Question, ChoiceOption, Answer
+from backend.models.practice_session import PracticeSession, PracticeAnswer, PracticeSessionStatus
+from backend.services.mistake_index_service import (
+    mission_mistake_items,
+    practice_mistake_items,
+    record_mission_mistakes,
+    backfill_mistakes,
+)
+from backend.services.progress_recorder import ProgressRecorder
+from backend.services.mission_progress_service import mark_feedback_shown
+from backend.services.mission_lifecycle_service import archive_past_incomplete_missions
+from backend.services.practice_service import submit_practice_answer
+from backend.services.utils import TARGET_TIMEZONE
+
+
+@pytest.fixture
+def questions():
+    return [
+        Question(
+            question_id=f"q{i}",
+            question_text=f"Question {i}",
+            skill_area="Vocabulary",
+            difficulty_level=1,
+            choices=[ChoiceOption(id="a", text="Apple"), ChoiceOption(id="b", text="Banana")],
+            correct_answer_id="a",
+            feedback_th="feedback"
+        )
+        for i in range(2)
+    ]
+
+
+@pytest.fixture
+def mission(questions):
+    return DailyMissionDocument(
+        user_id="user1",
+        date=date(2024, 3, 1),
+        questions=questions,
+        status=MissionStatus.COMPLETE,
+        answers=[
+            Answer(question_id="q0", current_answer="b", is_correct=False, attempt_count=3,
+                   is_complete=True, feedback_shown=True),
+            Answer(question_id="q1", current_answer="a", is_correct=True, attempt_count=1,
+                   is_complete=True, feedback_shown=True),
+        ]
+    )
+
+
+@pytest.fixture
+def mock_mistake_repo():
+    return AsyncMock()
+
+
+def test_mission_mistake_items_only_include_incorrect_answers(mission):
+    items = mission_mistake_items(mission)
+
+    assert len(items) == 1
+    assert items[0].question_id == "q0"
+    assert items[0].user_answer_text == "Banana"
+    assert items[0].correct_answer_text == "Apple"
+    assert items[0].attempt_count == 3
+    assert items[0].source == "mission"
+
+
+def test_practice_mistake_items_use_completion_day_in_target_timezone(questions):
+    # 20:00 UTC on 1 March is 03:00 on 2 March in UTC+7
+    session = PracticeSession(
+        user_id="user1",
+        topic="Vocabulary",
+        question_count=2,
+        questions=questions,
+        answers=[
+            PracticeAnswer(question_id="q0", user_answer="b", is_correct=False),
+            PracticeAnswer(question_id="q1", user_answer="a", is_correct=True),
+        ],
+        status=PracticeSessionStatus.COMPLETED,
+        completed_at=datetime(2024, 3, 1, 20, 0)
+    )
+
+    items = practice_mistake_items(session)
+
+    assert len(items) == 1
+    assert items[0].source == "practice"
+    assert items[0].attempt_count == 1
+    assert items[0].mission_date == date(2024, 3, 2)
+
+
+@pytest.mark.asyncio
+async def test_record_mission_mistakes_keys_by_mission_date(mission, mock_mistake_repo):
+    mock_mistake_repo.record_mistakes.return_value = 1
+
+    assert await record_mission_mistakes(mission, mock_mistake_repo) == 1
+
+    user_id, source, source_id, items = mock_mistake_repo.record_mistakes.call_args.args
+    assert (user_id, source, source_id) == ("user1", "mission", "2024-03-01")
+    assert [item.question_id for item in items] == ["q0"]
+
+
+@pytest.mark.asyncio
+async def test_recorder_swallows_repository_errors(mission, mock_mistake_repo):
+    mock_mistake_repo.record_mistakes.side_effect = Exception("write failed")
+
+    # Must not raise: the user's submission has already been saved
+    await ProgressRecorder(mock_mistake_repo).mission_completed(mission)
+
+
+@pytest.mark.asyncio
+async def test_recorder_bumps_review_epochs_of_affected_users(mission, mock_mistake_repo):
+    epoch_repo = AsyncMock()
+    recorder = ProgressRecorder(mock_mistake_repo, epoch_repo)
+
+    await recorder.mission_completed(mission)
+    epoch_repo.bump_epochs.assert_awaited_once_with(["user1"])
+
+    # The epoch still moves on when recording fails: the cache must not outlive the transition
+    mock_mistake_repo.record_mistakes.side_effect = Exception("write failed")
+    await recorder.missions_archived([mission])
+    assert list(epoch_repo.bump_epochs.call_args.args[0]) == ["user1"]
+
+
+@pytest.mark.asyncio
+async def test_recorder_schedules_new_mistakes_for_review(mission, mock_mistake_repo):
+    schedule_repo = AsyncMock()
+
+    await ProgressRecorder(mock_mistake_repo, schedule_repo=schedule_repo).mission_completed(mission)
+
+    user_id, scheduled = schedule_repo.schedule_mistakes.call_args.args
+    assert user_id == "user1"
+    assert [mistake.question_id for mistake, _ in scheduled] == ["q0"]
+
+
+@pytest.mark.asyncio
+async def test_recorder_notified_only_on_transition_to_complete(mission):
+    mission_repo = AsyncMock()
+    recorder = AsyncMock()
+    mission.status = MissionStatus.IN_PROGRESS
+    mission.answers[1].feedback_shown = False
+    mission_repo.find_mission.return_value = mission
+
+    await mark_feedback_shown("user1", "q1", mission_repo, recorder=recorder)
+    recorder.mission_completed.assert_awaited_once_with(mission)
+
+    # Already complete: showing feedback again must not record twice
+    await mark_feedback_shown("user1", "q1", mission_repo, recorder=recorder)
+    recorder.mission_completed.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_archival_reports_archived_missions(mission):
+    mission_repo = AsyncMock()
+    recorder = AsyncMock()
+    mission.status = MissionStatus.IN_PROGRESS
+    mission_repo.get_missions_to_archive.return_value = [mission]
+
+    assert await archive_past_incomplete_missions(mission_repo, recorder=recorder) == 1
+    recorder.missions_archived.assert_awaited_once_with([mission])
+
+
+@pytest.mark.asyncio
+async def test_practice_completion_notifies_recorder(questions):
+    practice_repo = AsyncMock()
+    recorder = AsyncMock()
+    session = PracticeSession(user_id="user1", topic="Vocabulary", question_count=1, questions=questions[:1])
+    practice_repo.find_session.return_value = session
+
+    await submit_practice_answer(session.session_id, "q0", "b", practice_repo, recorder=recorder)
+
+    recorder.practice_session_completed.assert_awaited_once_with(session)
+
+
+@pytest.mark.asyncio
+async def test_backfill_counts_missions_sessions_and_errors(mission, questions, mock_mistake_repo):
+    async def missions(_statuses):
+        yield mission
+        yield mission
+
+    async def sessions(_status):
+        yield PracticeSession(
+            user_id="user1", topic="Vocabulary", question_count=1, questions=questions[:1],
+            answers=[PracticeAnswer(question_id="q0", user_answer="b", is_correct=False)],
+            status=PracticeSessionStatus.COMPLETED, completed_at=datetime.now(TARGET_TIMEZONE)
+        )
+
+    mission_repo = MagicMock()
+    mission_repo.iter_missions_by_statuses = missions
+    practice_repo = MagicMock()
+    practice_repo.iter_sessions_by_status = sessions
+    mock_mistake_repo.record_mistakes.side_effect = [1, Exception("boom"), 1]
+
+    summary = await backfill_mistakes(mission_repo, practice_repo, mock_mistake_repo)
+
+    assert summary["missions_processed"] == 2
+    assert summary["sessions_processed"] == 1
+    assert summary["mistakes_inserted"] == 2
+    assert summary["error_count"] == 1
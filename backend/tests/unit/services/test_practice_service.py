@@ -1,19 +1,24 @@
 import pytest
+import random
 from unittest.mock import AsyncMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from backend.services.practice_service import (
     create_practice_session,
+    create_mistakes_practice_session,
     get_practice_session,
     submit_practice_answer,
     get_practice_session_summary,
     get_available_practice_topics,
+    save_practice_progress,
     PracticeServiceError,
     InsufficientQuestionsError,
     SessionNotFoundError,
     SessionAlreadyCompletedError,
+    SessionAbandonedError,
 )
-from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus, PracticeMode, AdaptiveState
+from backend.services.utils import get_utc7_today_date
 from backend.models.daily_mission import Question, ChoiceOption
 
 # Sample test data
@@ -92,6 +97,130 @@ async def test_create_practice_session_success(mock_question_repo, mock_practice
     mock_question_repo.get_questions_by_topic.assert_called_once_with("Math", 5)
     mock_practice_repo.create_session.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_create_practice_session_avoids_recently_served_questions(mock_question_repo, mock_practice_repo, sample_questions):
+    """Questions in the user's exposure filter are only used when the topic runs out."""
+    from backend.services.question_exposure import exposure_masks
+    mock_question_repo.get_topic_question_count.return_value = 5
+    mock_question_repo.get_questions_by_topic.return_value = sample_questions
+    exposure_repo = AsyncMock()
+    exposure_repo.get_generations.return_value = [exposure_masks(["test_q1", "test_q2", "test_q3"]), {}]
+
+    session = await create_practice_session(
+        user_id="test_user",
+        topic="Math",
+        question_count=2,
+        question_repo=mock_question_repo,
+        practice_repo=mock_practice_repo,
+        exposure_repo=exposure_repo
+    )
+
+    assert {q.question_id for q in session.questions} == {"test_q4", "test_q5"}
+    mock_question_repo.get_questions_by_topic.assert_called_once_with("Math")
+    user_id, masks, count, _ = exposure_repo.add_exposures.call_args.args
+    assert (user_id, count) == ("test_user", 2)
+    assert masks == exposure_masks(["test_q4", "test_q5"]) or masks == exposure_masks(["test_q5", "test_q4"])
+
+@pytest.mark.asyncio
+async def test_adaptive_session_serves_one_question_per_answer(mock_question_repo, mock_practice_repo):
+    """Adaptive sessions start with one question and get the next one with each answer's feedback."""
+    from backend.services.practice_service import create_adaptive_practice_session
+    from backend.services.adaptive_practice import candidate_index
+    bank = {
+        f"q{level}_{i}": Question(
+            question_id=f"q{level}_{i}", question_text="?", skill_area="Math", difficulty_level=level,
+            choices=[], correct_answer_id="a", feedback_th="fb"
+        )
+        for level in (1, 2, 3) for i in range(3)
+    }
+    mock_question_repo.get_all_questions.return_value = bank
+    candidate_index.clear()
+
+    session = await create_adaptive_practice_session("test_user", "Math", 3, mock_question_repo, mock_practice_repo)
+    assert session.mode == PracticeMode.ADAPTIVE
+    assert [q.difficulty_level for q in session.questions] == [2]
+    mock_practice_repo.find_session.return_value = session
+
+    feedback = await submit_practice_answer(
+        session.session_id, session.questions[0].question_id, "wrong", mock_practice_repo,
+        question_repo=mock_question_repo
+    )
+    assert feedback["progress"] == {"answered": 1, "total": 3}
+    assert feedback["next_question"]["difficulty_level"] == 1
+    assert feedback["session_complete"] is False
+
+    for _ in range(2):
+        feedback = await submit_practice_answer(
+            session.session_id, feedback["next_question"]["question_id"], "a", mock_practice_repo,
+            question_repo=mock_question_repo
+        )
+    assert feedback["session_complete"] is True
+    assert feedback["next_question"] is None
+    assert len({q.question_id for q in session.questions}) == 3
+    candidate_index.clear()
+
+def _mistake_summary(question_id, days_ago, attempt_count=1):
+    today = datetime.combine(get_utc7_today_date(), datetime.min.time())
+    return {
+        "question_id": question_id,
+        "mistake_count": 1,
+        "attempt_count": attempt_count,
+        "last_mistake_date": today - timedelta(days=days_ago),
+    }
+
+@pytest.mark.asyncio
+async def test_create_mistakes_practice_session_samples_recent_mistakes(
+    mock_question_repo, mock_practice_repo, sample_questions
+):
+    """Recent, repeatedly missed questions are picked far more often than old ones."""
+    questions_by_id = {q.question_id: q for q in sample_questions}
+    mock_question_repo.get_question_by_id.side_effect = lambda question_id: questions_by_id.get(question_id)
+    mistake_repo = AsyncMock()
+    mistake_repo.summarize_questions.return_value = [
+        _mistake_summary("test_q1", days_ago=0, attempt_count=3),
+        _mistake_summary("test_q2", days_ago=120),
+        _mistake_summary("retired_q", days_ago=0),
+    ]
+    rng = random.Random(7)
+
+    picks = []
+    for _ in range(200):
+        session = await create_mistakes_practice_session(
+            "test_user", 1, mock_question_repo, mock_practice_repo, mistake_repo, skill_area="Math", rng=rng
+        )
+        picks.append(session.questions[0].question_id)
+
+    assert session.mode == PracticeMode.MISTAKES
+    assert session.topic == "Math"
+    assert picks.count("test_q1") > 190
+    mistake_repo.summarize_questions.assert_called_with("test_user", "Math", window=500)
+
+@pytest.mark.asyncio
+async def test_create_mistakes_practice_session_caps_at_available_mistakes(
+    mock_question_repo, mock_practice_repo, sample_questions
+):
+    mock_question_repo.get_question_by_id.side_effect = lambda question_id: sample_questions[0]
+    mistake_repo = AsyncMock()
+    mistake_repo.summarize_questions.return_value = [_mistake_summary("test_q1", days_ago=3)]
+
+    session = await create_mistakes_practice_session(
+        "test_user", 5, mock_question_repo, mock_practice_repo, mistake_repo
+    )
+
+    assert session.question_count == 1
+    mock_practice_repo.create_session.assert_called_once_with(session)
+
+@pytest.mark.asyncio
+async def test_create_mistakes_practice_session_without_mistakes(mock_question_repo, mock_practice_repo):
+    mistake_repo = AsyncMock()
+    mistake_repo.summarize_questions.return_value = []
+
+    with pytest.raises(InsufficientQuestionsError):
+        await create_mistakes_practice_session(
+            "test_user", 5, mock_question_repo, mock_practice_repo, mistake_repo
+        )
+    mock_practice_repo.create_session.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_create_practice_session_insufficient_questions(mock_question_repo, mock_practice_repo):
     """Test practice session creation with insufficient questions."""
@@ -185,6 +314,52 @@ async def test_submit_practice_answer_correct(mock_practice_repo, sample_questio
     assert len(session.answers) == 1
     assert session.answers[0].is_correct == True
 
+@pytest.mark.asyncio
+async def test_completion_is_reported_only_by_the_write_that_completes(mock_practice_repo, sample_questions):
+    """A completion whose stored session is no longer in progress is not reported again."""
+    session = PracticeSession(user_id="test_user", topic="Math", question_count=1, questions=sample_questions[:1])
+    session.mark_completed()
+    recorder = AsyncMock()
+
+    mock_practice_repo.update_session.return_value = session
+    assert await save_practice_progress(session, mock_practice_repo, recorder) is True
+    # A re-sent completion, a racing worker or a compacted session matches nothing
+    mock_practice_repo.update_session.return_value = None
+    assert await save_practice_progress(session, mock_practice_repo, recorder) is False
+
+    assert session.status == PracticeSessionStatus.COMPLETED
+    recorder.practice_session_completed.assert_awaited_once_with(session)
+
+@pytest.mark.asyncio
+async def test_submit_practice_answer_with_buffer_writes_once_on_completion(mock_practice_repo, sample_questions):
+    """With the write-behind buffer the session is read once and written only when it completes."""
+    from backend.services.practice_session_buffer import PracticeSessionBuffer
+    session = PracticeSession(
+        user_id="test_user",
+        topic="Math",
+        question_count=5,
+        questions=sample_questions
+    )
+    mock_practice_repo.find_session.return_value = session
+    buffer = PracticeSessionBuffer(max_sessions=10)
+    recorder = AsyncMock()
+
+    for question in sample_questions:
+        await submit_practice_answer(
+            session_id=session.session_id,
+            question_id=question.question_id,
+            user_answer="b",
+            practice_repo=mock_practice_repo,
+            recorder=recorder,
+            buffer=buffer
+        )
+
+    mock_practice_repo.find_session.assert_awaited_once_with(session.session_id)
+    mock_practice_repo.update_session.assert_awaited_once()
+    assert mock_practice_repo.update_session.call_args.args[0].status == PracticeSessionStatus.COMPLETED
+    recorder.practice_session_completed.assert_awaited_once()
+    assert buffer.peek(session.session_id) is None
+
 @pytest.mark.asyncio
 async def test_submit_practice_answer_incorrect(mock_practice_repo, sample_questions):
     """Test submitting an incorrect answer."""
@@ -240,23 +415,25 @@ async def test_submit_practice_answer_session_complete(mock_practice_repo, sampl
     assert session.completed_at is not None
 
 @pytest.mark.asyncio
-async def test_get_available_practice_topics(mock_question_repo):
+async def test_get_available_practice_topics(mock_question_repo, sample_questions):
     """Test getting available practice topics."""
     # Setup mocks
-    mock_question_repo.get_available_topics.return_value = ["Math", "Reading", "Logic"]
-    mock_question_repo.get_topic_question_count.side_effect = [10, 15, 8]
+    reading = sample_questions[3].model_copy(update={"skill_area": "Reading", "difficulty_level": 2})
+    questions = sample_questions[:3] + [reading]
+    mock_question_repo.get_all_questions.return_value = {q.question_id: q for q in questions}
     
     # Test topic retrieval
     topics = await get_available_practice_topics(mock_question_repo)
     
-    # Assertions
-    assert len(topics) == 3
+    # Assertions: one pass over the bank, no per-topic counting
+    assert len(topics) == 2
     assert topics[0]["name"] == "Math"
-    assert topics[0]["question_count"] == 10
+    assert topics[0]["question_count"] == 3
+    assert topics[0]["difficulty_counts"] == {"1": 3}
     assert topics[0]["available"] == True
     assert topics[1]["name"] == "Reading"
-    assert topics[1]["question_count"] == 15
-    assert topics[1]["available"] == True
+    assert topics[1]["difficulty_counts"] == {"2": 1}
+    mock_question_repo.get_topic_question_count.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_get_practice_session_summary(mock_practice_repo, sample_questions):
@@ -291,4 +468,34 @@ async def test_get_practice_session_summary(mock_practice_repo, sample_questions
     assert summary["status"] == "completed"
     assert summary["correct_answers"] == 3
     assert "score" in summary
-    assert summary["score"]["total_questions"] == 5 
\ No newline at end of file
+    assert summary["score"]["total_questions"] == 5 
+
+@pytest.mark.asyncio
+async def test_submit_answer_to_abandoned_session(mock_practice_repo, sample_questions):
+    """Sessions compacted by the idle sweep no longer accept answers."""
+    session = PracticeSession(
+        user_id="test_user",
+        topic="Math",
+        question_count=5,
+        questions=[],
+        status=PracticeSessionStatus.ABANDONED
+    )
+    mock_practice_repo.find_session.return_value = session
+
+    with pytest.raises(SessionAbandonedError):
+        await submit_practice_answer(session.session_id, "test_q1", "b", mock_practice_repo)
+    mock_practice_repo.update_session.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_summary_of_in_progress_adaptive_session_counts_planned_questions(sample_questions, mock_practice_repo):
+    """An adaptive session holds only the questions served so far; the summary reports the planned total."""
+    session = PracticeSession(
+        user_id="test_user", topic="Math", question_count=5, mode=PracticeMode.ADAPTIVE,
+        questions=sample_questions[:1], adaptive=AdaptiveState(difficulty=1)
+    )
+    mock_practice_repo.find_session.return_value = session
+
+    summary = await get_practice_session_summary(session.session_id, mock_practice_repo)
+
+    assert summary["total_questions"] == 5
+    assert summary["total_questions"] == summary["score"]["total_questions"]
@@ -0,0 +1,98 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.models.daily_mission import Question
+from backend.models.practice_session import PracticeSession
+from backend.services.practice_session_buffer import PracticeSessionBuffer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session(session_id: str) -> PracticeSession:
+    question = Question(
+        question_id="q1", question_text="Q1?", skill_area="Math", difficulty_level=1,
+        choices=[], correct_answer_id="a", feedback_th="fb"
+    )
+    return PracticeSession(session_id=session_id, user_id="user1", topic="Math", question_count=1, questions=[question])
+
+@pytest.fixture
+def practice_repo():
+    repo = AsyncMock()
+    repo.find_session.side_effect = lambda session_id: _session(session_id)
+    return repo
+
+@pytest.mark.asyncio
+async def test_load_reads_once_then_serves_from_memory(practice_repo):
+    buffer = PracticeSessionBuffer(max_sessions=10)
+
+    first = await buffer.load("S1", practice_repo)
+    second = await buffer.load("S1", practice_repo)
+
+    assert first is second
+    practice_repo.find_session.assert_awaited_once_with("S1")
+    assert (buffer.hits, buffer.misses) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_load_missing_session_is_not_buffered(practice_repo):
+    practice_repo.find_session.side_effect = None
+    practice_repo.find_session.return_value = None
+    buffer = PracticeSessionBuffer(max_sessions=10)
+
+    assert await buffer.load("missing", practice_repo) is None
+    assert buffer.snapshot()["sessions"] == 0
+
+@pytest.mark.asyncio
+async def test_flush_writes_dirty_sessions_once(practice_repo):
+    buffer = PracticeSessionBuffer(max_sessions=10)
+    session = await buffer.load("S1", practice_repo)
+    await buffer.load("S2", practice_repo)
+    await buffer.stage(session, practice_repo)
+
+    assert await buffer.flush(practice_repo) == 1
+    practice_repo.update_session.assert_awaited_once_with(session)
+    assert await buffer.flush(practice_repo) == 0
+
+@pytest.mark.asyncio
+async def test_failed_write_stays_dirty(practice_repo):
+    buffer = PracticeSessionBuffer(max_sessions=10)
+    session = await buffer.load("S1", practice_repo)
+    await buffer.stage(session, practice_repo)
+    practice_repo.update_session.side_effect = Exception("db down")
+
+    assert await buffer.flush(practice_repo) == 0
+    assert buffer.snapshot()["dirty"] == 1
+
+    practice_repo.update_session.side_effect = None
+    assert await buffer.flush(practice_repo) == 1
+
+@pytest.mark.asyncio
+async def test_eviction_writes_back_dirty_sessions(practice_repo):
+    buffer = PracticeSessionBuffer(max_sessions=2)
+    dirty = await buffer.load("S1", practice_repo)
+    await buffer.stage(dirty, practice_repo)
+    await buffer.load("S2", practice_repo)
+    await buffer.load("S3", practice_repo)  # evicts S1, the least recently used
+
+    assert buffer.peek("S1") is None
+    practice_repo.update_session.assert_awaited_once_with(dirty)
+    assert buffer.evictions == 1
+
+@pytest.mark.asyncio
+async def test_flush_drops_idle_clean_sessions(practice_repo):
+    clock = FakeClock()
+    buffer = PracticeSessionBuffer(max_sessions=10, idle_seconds=60, clock=clock)
+    await buffer.load("S1", practice_repo)
+    clock.now = 30
+    await buffer.load("S2", practice_repo)
+
+    clock.now = 75
+    await buffer.flush(practice_repo)
+
+    assert buffer.peek("S1") is None
+    assert buffer.peek("S2") is not None
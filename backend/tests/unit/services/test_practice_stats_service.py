@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import DuplicateKeyError
+
+from backend.models.practice_session import PracticeSession, PracticeSessionStatus
+from backend.repositories.practice_stats_repository import PracticeStatsRepository
+from backend.services.practice_stats_service import (
+    record_completed_session,
+    get_practice_stats,
+    accumulate_session,
+    rebuild_practice_stats,
+)
+from backend.services.utils import get_utc7_today_date
+
+
+def _session(user_id, topic, days_ago, question_count=5, correct_count=3):
+    completed_at = datetime.combine(get_utc7_today_date() - timedelta(days=days_ago), datetime.min.time())
+    return PracticeSession(
+        user_id=user_id, topic=topic, question_count=question_count, questions=[],
+        status=PracticeSessionStatus.COMPLETED, correct_count=correct_count, completed_at=completed_at
+    )
+
+
+def _apply(doc, update):
+    """Applies the $inc/$addToSet/$unset/$push update built by record_session to a dict."""
+    for path, value in update["$inc"].items():
+        *parents, leaf = path.split(".")
+        node = doc
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = node.get(leaf, 0) + value
+    for field, value in update["$addToSet"].items():
+        doc.setdefault(field, [])
+        if value not in doc[field]:
+            doc[field].append(value)
+    for path in update["$unset"]:
+        doc.get("daily", {}).pop(path.split(".", 1)[1], None)
+    for field, push in update["$push"].items():
+        doc[field] = (doc.get(field, []) + push["$each"])[push["$slice"]:]
+
+
+def _stats_collection(doc):
+    """A collection holding the single stats document `doc`, applying record_session's upserts."""
+    async def update_one(query, update, upsert=False):
+        if query["counted_sessions"]["$ne"] in doc.get("counted_sessions", []):
+            # The upsert's insert collides with the existing document's _id
+            raise DuplicateKeyError("E11000 duplicate key error")
+        _apply(doc, update)
+
+    collection = AsyncMock()
+    collection.update_one.side_effect = update_one
+    return collection
+
+
+def _stats_repo(collection):
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return PracticeStatsRepository(db)
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_a_rebuild():
+    sessions = [
+        _session("user1", "Math", days_ago=0),
+        _session("user1", "Math", days_ago=3, correct_count=5),
+        _session("user1", "Reading.Advanced", days_ago=45),
+    ]
+    live = {"_id": "user1"}
+    stats_repo = _stats_repo(_stats_collection(live))
+    for session in sorted(sessions, key=lambda s: s.completed_at):  # sessions complete in time order
+        await record_completed_session(session, stats_repo, window_days=30)
+
+    rebuilt = {}
+    window_start = get_utc7_today_date() - timedelta(days=29)
+    for session in sorted(sessions, key=lambda s: s.completed_at):
+        accumulate_session(rebuilt, session, window_start)
+
+    assert live == rebuilt["user1"]
+
+
+@pytest.mark.asyncio
+async def test_completing_a_session_twice_counts_it_once():
+    session = _session("user1", "Math", days_ago=0)
+    live = {"_id": "user1"}
+    stats_repo = _stats_repo(_stats_collection(live))
+
+    await record_completed_session(session, stats_repo, window_days=30)
+    await record_completed_session(session, stats_repo, window_days=30)
+
+    assert live["total_sessions"] == 1
+    assert live["total_questions"] == 5
+    assert live["by_topic"]["Math"]["sessions"] == 1
+    assert live["daily"][get_utc7_today_date().isoformat()]["sessions"] == 1
+    assert live["counted_sessions"] == [session.session_id]
+
+
+@pytest.mark.asyncio
+async def test_get_practice_stats_sums_only_the_window():
+    today = get_utc7_today_date()
+    stats_repo = AsyncMock()
+    stats_repo.get_stats.return_value = {
+        "_id": "user1",
+        "total_sessions": 3, "total_questions": 15, "total_correct": 9,
+        "topics_practiced": ["Math"],
+        "by_topic": {"Math": {"sessions": 3, "questions": 15, "correct": 9}},
+        "daily": {
+            today.isoformat(): {"sessions": 1, "questions": 5, "correct": 5},
+            (today - timedelta(days=10)).isoformat(): {"sessions": 2, "questions": 10, "correct": 4},
+        },
+    }
+
+    stats = await get_practice_stats("user1", stats_repo, window_days=7)
+
+    assert stats["accuracy"] == 60
+    assert stats["topic_breakdown"]["Math"]["sessions"] == 3
+    assert stats["recent"] == {"days": 7, "sessions": 1, "questions": 5, "correct": 5, "accuracy": 100}
+
+
+@pytest.mark.asyncio
+async def test_get_practice_stats_for_new_user():
+    stats_repo = AsyncMock()
+    stats_repo.get_stats.return_value = None
+
+    stats = await get_practice_stats("user1", stats_repo, window_days=30)
+
+    assert stats["total_sessions"] == 0
+    assert stats["recent"]["sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_replaces_all_stats():
+    async def sessions(_status):
+        yield _session("user1", "Math", days_ago=1)
+        yield _session("user2", "Math", days_ago=1)
+
+    practice_repo = MagicMock()
+    practice_repo.iter_sessions_by_status = sessions
+    stats_repo = AsyncMock()
+    stats_repo.replace_stats.return_value = 2
+
+    summary = await rebuild_practice_stats(practice_repo, stats_repo, window_days=30)
+
+    stats_repo.clear_all_stats.assert_awaited_once()
+    assert [doc["_id"] for doc in stats_repo.replace_stats.call_args.args[0]] == ["user1", "user2"]
+    assert summary["sessions_processed"] == 2
@@ -0,0 +1,183 @@
+import pytest
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
+from unittest.mock import AsyncMock
+from urllib.parse import unquote
+
+from backend.models.daily_mission import (
+    Answer, AnswerAttempt, ChoiceOption, DailyMissionDocument, MissionStatus, Question
+)
+from backend.models.practice_session import PracticeAnswer, PracticeSession
+from backend.services.mission_progress_service import submit_answer_with_feedback
+from backend.services.practice_service import submit_practice_answer
+from backend.services.progress_recorder import ProgressRecorder
+from backend.services.progress_rollup_service import (
+    MAX_ANSWER_SECONDS,
+    accumulate_attempts,
+    answer_seconds,
+    get_progress_dashboard,
+    mission_attempts,
+    practice_attempts,
+)
+
+START = datetime(2024, 3, 27, 1, 0)  # 08:00 in UTC+7
+
+
+def _question(question_id, skill_area):
+    return Question(
+        question_id=question_id, question_text="?", skill_area=skill_area, difficulty_level=1,
+        choices=[ChoiceOption(id="a", text="A"), ChoiceOption(id="b", text="B")],
+        correct_answer_id="a", feedback_th=""
+    )
+
+
+@pytest.fixture
+def mission():
+    return DailyMissionDocument(
+        user_id="user1",
+        date=date(2024, 3, 27),
+        questions=[_question("q0", "Vocabulary"), _question("q1", "Analogies")],
+        status=MissionStatus.IN_PROGRESS,
+        created_at=START,
+        answers=[
+            Answer(question_id="q0", current_answer="a", is_correct=True, attempt_count=2, attempts_history=[
+                AnswerAttempt(answer="b", is_correct=False, timestamp=START + timedelta(seconds=30)),
+                AnswerAttempt(answer="a", is_correct=True, timestamp=START + timedelta(seconds=50)),
+            ]),
+            Answer(question_id="q1", current_answer="b", is_correct=False, attempt_count=1, attempts_history=[
+                AnswerAttempt(answer="b", is_correct=False, timestamp=START + timedelta(hours=2)),
+            ]),
+        ],
+    )
+
+
+def test_answer_seconds_are_capped():
+    assert answer_seconds(START + timedelta(seconds=12), START) == 12
+    assert answer_seconds(START + timedelta(hours=1), START) == MAX_ANSWER_SECONDS
+    assert answer_seconds(START, None) == 0
+
+
+def test_mission_attempts_count_every_attempt_in_order(mission):
+    attempts = mission_attempts(mission)
+
+    assert [(a.skill_area, a.is_correct, a.seconds) for a in attempts] == [
+        ("Vocabulary", False, 30), ("Vocabulary", True, 20), ("Analogies", False, MAX_ANSWER_SECONDS)
+    ]
+    assert {a.day for a in attempts} == {date(2024, 3, 27)}
+
+
+def test_practice_attempts_use_question_skill_area_and_target_day():
+    session = PracticeSession(
+        user_id="user1", topic="Mixed", question_count=2, created_at=datetime(2024, 3, 26, 16, 59),
+        questions=[_question("q0", "Vocabulary"), _question("q1", "Analogies")],
+        answers=[
+            PracticeAnswer(question_id="q0", user_answer="a", is_correct=True, answered_at=datetime(2024, 3, 26, 17, 0)),
+        ],
+    )
+
+    [attempt] = practice_attempts(session)
+
+    # 17:00 UTC is already the next day in UTC+7
+    assert (attempt.day, attempt.skill_area, attempt.is_correct, attempt.seconds) == (
+        date(2024, 3, 27), "Vocabulary", True, 60
+    )
+
+
+@pytest.mark.asyncio
+async def test_dashboard_sums_each_window_by_skill():
+    rollup_repo = AsyncMock()
+    today = date(2024, 3, 31)
+    rollup_repo.get_rollups.return_value = [
+        {"day": datetime(2024, 3, 31), "attempts": 4, "correct": 3, "time_spent_seconds": 100,
+         "by_skill": {"Vocabulary": {"attempts": 4, "correct": 3, "time_spent_seconds": 100}}},
+        {"day": datetime(2024, 3, 1), "attempts": 2, "correct": 0, "time_spent_seconds": 50,
+         "by_skill": {"Analogies": {"attempts": 2, "correct": 0, "time_spent_seconds": 50}}},
+    ]
+
+    dashboard = await get_progress_dashboard("user1", rollup_repo, today=today)
+
+    rollup_repo.get_rollups.assert_awaited_once_with("user1", date(2024, 1, 2), today)
+    week, month, quarter = dashboard["windows"]
+    assert (week["days"], week["attempts"], week["accuracy"]) == (7, 4, 75.0)
+    assert list(week["by_skill"]) == ["Vocabulary"]
+    assert (month["attempts"], month["correct"], month["time_spent_seconds"]) == (4, 3, 100)
+    assert quarter["attempts"] == 6
+    assert quarter["by_skill"]["Analogies"]["accuracy"] == 0
+
+
+def _apply_record(docs: Dict[str, Dict[str, Any]], user_id, day, skill_area, is_correct, seconds):
+    """Applies ProgressRollupRepository.record_attempt's $inc to an in-memory document."""
+    doc = docs.setdefault(f"{user_id}:{day.isoformat()}", {
+        "_id": f"{user_id}:{day.isoformat()}",
+        "user_id": user_id,
+        "day": datetime.combine(day, datetime.min.time()),
+        "attempts": 0, "correct": 0, "time_spent_seconds": 0,
+        "by_skill": {},
+    })
+    skill = doc["by_skill"].setdefault(skill_area.replace(".", "%2E"), {"attempts": 0, "correct": 0, "time_spent_seconds": 0})
+    for bucket in (doc, skill):
+        bucket["attempts"] += 1
+        bucket["correct"] += int(is_correct)
+        bucket["time_spent_seconds"] += seconds
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_a_rebuild(mission):
+    docs: Dict[str, Dict[str, Any]] = {}
+    rollup_repo = AsyncMock()
+    rollup_repo.record_attempt.side_effect = lambda *args: _apply_record(docs, *args)
+    recorder = ProgressRecorder(AsyncMock(), rollup_repo=rollup_repo)
+
+    # Replay the mission one attempt at a time, as submissions would
+    replay = mission.model_copy(deep=True)
+    history = sorted(
+        ((answer.question_id, attempt) for answer in mission.answers for attempt in answer.attempts_history),
+        key=lambda item: item[1].timestamp,
+    )
+    for answer in replay.answers:
+        answer.attempts_history = []
+    for question_id, attempt in history:
+        next(a for a in replay.answers if a.question_id == question_id).attempts_history.append(attempt)
+        await recorder.mission_answer_submitted(replay)
+
+    rebuilt: Dict[str, Dict[str, Any]] = {}
+    accumulate_attempts(rebuilt, mission.user_id, mission_attempts(mission))
+    assert docs == rebuilt
+    assert {unquote(key) for key in rebuilt["user1:2024-03-27"]["by_skill"]} == {"Vocabulary", "Analogies"}
+
+
+@pytest.mark.asyncio
+async def test_mission_submission_notifies_recorder(mission):
+    mission_repo = AsyncMock()
+    mission_repo.find_mission.return_value = mission
+    recorder = AsyncMock()
+
+    await submit_answer_with_feedback("user1", "q1", "a", mission_repo, recorder=recorder)
+
+    recorder.mission_answer_submitted.assert_awaited_once_with(mission)
+
+
+@pytest.mark.asyncio
+async def test_practice_submission_notifies_recorder_once_per_new_answer():
+    practice_repo = AsyncMock()
+    recorder = AsyncMock()
+    session = PracticeSession(
+        user_id="user1", topic="Vocabulary", question_count=2,
+        questions=[_question("q0", "Vocabulary"), _question("q1", "Vocabulary")]
+    )
+    practice_repo.find_session.return_value = session
+
+    await submit_practice_answer(session.session_id, "q0", "a", practice_repo, recorder=recorder)
+    await submit_practice_answer(session.session_id, "q0", "a", practice_repo, recorder=recorder)
+
+    recorder.practice_answer_submitted.assert_awaited_once_with(session)
+
+
+@pytest.mark.asyncio
+async def test_recorder_swallows_rollup_errors(mission):
+    rollup_repo = AsyncMock()
+    rollup_repo.record_attempt.side_effect = Exception("write failed")
+
+    await ProgressRecorder(AsyncMock(), rollup_repo=rollup_repo).mission_answer_submitted(mission)
+
+    rollup_repo.record_attempt.assert_awaited_once()
@@ -0,0 +1,92 @@
+import random
+import pytest
+from typing import Dict, List
+from unittest.mock import AsyncMock
+
+from backend.services.question_exposure import (
+    EXPOSURE_FILTER_BITS,
+    EXPOSURE_FILTER_HASHES,
+    ExposureFilter,
+    exposure_bits,
+    exposure_masks,
+    load_exposure_filter,
+    pick_preferring_unseen,
+    record_exposures,
+)
+
+
+class InMemoryExposureRepository:
+    """Applies add_exposures the way the $bit / rotation updates do."""
+
+    def __init__(self):
+        self.current: Dict[int, int] = {}
+        self.previous: Dict[int, int] = {}
+        self.current_count = 0
+
+    async def get_generations(self, user_id: str) -> List[Dict[int, int]]:
+        return [dict(self.current), dict(self.previous)]
+
+    async def add_exposures(self, user_id, word_masks, count, generation_size):
+        for index, mask in word_masks.items():
+            self.current[index] = self.current.get(index, 0) | mask
+        self.current_count += count
+        if self.current_count >= generation_size:
+            self.previous, self.current, self.current_count = self.current, {}, 0
+
+
+def test_exposure_bits_are_stable_and_in_range():
+    bits = exposure_bits("q42")
+
+    assert bits == exposure_bits("q42")
+    assert len(bits) == EXPOSURE_FILTER_HASHES
+    assert all(0 <= bit < EXPOSURE_FILTER_BITS for bit in bits)
+
+def test_filter_has_no_false_negatives():
+    question_ids = [f"q{i}" for i in range(300)]
+    exposure_filter = ExposureFilter([exposure_masks(question_ids)])
+
+    assert all(exposure_filter.might_have_seen(qid) for qid in question_ids)
+    false_positives = sum(exposure_filter.might_have_seen(f"other{i}") for i in range(2000))
+    assert false_positives < 20
+
+def test_empty_filter_has_seen_nothing():
+    assert not ExposureFilter().might_have_seen("q1")
+    assert not ExposureFilter([{}, {}]).might_have_seen("q1")
+
+def test_pick_prefers_unseen_and_falls_back_to_seen():
+    candidates = [f"q{i}" for i in range(6)]
+    exposure_filter = ExposureFilter([exposure_masks(["q0", "q1", "q2", "q3"])])
+    rng = random.Random(7)
+
+    assert set(pick_preferring_unseen(candidates, 2, exposure_filter, rng=rng)) == {"q4", "q5"}
+
+    picked = pick_preferring_unseen(candidates, 4, exposure_filter, rng=rng)
+    assert picked[:2] == ["q4", "q5"]
+    assert len(set(picked)) == 4
+
+@pytest.mark.asyncio
+async def test_generations_rotate_and_forget_old_exposures(monkeypatch):
+    monkeypatch.setattr("backend.services.question_exposure.settings.QUESTION_EXPOSURE_GENERATION_SIZE", 5)
+    repo = InMemoryExposureRepository()
+
+    await record_exposures("user1", [f"a{i}" for i in range(5)], repo)  # fills and rotates
+    await record_exposures("user1", ["b0"], repo)
+    exposure_filter = await load_exposure_filter("user1", repo)
+    assert exposure_filter.might_have_seen("a0")
+    assert exposure_filter.might_have_seen("b0")
+
+    await record_exposures("user1", [f"c{i}" for i in range(4)], repo)  # rotates "a" out
+    exposure_filter = await load_exposure_filter("user1", repo)
+    assert exposure_filter.might_have_seen("b0")
+    assert not any(exposure_filter.might_have_seen(f"a{i}") for i in range(5))
+
+@pytest.mark.asyncio
+async def test_exposure_failures_are_not_raised():
+    repo = AsyncMock()
+    repo.get_generations.side_effect = Exception("db down")
+    repo.add_exposures.side_effect = Exception("db down")
+
+    exposure_filter = await load_exposure_filter("user1", repo)
+    await record_exposures("user1", ["q1"], repo)
+
+    assert not exposure_filter.might_have_seen("q1")
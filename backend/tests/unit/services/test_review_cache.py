@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.services.review_cache import ReviewCache
+
+
+def test_get_counts_hits_and_misses():
+    cache = ReviewCache(max_entries=10)
+
+    assert cache.get("user1", 0, "stats") is None
+    cache.put("user1", 0, "stats", {"total": 3})
+    assert cache.get("user1", 0, "stats") == {"total": 3}
+
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ReviewCache(max_entries=2)
+    cache.put("user1", 0, "a", 1)
+    cache.put("user2", 0, "b", 2)
+    cache.get("user1", 0, "a")
+
+    cache.put("user3", 0, "c", 3)
+
+    assert cache.get("user2", 0, "b") is None
+    assert cache.get("user1", 0, "a") == 1
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_newer_epoch_drops_the_users_entries():
+    cache = ReviewCache(max_entries=10)
+    cache.put("user1", 0, "a", 1)
+    cache.put("user1", 0, "b", 2)
+    cache.put("user2", 0, "a", 3)
+
+    assert cache.get("user1", 1, "a") is None
+
+    snapshot = cache.snapshot()
+    assert snapshot["entries"] == 1
+    assert snapshot["invalidations"] == 2
+    assert cache.get("user2", 0, "a") == 3
+
+
+def test_result_computed_at_an_older_epoch_is_not_stored():
+    cache = ReviewCache(max_entries=10)
+    cache.get("user1", 2, "a")
+
+    cache.put("user1", 1, "a", "stale")
+
+    assert cache.snapshot()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_computes_once_per_epoch():
+    cache = ReviewCache(max_entries=10)
+    compute = AsyncMock(return_value=["Math"])
+
+    assert await cache.get_or_compute("user1", 0, "skills", compute) == ["Math"]
+    assert await cache.get_or_compute("user1", 0, "skills", compute) == ["Math"]
+    assert compute.await_count == 1
+
+    await cache.get_or_compute("user1", 1, "skills", compute)
+    assert compute.await_count == 2
@@ -1,9 +1,13 @@
 import pytest
-from unittest.mock import AsyncMock, Mock
+from bson import ObjectId
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import date, datetime
 from typing import List
 
 from backend.services.review_mistakes_service import ReviewMistakesService
+from backend.services.mistake_index_service import get_choice_text, mission_mistake_items
+from backend.services.cursor_pagination import InvalidCursorError, encode_cursor
+from backend.services.review_cache import ReviewCache
 from backend.models.daily_mission import (
     DailyMissionDocument, 
     MissionStatus, 
@@ -138,11 +142,19 @@ class TestReviewMistakesService:
             )
         ]
     
+    @pytest.fixture
+    def sample_mistakes(self, sample_missions):
+        """Review items the aggregation returns for sample_missions, newest first"""
+        return [
+            item
+            for mission in sorted(sample_missions, key=lambda m: m.date, reverse=True)
+            for item in mission_mistake_items(mission)
+        ]
+    
     @pytest.mark.asyncio
     async def test_get_user_mistakes_no_mistakes(self, service, mock_mission_repo):
         """Test handling when user has no mistakes"""
-        # Mock repository to return empty missions
-        mock_mission_repo.find_missions_by_status.return_value = []
+        mock_mission_repo.aggregate_review_mistakes.return_value = ([], 0)
         
         result = await service.get_user_mistakes("user123")
         
@@ -153,13 +165,9 @@ class TestReviewMistakesService:
         assert result.pagination.total_pages == 0
     
     @pytest.mark.asyncio
-    async def test_get_user_mistakes_with_pagination(self, service, mock_mission_repo, sample_missions):
+    async def test_get_user_mistakes_with_pagination(self, service, mock_mission_repo, sample_mistakes):
         """Test paginated retrieval of user mistakes"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            [sample_missions[1]]   # ARCHIVED missions
-        ]
+        mock_mission_repo.aggregate_review_mistakes.return_value = (sample_mistakes[:1], 2)
         
         result = await service.get_user_mistakes(
             user_id="user123",
@@ -167,6 +175,7 @@ class TestReviewMistakesService:
             items_per_page=1
         )
         
+        mock_mission_repo.aggregate_review_mistakes.assert_awaited_once_with("user123", None, 0, 1)
         assert isinstance(result, ReviewMistakesResponse)
         assert result.total_mistakes == 2
         assert len(result.mistakes) == 1  # Limited by page size
@@ -176,13 +185,15 @@ class TestReviewMistakesService:
         assert result.pagination.has_previous is False
     
     @pytest.mark.asyncio
-    async def test_get_user_mistakes_grouped_by_date(self, service, mock_mission_repo, sample_missions):
+    async def test_get_user_mistakes_grouped_by_date(self, service, mock_mission_repo, sample_mistakes):
         """Test grouping mistakes by date"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            [sample_missions[1]]   # ARCHIVED missions
-        ]
+        mock_mission_repo.aggregate_grouped_review_mistakes.return_value = (
+            [
+                (datetime(2024, 1, 16), [sample_mistakes[0]]),
+                (datetime(2024, 1, 15), [sample_mistakes[1]]),
+            ],
+            [(datetime(2024, 1, 16), 1), (datetime(2024, 1, 15), 1)]
+        )
         
         result = await service.get_user_mistakes(
             user_id="user123",
@@ -191,11 +202,12 @@ class TestReviewMistakesService:
             group_by="date"
         )
         
+        mock_mission_repo.aggregate_grouped_review_mistakes.assert_awaited_once_with("user123", "date", None, 0, 10)
         assert isinstance(result, GroupedReviewMistakesResponse)
         assert result.total_mistakes == 2
         assert len(result.grouped_mistakes) == 2  # Two different dates
         
-        # Check date formatting
+        # Check date formatting (order comes from the database)
         expected_dates = ["16 Jan 2024", "15 Jan 2024"]  # Sorted descending
         assert list(result.grouped_mistakes.keys()) == expected_dates
         
@@ -204,13 +216,12 @@ class TestReviewMistakesService:
         assert result.group_counts["15 Jan 2024"] == 1
     
     @pytest.mark.asyncio
-    async def test_get_user_mistakes_grouped_by_topic(self, service, mock_mission_repo, sample_missions):
+    async def test_get_user_mistakes_grouped_by_topic(self, service, mock_mission_repo, sample_mistakes):
         """Test grouping mistakes by skill area (topic)"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            [sample_missions[1]]   # ARCHIVED missions
-        ]
+        mock_mission_repo.aggregate_grouped_review_mistakes.return_value = (
+            [("Geography", [sample_mistakes[0]]), ("Mathematics", [sample_mistakes[1]])],
+            [("Geography", 1), ("Mathematics", 1)]
+        )
         
         result = await service.get_user_mistakes(
             user_id="user123",
@@ -231,56 +242,55 @@ class TestReviewMistakesService:
         assert result.group_counts["Mathematics"] == 1
     
     @pytest.mark.asyncio
-    async def test_get_user_mistakes_with_skill_area_filter(self, service, mock_mission_repo, sample_missions):
+    async def test_grouped_pagination_counts_groups(self, service, mock_mission_repo, sample_mistakes):
+        """Groups, not mistakes, are paginated; counts cover every group"""
+        mock_mission_repo.aggregate_grouped_review_mistakes.return_value = (
+            [("Mathematics", [sample_mistakes[1]])],
+            [("Geography", 1), ("Mathematics", 1)]
+        )
+        
+        result = await service.get_user_mistakes("user123", page=2, items_per_page=1, group_by="topic")
+        
+        mock_mission_repo.aggregate_grouped_review_mistakes.assert_awaited_once_with("user123", "topic", None, 1, 1)
+        assert list(result.grouped_mistakes.keys()) == ["Mathematics"]
+        assert result.pagination.total_items == 2
+        assert result.pagination.has_previous is True
+        assert result.pagination.has_next is False
+    
+    @pytest.mark.asyncio
+    async def test_get_user_mistakes_with_skill_area_filter(self, service, mock_mission_repo, sample_mistakes):
         """Test filtering mistakes by skill area"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            [sample_missions[1]]   # ARCHIVED missions
-        ]
+        math_mistakes = [m for m in sample_mistakes if m.skill_area == "Mathematics"]
+        mock_mission_repo.aggregate_review_mistakes.return_value = (math_mistakes, 1)
         
         result = await service.get_user_mistakes(
             user_id="user123",
             skill_area_filter="Mathematics"
         )
         
+        mock_mission_repo.aggregate_review_mistakes.assert_awaited_once_with("user123", "Mathematics", 0, 20)
         assert isinstance(result, ReviewMistakesResponse)
         assert result.total_mistakes == 1
         assert len(result.mistakes) == 1
         assert result.mistakes[0].skill_area == "Mathematics"
     
     @pytest.mark.asyncio
-    async def test_get_available_skill_areas(self, service, mock_mission_repo, sample_missions):
+    async def test_get_available_skill_areas(self, service, mock_mission_repo):
         """Test getting available skill areas"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            [sample_missions[1]]   # ARCHIVED missions
-        ]
+        mock_mission_repo.aggregate_review_skill_areas.return_value = ["Geography", "Mathematics"]
         
         result = await service.get_available_skill_areas("user123")
         
-        assert isinstance(result, list)
-        assert len(result) == 2
-        assert "Mathematics" in result
-        assert "Geography" in result
-        assert result == sorted(result)  # Should be sorted
+        assert result == ["Geography", "Mathematics"]
+        mock_mission_repo.aggregate_review_skill_areas.assert_awaited_once_with("user123")
     
-    @pytest.mark.asyncio
-    async def test_extract_mistakes_content_validation(self, service, mock_mission_repo, sample_missions):
+    def test_extract_mistakes_content_validation(self, sample_missions):
         """Test that extracted mistake content is correct"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            []  # No archived missions
-        ]
+        mistakes = mission_mistake_items(sample_missions[0])
         
-        result = await service.get_user_mistakes("user123")
+        assert len(mistakes) == 1
         
-        assert isinstance(result, ReviewMistakesResponse)
-        assert len(result.mistakes) == 1
-        
-        mistake = result.mistakes[0]
+        mistake = mistakes[0]
         assert mistake.question_id == "Q1"
         assert mistake.question_text == "What is 2+2?"
         assert mistake.skill_area == "Mathematics"
@@ -294,13 +304,9 @@ class TestReviewMistakesService:
         assert mistake.mission_date == date(2024, 1, 15)
     
     @pytest.mark.asyncio
-    async def test_pagination_edge_cases(self, service, mock_mission_repo, sample_missions):
+    async def test_pagination_edge_cases(self, service, mock_mission_repo, sample_mistakes):
         """Test pagination edge cases"""
-        # Mock repository calls
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [sample_missions[0]],  # COMPLETE missions
-            [sample_missions[1]]   # ARCHIVED missions
-        ]
+        mock_mission_repo.aggregate_review_mistakes.return_value = (sample_mistakes[1:], 2)
         
         # Test last page
         result = await service.get_user_mistakes(
@@ -309,25 +315,25 @@ class TestReviewMistakesService:
             items_per_page=1
         )
         
+        mock_mission_repo.aggregate_review_mistakes.assert_awaited_once_with("user123", None, 1, 1)
         assert isinstance(result, ReviewMistakesResponse)
         assert result.pagination.current_page == 2
         assert result.pagination.has_next is False
         assert result.pagination.has_previous is True
         assert len(result.mistakes) == 1
     
-    def test_get_choice_text_helper(self, service):
+    def test_get_choice_text_helper(self):
         """Test the helper method for getting choice text"""
         choices = [
             ChoiceOption(id="A", text="Option A"),
             ChoiceOption(id="B", text="Option B")
         ]
         
-        assert service._get_choice_text(choices, "A") == "Option A"
-        assert service._get_choice_text(choices, "B") == "Option B"
-        assert service._get_choice_text(choices, "C") == "Unknown"
+        assert get_choice_text(choices, "A") == "Option A"
+        assert get_choice_text(choices, "B") == "Option B"
+        assert get_choice_text(choices, "C") == "Unknown"
     
-    @pytest.mark.asyncio
-    async def test_empty_missions_handling(self, service, mock_mission_repo):
+    def test_empty_missions_handling(self):
         """Test handling of missions with no answers"""
         empty_mission = DailyMissionDocument(
             user_id="user123",
@@ -339,13 +345,178 @@ class TestReviewMistakesService:
             updated_at=datetime(2024, 1, 15, 8, 30)
         )
         
-        mock_mission_repo.find_missions_by_status.side_effect = [
-            [empty_mission],  # COMPLETE missions
-            []  # ARCHIVED missions
+        assert mission_mistake_items(empty_mission) == []
+
+
+class TestReviewMistakesServiceIndexed:
+    """Tests for reading review mistakes from the materialized mistakes collection"""
+
+    @pytest.fixture
+    def mock_mistake_repo(self):
+        """Mock mistake repository"""
+        return AsyncMock()
+
+    @pytest.fixture
+    def service(self, mock_mistake_repo):
+        """Create service instance backed by the mistakes collection"""
+        return ReviewMistakesService(AsyncMock(), mock_mistake_repo)
+
+    def _item(self, question_id: str, skill_area: str, mission_date: date) -> ReviewMistakeItem:
+        return ReviewMistakeItem(
+            question_id=question_id,
+            question_text="Question",
+            skill_area=skill_area,
+            difficulty_level=1,
+            choices=[{"id": "A", "text": "A"}],
+            user_answer_id="A",
+            user_answer_text="A",
+            correct_answer_id="B",
+            correct_answer_text="B",
+            explanation="",
+            mission_date=mission_date,
+            mission_completion_date=datetime(2024, 1, 15, 8, 30),
+            attempt_count=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_page_is_read_with_skip_and_limit(self, service, mock_mistake_repo):
+        mock_mistake_repo.count_mistakes.return_value = 25
+        mock_mistake_repo.find_mistakes.return_value = (
+            [self._item("Q1", "Math", date(2024, 1, 15))],
+            (datetime(2024, 1, 15), ObjectId())
+        )
+
+        result = await service.get_user_mistakes("user123", page=2, items_per_page=10, skill_area_filter="Math")
+
+        mock_mistake_repo.find_mistakes.assert_awaited_once_with("user123", "Math", skip=10, limit=10)
+        assert result.total_mistakes == 25
+        assert result.pagination.total_pages == 3
+        assert result.pagination.has_next is True
+        assert result.pagination.next_cursor is not None
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached_until_the_review_epoch_changes(self, mock_mistake_repo):
+        epoch_repo = AsyncMock()
+        epoch_repo.get_epoch.return_value = 4
+        service = ReviewMistakesService(AsyncMock(), mock_mistake_repo, cache=ReviewCache(), epoch_repo=epoch_repo)
+        mock_mistake_repo.get_skill_areas.return_value = ["Math"]
+
+        assert await service.get_available_skill_areas("user123") == ["Math"]
+        assert await service.get_available_skill_areas("user123") == ["Math"]
+        mock_mistake_repo.get_skill_areas.assert_awaited_once()
+
+        # A status transition bumps the epoch, so the next call recomputes
+        epoch_repo.get_epoch.return_value = 5
+        mock_mistake_repo.get_skill_areas.return_value = ["Math", "Science"]
+        assert await service.get_available_skill_areas("user123") == ["Math", "Science"]
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_reads_following_page_by_key(self, service, mock_mistake_repo):
+        last_key = (datetime(2024, 1, 15), ObjectId())
+        mock_mistake_repo.count_mistakes.return_value = 3
+        mock_mistake_repo.find_mistakes.return_value = ([self._item("Q1", "Math", date(2024, 1, 15))], last_key)
+        first = await service.get_user_mistakes("user123", items_per_page=1)
+
+        mock_mistake_repo.count_mistakes.reset_mock()
+        mock_mistake_repo.find_mistakes.return_value = ([self._item("Q2", "Math", date(2024, 1, 14))], None)
+        second = await service.get_user_mistakes(
+            "user123", items_per_page=1, cursor=first.pagination.next_cursor
+        )
+
+        # The total travels in the cursor; the page is read from the key, not an offset
+        mock_mistake_repo.count_mistakes.assert_not_awaited()
+        assert mock_mistake_repo.find_mistakes.call_args.kwargs["after"] == last_key
+        assert second.pagination.current_page == 2
+        assert second.pagination.total_items == 3
+        assert second.pagination.has_next is False
+        assert second.pagination.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_for_other_filter_is_rejected(self, service, mock_mistake_repo):
+        cursor = encode_cursor([datetime(2024, 1, 15), ObjectId()], s="Math", p=2, t=3)
+
+        with pytest.raises(InvalidCursorError):
+            await service.get_user_mistakes("user123", skill_area_filter="Geo", cursor=cursor)
+
+    @pytest.mark.asyncio
+    async def test_grouped_cursor_reads_groups_after_key(self, service, mock_mistake_repo):
+        cursor = encode_cursor(["Geo"], g="topic", s=None, p=2, t=3, m=9)
+        mock_mistake_repo.find_mistake_groups.return_value = (
+            [("Math", [self._item("Q1", "Math", date(2024, 1, 15))])], True
+        )
+
+        result = await service.get_user_mistakes("user123", items_per_page=1, group_by="topic", cursor=cursor)
+
+        mock_mistake_repo.find_mistake_groups.assert_awaited_once_with(
+            "user123", "topic", None, after="Geo", limit=1
+        )
+        assert result.group_counts == {"Math": 1}
+        assert result.total_mistakes == 9
+        assert result.pagination.has_next is True
+        assert result.pagination.next_cursor is not None
+
+    @pytest.mark.asyncio
+    async def test_no_mistakes_skips_page_query(self, service, mock_mistake_repo):
+        mock_mistake_repo.count_mistakes.return_value = 0
+
+        result = await service.get_user_mistakes("user123", page=3)
+
+        mock_mistake_repo.find_mistakes.assert_not_awaited()
+        assert result.pagination.current_page == 1
+        assert result.mistakes == []
+
+    @pytest.mark.asyncio
+    async def test_grouped_by_date_reads_only_page_groups(self, service, mock_mistake_repo):
+        mock_mistake_repo.count_by_group.return_value = [
+            (datetime(2024, 1, 16), 1),
+            (datetime(2024, 1, 15), 2),
         ]
-        
-        result = await service.get_user_mistakes("user123")
-        
-        assert isinstance(result, ReviewMistakesResponse)
-        assert result.total_mistakes == 0
-        assert len(result.mistakes) == 0 
\ No newline at end of file
+        mock_mistake_repo.find_mistakes_in_groups.return_value = [self._item("Q2", "Geo", date(2024, 1, 16))]
+
+        result = await service.get_user_mistakes("user123", page=1, items_per_page=1, group_by="date")
+
+        assert mock_mistake_repo.find_mistakes_in_groups.call_args.args[2] == [datetime(2024, 1, 16)]
+        assert list(result.grouped_mistakes.keys()) == ["16 Jan 2024"]
+        assert result.group_counts == {"16 Jan 2024": 1, "15 Jan 2024": 2}
+        assert result.total_mistakes == 3
+        assert result.pagination.total_pages == 2
+
+    @pytest.mark.asyncio
+    async def test_skill_areas_come_from_mistakes_collection(self, service, mock_mistake_repo):
+        mock_mistake_repo.get_skill_areas.return_value = ["Geo", "Math"]
+
+        assert await service.get_available_skill_areas("user123") == ["Geo", "Math"]
+
+    @pytest.mark.asyncio
+    async def test_review_stats_fill_weekly_trend(self, service, mock_mistake_repo):
+        mock_mistake_repo.get_mistake_stats.return_value = {
+            "total": 5,
+            "by_skill": [("Geo", 2), ("Math", 3)],
+            "by_difficulty": [(1, 4), (3, 1)],
+            "by_week": [(date(2024, 1, 8), 5)],
+        }
+
+        # Wednesday 17 Jan 2024: the three weeks start on 1, 8 and 15 Jan
+        with patch("backend.services.review_mistakes_service.get_utc7_today_date", return_value=date(2024, 1, 17)):
+            stats = await service.get_review_stats("user123", weeks=3)
+
+        mock_mistake_repo.get_mistake_stats.assert_awaited_once_with("user123", date(2024, 1, 1))
+        assert stats["total_mistakes"] == 5
+        assert stats["skill_areas"] == ["Geo", "Math"]
+        assert stats["skill_area_breakdown"] == {"Geo": 2, "Math": 3}
+        assert stats["difficulty_breakdown"] == {1: 4, 3: 1}
+        assert stats["weekly_trend"] == [
+            {"week_start": "2024-01-01", "count": 0},
+            {"week_start": "2024-01-08", "count": 5},
+            {"week_start": "2024-01-15", "count": 0},
+        ]
+
+
+def test_unbackfilled_databases_can_aggregate_from_missions():
+    from backend.routes.review_mistakes import get_review_mistakes_service
+
+    mission_repo, mistake_repo = AsyncMock(), AsyncMock()
+    with patch("backend.routes.review_mistakes.settings.REVIEW_MISTAKES_FROM_MISSIONS", False):
+        assert get_review_mistakes_service(mission_repo, mistake_repo, AsyncMock()).mistake_repo is mistake_repo
+    with patch("backend.routes.review_mistakes.settings.REVIEW_MISTAKES_FROM_MISSIONS", True):
+        assert get_review_mistakes_service(mission_repo, mistake_repo, AsyncMock()).mistake_repo is None
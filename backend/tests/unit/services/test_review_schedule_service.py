@@ -0,0 +1,65 @@
+import pytest
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock
+
+from backend.models.api_responses import ReviewMistakeItem
+from backend.services.review_schedule_service import (
+    schedule_mistakes,
+    get_due_reviews,
+    grade_review,
+    ReviewItemNotFoundError,
+    InvalidGradeError,
+)
+from backend.services.cursor_pagination import InvalidCursorError, encode_cursor
+
+
+@pytest.fixture
+def mock_schedule_repo():
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_first_review_is_a_day_after_the_mistake(mock_schedule_repo):
+    mistake = ReviewMistakeItem(
+        question_id="q1", question_text="Question", skill_area="Math", difficulty_level=1,
+        choices=[], user_answer_id="b", user_answer_text="B", correct_answer_id="a",
+        correct_answer_text="A", explanation="", mission_date=date(2024, 3, 1),
+        mission_completion_date=datetime(2024, 3, 1, 20, 0, tzinfo=timezone.utc), attempt_count=1
+    )
+
+    await schedule_mistakes("user1", [mistake], mock_schedule_repo)
+
+    user_id, scheduled = mock_schedule_repo.schedule_mistakes.call_args.args
+    assert scheduled == [(mistake, datetime(2024, 3, 2, 20, 0))]
+
+
+@pytest.mark.asyncio
+async def test_due_reviews_cursor_round_trip(mock_schedule_repo):
+    next_key = (datetime(2024, 3, 1), "q4")
+    mock_schedule_repo.find_due.return_value = ([], next_key)
+
+    _, cursor = await get_due_reviews("user1", mock_schedule_repo, limit=5)
+    await get_due_reviews("user1", mock_schedule_repo, limit=5, cursor=cursor)
+
+    assert mock_schedule_repo.find_due.call_args.kwargs["after"] == next_key
+
+
+@pytest.mark.asyncio
+async def test_due_reviews_reject_cursor_from_other_listing(mock_schedule_repo):
+    with pytest.raises(InvalidCursorError):
+        await get_due_reviews("user1", mock_schedule_repo, cursor=encode_cursor([datetime(2024, 3, 1), "q1"], p=2))
+
+
+@pytest.mark.asyncio
+async def test_grade_review_of_unscheduled_question(mock_schedule_repo):
+    mock_schedule_repo.grade_item.return_value = None
+
+    with pytest.raises(ReviewItemNotFoundError):
+        await grade_review("user1", "q1", 4, mock_schedule_repo)
+
+
+@pytest.mark.asyncio
+async def test_grade_review_rejects_grade_outside_scale(mock_schedule_repo):
+    with pytest.raises(InvalidGradeError):
+        await grade_review("user1", "q1", 6, mock_schedule_repo)
+    mock_schedule_repo.grade_item.assert_not_awaited()
@@ -0,0 +1,96 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import AsyncMock
+
+from backend.models.daily_mission import DailyMissionDocument, MissionStatus
+from backend.services.progress_recorder import ProgressRecorder
+from backend.services.streak_service import get_streak
+from backend.jobs.daily_reset import run_daily_reset_job
+
+TODAY = date(2024, 3, 27)  # a Wednesday
+
+
+def _doc(last_completed, current=4, week_start=datetime(2024, 3, 25), week_completions=2):
+    return {
+        "_id": "user1",
+        "current_streak": current,
+        "longest_streak": 9,
+        "last_completed_date": last_completed,
+        "week_start": week_start,
+        "week_completions": week_completions,
+        "total_completed_days": 20,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_streak_returns_stored_counters():
+    streak_repo = AsyncMock()
+    streak_repo.get_streak.return_value = _doc(datetime(2024, 3, 26))
+
+    streak = await get_streak("user1", streak_repo, today=TODAY)
+
+    assert streak == {
+        "current_streak": 4,
+        "longest_streak": 9,
+        "last_completed_date": "2024-03-26",
+        "week_completions": 2,
+        "total_completed_days": 20,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_streak_reads_missed_day_and_past_week_as_zero():
+    streak_repo = AsyncMock()
+    # Last completed two days ago, in the previous week; the daily reset has not run yet
+    streak_repo.get_streak.return_value = _doc(datetime(2024, 3, 24), week_start=datetime(2024, 3, 18))
+
+    streak = await get_streak("user1", streak_repo, today=TODAY)
+
+    assert streak["current_streak"] == 0
+    assert streak["week_completions"] == 0
+    assert streak["longest_streak"] == 9
+
+
+@pytest.mark.asyncio
+async def test_get_streak_for_new_user():
+    streak_repo = AsyncMock()
+    streak_repo.get_streak.return_value = None
+
+    streak = await get_streak("user1", streak_repo, today=TODAY)
+
+    assert streak["current_streak"] == 0
+    assert streak["last_completed_date"] is None
+    assert streak["total_completed_days"] == 0
+
+
+@pytest.mark.asyncio
+async def test_recorder_records_completed_mission_day():
+    streak_repo = AsyncMock()
+    mission = DailyMissionDocument(user_id="user1", date=TODAY, questions=[], status=MissionStatus.COMPLETE)
+
+    await ProgressRecorder(AsyncMock(), streak_repo=streak_repo).mission_completed(mission)
+
+    streak_repo.record_completion.assert_awaited_once_with("user1", TODAY)
+
+
+@pytest.mark.asyncio
+async def test_recorder_swallows_streak_errors():
+    streak_repo = AsyncMock()
+    streak_repo.record_completion.side_effect = Exception("write failed")
+    streak_repo.reset_broken_streaks.side_effect = Exception("write failed")
+    recorder = ProgressRecorder(AsyncMock(), streak_repo=streak_repo)
+    mission = DailyMissionDocument(user_id="user1", date=TODAY, questions=[], status=MissionStatus.COMPLETE)
+
+    await recorder.mission_completed(mission)
+    await recorder.day_rolled_over(TODAY)
+
+
+@pytest.mark.asyncio
+async def test_daily_reset_resets_broken_streaks_even_when_nothing_is_archived():
+    mission_repo = AsyncMock()
+    mission_repo.get_missions_to_archive.return_value = []
+    recorder = AsyncMock()
+
+    await run_daily_reset_job(mission_repo, recorder)
+
+    recorder.day_rolled_over.assert_awaited_once()
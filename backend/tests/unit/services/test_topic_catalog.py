@@ -0,0 +1,48 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.models.daily_mission import Question, ChoiceOption
+from backend.repositories.question_repository import QuestionRepository
+from backend.services.topic_catalog import TopicCatalogCache
+
+
+@pytest.fixture
+def bank():
+    return {
+        "q1": Question(
+            question_id="q1", question_text="Question", skill_area="Math", difficulty_level=1,
+            choices=[ChoiceOption(id="a", text="A")], correct_answer_id="a", feedback_th=""
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_built_once_per_bank_version(bank):
+    catalog = TopicCatalogCache()
+    question_repo = AsyncMock()
+    question_repo.get_all_questions.return_value = bank
+
+    with patch.object(QuestionRepository, "_bank_version", "v1"):
+        first = await catalog.get_payload(question_repo)
+        second = await catalog.get_payload(question_repo)
+
+    assert first is second
+    assert catalog.builds == 1
+    assert question_repo.get_all_questions.await_count == 1
+    body = json.loads(first.body)
+    assert body["data"][0]["name"] == "Math"
+    assert body["data"][0]["difficulty_counts"] == {"1": 1}
+
+    # A reloaded bank with different content has a new version
+    with patch.object(QuestionRepository, "_bank_version", "v2"):
+        third = await catalog.get_payload(question_repo)
+    assert third.version == "v2"
+    assert catalog.builds == 2
+
+
+def test_bank_version_depends_on_topics_and_difficulties(bank):
+    changed = {"q1": bank["q1"].model_copy(update={"difficulty_level": 2})}
+
+    assert QuestionRepository._fingerprint(bank) == QuestionRepository._fingerprint(dict(bank))
+    assert QuestionRepository._fingerprint(bank) != QuestionRepository._fingerprint(changed)
@@ -0,0 +1,227 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.database import DatabaseManager
+from backend.db_monitoring import (
+    PoolMonitor,
+    SlowQueryMonitor,
+    current_repository_method,
+    instrument_repository,
+    plan_outline,
+    redact_filter,
+)
+
+
+def _started(command_name, command, request_id=1):
+    return SimpleNamespace(
+        command_name=command_name,
+        command=command,
+        database_name="edtech",
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        operation_id=request_id,
+    )
+
+
+def _succeeded(command_name, duration_ms, request_id=1):
+    return SimpleNamespace(
+        command_name=command_name,
+        duration_micros=int(duration_ms * 1000),
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        operation_id=request_id,
+    )
+
+
+def _run(monitor, command_name, command, duration_ms, request_id=1):
+    monitor.started(_started(command_name, command, request_id))
+    monitor.succeeded(_succeeded(command_name, duration_ms, request_id))
+
+
+def test_redact_filter_keeps_shape_and_hides_values():
+    """Literal values are replaced while operators and field references survive."""
+    shape = redact_filter({
+        "user_id": "user123",
+        "status": {"$in": ["complete", "archived"]},
+        "$or": [{"date": {"$lt": "2024-01-01"}}, {"score": 5}],
+    })
+
+    assert shape == {
+        "user_id": "?",
+        "status": {"$in": ["?"]},
+        "$or": [{"date": {"$lt": "?"}}, {"score": "?"}],
+    }
+    assert redact_filter([{"$group": {"_id": "$topic", "n": {"$sum": 1}}}]) == [
+        {"$group": {"_id": "$topic", "n": {"$sum": "?"}}}
+    ]
+
+
+def test_fast_commands_are_counted_but_not_logged_as_slow():
+    monitor = SlowQueryMonitor(slow_threshold_ms=100)
+
+    _run(monitor, "find", {"find": "missions", "filter": {"user_id": "u1"}}, duration_ms=5)
+
+    snapshot = monitor.snapshot()
+    assert snapshot["slow_operations"] == []
+    assert snapshot["command_stats"][0]["command"] == "find"
+    assert snapshot["command_stats"][0]["collection"] == "missions"
+    assert snapshot["command_stats"][0]["count"] == 1
+
+
+def test_slow_command_is_recorded_with_redacted_filter():
+    monitor = SlowQueryMonitor(slow_threshold_ms=100)
+
+    _run(monitor, "find", {"find": "missions", "filter": {"user_id": "secret-user"}}, duration_ms=250)
+
+    slow = monitor.snapshot()["slow_operations"]
+    assert len(slow) == 1
+    assert slow[0]["duration_ms"] == 250
+    assert slow[0]["filter_shape"] == {"user_id": "?"}
+    assert "secret-user" not in str(monitor.snapshot())
+
+
+def test_slow_window_is_bounded():
+    monitor = SlowQueryMonitor(slow_threshold_ms=1, window_size=3)
+
+    for request_id in range(10):
+        _run(monitor, "find", {"find": "missions", "filter": {}}, duration_ms=10, request_id=request_id)
+
+    snapshot = monitor.snapshot()
+    assert len(snapshot["slow_operations"]) == 3
+    assert snapshot["command_stats"][0]["slow_count"] == 10
+
+
+def test_housekeeping_commands_are_ignored():
+    monitor = SlowQueryMonitor(slow_threshold_ms=0)
+
+    _run(monitor, "hello", {"hello": 1}, duration_ms=500)
+
+    assert monitor.snapshot()["command_stats"] == []
+
+
+@pytest.mark.asyncio
+async def test_repeat_offender_is_explained_once():
+    monitor = SlowQueryMonitor(slow_threshold_ms=10, explain_enabled=True, explain_after=2)
+    command = {"find": "missions", "filter": {"user_id": "u1"}, "lsid": {"id": "x"}, "$db": "edtech"}
+
+    for request_id in range(3):
+        _run(monitor, "find", command, duration_ms=50, request_id=request_id)
+
+    db = MagicMock()
+    db.command = AsyncMock(return_value={"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}})
+    client = MagicMock()
+    client.__getitem__.return_value = db
+
+    assert await monitor.run_pending_explains(client) == 1
+    explain_command = db.command.call_args.args[0]
+    assert explain_command["explain"] == {"find": "missions", "filter": {"user_id": "u1"}}
+
+    # Further slow runs of the same shape do not queue another explain
+    _run(monitor, "find", command, duration_ms=50, request_id=99)
+    assert await monitor.run_pending_explains(client) == 0
+    assert monitor.snapshot()["explains"][0]["winning_plan"] == {"stage": "COLLSCAN"}
+
+
+def test_plan_outline_drops_query_values():
+    winning_plan = {
+        "stage": "FETCH",
+        "filter": {"status": {"$eq": "complete"}},
+        "inputStage": {
+            "stage": "IXSCAN",
+            "keyPattern": {"user_id": 1, "date": -1},
+            "indexName": "user_date",
+            "isMultiKey": False,
+            "direction": "forward",
+            "indexBounds": {"user_id": ['["u1", "u1"]'], "date": ["[MaxKey, MinKey]"]},
+        },
+    }
+
+    assert plan_outline({"queryPlan": winning_plan, "slotBasedPlan": {"stages": "..."}}) == {
+        "stage": "FETCH",
+        "inputStage": {
+            "stage": "IXSCAN",
+            "keyPattern": {"user_id": 1, "date": -1},
+            "indexName": "user_date",
+            "isMultiKey": False,
+            "direction": "forward",
+        },
+    }
+    assert plan_outline([
+        {"$cursor": {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN", "filter": {"user_id": {"$eq": "u1"}}}}}},
+        {"$group": {"_id": "$topic", "count": {"$sum": 1}}},
+    ]) == [{"stage": "$cursor", "inputStage": {"stage": "COLLSCAN"}}, {"stage": "$group"}]
+
+
+@pytest.mark.asyncio
+async def test_instrument_repository_sets_caller_for_commands():
+    monitor = SlowQueryMonitor(slow_threshold_ms=0)
+
+    @instrument_repository
+    class FakeRepository:
+        async def load(self):
+            assert current_repository_method.get() == "FakeRepository.load"
+            _run(monitor, "find", {"find": "things", "filter": {}}, duration_ms=1)
+
+    await FakeRepository().load()
+
+    assert current_repository_method.get() is None
+    assert monitor.snapshot()["command_stats"][0]["caller"] == "FakeRepository.load"
+
+
+def _pool_event(**kwargs):
+    return SimpleNamespace(address=("localhost", 27017), **kwargs)
+
+
+def test_pool_monitor_tracks_in_use_connections_and_checkout_waits():
+    monitor = PoolMonitor()
+    monitor.pool_created(_pool_event())
+    monitor.connection_created(_pool_event(connection_id=1))
+    monitor.connection_created(_pool_event(connection_id=2))
+
+    for connection_id, wait in ((1, 0.0005), (2, 0.030)):
+        monitor.connection_check_out_started(_pool_event())
+        monitor.connection_checked_out(_pool_event(connection_id=connection_id, duration=wait))
+    monitor.connection_checked_in(_pool_event(connection_id=1))
+
+    pool = monitor.snapshot()["pools"]["localhost:27017"]
+    assert pool["connections_open"] == 2
+    assert pool["connections_in_use"] == 1
+    assert pool["peak_in_use"] == 2
+    assert pool["waiting"] == 0
+    assert pool["checkouts"] == 2
+    assert pool["checkout_wait_max_ms"] == 30
+    assert pool["checkout_wait_histogram"]["<1ms"] == 1
+    assert pool["checkout_wait_histogram"]["<100ms"] == 1
+
+
+def test_pool_monitor_records_failures_and_clears():
+    monitor = PoolMonitor()
+
+    monitor.connection_check_out_started(_pool_event())
+    monitor.connection_check_out_failed(_pool_event(reason="timeout", duration=0.5))
+    monitor.pool_cleared(_pool_event())
+
+    pool = monitor.snapshot()["pools"]["localhost:27017"]
+    assert pool["checkout_failures"] == {"timeout": 1}
+    assert pool["checkout_wait_histogram"][">=500ms"] == 1
+    assert pool["pool_cleared"] == 1
+    assert pool["last_cleared_at"] is not None
+
+
+def test_client_options_only_include_configured_values():
+    with patch.multiple(
+        "backend.database.settings",
+        MONGO_MAX_POOL_SIZE=20,
+        MONGO_WAIT_QUEUE_TIMEOUT_MS=None,
+        MONGO_COMPRESSORS="zstd,zlib",
+        MONGO_WRITE_CONCERN_W="2",
+        MONGO_READ_CONCERN_LEVEL=None,
+    ):
+        options = DatabaseManager().client_options()
+
+    assert options["maxPoolSize"] == 20
+    assert options["compressors"] == "zstd,zlib"
+    assert options["w"] == 2
+    assert "waitQueueTimeoutMS" not in options
+    assert "readConcernLevel" not in options